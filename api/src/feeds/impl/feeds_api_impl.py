@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import List, Union, TypeVar, Optional
 
 from sqlalchemy import or_
-from sqlalchemy.orm import contains_eager, selectinload, Session
+from sqlalchemy.orm import selectinload, Session
 from sqlalchemy.orm.query import Query
 
 from feeds.impl.datasets_api_impl import DatasetsApiImpl
@@ -10,6 +10,7 @@ from feeds.impl.error_handling import raise_http_error, raise_http_validation_er
 from shared.db_models.feed_impl import FeedImpl
 from shared.db_models.gbfs_feed_impl import GbfsFeedImpl
 from shared.db_models.gtfs_feed_availability_check_impl import GtfsFeedAvailabilityCheckImpl
+from shared.db_models.gtfs_feed_daily_availability_impl import GtfsFeedDailyAvailabilityImpl
 from shared.db_models.gtfs_feed_impl import GtfsFeedImpl
 from shared.db_models.gtfs_rt_feed_impl import GtfsRTFeedImpl
 from feeds_gen.apis.feeds_api_base import BaseFeedsApi
@@ -18,10 +19,13 @@ from feeds_gen.models.gbfs_feed import GbfsFeed
 from feeds_gen.models.gtfs_dataset import GtfsDataset
 from feeds_gen.models.gtfs_feed import GtfsFeed
 from feeds_gen.models.gtfs_feed_availability_response import GtfsFeedAvailabilityResponse
+from feeds_gen.models.gtfs_feed_daily_availability_response import GtfsFeedDailyAvailabilityResponse
 from feeds_gen.models.gtfs_rt_feed import GtfsRTFeed
 from middleware.request_context import is_user_email_restricted
+from shared.common.date_utils import utc_date
 from shared.common.db_utils import (
     get_gtfs_feeds_query,
+    get_gtfs_feed_summaries_query,
     get_gtfs_rt_feeds_query,
     get_selectinload_options,
     add_official_filter,
@@ -39,9 +43,11 @@ from shared.common.error_handling import (
 from shared.database.database import Database, with_db_session
 from shared.database_gen.sqlacodegen_models import (
     Feed as FeedOrm,
+    FeedSummary,
     Gtfsdataset,
     Gtfsfeed,
     GtfsFeedAvailabilityCheck,
+    GtfsFeedAvailabilityDaily,
     Gtfsrealtimefeed,
 )
 from shared.feed_filters.feed_filter import FeedFilter
@@ -71,23 +77,21 @@ class FeedsApiImpl(BaseFeedsApi):
         is_email_restricted = is_user_email_restricted()
         self.logger.debug(f"User email is restricted: {is_email_restricted}")
 
-        # Use an explicit LEFT OUTER JOIN and contains_eager so the License relationship
-        # is populated from the same SQL result without causing N+1 queries.
-        feed = (
-            FeedFilter(stable_id=id, provider__ilike=None, producer_url__ilike=None, status=None)
-            .filter(Database().get_query_model(db_session, FeedOrm))
-            .outerjoin(FeedOrm.license)
-            .options(contains_eager(FeedOrm.license))
+        # The feed summary holds the license, external ids, redirects and related links of the feed,
+        # so the response is built from a single row.
+        summary = (
+            db_session.query(FeedSummary)
+            .filter(FeedSummary.stable_id == id)
             .filter(
                 or_(
-                    FeedOrm.operational_status == "published",
+                    FeedSummary.operational_status == "published",
                     not is_email_restricted,  # Allow all feeds to be returned if the user is not restricted
                 )
             )
             .first()
         )
-        if feed:
-            return FeedImpl.from_orm(feed)
+        if summary:
+            return FeedImpl.from_summary(summary)
         else:
             raise_http_error(404, feed_not_found.format(id))
 
@@ -131,9 +135,11 @@ class FeedsApiImpl(BaseFeedsApi):
     @with_db_session
     def get_gtfs_feed(self, id: str, db_session: Session) -> GtfsFeed:
         """Get the specified gtfs feed from the Mobility Database."""
-        feed = self._get_gtfs_feed(id, db_session)
-        if feed:
-            return GtfsFeedImpl.from_orm(feed)
+        summary = get_gtfs_feed_summaries_query(
+            db_session=db_session, stable_id=id, published_only=is_user_email_restricted()
+        ).first()
+        if summary:
+            return GtfsFeedImpl.from_summary(summary)
         else:
             raise_http_error(404, gtfs_feed_not_found.format(id))
 
@@ -209,7 +215,7 @@ class FeedsApiImpl(BaseFeedsApi):
     ) -> List[GtfsFeed]:
         try:
             published_only = is_user_email_restricted()
-            feed_query = get_gtfs_feeds_query(
+            summaries_query = get_gtfs_feed_summaries_query(
                 limit=limit,
                 offset=offset,
                 provider=provider,
@@ -225,12 +231,12 @@ class FeedsApiImpl(BaseFeedsApi):
                 db_session=db_session,
             )
         except InternalHTTPException as e:
-            # get_gtfs_feeds_query cannot throw HTTPException since it's part of fastapi and it's
+            # get_gtfs_feed_summaries_query cannot throw HTTPException since it's part of fastapi and it's
             # not necessarily deployed (e.g. for python functions). Instead it throws an InternalHTTPException
             # that needs to be converted to HTTPException before being thrown.
             raise convert_exception(e)
 
-        return self._get_response(feed_query, GtfsFeedImpl)
+        return [GtfsFeedImpl.from_summary(summary) for summary in summaries_query.all()]
 
     @with_db_session
     def get_gtfs_rt_feed(self, id: str, db_session: Session) -> GtfsRTFeed:
@@ -312,6 +318,21 @@ class FeedsApiImpl(BaseFeedsApi):
         else:
             raise_http_error(404, gtfs_feed_not_found.format(id))
 
+    @staticmethod
+    def _parse_availability_range(_from: str, to: str) -> tuple[Optional[datetime], Optional[datetime]]:
+        """Validate and parse the from/to query parameters of the availability endpoints."""
+        if _from and not valid_iso_date(_from):
+            raise_http_validation_error(invalid_date_message.format("from"))
+        if to and not valid_iso_date(to):
+            raise_http_validation_error(invalid_date_message.format("to"))
+
+        from_dt = datetime.fromisoformat(_from.replace("Z", "+00:00")) if _from else None
+        to_dt = datetime.fromisoformat(to.replace("Z", "+00:00")) if to else None
+
+        if from_dt and to_dt and from_dt > to_dt:
+            raise_http_validation_error(availability_from_after_to)
+        return from_dt, to_dt
+
     @with_db_session
     def get_gtfs_feed_availability(
         self,
@@ -324,16 +345,7 @@ class FeedsApiImpl(BaseFeedsApi):
         db_session: Session,
     ) -> GtfsFeedAvailabilityResponse:
         """Returns historical availability checks for a GTFS feed."""
-        if _from and not valid_iso_date(_from):
-            raise_http_validation_error(invalid_date_message.format("from"))
-        if to and not valid_iso_date(to):
-            raise_http_validation_error(invalid_date_message.format("to"))
-
-        from_dt = datetime.fromisoformat(_from.replace("Z", "+00:00")) if _from else None
-        to_dt = datetime.fromisoformat(to.replace("Z", "+00:00")) if to else None
-
-        if from_dt and to_dt and from_dt > to_dt:
-            raise_http_validation_error(availability_from_after_to)
+        from_dt, to_dt = self._parse_availability_range(_from, to)
 
         feed = self._get_gtfs_feed(id, db_session, include_options_for_joinedload=False)
         if not feed:
@@ -359,6 +371,46 @@ class FeedsApiImpl(BaseFeedsApi):
             checks=[GtfsFeedAvailabilityCheckImpl.from_orm(c) for c in checks],
         )
 
+    @with_db_session
+    def get_gtfs_feed_daily_availability(
+        self,
+        id: str,
+        _from: str,
+        to: str,
+        limit: int,
+        offset: int,
+        sort: str,
+        db_session: Session,
+    ) -> GtfsFeedDailyAvailabilityResponse:
+        """Returns the daily availability roll-up of a GTFS feed.
+
+        Reads gtfs_feed_availability_daily, so the cost depends on the number of days requested and not on
+        the number of raw checks. from/to select the UTC days containing those timestamps.
+        """
+        from_dt, to_dt = self._parse_availability_range(_from, to)
+
+        feed = self._get_gtfs_feed(id, db_session, include_options_for_joinedload=False)
+        if not feed:
+            raise_http_error(404, gtfs_feed_not_found.format(id))
+
+        query = db_session.query(GtfsFeedAvailabilityDaily).filter(GtfsFeedAvailabilityDaily.feed_id == feed.id)
+        if from_dt:
+            query = query.filter(GtfsFeedAvailabilityDaily.day >= utc_date(from_dt))
+        if to_dt:
+            query = query.filter(GtfsFeedAvailabilityDaily.day <= utc_date(to_dt))
+
+        total = query.count()
+        order = GtfsFeedAvailabilityDaily.day.asc() if sort == "asc" else GtfsFeedAvailabilityDaily.day.desc()
+        days = query.order_by(order).offset(offset).limit(limit).all()
+
+        return GtfsFeedDailyAvailabilityResponse(
+            feed_id=id,
+            total=total,
+            offset=offset,
+            limit=limit,
+            days=[GtfsFeedDailyAvailabilityImpl.from_orm(d) for d in days],
+        )
+
     @with_db_session
     def get_gbfs_feed(
         self,
@@ -0,0 +1,8 @@
+from datetime import date, datetime, timezone
+
+
+def utc_date(value: datetime) -> date:
+    """Return the UTC calendar day of a datetime. Naive datetimes are considered to be in UTC."""
+    if value.tzinfo is None:
+        return value.date()
+    return value.astimezone(timezone.utc).date()
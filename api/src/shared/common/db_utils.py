@@ -6,13 +6,13 @@ from typing import Iterator, List, Dict, Optional
 from geoalchemy2 import WKTElement
 from sqlalchemy import or_
 from sqlalchemy import select
-from sqlalchemy.orm import joinedload, Session, contains_eager, load_only, selectinload
+from sqlalchemy.orm import aliased, joinedload, Session, contains_eager, load_only, selectinload
 from sqlalchemy.orm.query import Query
 from sqlalchemy.orm.strategy_options import _AbstractLoad
 from sqlalchemy import func
-from sqlalchemy.sql import and_
 from shared.database_gen.sqlacodegen_models import (
     Feed,
+    FeedSummary,
     Gtfsdataset,
     Gtfsfeed,
     Location,
@@ -96,6 +96,55 @@ def get_gtfs_feeds_query(
     return feed_query
 
 
+def get_gtfs_feed_summaries_query(
+    db_session: Session,
+    stable_id: str | None = None,
+    limit: int | None = None,
+    offset: int | None = None,
+    provider: str | None = None,
+    producer_url: str | None = None,
+    country_code: str | None = None,
+    subdivision_name: str | None = None,
+    municipality: str | None = None,
+    dataset_latitudes: str | None = None,
+    dataset_longitudes: str | None = None,
+    bounding_filter_method: str | None = None,
+    is_official: bool | None = None,
+    published_only: bool = True,
+) -> Query:
+    """
+    Get the DB query retrieving the feed_summary rows of the GTFS feeds matching the filters of
+    get_gtfs_feeds_query. The summary holds everything the GTFS feed responses need, so the page is
+    read from a single table instead of loading the feed relationships.
+    """
+    feed_ids = (
+        get_gtfs_feeds_query(
+            db_session=db_session,
+            stable_id=stable_id,
+            provider=provider,
+            producer_url=producer_url,
+            country_code=country_code,
+            subdivision_name=subdivision_name,
+            municipality=municipality,
+            dataset_latitudes=dataset_latitudes,
+            dataset_longitudes=dataset_longitudes,
+            bounding_filter_method=bounding_filter_method,
+            is_official=is_official,
+            published_only=published_only,
+            include_options_for_joinedload=False,
+        )
+        .with_entities(Gtfsfeed.id)
+        .subquery()
+    )
+    return (
+        db_session.query(FeedSummary)
+        .filter(FeedSummary.feed_id.in_(select(feed_ids.c.id)))
+        .order_by(FeedSummary.provider, FeedSummary.stable_id)
+        .limit(limit)
+        .offset(offset)
+    )
+
+
 def apply_most_common_location_filter(query: Query, db_session: Session) -> Query:
     """
     Apply the most common location filter to the query.
@@ -488,36 +537,40 @@ def get_gbfs_feeds_query(
             else None
         ),
     )
-    # Subquery: latest report per version
-    latest_report_subq = (
-        db_session.query(
-            Gbfsvalidationreport.gbfs_version_id.label("gbfs_version_id"),
-            func.max(Gbfsvalidationreport.validated_at).label("latest_validated_at"),
-        )
-        .group_by(Gbfsvalidationreport.gbfs_version_id)
-        .subquery()
+    # Filter on the feed ids only: the filters need the locations and versions joins, which must not
+    # multiply the rows the page limit and offset apply to.
+    feed_ids = gbfs_feed_filter.filter(
+        select(Gbfsfeed.id).outerjoin(Location, Gbfsfeed.locations).outerjoin(Gbfsfeed.gbfsversions)
+    ).subquery()
+
+    # Only the latest validation report of each version is loaded. The lookup is correlated to the
+    # versions of the page and served by the (gbfs_version_id, validated_at) index, so its cost does
+    # not grow with the report history.
+    other_report = aliased(Gbfsvalidationreport)
+    latest_validated_at = (
+        select(func.max(other_report.validated_at))
+        .where(other_report.gbfs_version_id == Gbfsvalidationreport.gbfs_version_id)
+        .correlate(Gbfsvalidationreport)
+        .scalar_subquery()
     )
+    # When filtering on a version, only that version is returned
+    versions = Gbfsfeed.gbfsversions.and_(Gbfsversion.version == version) if version else Gbfsfeed.gbfsversions
 
-    # Join validation reports filtered by latest `validated_at`
-    query = gbfs_feed_filter.filter(
+    query = (
         db_session.query(Gbfsfeed)
-        .outerjoin(Location, Gbfsfeed.locations)
-        .outerjoin(Gbfsfeed.gbfsversions)
-        .outerjoin(latest_report_subq, Gbfsversion.id == latest_report_subq.c.gbfs_version_id)
-        .outerjoin(
-            Gbfsvalidationreport,
-            and_(
-                Gbfsversion.id == Gbfsvalidationreport.gbfs_version_id,
-                Gbfsvalidationreport.validated_at == latest_report_subq.c.latest_validated_at,
-            ),
-        )
+        .filter(Gbfsfeed.id.in_(select(feed_ids.c.id)))
         .options(
-            contains_eager(Gbfsfeed.gbfsversions).contains_eager(Gbfsversion.gbfsvalidationreports),
-            contains_eager(Gbfsfeed.gbfsversions).joinedload(Gbfsversion.gbfsendpoints),
-            joinedload(Feed.locations),
-            joinedload(Feed.externalids),
-            joinedload(Feed.redirectingids).joinedload(Redirectingid.target),
+            # selectinload keeps one row per feed instead of the cartesian product of the collections
+            selectinload(versions).selectinload(
+                Gbfsversion.gbfsvalidationreports.and_(Gbfsvalidationreport.validated_at == latest_validated_at)
+            ),
+            selectinload(versions).selectinload(Gbfsversion.gbfsendpoints),
+            selectinload(Feed.locations),
+            selectinload(Feed.externalids),
+            selectinload(Feed.redirectingids).joinedload(Redirectingid.target),
         )
+        # Stable order so limit and offset page consistently
+        .order_by(Gbfsfeed.provider, Gbfsfeed.stable_id)
     )
     return query
 
@@ -1,11 +1,18 @@
+import hashlib
 import json
 import logging
 import os
-from typing import List
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional
 
 REFRESH_VIEW_TASK_EXECUTOR_BODY = json.dumps(
     {"task": "refresh_materialized_view", "payload": {"dry_run": False}}
 ).encode()
+REVALIDATE_FEEDS_TASK_EXECUTOR_BODY = json.dumps({"task": "revalidate_feeds", "payload": {}}).encode()
 
 
 def create_refresh_materialized_view_task():
@@ -70,22 +77,71 @@ def create_refresh_materialized_view_task():
         return {"error": "Error enqueuing task: %s" % error}, 500
 
 
-def create_web_revalidation_task(feed_stable_ids: List[str]) -> None:
+def create_web_revalidation_task(feed_stable_ids: List[str], db_session=None) -> None:
     """
-    Enqueue a Cloud Task to revalidate the website cache for specific feed pages.
-    Uses time-bucketed task names for deduplication: multiple calls for the same
-    feed within the same 30-minute window are collapsed into one task.
+    Request the revalidation of the website cache for specific feed pages.
+    The feed stable IDs are recorded in the web_revalidation_request table and a single
+    revalidate_feeds Cloud Task is scheduled for the next :00 or :30. That task drains the table
+    and calls the web app with chunked multi-feed requests, so every feed touched within the same
+    30-minute window is revalidated by one call instead of one Cloud Task and call per feed.
 
     Args:
         feed_stable_ids: List of feed stable IDs whose pages should be revalidated.
+        db_session: Optional session; the requests are then written in the caller's transaction.
+            When omitted, a session is opened and committed for this call.
+    """
+    feed_stable_ids = sorted(set(feed_stable_ids or []))
+    if not feed_stable_ids:
+        return
+
+    if not os.getenv("WEB_REVALIDATION_QUEUE"):
+        logging.warning(
+            "WEB_REVALIDATION_QUEUE not set; skipping revalidation for %s",
+            feed_stable_ids,
+        )
+        return
+
+    try:
+        if db_session is None:
+            from shared.database.database import with_db_session
+
+            with_db_session(buffer_web_revalidation_requests)(feed_stable_ids)
+        else:
+            buffer_web_revalidation_requests(feed_stable_ids, db_session=db_session)
+    except Exception as error:
+        logging.error("Error buffering revalidation requests for %s: %s", feed_stable_ids, error)
+        return
+
+    create_revalidate_feeds_task()
+
+
+def buffer_web_revalidation_requests(feed_stable_ids: List[str], db_session) -> None:
+    """
+    Insert the feed stable IDs in the web_revalidation_request table.
+    A feed already waiting for revalidation gets its request time refreshed, so a drain that read
+    the previous request does not delete this newer one.
+    """
+    from sqlalchemy import func
+    from sqlalchemy.dialects.postgresql import insert
+    from shared.database_gen.sqlacodegen_models import WebRevalidationRequest
+
+    db_session.execute(
+        insert(WebRevalidationRequest)
+        .values([{"feed_stable_id": feed_stable_id} for feed_stable_id in feed_stable_ids])
+        .on_conflict_do_update(index_elements=["feed_stable_id"], set_={"requested_at": func.now()})
+    )
+
+
+def create_revalidate_feeds_task() -> None:
+    """
+    Enqueue the Cloud Task draining the web_revalidation_request table.
+    Uses a time-bucketed task name: every call within the same 30-minute window is collapsed into
+    one task scheduled at the end of the window.
     """
     from google.cloud import tasks_v2
     from google.protobuf import timestamp_pb2
     from datetime import datetime, timedelta
 
-    if not feed_stable_ids:
-        return
-
     try:
         now = datetime.now()
 
@@ -106,80 +162,48 @@ def create_web_revalidation_task(feed_stable_ids: List[str]) -> None:
         url = f"https://{gcp_region}-{project}.cloudfunctions.net/" f"tasks_executor-{environment_name}"
 
         if not queue:
-            logging.warning(
-                "WEB_REVALIDATION_QUEUE not set; skipping revalidation for %s",
-                feed_stable_ids,
-            )
+            logging.warning("WEB_REVALIDATION_QUEUE not set; skipping revalidate_feeds task.")
             return
 
-        client = tasks_v2.CloudTasksClient()
-        timestamp_str = bucket_time.strftime("%Y-%m-%d-%H-%M")
-
-        for feed_stable_id in feed_stable_ids:
-            task_name = f"revalidate-{feed_stable_id}-{timestamp_str}"
-            body = json.dumps(
-                {
-                    "task": "revalidate_feed",
-                    "payload": {"feed_stable_id": feed_stable_id},
-                }
-            ).encode()
-
-            try:
-                create_http_task_with_name(
-                    client=client,
-                    body=body,
-                    url=url,
-                    project_id=project,
-                    gcp_region=gcp_region,
-                    queue_name=queue,
-                    task_name=task_name,
-                    task_time=proto_time,
-                    http_method=tasks_v2.HttpMethod.POST,
-                )
-                logging.info(
-                    "Scheduled web revalidation task for feed %s (%s)",
-                    feed_stable_id,
-                    task_name,
-                )
-            except Exception as e:
-                if "ALREADY_EXISTS" in str(e):
-                    logging.info(
-                        "Revalidation task already exists for %s, skipping.",
-                        task_name,
-                    )
-                else:
-                    logging.error(
-                        "Error creating revalidation task for %s: %s",
-                        feed_stable_id,
-                        e,
-                    )
+        task_name = f"revalidate-feeds-{bucket_time.strftime('%Y-%m-%d-%H-%M')}"
+        try:
+            create_http_task_with_name(
+                client=tasks_v2.CloudTasksClient(),
+                body=REVALIDATE_FEEDS_TASK_EXECUTOR_BODY,
+                url=url,
+                project_id=project,
+                gcp_region=gcp_region,
+                queue_name=queue,
+                task_name=task_name,
+                task_time=proto_time,
+                http_method=tasks_v2.HttpMethod.POST,
+            )
+            logging.info("Scheduled web revalidation task %s", task_name)
+        except Exception as e:
+            if "ALREADY_EXISTS" in str(e):
+                logging.info("Revalidation task already exists for %s, skipping.", task_name)
+            else:
+                logging.error("Error creating revalidation task %s: %s", task_name, e)
 
     except Exception as error:
-        logging.error("Error enqueuing revalidation tasks: %s", error)
+        logging.error("Error enqueuing revalidation task: %s", error)
 
 
-def create_http_task_with_name(
-    client: any,  # tasks_v2.CloudTasksClient
+def build_http_task(
+    parent: str,
     body: bytes,
     url: str,
-    project_id: str,
-    gcp_region: str,
-    queue_name: str,
-    task_name: str,
+    task_name: Optional[str],
     task_time,
     http_method: any,  # tasks_v2.HttpMethod
-    timeout_s: int = 1800,  # 30 minutes
+    timeout_s: int = 1800,
 ):
-    """Creates a GCP Cloud Task."""
+    """Builds the tasks_v2.Task of an authenticated HTTP call, named under parent if task_name is set."""
     from google.cloud import tasks_v2
     from google.protobuf import duration_pb2
 
     token = tasks_v2.OidcToken(service_account_email=os.getenv("SERVICE_ACCOUNT_EMAIL"))
-
-    parent = client.queue_path(project_id, gcp_region, queue_name)
-    logging.info("Queue parent path: %s", parent)
-
-    task = tasks_v2.Task(
+    return tasks_v2.Task(
         # If task_name is provided, it will be used; otherwise, a unique name will be generated.
         # This is useful for deduplication purposes.
         name=f"{parent}/tasks/{task_name}" if task_name else None,
@@ -193,6 +217,25 @@ def create_http_task_with_name(
         ),
         dispatch_deadline=duration_pb2.Duration(seconds=timeout_s),
     )
+
+
+def create_http_task_with_name(
+    client: any,  # tasks_v2.CloudTasksClient
+    body: bytes,
+    url: str,
+    project_id: str,
+    gcp_region: str,
+    queue_name: str,
+    task_name: str,
+    task_time,
+    http_method: any,  # tasks_v2.HttpMethod
+    timeout_s: int = 1800,  # 30 minutes
+):
+    """Creates a GCP Cloud Task."""
+    parent = client.queue_path(project_id, gcp_region, queue_name)
+    logging.info("Queue parent path: %s", parent)
+
+    task = build_http_task(parent, body, url, task_name, task_time, http_method, timeout_s)
     try:
         client.create_task(parent=parent, task=task)
         logging.info("Task created with task_name: %s", task_name)
@@ -201,3 +244,156 @@ def create_http_task_with_name(
             logging.info("Task already exists for %s, skipping.", task_name)
         else:
             logging.error("Error creating task: %s", e)
+
+
+# Cloud Tasks task names: letters, digits, hyphens and underscores, at most 500 characters.
+MAX_TASK_NAME_LENGTH = 500
+DEFAULT_ENQUEUE_WORKERS = 8
+DEFAULT_ENQUEUE_ATTEMPTS = 3
+DEFAULT_ENQUEUE_BACKOFF_SECONDS = 0.5
+
+
+def deterministic_task_name(*parts) -> str:
+    """
+    Builds a Cloud Tasks task name from parts, e.g. ("pmtiles", dataset_stable_id).
+    The same parts always give the same name, so enqueuing the same work twice creates a single
+    task. Invalid characters are replaced by hyphens; a name too long is truncated and suffixed
+    with a hash of the parts to stay unique.
+    """
+    name = re.sub(r"[^a-zA-Z0-9_-]", "-", "-".join(str(part) for part in parts))
+    if len(name) > MAX_TASK_NAME_LENGTH:
+        digest = hashlib.sha1(name.encode()).hexdigest()
+        name = f"{name[: MAX_TASK_NAME_LENGTH - len(digest) - 1]}-{digest}"
+    return name
+
+
+@dataclass(frozen=True)
+class HttpTaskSpec:
+    """An HTTP Cloud Task to enqueue with enqueue_http_tasks."""
+
+    url: str
+    body: bytes
+    queue_name: str
+    # Deterministic name for deduplication (see deterministic_task_name); None lets Cloud Tasks
+    # generate one.
+    task_name: Optional[str] = None
+    # When the task should run; None runs it as soon as possible.
+    schedule_time: Optional[datetime] = None
+    timeout_s: int = 1800
+
+
+@dataclass(frozen=True)
+class TaskEnqueueResult:
+    """Outcome of enqueuing one HttpTaskSpec."""
+
+    spec: HttpTaskSpec
+    # "created", "already_exists" (a task with the same name was enqueued before) or "failed"
+    status: str
+    attempts: int
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed"
+
+
+def enqueue_http_tasks(
+    specs: Iterable[HttpTaskSpec],
+    client=None,
+    project_id: Optional[str] = None,
+    gcp_region: Optional[str] = None,
+    max_workers: int = DEFAULT_ENQUEUE_WORKERS,
+    max_attempts: int = DEFAULT_ENQUEUE_ATTEMPTS,
+    backoff_seconds: float = DEFAULT_ENQUEUE_BACKOFF_SECONDS,
+) -> List[TaskEnqueueResult]:
+    """
+    Enqueue many HTTP Cloud Tasks concurrently.
+
+    Each create_task call is a blocking RPC, so the specs are submitted through a pool of at most
+    max_workers threads sharing one client. Transient errors (unavailable, deadline exceeded,
+    internal, throttled, aborted) are retried up to max_attempts times with exponential backoff; a
+    task whose name already exists counts as enqueued. Errors never propagate: every spec gets a
+    TaskEnqueueResult, returned in the order of the specs.
+
+    Args:
+        specs: Tasks to enqueue.
+        client: tasks_v2.CloudTasksClient, or a compatible fake in tests. Created when omitted.
+        project_id: GCP project of the queues. Defaults to the PROJECT_ID environment variable.
+        gcp_region: Region of the queues. Defaults to the GCP_REGION environment variable.
+        max_workers: Maximum number of concurrent create_task calls.
+        max_attempts: Attempts per task on transient errors.
+        backoff_seconds: Wait before the first retry, doubled on every retry.
+    """
+    from google.cloud import tasks_v2
+    from google.protobuf import timestamp_pb2
+
+    specs = list(specs)
+    if not specs:
+        return []
+    client = client or tasks_v2.CloudTasksClient()
+    project_id = project_id or os.getenv("PROJECT_ID")
+    gcp_region = gcp_region or os.getenv("GCP_REGION")
+
+    def enqueue(spec: HttpTaskSpec) -> TaskEnqueueResult:
+        parent = client.queue_path(project_id, gcp_region, spec.queue_name)
+        task_time = None
+        if spec.schedule_time is not None:
+            task_time = timestamp_pb2.Timestamp()
+            task_time.FromDatetime(spec.schedule_time)
+        task = build_http_task(
+            parent,
+            spec.body,
+            spec.url,
+            spec.task_name,
+            task_time,
+            tasks_v2.HttpMethod.POST,
+            spec.timeout_s,
+        )
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                client.create_task(parent=parent, task=task)
+                return TaskEnqueueResult(spec=spec, status="created", attempts=attempt)
+            except Exception as error:
+                if _is_already_exists(error):
+                    return TaskEnqueueResult(spec=spec, status="already_exists", attempts=attempt)
+                if attempt >= max_attempts or not _is_transient(error):
+                    logging.error("Error creating task %s: %s", spec.task_name, error)
+                    return TaskEnqueueResult(spec=spec, status="failed", attempts=attempt, error=str(error))
+                logging.warning("Retrying task %s after attempt %d failed: %s", spec.task_name, attempt, error)
+                time.sleep(backoff_seconds * 2 ** (attempt - 1))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(specs)))) as executor:
+        results = list(executor.map(enqueue, specs))
+
+    logging.info(
+        "Enqueued %d task(s): %d created, %d already existing, %d failed.",
+        len(results),
+        sum(result.status == "created" for result in results),
+        sum(result.status == "already_exists" for result in results),
+        sum(not result.ok for result in results),
+    )
+    return results
+
+
+def _is_already_exists(error: Exception) -> bool:
+    from google.api_core import exceptions
+
+    return isinstance(error, exceptions.AlreadyExists) or "already exists" in str(error).lower()
+
+
+def _is_transient(error: Exception) -> bool:
+    from google.api_core import exceptions
+
+    return isinstance(
+        error,
+        (
+            exceptions.Aborted,
+            exceptions.DeadlineExceeded,
+            exceptions.InternalServerError,
+            exceptions.ResourceExhausted,
+            exceptions.ServiceUnavailable,
+            exceptions.TooManyRequests,
+        ),
+    )
@@ -1,10 +1,13 @@
 import logging
 import re
-from dataclasses import dataclass
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
 from difflib import SequenceMatcher
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
-from typing import List, Tuple, Optional
+from sqlalchemy import select, func, literal
+from typing import Dict, Iterable, List, Tuple, Optional
 
 from shared.common.db_utils import normalize_url, normalize_url_str
 from shared.database_gen.sqlacodegen_models import License, FeedLicenseChange, Feed
@@ -257,6 +260,16 @@ def resolve_fuzzy_match(
         if score >= fuzzy_threshold:
             scored.append((float(score), lic))
 
+    return _fuzzy_matching_licenses(url_str, url_normalized, scored, max_candidates)
+
+
+def _fuzzy_matching_licenses(
+    url_str: str,
+    url_normalized: str,
+    scored: list[tuple[float, "License | IndexedLicense"]],
+    max_candidates: int | None,
+) -> List[MatchingLicense]:
+    """Sort scored candidates (best first), apply the limit and build the fuzzy MatchingLicense list."""
     # Sort by descending score and optionally limit
     scored.sort(key=lambda x: x[0], reverse=True)
     if max_candidates is not None:
@@ -318,11 +331,148 @@ def extract_spdx_id_from_url(url_normalized: str) -> Optional[str]:
     return spdx_id
 
 
+def _sql_normalized_url(url: str) -> str:
+    """Python equivalent of ``lower(trim(normalize_url(License.url)))`` used by find_exact_match_license_url."""
+    u = re.sub(r"^https?://", "", url, flags=re.I)
+    u = re.sub(r"^www\.", "", u, flags=re.I)
+    u = re.sub(r"/\Z", "", u)
+    return u.strip(" ").lower()
+
+
+@dataclass(eq=False)
+class IndexedLicense:
+    """Snapshot of a License row with the values precomputed for matching.
+
+    Exposes ``id``, ``name`` and ``url`` like the ORM row so it can be used wherever resolve_license reads a
+    License, without keeping ORM instances alive across sessions.
+    """
+
+    id: str
+    name: str | None
+    url: str | None
+    # normalize_url_str(url) and its host, used by the fuzzy matcher
+    normalized_url: str = ""
+    host: str = ""
+    # Character counts of normalized_url, used to bound the fuzzy ratio before running SequenceMatcher
+    char_counts: Counter = field(default_factory=Counter)
+
+
+class LicenseIndex:
+    """In-memory index of the license catalog for resolve_license.
+
+    Holds the same lookups resolve_license otherwise runs in SQL (exact normalized URL, id, lower-cased id) and
+    the same-host buckets of the fuzzy matcher, with each license URL normalized once. Fuzzy scores are still
+    difflib ratios, so results are identical to the DB-backed path; candidates are pruned with the
+    SequenceMatcher upper bounds (length ratio, then character multiset overlap) before computing the ratio.
+
+    Use get_license_index to share one index per process.
+    """
+
+    def __init__(self, licenses: Iterable[License], version: tuple | None = None):
+        self.version = version
+        self.by_normalized_url: Dict[str, IndexedLicense] = {}
+        self.by_id: Dict[str, IndexedLicense] = {}
+        self.by_lower_id: Dict[str, IndexedLicense] = {}
+        self.by_host: Dict[str, List[IndexedLicense]] = {}
+        for lic in sorted(licenses, key=lambda item: item.id):
+            entry = IndexedLicense(id=lic.id, name=lic.name, url=lic.url)
+            self.by_id[entry.id] = entry
+            self.by_lower_id.setdefault(entry.id.lower(), entry)
+            if not entry.url:
+                continue
+            self.by_normalized_url.setdefault(_sql_normalized_url(entry.url), entry)
+            entry.normalized_url = normalize_url_str(entry.url)
+            entry.host = extract_host(entry.normalized_url)
+            entry.char_counts = Counter(entry.normalized_url)
+            self.by_host.setdefault(entry.host, []).append(entry)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def find_exact(self, url_normalized: str) -> IndexedLicense | None:
+        """Same lookup as find_exact_match_license_url."""
+        return self.by_normalized_url.get(normalize_url_str(url_normalized))
+
+    def get(self, license_id: str) -> IndexedLicense | None:
+        """License by id (case-sensitive)."""
+        return self.by_id.get(license_id)
+
+    def get_case_insensitive(self, license_id: str) -> IndexedLicense | None:
+        """License by id, ignoring case."""
+        return self.by_lower_id.get(license_id.lower())
+
+    def resolve_fuzzy_match(
+        self,
+        url_str: str,
+        url_host: str,
+        url_normalized: str,
+        fuzzy_threshold: float,
+        max_candidates: int | None = 5,
+    ) -> List[MatchingLicense]:
+        """Same results as resolve_fuzzy_match, scored against the precomputed same-host bucket."""
+        if not url_host:
+            return []
+        url_length = len(url_normalized)
+        url_counts = Counter(url_normalized)
+        scored: list[tuple[float, IndexedLicense]] = []
+        for entry in self.by_host.get(url_host, []):
+            total = url_length + len(entry.normalized_url)
+            # Upper bounds of SequenceMatcher.ratio(): skip candidates that cannot reach the threshold
+            if 2.0 * min(url_length, len(entry.normalized_url)) / total < fuzzy_threshold:
+                continue
+            if 2.0 * sum((url_counts & entry.char_counts).values()) / total < fuzzy_threshold:
+                continue
+            score = fuzzy_ratio(url_normalized, entry.normalized_url)
+            if score >= fuzzy_threshold:
+                scored.append((float(score), entry))
+        return _fuzzy_matching_licenses(url_str, url_normalized, scored, max_candidates)
+
+
+_license_index: LicenseIndex | None = None
+_license_index_lock = threading.Lock()
+
+
+def get_license_catalog_version(db_session: Session) -> tuple:
+    """Cheap version stamp of the license catalog: row count, latest update and a digest of id/name/url."""
+    row_digest = func.concat_ws("|", License.id, License.name, License.url)
+    return tuple(
+        db_session.execute(
+            select(
+                func.count(License.id),
+                func.max(func.coalesce(License.updated_at, License.created_at)),
+                func.md5(func.string_agg(row_digest, aggregate_order_by(literal("\n"), License.id))),
+            )
+        ).one()
+    )
+
+
+def get_license_index(db_session: Session) -> LicenseIndex:
+    """Return the process-wide LicenseIndex, rebuilding it when the catalog version stamp changed."""
+    global _license_index
+    version = get_license_catalog_version(db_session)
+    index = _license_index
+    if index is not None and index.version == version:
+        return index
+    with _license_index_lock:
+        if _license_index is None or _license_index.version != version:
+            _license_index = LicenseIndex(db_session.scalars(select(License)), version=version)
+            logging.info("Built license index with %d licenses", len(_license_index))
+        return _license_index
+
+
+def reset_license_index() -> None:
+    """Drop the process-wide LicenseIndex (mainly for tests)."""
+    global _license_index
+    with _license_index_lock:
+        _license_index = None
+
+
 def resolve_license(
     license_url: str,
     allow_fuzzy: bool = True,
     fuzzy_threshold: float = 0.94,
     db_session: Session | None = None,
+    license_index: LicenseIndex | None = None,
 ) -> List[MatchingLicense]:
     """Resolve a license URL to one or more SPDX candidates using multiple strategies.
 
@@ -339,6 +489,8 @@ def resolve_license(
         allow_fuzzy (bool): Whether to allow fuzzy matching.
         fuzzy_threshold (float): Minimum similarity ratio for fuzzy match.
         db_session (Session | None): SQLAlchemy DB session. Required for DB-based strategies.
+        license_index (LicenseIndex | None): If given, catalog lookups are answered from this index instead of
+            querying db_session. Results are the same.
 
     Returns:
         List[MatchingLicense]: Ordered list of resolution results. Empty if no match.
@@ -348,7 +500,10 @@ def resolve_license(
     url_host = extract_host(url_normalized)
 
     # 1) Exact hit in DB (compare normalized strings of known licenses)
-    exact_match: License | None = find_exact_match_license_url(url_normalized, db_session) if db_session else None
+    if license_index is not None:
+        exact_match: License | IndexedLicense | None = license_index.find_exact(url_normalized)
+    else:
+        exact_match = find_exact_match_license_url(url_normalized, db_session) if db_session else None
     if exact_match:
         return [
             MatchingLicense(
@@ -367,7 +522,10 @@ def resolve_license(
     # 2) Creative Commons resolver
     common_creative_match, notes, regional_id = resolve_commons_creative_license(url_str)
     if common_creative_match:
-        cc_license: License | None = db_session.query(License).filter(License.id == common_creative_match).one_or_none()
+        if license_index is not None:
+            cc_license: License | IndexedLicense | None = license_index.get(common_creative_match)
+        else:
+            cc_license = db_session.query(License).filter(License.id == common_creative_match).one_or_none()
         if not cc_license:
             logging.warning("CC license SPDX ID %s not found in DB", common_creative_match)
             return []
@@ -392,9 +550,10 @@ def resolve_license(
     spdx_id = extract_spdx_id_from_url(url_normalized)
     if spdx_id:
         # Try to enrich from DB if a matching License row exists
-        db_lic: License | None = (
-            db_session.query(License).filter(func.lower(License.id) == func.lower(spdx_id)).one_or_none()
-        )
+        if license_index is not None:
+            db_lic: License | IndexedLicense | None = license_index.get_case_insensitive(spdx_id)
+        else:
+            db_lic = db_session.query(License).filter(func.lower(License.id) == func.lower(spdx_id)).one_or_none()
         if db_lic is not None:
             return [
                 MatchingLicense(
@@ -415,11 +574,16 @@ def resolve_license(
     # 4) Generic heuristics
     heuristic_match = heuristic_spdx(url_str)
     if heuristic_match:
-        if db_session is not None:
+        if license_index is not None or db_session is not None:
             # Check if the license found is actually in the DB
-            db_lic = (
-                db_session.query(License).filter(func.lower(License.id) == func.lower(heuristic_match)).one_or_none()
-            )
+            if license_index is not None:
+                db_lic = license_index.get_case_insensitive(heuristic_match)
+            else:
+                db_lic = (
+                    db_session.query(License)
+                    .filter(func.lower(License.id) == func.lower(heuristic_match))
+                    .one_or_none()
+                )
             if db_lic is None:
                 logging.warning("Heuristic SPDX ID %s not found in DB, skipping assignment", heuristic_match)
                 heuristic_match = None
@@ -438,7 +602,16 @@ def resolve_license(
             ]
 
     # 5) Fuzzy (same host candidates only)
-    if allow_fuzzy and url_host and db_session is not None:
+    if allow_fuzzy and url_host and license_index is not None:
+        fuzzy_results = license_index.resolve_fuzzy_match(
+            url_str=url_str,
+            url_host=url_host,
+            url_normalized=url_normalized,
+            fuzzy_threshold=fuzzy_threshold,
+        )
+        if fuzzy_results:
+            return fuzzy_results
+    elif allow_fuzzy and url_host and db_session is not None:
         fuzzy_results = resolve_fuzzy_match(
             url_str=url_str,
             url_host=url_host,
@@ -1,4 +1,4 @@
-from shared.database_gen.sqlacodegen_models import Feed
+from shared.database_gen.sqlacodegen_models import Feed, FeedSummary
 from shared.db_models.external_id_impl import ExternalIdImpl
 from shared.db_models.redirect_impl import RedirectImpl
 from feeds_gen.models.basic_feed import BasicFeed
@@ -51,6 +51,34 @@ class BaseFeedImpl(BasicFeed):
             redirects=sorted([RedirectImpl.from_orm(item) for item in feed.redirectingids], key=lambda x: x.target_id),
         )
 
+    @classmethod
+    def from_summary(cls, summary: FeedSummary | None) -> BasicFeed | None:
+        """Create a model instance from a feed_summary row.
+        The summary collections are stored pre-sorted, so no relationship is loaded."""
+        if not summary:
+            return None
+        return cls(
+            id=summary.stable_id,
+            data_type=summary.data_type,
+            created_at=summary.created_at,
+            external_ids=[ExternalIdImpl(**item) for item in summary.external_ids or []],
+            provider=summary.provider,
+            feed_contact_email=summary.feed_contact_email,
+            source_info=SourceInfo(
+                producer_url=summary.producer_url,
+                is_producer_url_unstable=summary.is_producer_url_unstable,
+                authentication_type=None if summary.authentication_type is None else int(summary.authentication_type),
+                authentication_info_url=summary.authentication_info_url,
+                api_key_parameter_name=summary.api_key_parameter_name,
+                license_url=summary.license_url,
+                license_id=summary.license_id,
+                license_is_spdx=summary.license_is_spdx,
+                license_notes=summary.license_notes,
+                license_tags=list(summary.license_tags) if summary.license_tags else None,
+            ),
+            redirects=[RedirectImpl(**item) for item in summary.redirects or []],
+        )
+
 
 class BasicFeedImpl(BaseFeedImpl, BasicFeed):
     """Implementation of the `BasicFeed` model.
@@ -27,3 +27,22 @@ class BoundingBoxImpl(BoundingBox):
             minimum_longitude=shape.bounds[0],
             maximum_longitude=shape.bounds[2],
         )
+
+    @classmethod
+    def from_bounds(
+        cls,
+        minimum_latitude: float | None,
+        maximum_latitude: float | None,
+        minimum_longitude: float | None,
+        maximum_longitude: float | None,
+    ) -> BoundingBox | None:
+        """Create a model instance from bounds already extracted from the geometry, e.g. in feed_summary."""
+        bounds = (minimum_latitude, maximum_latitude, minimum_longitude, maximum_longitude)
+        if any(bound is None for bound in bounds):
+            return None
+        return BoundingBoxImpl(
+            minimum_latitude=minimum_latitude,
+            maximum_latitude=maximum_latitude,
+            minimum_longitude=minimum_longitude,
+            maximum_longitude=maximum_longitude,
+        )
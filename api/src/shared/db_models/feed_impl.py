@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from shared.database.database import with_db_session
 from shared.db_models.basic_feed_impl import BaseFeedImpl
 from feeds_gen.models.feed import Feed
-from shared.database_gen.sqlacodegen_models import Feed as FeedOrm, License
+from shared.database_gen.sqlacodegen_models import Feed as FeedOrm, FeedSummary, License
 from shared.db_models.external_id_impl import ExternalIdImpl
 from shared.db_models.feed_related_link_impl import FeedRelatedLinkImpl
 
@@ -38,6 +38,20 @@ class FeedImpl(BaseFeedImpl, Feed):
         feed.note = feed_orm.note
         return feed
 
+    @classmethod
+    def from_summary(cls, summary: FeedSummary | None) -> Feed | None:
+        feed: Feed = super().from_summary(summary)
+        if not feed:
+            return None
+        feed.status = summary.status
+        feed.official = summary.official
+        feed.official_updated_at = summary.official_updated_at
+        feed.seasonal = summary.seasonal
+        feed.feed_name = summary.feed_name
+        feed.related_links = [FeedRelatedLinkImpl(**related_link) for related_link in summary.related_links or []]
+        feed.note = summary.note
+        return feed
+
     @classmethod
     @with_db_session
     def to_orm_from_dict(cls, feed_dict: dict | None, db_session: Session | None = None) -> FeedOrm | None:
@@ -0,0 +1,29 @@
+from shared.database_gen.sqlacodegen_models import GtfsFeedAvailabilityDaily as GtfsFeedAvailabilityDailyOrm
+from feeds_gen.models.gtfs_feed_daily_availability import GtfsFeedDailyAvailability
+
+
+class GtfsFeedDailyAvailabilityImpl(GtfsFeedDailyAvailability):
+    """Implementation of the `GtfsFeedDailyAvailability` model.
+    This class converts a SQLAlchemy gtfs_feed_availability_daily row to a Pydantic model.
+    """
+
+    class Config:
+        """Pydantic configuration.
+        Enabling `from_attributes` method to create a model instance from a SQLAlchemy row object."""
+
+        from_attributes = True
+
+    @classmethod
+    def from_orm(cls, daily: GtfsFeedAvailabilityDailyOrm | None) -> GtfsFeedDailyAvailability | None:
+        """Create a model instance from a SQLAlchemy GtfsFeedAvailabilityDaily row object."""
+        if not daily:
+            return None
+        return cls(
+            day=daily.day,
+            total_checks=daily.total_checks,
+            successful_checks=daily.successful_checks,
+            success_ratio=daily.success_ratio,
+            latency_p50_ms=daily.latency_p50_ms,
+            latency_p95_ms=daily.latency_p95_ms,
+            last_error_type=daily.last_error_type,
+        )
@@ -1,6 +1,6 @@
 from shared.db_models.bounding_box_impl import BoundingBoxImpl
 from shared.db_models.feed_impl import FeedImpl
-from shared.database_gen.sqlacodegen_models import Gtfsfeed as GtfsfeedOrm
+from shared.database_gen.sqlacodegen_models import FeedSummary, Gtfsfeed as GtfsfeedOrm
 from shared.db_models.latest_dataset_impl import LatestDatasetImpl
 from shared.db_models.location_impl import LocationImpl
 from feeds_gen.models.gtfs_feed import GtfsFeed
@@ -29,3 +29,19 @@ class GtfsFeedImpl(FeedImpl, GtfsFeed):
             feed.visualization_dataset.stable_id if feed.visualization_dataset else None
         )
         return gtfs_feed
+
+    @classmethod
+    def from_summary(cls, summary: FeedSummary | None) -> GtfsFeed | None:
+        gtfs_feed: GtfsFeed = super().from_summary(summary)
+        if not gtfs_feed:
+            return None
+        gtfs_feed.locations = [LocationImpl.from_summary(item) for item in summary.locations or []]
+        gtfs_feed.latest_dataset = LatestDatasetImpl.from_summary(summary)
+        gtfs_feed.bounding_box = BoundingBoxImpl.from_bounds(
+            summary.bounding_box_minimum_latitude,
+            summary.bounding_box_maximum_latitude,
+            summary.bounding_box_minimum_longitude,
+            summary.bounding_box_maximum_longitude,
+        )
+        gtfs_feed.visualization_dataset_id = summary.visualization_dataset_stable_id
+        return gtfs_feed
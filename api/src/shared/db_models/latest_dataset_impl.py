@@ -1,6 +1,6 @@
 from functools import reduce
 
-from shared.database_gen.sqlacodegen_models import Gtfsdataset
+from shared.database_gen.sqlacodegen_models import FeedSummary, Gtfsdataset
 from shared.db_models.bounding_box_impl import BoundingBoxImpl
 from feeds_gen.models.latest_dataset import LatestDataset
 from feeds_gen.models.latest_dataset_validation_report import LatestDatasetValidationReport
@@ -55,3 +55,48 @@ class LatestDatasetImpl(LatestDataset):
             ),
             zipped_folder_size_mb=round(dataset.zipped_size_bytes / 1024**2, 2) if dataset.zipped_size_bytes else None,
         )
+
+    @classmethod
+    def from_summary(cls, summary: FeedSummary | None) -> LatestDataset | None:
+        """Create a model instance from the latest dataset columns of a feed_summary row."""
+        if not summary or not summary.latest_dataset_stable_id:
+            return None
+        validation_report: LatestDatasetValidationReport | None = None
+        if summary.latest_report_id:
+            validation_report = LatestDatasetValidationReport(
+                total_error=summary.latest_report_total_error,
+                total_warning=summary.latest_report_total_warning,
+                total_info=summary.latest_report_total_info,
+                unique_error_count=summary.latest_report_unique_error_count,
+                unique_warning_count=summary.latest_report_unique_warning_count,
+                unique_info_count=summary.latest_report_unique_info_count,
+                features=list(summary.latest_report_features or []),
+            )
+
+        return cls(
+            id=summary.latest_dataset_stable_id,
+            hosted_url=summary.latest_dataset_hosted_url,
+            bounding_box=BoundingBoxImpl.from_bounds(
+                summary.latest_dataset_minimum_latitude,
+                summary.latest_dataset_maximum_latitude,
+                summary.latest_dataset_minimum_longitude,
+                summary.latest_dataset_maximum_longitude,
+            ),
+            downloaded_at=summary.latest_dataset_downloaded_at,
+            service_date_range_start=summary.latest_dataset_service_date_range_start,
+            service_date_range_end=summary.latest_dataset_service_date_range_end,
+            agency_timezone=summary.latest_dataset_agency_timezone,
+            hash=summary.latest_dataset_hash,
+            hash_md5=summary.latest_dataset_hash_md5,
+            validation_report=validation_report,
+            unzipped_folder_size_mb=(
+                round(summary.latest_dataset_unzipped_size_bytes / 1024**2, 2)
+                if summary.latest_dataset_unzipped_size_bytes
+                else None
+            ),
+            zipped_folder_size_mb=(
+                round(summary.latest_dataset_zipped_size_bytes / 1024**2, 2)
+                if summary.latest_dataset_zipped_size_bytes
+                else None
+            ),
+        )
@@ -20,19 +20,35 @@ class LocationImpl(Location):
         """Create a model instance from a SQLAlchemy a Location row object."""
         if not location:
             return None
-        country_name = location.country
-        if not country_name:
-            try:
-                country_name = pycountry.countries.get(alpha_2=location.country_code).name
-            except AttributeError:
-                pass
         return cls(
             country_code=location.country_code,
-            country=country_name,
+            country=cls._country_name(location.country, location.country_code),
             subdivision_name=location.subdivision_name,
             municipality=location.municipality,
         )
 
+    @classmethod
+    def from_summary(cls, location: dict | None) -> Location | None:
+        """Create a model instance from a location of the feed_summary `locations` column."""
+        if not location:
+            return None
+        return cls(
+            country_code=location.get("country_code"),
+            country=cls._country_name(location.get("country"), location.get("country_code")),
+            subdivision_name=location.get("subdivision_name"),
+            municipality=location.get("municipality"),
+        )
+
+    @staticmethod
+    def _country_name(country: str | None, country_code: str | None) -> str | None:
+        """Stored country name, falling back to the name of the country code."""
+        if country:
+            return country
+        try:
+            return pycountry.countries.get(alpha_2=country_code).name
+        except AttributeError:
+            return None
+
     @classmethod
     @with_db_session
     def to_orm_from_dict(self, location_dict: dict, db_session: Session) -> LocationOrm | None:
@@ -39,13 +39,20 @@ BREVO_TEMPLATE_ADMIN_EVENT_SUMMARY
 BREVO_MAX_RPS
     Maximum Brevo API requests per second (default: ``900``). Stays below
     Brevo's hard limit of 1000 rps. Enforced by a shared token-bucket limiter.
+BREVO_BATCH_MAX_VERSIONS
+    Maximum number of message versions (recipients) put into one batched
+    Brevo request by ``send_batch`` (default: ``100``).
 
 Design
 ------
 * ``send_single`` sends one email for one notification_event.
 * ``send_digest`` sends one email batching multiple notification_events.
-* Both raise ``BrevoSendError`` on failure so the caller can update
+* ``send_batch`` sends many template-based emails that share a Brevo template
+  in one API call, one ``messageVersions`` entry per recipient.
+* All raise ``BrevoSendError`` on failure so the caller can update
   ``notification_log.status`` and ``retry_count`` accordingly.
+* The ``sib_api_v3_sdk.ApiClient`` (and its connection pool) is created once
+  per process and API key and reused by every send.
 * Template params are passed as ``params`` to the Brevo API; Brevo renders
   them via its template engine.  When no template ID is configured, a minimal
   HTML fallback is built inline.
@@ -55,6 +62,7 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from html import escape as _html_escape
@@ -208,6 +216,25 @@ _SINGLE_EMAIL_SUBJECT_DICTIONARY = {
 }
 
 
+# Brevo accepts up to 1000 message versions per request; stay well below so a
+# single failed batch only affects a bounded number of recipients.
+BREVO_BATCH_MAX_VERSIONS_ENV = "BREVO_BATCH_MAX_VERSIONS"
+DEFAULT_BREVO_BATCH_MAX_VERSIONS = 100
+
+
+def get_brevo_batch_max_versions() -> int:
+    """Return the maximum number of message versions per ``send_batch`` request.
+
+    Configured from ``BREVO_BATCH_MAX_VERSIONS`` (default
+    :data:`DEFAULT_BREVO_BATCH_MAX_VERSIONS`). Invalid or non-positive values
+    fall back to the default.
+    """
+    value = _int_env(BREVO_BATCH_MAX_VERSIONS_ENV)
+    if value is None or value <= 0:
+        return DEFAULT_BREVO_BATCH_MAX_VERSIONS
+    return value
+
+
 class BrevoSendError(Exception):
     """Raised when a Brevo API call fails.  Callers catch this to record failure."""
 
@@ -224,6 +251,22 @@ class EmailRecipient:
         return d
 
 
+@dataclass
+class PreparedEmail:
+    """A fully built email, ready to be handed to Brevo.
+
+    ``html_content`` is only set when no Brevo template is configured for the
+    notification type (HTML fallback); ``params`` are only sent to Brevo in
+    template mode.
+    """
+
+    recipient: EmailRecipient
+    subject: str
+    template_id: Optional[int]
+    params: Dict[str, Any]
+    html_content: Optional[str] = None
+
+
 def get_template_id_by_notification(
     notification_type_id: str,
     *,
@@ -408,6 +451,67 @@ def build_digest_html(events: List, subscription=None) -> str:
     return _jinja_env.get_template("feed_url_updated_digest.html.j2").render(**context)
 
 
+def prepare_single(
+    recipient: EmailRecipient,
+    notification_event: NotificationEvent,
+    subscription,
+) -> PreparedEmail:
+    """Build the email sent by ``send_single`` without sending it."""
+    template_id = get_template_id_by_notification(
+        notification_event.notification_type_id,
+        digest=False,
+    )
+    params = build_params_by_notification(
+        notification_event.notification_type_id,
+        [notification_event],
+        subscription,
+    )
+    subject = build_single_subject(notification_event)
+    # This is case the HTML fallback is used, so we don't need to pass html_content
+    html = build_single_html(notification_event, subscription) if template_id is None else None
+    return PreparedEmail(
+        recipient=recipient,
+        subject=subject,
+        template_id=template_id,
+        params=params,
+        html_content=html,
+    )
+
+
+def prepare_digest(
+    recipient: EmailRecipient,
+    notification_events: List,
+    subscription,
+) -> PreparedEmail:
+    """Build the email sent by ``send_digest`` without sending it.
+
+    ``notification_events`` must not be empty.
+    """
+    notification_type_id = notification_events[0].notification_type_id
+
+    template_id = get_template_id_by_notification(notification_type_id, digest=True)
+    if template_id is None:
+        logger.info(
+            "No Brevo template configured for notification type %s; using HTML fallback",
+            notification_type_id,
+        )
+
+    params = build_params_by_notification(
+        notification_type_id,
+        notification_events,
+        subscription,
+    )
+    subject = build_digest_subject(notification_events)
+    html = build_digest_html(notification_events, subscription) if template_id is None else None
+    return PreparedEmail(
+        recipient=recipient,
+        subject=subject,
+        template_id=template_id,
+        params=params,
+        html_content=html,
+    )
+
+
 def send_single(
     recipient: EmailRecipient,
     notification_event: NotificationEvent,  # NotificationEvent ORM object
@@ -429,26 +533,7 @@ def send_single(
     BrevoSendError
         When the Brevo API returns an error.
     """
-    template_id = get_template_id_by_notification(
-        notification_event.notification_type_id,
-        digest=False,
-    )
-    params = build_params_by_notification(
-        notification_event.notification_type_id,
-        [notification_event],
-        subscription,
-    )
-    subject = build_single_subject(notification_event)
-    # This is case the HTML fallback is used, so we don't need to pass html_content
-    html = build_single_html(notification_event, subscription) if template_id is None else None
-
-    _send(
-        recipient=recipient,
-        subject=subject,
-        html_content=html,
-        template_id=template_id,
-        params=params,
-    )
+    send_prepared(prepare_single(recipient, notification_event, subscription))
 
 
 def send_digest(
@@ -476,30 +561,89 @@ def send_digest(
         logger.debug("send_digest called with empty event list; skipping")
         return
 
-    notification_type_id = notification_events[0].notification_type_id
+    send_prepared(prepare_digest(recipient, notification_events, subscription))
 
-    template_id = get_template_id_by_notification(notification_type_id, digest=True)
-    if template_id is None:
-        logger.info(
-            "No Brevo template configured for notification type %s; using HTML fallback",
-            notification_type_id,
-        )
 
-    params = build_params_by_notification(
-        notification_type_id,
-        notification_events,
-        subscription,
-    )
-    subject = build_digest_subject(notification_events)
-    html = build_digest_html(notification_events, subscription) if template_id is None else None
+def send_prepared(email: PreparedEmail) -> None:
+    """Send one email built by ``prepare_single`` / ``prepare_digest``.
 
+    Raises
+    ------
+    BrevoSendError
+        When the Brevo API returns an error.
+    """
     _send(
-        recipient=recipient,
-        subject=subject,
-        html_content=html,
-        template_id=template_id,
-        params=params,
+        recipient=email.recipient,
+        subject=email.subject,
+        html_content=email.html_content,
+        template_id=email.template_id,
+        params=email.params,
+    )
+
+
+def send_batch(emails: List[PreparedEmail]) -> List[str]:
+    """Send many template-based emails in a single Brevo API call.
+
+    Every email must use the same Brevo template; each one becomes a
+    ``messageVersions`` entry carrying its own recipient and template params,
+    so Brevo renders one personalised message per recipient. HTML-fallback
+    emails (no template) cannot be batched and must go through ``send_single``
+    / ``send_digest``. Callers are responsible for keeping ``emails`` within
+    :func:`get_brevo_batch_max_versions`.
+
+    The request is all-or-nothing: on failure no version is sent.
+
+    Returns
+    -------
+    List[str]
+        The Brevo message ids, one per version, when reported by the API.
+
+    Raises
+    ------
+    BrevoSendError
+        When the batch is invalid or the Brevo API returns an error.
+    """
+    if not emails:
+        return []
+    template_ids = {email.template_id for email in emails}
+    if len(template_ids) != 1 or None in template_ids:
+        raise BrevoSendError(f"send_batch requires a single Brevo template id, got {sorted(map(str, template_ids))}")
+
+    try:
+        import sib_api_v3_sdk
+        from sib_api_v3_sdk.rest import ApiException
+    except ImportError as exc:
+        raise BrevoSendError(f"sib_api_v3_sdk is not installed: {exc}") from exc
+
+    api = sib_api_v3_sdk.TransactionalEmailsApi(_get_api_client())
+
+    send_email = sib_api_v3_sdk.SendSmtpEmail(
+        sender=_sender(),
+        template_id=emails[0].template_id,
+        message_versions=[
+            sib_api_v3_sdk.SendSmtpEmailMessageVersions(
+                to=[email.recipient.to_dict()],
+                params=email.params,
+            )
+            for email in emails
+        ],
+    )
+
+    try:
+        result = api.send_transac_email(send_email)
+    except ApiException as exc:
+        raise BrevoSendError(f"Brevo API error {exc.status}: {exc.reason}") from exc
+    except Exception as exc:
+        raise BrevoSendError(f"Unexpected error sending email batch: {exc}") from exc
+
+    message_ids = list(getattr(result, "message_ids", None) or [])
+    logger.info(
+        "Brevo batch sent (template_id=%s, versions=%d, message_ids=%d)",
+        emails[0].template_id,
+        len(emails),
+        len(message_ids),
     )
+    return message_ids
 
 
 # ---------------------------------------------------------------------------
@@ -507,6 +651,53 @@ def send_digest(
 # ---------------------------------------------------------------------------
 
 
+_api_clients: Dict[str, Any] = {}
+_api_clients_lock = threading.Lock()
+
+
+def _get_api_client():
+    """Return the process-wide ``sib_api_v3_sdk.ApiClient`` for ``BREVO_API_KEY``.
+
+    Creating an ``ApiClient`` allocates a new urllib3 connection pool, so a
+    client per email would open a new TLS connection per send. The client is
+    created once per API key and reused by every send of the process.
+
+    Raises BrevoSendError when the SDK is missing or ``BREVO_API_KEY`` is unset.
+    """
+    try:
+        import sib_api_v3_sdk
+    except ImportError as exc:
+        raise BrevoSendError(f"sib_api_v3_sdk is not installed: {exc}") from exc
+
+    api_key = os.getenv("BREVO_API_KEY")
+    if not api_key:
+        raise BrevoSendError("BREVO_API_KEY environment variable is not set")
+
+    client = _api_clients.get(api_key)
+    if client is None:
+        with _api_clients_lock:
+            client = _api_clients.get(api_key)
+            if client is None:
+                configuration = sib_api_v3_sdk.Configuration()
+                configuration.api_key = {"api-key": api_key}
+                client = sib_api_v3_sdk.ApiClient(configuration)
+                _api_clients[api_key] = client
+    return client
+
+
+def reset_brevo_api_client() -> None:
+    """Drop the cached Brevo API clients (tests / key rotation)."""
+    with _api_clients_lock:
+        _api_clients.clear()
+
+
+def _sender() -> Dict[str, str]:
+    return {
+        "email": os.getenv("BREVO_SENDER_EMAIL", _DEFAULT_SENDER_EMAIL),
+        "name": os.getenv("BREVO_SENDER_NAME", _DEFAULT_SENDER_NAME),
+    }
+
+
 def _send(
     recipient: EmailRecipient,
     subject: str,
@@ -524,22 +715,11 @@ def _send(
     except ImportError as exc:
         raise BrevoSendError(f"sib_api_v3_sdk is not installed: {exc}") from exc
 
-    api_key = os.getenv("BREVO_API_KEY")
-    if not api_key:
-        raise BrevoSendError("BREVO_API_KEY environment variable is not set")
-
-    configuration = sib_api_v3_sdk.Configuration()
-    configuration.api_key = {"api-key": api_key}
-
-    client = sib_api_v3_sdk.ApiClient(configuration)
-    api = sib_api_v3_sdk.TransactionalEmailsApi(client)
-
-    sender_email = os.getenv("BREVO_SENDER_EMAIL", _DEFAULT_SENDER_EMAIL)
-    sender_name = os.getenv("BREVO_SENDER_NAME", _DEFAULT_SENDER_NAME)
+    api = sib_api_v3_sdk.TransactionalEmailsApi(_get_api_client())
 
     send_email = sib_api_v3_sdk.SendSmtpEmail(
         to=[recipient.to_dict()],
-        sender={"email": sender_email, "name": sender_name},
+        sender=_sender(),
         subject=subject if template_id is None else None,
         html_content=html_content,
         template_id=template_id,
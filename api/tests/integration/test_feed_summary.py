@@ -0,0 +1,179 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from faker import Faker
+from sqlalchemy import text
+
+from shared.database_gen.sqlacodegen_models import (
+    Externalid,
+    Feed,
+    Gtfsdataset,
+    Gtfsfeed,
+    License,
+    Location,
+    Redirectingid,
+    Validationreport,
+)
+from shared.db_models.model_utils import compare_java_versions
+
+fake = Faker()
+
+
+@contextmanager
+def rolled_back_session(test_database):
+    """Session whose writes, and the summary rows refreshed by the triggers, are rolled back at the end."""
+    with test_database.start_db_session() as session:
+        try:
+            yield session
+        finally:
+            session.rollback()
+
+
+def new_feed(session, feed_type=Feed, **kwargs) -> Feed:
+    feed_id = fake.uuid4()
+    feed = feed_type(id=feed_id, stable_id=f"summary-test-{feed_id}", **kwargs)
+    session.add(feed)
+    session.flush()
+    return feed
+
+
+def summary(session, feed_id: str) -> dict:
+    """The feed_summary row of the feed, read after flushing the pending writes."""
+    session.flush()
+    return session.execute(text("SELECT * FROM feed_summary WHERE feed_id = :id"), {"id": feed_id}).mappings().one()
+
+
+def test_feed_insert_and_update(test_database):
+    with rolled_back_session(test_database) as session:
+        feed = new_feed(session, provider="provider")
+        assert summary(session, feed.id)["provider"] == "provider"
+
+        feed.provider = "new provider"
+        assert summary(session, feed.id)["provider"] == "new provider"
+
+
+def test_external_id_insert_and_update(test_database):
+    with rolled_back_session(test_database) as session:
+        feed = new_feed(session)
+        external_id = Externalid(feed_id=feed.id, associated_id="1", source="mdb")
+        session.add(external_id)
+        assert summary(session, feed.id)["external_ids"] == [{"external_id": "1", "source": "mdb"}]
+
+        external_id.source = "tld"
+        assert summary(session, feed.id)["external_ids"] == [{"external_id": "1", "source": "tld"}]
+
+
+def test_location_insert_and_update(test_database):
+    with rolled_back_session(test_database) as session:
+        feed = new_feed(session)
+        location = Location(id=fake.uuid4(), country_code="CA", municipality="Montreal")
+        session.add(location)
+        feed.locations.append(location)
+        assert [item["municipality"] for item in summary(session, feed.id)["locations"]] == ["Montreal"]
+
+        location.municipality = "Laval"
+        assert [item["municipality"] for item in summary(session, feed.id)["locations"]] == ["Laval"]
+
+
+def test_locationfeed_update(test_database):
+    with rolled_back_session(test_database) as session:
+        feed = new_feed(session)
+        other_feed = new_feed(session)
+        location = Location(id=fake.uuid4(), country_code="CA")
+        session.add(location)
+        feed.locations.append(location)
+        session.flush()
+
+        session.execute(
+            text("UPDATE locationfeed SET feed_id = :other WHERE feed_id = :feed"),
+            {"other": other_feed.id, "feed": feed.id},
+        )
+
+        assert summary(session, feed.id)["locations"] == []
+        assert [item["country_code"] for item in summary(session, other_feed.id)["locations"]] == ["CA"]
+
+
+def test_redirect_insert_and_update(test_database):
+    with rolled_back_session(test_database) as session:
+        feed = new_feed(session)
+        target = new_feed(session)
+        redirect = Redirectingid(source_id=feed.id, target_id=target.id, redirect_comment="comment")
+        session.add(redirect)
+        assert summary(session, feed.id)["redirects"] == [{"target_id": target.stable_id, "comment": "comment"}]
+
+        redirect.redirect_comment = "new comment"
+        assert summary(session, feed.id)["redirects"] == [{"target_id": target.stable_id, "comment": "new comment"}]
+
+
+def test_redirect_target_stable_id_update(test_database):
+    with rolled_back_session(test_database) as session:
+        feed = new_feed(session)
+        target = new_feed(session)
+        session.add(Redirectingid(source_id=feed.id, target_id=target.id, redirect_comment="comment"))
+        session.flush()
+
+        target.stable_id = f"{target.stable_id}-renamed"
+
+        assert summary(session, feed.id)["redirects"] == [{"target_id": target.stable_id, "comment": "comment"}]
+
+
+def test_license_insert_and_update(test_database):
+    with rolled_back_session(test_database) as session:
+        license_orm = License(id=fake.uuid4(), type="standard", name="License", is_spdx=False)
+        session.add(license_orm)
+        session.flush()
+        feed = new_feed(session, license_id=license_orm.id)
+        assert summary(session, feed.id)["license_is_spdx"] is False
+
+        license_orm.is_spdx = True
+        assert summary(session, feed.id)["license_is_spdx"] is True
+
+
+def latest_report_id(test_database, reports: list[Validationreport]) -> str:
+    """Id of the latest validation report in the summary of a feed whose latest dataset has the reports."""
+    with rolled_back_session(test_database) as session:
+        feed = new_feed(session, feed_type=Gtfsfeed, data_type="gtfs")
+        dataset = Gtfsdataset(id=fake.uuid4(), feed_id=feed.id, stable_id=fake.uuid4())
+        session.add(dataset)
+        session.flush()
+        feed.latest_dataset_id = dataset.id
+        dataset.validation_reports.extend(reports)
+        return summary(session, feed.id)["latest_report_id"]
+
+
+@pytest.mark.parametrize(
+    "version_1,version_2",
+    [
+        ("5.0", "5.0.1"),
+        ("5.0.1", "5.1"),
+        ("5.0.10", "5.0.9"),
+        ("10.0", "9.1.2"),
+        ("5.0.1-SNAPSHOT", "5.0.1"),
+        ("5.0.1-SNAPSHOT", "5.0"),
+    ],
+)
+def test_latest_report_of_highest_validator_version(test_database, version_1, version_2):
+    """The summary picks the report of the validator version that compare_java_versions orders last."""
+    expected = version_1 if compare_java_versions(version_1, version_2) == 1 else version_2
+    validated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    reports = [
+        Validationreport(id=f"{fake.uuid4()}_{version}", validator_version=version, validated_at=validated_at)
+        for version in (version_1, version_2)
+    ]
+
+    assert latest_report_id(test_database, reports).endswith(f"_{expected}")
+
+
+def test_latest_report_of_versions_with_unequal_lengths(test_database):
+    """Versions 5.0 and 5.0.0 are equal, so the most recently validated report is the latest."""
+    validated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    reports = [
+        Validationreport(id=f"{fake.uuid4()}_5.0.0", validator_version="5.0.0", validated_at=validated_at),
+        Validationreport(
+            id=f"{fake.uuid4()}_5.0", validator_version="5.0", validated_at=validated_at + timedelta(days=1)
+        ),
+    ]
+
+    assert compare_java_versions("5.0", "5.0.0") == 0
+    assert latest_report_id(test_database, reports).endswith("_5.0")
@@ -921,6 +921,25 @@ def test_gbfs_filters(client, values):
         assert any(feed["id"] in values["expected_feed_ids"] for feed in feeds)
 
 
+def test_gbfs_feeds_pages_count_feeds(client):
+    """Test /v1/gbfs_feeds limit and offset apply to feeds, not to their joined versions and endpoints"""
+    pages = [
+        client.request("GET", "/v1/gbfs_feeds", headers=authHeaders, params={"limit": 1, "offset": offset}).json()
+        for offset in range(3)
+    ]
+    assert [len(page) for page in pages] == [1, 1, 1]
+    assert sorted(page[0]["id"] for page in pages) == ["gbfs-system_id_1", "gbfs-system_id_2", "gbfs-system_id_3"]
+
+
+def test_gbfs_feeds_version_filter_returns_matching_versions(client):
+    """Test /v1/gbfs_feeds?version= only returns the matching versions of the feeds"""
+    response = client.request("GET", "/v1/gbfs_feeds", headers=authHeaders, params={"version": "3.0"})
+    assert response.status_code == 200
+    (feed,) = response.json()
+    assert [version["version"] for version in feed["versions"]] == ["3.0"]
+    assert len(feed["versions"][0]["endpoints"]) == 2
+
+
 @pytest.mark.parametrize(
     "values",
     [
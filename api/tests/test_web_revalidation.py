@@ -51,7 +51,7 @@ class TestCreateWebRevalidationTask(unittest.TestCase):
         from shared.common.gcp_utils import create_web_revalidation_task
 
         # Should not raise
-        create_web_revalidation_task(["mdb-123"])
+        create_web_revalidation_task(["mdb-123"], db_session=MagicMock())
 
     @patch("shared.common.gcp_utils.create_http_task_with_name")
     @patch.dict(
@@ -64,20 +64,49 @@ class TestCreateWebRevalidationTask(unittest.TestCase):
             "SERVICE_ACCOUNT_EMAIL": "test@test.iam.gserviceaccount.com",
         },
     )
-    def test_creates_tasks_for_each_feed(self, mock_create_task):
-        """Should create one Cloud Task per feed stable ID."""
+    def test_creates_single_task_for_all_feeds(self, mock_create_task):
+        """Should buffer every feed stable ID and create one Cloud Task for all of them."""
         from shared.common.gcp_utils import create_web_revalidation_task
 
-        create_web_revalidation_task(["mdb-100", "mdb-200"])
+        db_session = MagicMock()
+        create_web_revalidation_task(["mdb-200", "mdb-100", "mdb-200"], db_session=db_session)
 
-        self.assertEqual(mock_create_task.call_count, 2)
+        self.assertEqual(mock_create_task.call_count, 1)
+        self.assertIn(b"revalidate_feeds", mock_create_task.call_args.kwargs.get("body", b""))
+
+        db_session.execute.assert_called_once()
+        statement = db_session.execute.call_args.args[0]
+        compiled = statement.compile()
+        self.assertIn("ON CONFLICT", str(compiled).upper())
+        # A feed buffered again gets a newer request time, so a drain in progress keeps it
+        self.assertIn("DO UPDATE SET REQUESTED_AT = NOW()", str(compiled).upper())
+        self.assertEqual(
+            sorted(value for key, value in compiled.params.items() if key.startswith("feed_stable_id")),
+            ["mdb-100", "mdb-200"],
+        )
 
-        # Verify the task bodies contain the correct feed IDs
-        first_call_body = mock_create_task.call_args_list[0]
-        second_call_body = mock_create_task.call_args_list[1]
+    @patch("shared.common.gcp_utils.create_http_task_with_name")
+    @patch.dict(
+        "os.environ",
+        {
+            "PROJECT_ID": "test-project",
+            "WEB_REVALIDATION_QUEUE": "web-revalidation-queue",
+            "GCP_REGION": "us-central1",
+            "ENVIRONMENT": "dev",
+            "SERVICE_ACCOUNT_EMAIL": "test@test.iam.gserviceaccount.com",
+        },
+    )
+    def test_dedup_task_name_is_time_bucketed(self, mock_create_task):
+        """Task name should only depend on the window so all feeds share one task."""
+        from shared.common.gcp_utils import create_web_revalidation_task
 
-        self.assertIn(b"mdb-100", first_call_body.kwargs.get("body", b""))
-        self.assertIn(b"mdb-200", second_call_body.kwargs.get("body", b""))
+        create_web_revalidation_task(["mdb-42"], db_session=MagicMock())
+        create_web_revalidation_task(["mdb-43"], db_session=MagicMock())
+
+        first_name = mock_create_task.call_args_list[0].kwargs.get("task_name", "")
+        second_name = mock_create_task.call_args_list[1].kwargs.get("task_name", "")
+        self.assertTrue(first_name.startswith("revalidate-feeds-"))
+        self.assertEqual(first_name, second_name)
 
     @patch("shared.common.gcp_utils.create_http_task_with_name")
     @patch.dict(
@@ -90,15 +119,17 @@ class TestCreateWebRevalidationTask(unittest.TestCase):
             "SERVICE_ACCOUNT_EMAIL": "test@test.iam.gserviceaccount.com",
         },
     )
-    def test_dedup_task_name_contains_feed_id(self, mock_create_task):
-        """Task name should include the feed stable ID for deduplication."""
+    def test_buffer_failure_skips_task(self, mock_create_task):
+        """No task should be scheduled when the feeds could not be buffered."""
         from shared.common.gcp_utils import create_web_revalidation_task
 
-        create_web_revalidation_task(["mdb-42"])
+        db_session = MagicMock()
+        db_session.execute.side_effect = Exception("db down")
 
-        self.assertEqual(mock_create_task.call_count, 1)
-        task_name = mock_create_task.call_args.kwargs.get("task_name", "")
-        self.assertTrue(task_name.startswith("revalidate-mdb-42-"))
+        # Should not raise
+        create_web_revalidation_task(["mdb-1"], db_session=db_session)
+
+        mock_create_task.assert_not_called()
 
     @patch("shared.common.gcp_utils.create_http_task_with_name")
     @patch.dict(
@@ -117,7 +148,7 @@ class TestCreateWebRevalidationTask(unittest.TestCase):
         from shared.common.gcp_utils import create_web_revalidation_task
 
         # Should not raise
-        create_web_revalidation_task(["mdb-123"])
+        create_web_revalidation_task(["mdb-123"], db_session=MagicMock())
 
     @patch("shared.common.gcp_utils.create_http_task_with_name")
     @patch.dict(
@@ -134,7 +165,7 @@ class TestCreateWebRevalidationTask(unittest.TestCase):
         """Tasks should target the tasks_executor Cloud Function URL."""
         from shared.common.gcp_utils import create_web_revalidation_task
 
-        create_web_revalidation_task(["mdb-1"])
+        create_web_revalidation_task(["mdb-1"], db_session=MagicMock())
 
         url = mock_create_task.call_args.kwargs.get("url", "")
         self.assertIn("tasks_executor-dev", url)
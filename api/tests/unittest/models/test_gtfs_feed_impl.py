@@ -16,6 +16,7 @@ from shared.database_gen.sqlacodegen_models import (
     Entitytype,
     Notice,
     Feed,
+    FeedSummary,
 )
 from shared.db_models.bounding_box_impl import BoundingBoxImpl
 from shared.db_models.external_id_impl import ExternalIdImpl
@@ -244,3 +245,74 @@ class TestGtfsFeedImpl(unittest.TestCase):
         )
         result = GtfsFeedImpl.from_orm(minimal_feed_orm)
         assert result == minimal_expected_result
+
+    def test_from_summary_all_fields(self):
+        """Test the `from_summary` method gives the same result as `from_orm`."""
+        summary = FeedSummary(
+            feed_id="id",
+            stable_id="stable_id",
+            data_type="gtfs",
+            status="active",
+            provider="provider",
+            feed_name="feed_name",
+            note="note",
+            feed_contact_email="feed_contact_email",
+            seasonal=False,
+            producer_url="producer_url",
+            authentication_type="1",
+            authentication_info_url="authentication_info_url",
+            api_key_parameter_name="api_key_parameter_name",
+            license_url="license_url",
+            external_ids=[{"external_id": "associated_id", "source": "source"}],
+            redirects=[{"target_id": "target_id", "comment": "redirect_comment"}],
+            related_links=[],
+            locations=[
+                {
+                    "country_code": "CA",
+                    "country": None,
+                    "subdivision_name": "subdivision_name",
+                    "municipality": "municipality",
+                }
+            ],
+            latest_dataset_stable_id="dataset_stable_id",
+            latest_dataset_hosted_url="hosted_url",
+            latest_dataset_downloaded_at=datetime(year=2022, month=12, day=31, hour=13, minute=45, second=56),
+            latest_dataset_service_date_range_start=datetime(2024, 1, 1, 0, 0, 0, tzinfo=ZoneInfo("Canada/Atlantic")),
+            latest_dataset_service_date_range_end=datetime(2025, 1, 1, 0, 0, 0, tzinfo=ZoneInfo("Canada/Atlantic")),
+            latest_dataset_agency_timezone="Canada/Atlantic",
+            latest_dataset_hash="hash",
+            latest_dataset_minimum_latitude=1.0,
+            latest_dataset_maximum_latitude=2.0,
+            latest_dataset_minimum_longitude=3.0,
+            latest_dataset_maximum_longitude=4.0,
+            latest_report_id="id",
+            latest_report_total_error=27,
+            latest_report_total_warning=64,
+            latest_report_total_info=4,
+            latest_report_unique_error_count=3,
+            latest_report_unique_warning_count=4,
+            latest_report_unique_info_count=2,
+            latest_report_features=["feature"],
+        )
+        result = GtfsFeedImpl.from_summary(summary)
+        assert result == expected_gtfs_feed_result
+
+    def test_from_summary_without_dataset(self):
+        """Test the `from_summary` method for a feed without latest dataset nor validation report."""
+        summary = FeedSummary(
+            feed_id="id",
+            stable_id="stable_id",
+            data_type="gtfs",
+            feed_name="",
+            seasonal=False,
+            external_ids=[],
+            redirects=[],
+            related_links=[],
+            locations=[],
+        )
+        result = GtfsFeedImpl.from_summary(summary)
+        assert result.latest_dataset is None
+        assert result.bounding_box is None
+        assert result.locations == []
+        assert result.source_info.license_tags is None
+        assert GtfsFeedImpl.from_summary(None) is None
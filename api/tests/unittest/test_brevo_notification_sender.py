@@ -26,6 +26,7 @@ import shared.notifications.brevo_notification_sender as bns
 from shared.notifications.brevo_notification_sender import (
     BrevoSendError,
     EmailRecipient,
+    PreparedEmail,
     build_digest_html,
     build_digest_subject,
     build_params_admin_event_summary,
@@ -34,7 +35,12 @@ from shared.notifications.brevo_notification_sender import (
     build_single_html,
     build_single_subject,
     event_payload,
+    get_brevo_batch_max_versions,
     get_template_id_by_notification,
+    prepare_digest,
+    prepare_single,
+    reset_brevo_api_client,
+    send_batch,
     send_digest,
     send_single,
     subject_feed,
@@ -653,6 +659,139 @@ def test_send_wraps_unexpected_exception(monkeypatch):
             )
 
 
+def test_send_reuses_api_client_across_calls(monkeypatch):
+    monkeypatch.setenv("BREVO_API_KEY", "key")
+    reset_brevo_api_client()
+    fake_api = MagicMock()
+    with patch("sib_api_v3_sdk.ApiClient") as client_cls, patch(
+        "sib_api_v3_sdk.TransactionalEmailsApi", return_value=fake_api
+    ) as api_cls:
+        for _ in range(3):
+            _send(
+                recipient=EmailRecipient(email="a@b.com"),
+                subject="s",
+                html_content="<p>x</p>",
+                template_id=None,
+                params={},
+            )
+    reset_brevo_api_client()
+    client_cls.assert_called_once()
+    assert api_cls.call_count == 3
+    assert all(c.args[0] is client_cls.return_value for c in api_cls.call_args_list)
+
+
+def test_api_client_is_keyed_by_api_key(monkeypatch):
+    reset_brevo_api_client()
+    with patch("sib_api_v3_sdk.ApiClient") as client_cls:
+        client_cls.side_effect = lambda configuration: MagicMock()
+        monkeypatch.setenv("BREVO_API_KEY", "key-1")
+        first = bns._get_api_client()
+        monkeypatch.setenv("BREVO_API_KEY", "key-2")
+        second = bns._get_api_client()
+        monkeypatch.setenv("BREVO_API_KEY", "key-1")
+        again = bns._get_api_client()
+    reset_brevo_api_client()
+    assert first is again
+    assert first is not second
+
+
+# ---------------------------------------------------------------------------
+# prepare_* / send_batch
+# ---------------------------------------------------------------------------
+
+
+def test_prepare_single_and_digest_template_mode(monkeypatch):
+    monkeypatch.setenv("BREVO_TEMPLATE_FEED_URL_UPDATED", "7")
+    monkeypatch.setenv("BREVO_TEMPLATE_FEED_URL_UPDATED_DIGEST", "8")
+    recipient = EmailRecipient(email="a@b.com")
+    event = _event(feeds=[_feed("mdb-1", NotificationFeedRole.SUBJECT)])
+
+    single = prepare_single(recipient, event, _SUBSCRIPTION)
+    digest = prepare_digest(recipient, [event, event], _SUBSCRIPTION)
+
+    assert single.template_id == 7
+    assert single.html_content is None
+    assert single.params["event_count"] == 1
+    assert digest.template_id == 8
+    assert digest.html_content is None
+    assert digest.params["event_count"] == 2
+
+
+def test_prepare_single_html_fallback(monkeypatch):
+    monkeypatch.delenv("BREVO_TEMPLATE_FEED_URL_UPDATED", raising=False)
+    event = _event(feeds=[_feed("mdb-1", NotificationFeedRole.SUBJECT)])
+    email = prepare_single(EmailRecipient(email="a@b.com"), event, _SUBSCRIPTION)
+    assert email.template_id is None
+    assert "<html" in email.html_content.lower()
+
+
+def _prepared(email, template_id=7, params=None):
+    return PreparedEmail(
+        recipient=EmailRecipient(email=email, name="N"),
+        subject="s",
+        template_id=template_id,
+        params=params or {"event_count": 1},
+    )
+
+
+def test_send_batch_one_request_with_one_version_per_recipient(monkeypatch):
+    monkeypatch.setenv("BREVO_API_KEY", "key")
+    fake_api = MagicMock()
+    fake_api.send_transac_email.return_value = SimpleNamespace(message_id=None, message_ids=["m1", "m2"])
+    with patch("sib_api_v3_sdk.TransactionalEmailsApi", return_value=fake_api):
+        message_ids = send_batch(
+            [
+                _prepared("a@b.com", params={"event_count": 1}),
+                _prepared("c@d.com", params={"event_count": 2}),
+            ]
+        )
+
+    assert message_ids == ["m1", "m2"]
+    fake_api.send_transac_email.assert_called_once()
+    sent = fake_api.send_transac_email.call_args.args[0]
+    assert sent.template_id == 7
+    assert sent.to is None
+    assert [v.to for v in sent.message_versions] == [
+        [{"email": "a@b.com", "name": "N"}],
+        [{"email": "c@d.com", "name": "N"}],
+    ]
+    assert [v.params["event_count"] for v in sent.message_versions] == [1, 2]
+
+
+def test_send_batch_empty_is_noop():
+    assert send_batch([]) == []
+
+
+def test_send_batch_rejects_mixed_or_missing_templates(monkeypatch):
+    monkeypatch.setenv("BREVO_API_KEY", "key")
+    with pytest.raises(BrevoSendError, match="single Brevo template"):
+        send_batch([_prepared("a@b.com", template_id=7), _prepared("c@d.com", template_id=8)])
+    with pytest.raises(BrevoSendError, match="single Brevo template"):
+        send_batch([_prepared("a@b.com", template_id=None)])
+
+
+def test_send_batch_wraps_api_exception(monkeypatch):
+    monkeypatch.setenv("BREVO_API_KEY", "key")
+    from sib_api_v3_sdk.rest import ApiException
+
+    fake_api = MagicMock()
+    fake_api.send_transac_email.side_effect = ApiException(status=400, reason="Bad")
+    with patch("sib_api_v3_sdk.TransactionalEmailsApi", return_value=fake_api):
+        with pytest.raises(BrevoSendError, match="400"):
+            send_batch([_prepared("a@b.com")])
+
+
+def test_get_brevo_batch_max_versions(monkeypatch):
+    monkeypatch.delenv("BREVO_BATCH_MAX_VERSIONS", raising=False)
+    assert get_brevo_batch_max_versions() == bns.DEFAULT_BREVO_BATCH_MAX_VERSIONS
+    monkeypatch.setenv("BREVO_BATCH_MAX_VERSIONS", "25")
+    assert get_brevo_batch_max_versions() == 25
+    monkeypatch.setenv("BREVO_BATCH_MAX_VERSIONS", "0")
+    assert get_brevo_batch_max_versions() == bns.DEFAULT_BREVO_BATCH_MAX_VERSIONS
+    monkeypatch.setenv("BREVO_BATCH_MAX_VERSIONS", "lots")
+    assert get_brevo_batch_max_versions() == bns.DEFAULT_BREVO_BATCH_MAX_VERSIONS
+
+
 # ---------------------------------------------------------------------------
 # _int_env
 # ---------------------------------------------------------------------------
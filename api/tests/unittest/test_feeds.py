@@ -1,16 +1,20 @@
 import copy
-from datetime import datetime
+from datetime import date, datetime
 from unittest.mock import Mock, MagicMock
 import json
 
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
 
 from shared.database_gen.sqlacodegen_models import GtfsFeedAvailabilityCheck as DbAvailabilityCheck
+from shared.database_gen.sqlacodegen_models import GtfsFeedAvailabilityDaily as DbAvailabilityDaily
 from shared.db_models.feed_impl import FeedImpl
 from shared.db_models.gtfs_feed_availability_check_impl import GtfsFeedAvailabilityCheckImpl
+from shared.db_models.gtfs_feed_daily_availability_impl import GtfsFeedDailyAvailabilityImpl
 from shared.database.database import Database
 from shared.database_gen.sqlacodegen_models import (
     Feed,
+    FeedSummary,
     Externalid,
     Gtfsdataset,
     Redirectingid,
@@ -130,17 +134,35 @@ def test_feeds_get(client: TestClient, mocker):
 
 def test_feed_get(client: TestClient, mocker):
     """
-    Unit test for get_feeds
+    Unit test for get_feed
     """
-    mock_filter = mocker.patch.object(FeedFilter, "filter")
-    # FeedsApiImpl.get_feed() builds a query like
-    # filter().outerjoin().options().filter().first(); mimic that so FeedImpl.from_orm
-    # receives the actual Feed ORM instead of a MagicMock chain.
+    mock_summary = FeedSummary(
+        feed_id="test_feed_id",
+        stable_id="test_id",
+        data_type="gtfs",
+        status="active",
+        seasonal=False,
+        provider="test_provider",
+        feed_name="test_feed_name",
+        created_at=datetime.fromisoformat("2023-07-10T22:06:00+00:00"),
+        note="test_note",
+        feed_contact_email="test_feed_contact_email",
+        producer_url="test_producer_url",
+        authentication_type="1",
+        authentication_info_url="test_authentication_info_url",
+        api_key_parameter_name="test_api_key_parameter_name",
+        license_url="test_license_url",
+        external_ids=[{"external_id": "test_associated_id", "source": "test_source"}],
+        redirects=[{"target_id": "test_target_id", "comment": "Some comment"}],
+        related_links=[],
+        locations=[],
+    )
+    # FeedsApiImpl.get_feed() reads the feed summary with query(FeedSummary).filter().filter().first()
+    mock_query = mocker.patch.object(Session, "query")
     chain = Mock()
-    for method in ("filter", "outerjoin", "options", "order_by", "limit", "offset"):
-        getattr(chain, method).return_value = chain
-    chain.first.return_value = mock_feed
-    mock_filter.return_value = chain
+    chain.filter.return_value = chain
+    chain.first.return_value = mock_summary
+    mock_query.return_value = chain
 
     response = client.request(
         "GET",
@@ -148,15 +170,14 @@ def test_feed_get(client: TestClient, mocker):
         headers=authHeaders,
     )
 
-    assert mock_filter.call_count == 1, (
-        f"create_feed_filter() was called {mock_filter.call_count} times instead of 1 " f"time"
-    )
+    mock_query.assert_called_once_with(FeedSummary)
     assert response.status_code == 200, f"Response status code was {response.status_code} instead of 200"
     response_feed = response.json()
 
+    assert response_feed == json.loads(FeedImpl.from_summary(mock_summary).model_dump_json())
     assert (
         response_feed == expected_feed_response
-    ), f"Response feed was {response_feed} instead of {expected_feed_response.dict()}"
+    ), f"Response feed was {response_feed} instead of {expected_feed_response}"
 
 
 def test_gtfs_feeds_get(client: TestClient, mocker):
@@ -410,3 +431,28 @@ def test_map_availability_check_failure():
     assert result.success is False
     assert result.status_code == 503
     assert result.error_type == "http_error"
+
+
+def test_map_daily_availability():
+    """Daily roll-up rows map every aggregated column."""
+    db_daily = MagicMock(spec=DbAvailabilityDaily)
+    db_daily.day = date(2025, 1, 10)
+    db_daily.total_checks = 24
+    db_daily.successful_checks = 18
+    db_daily.success_ratio = 0.75
+    db_daily.latency_p50_ms = 120.0
+    db_daily.latency_p95_ms = 910.5
+    db_daily.last_error_type = "timeout"
+    result = GtfsFeedDailyAvailabilityImpl.from_orm(db_daily)
+    assert result.day == date(2025, 1, 10)
+    assert result.total_checks == 24
+    assert result.successful_checks == 18
+    assert result.success_ratio == 0.75
+    assert result.latency_p50_ms == 120.0
+    assert result.latency_p95_ms == 910.5
+    assert result.last_error_type == "timeout"
+
+
+def test_map_daily_availability_none():
+    """None maps to None."""
+    assert GtfsFeedDailyAvailabilityImpl.from_orm(None) is None
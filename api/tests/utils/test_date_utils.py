@@ -1,3 +1,6 @@
+from datetime import date, datetime, timedelta, timezone
+
+from shared.common.date_utils import utc_date
 from utils.date_utils import valid_iso_date
 
 
@@ -33,3 +36,11 @@ def test_invalid_iso_date_valid_format():
     """Test valid_iso_date function with invalids ISO 8601 date formats."""
     assert not valid_iso_date("2021-01-01")
     assert not valid_iso_date("June 2021")
+
+
+def test_utc_date():
+    """utc_date returns the UTC day, converting aware datetimes and keeping naive ones as is."""
+    assert utc_date(datetime(2026, 5, 14, 23, 30)) == date(2026, 5, 14)
+    assert utc_date(datetime(2026, 5, 14, 23, 30, tzinfo=timezone.utc)) == date(2026, 5, 14)
+    assert utc_date(datetime(2026, 5, 14, 23, 30, tzinfo=timezone(timedelta(hours=-2)))) == date(2026, 5, 15)
+    assert utc_date(datetime(2026, 5, 15, 0, 30, tzinfo=timezone(timedelta(hours=2)))) == date(2026, 5, 14)
@@ -1,5 +1,9 @@
 """Unit tests for license_utils module."""
 
+import logging
+import random
+import re
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -13,7 +17,11 @@ from shared.common.license_utils import (
     find_exact_match_license_url,
     assign_license_by_url,
     MatchingLicense,
+    LicenseIndex,
+    get_license_index,
+    reset_license_index,
 )
+from shared.common.db_utils import normalize_url_str
 from shared.database_gen.sqlacodegen_models import License
 
 
@@ -274,6 +282,145 @@ class TestLicenseUtils(unittest.TestCase):
         self.assertEqual(ml.confidence, 1.0)
 
 
+class TestLicenseIndex(unittest.TestCase):
+    """Unit tests for LicenseIndex and the process-wide index."""
+
+    def setUp(self):
+        self.licenses = [
+            License(id="MIT", type="standard", name="MIT License", url="https://opensource.org/licenses/MIT/"),
+            License(id="CC-BY-4.0", type="standard", name="CC BY 4.0", url="https://creativecommons.org/by/4.0"),
+            License(id="LIC-A", type="custom", name="License A", url="http://www.licenses.example.org/pageA"),
+            License(id="LIC-B", type="custom", name="License B", url="licenses.example.org/pageB"),
+            License(id="NO-URL", type="custom", name="No URL", url=None),
+        ]
+        self.index = LicenseIndex(self.licenses)
+        reset_license_index()
+
+    def tearDown(self):
+        reset_license_index()
+
+    def test_lookups(self):
+        self.assertEqual(self.index.find_exact("opensource.org/licenses/mit").id, "MIT")
+        self.assertEqual(self.index.find_exact("licenses.example.org/pagea").id, "LIC-A")
+        self.assertIsNone(self.index.find_exact("opensource.org/licenses/bsd"))
+        self.assertEqual(self.index.get("CC-BY-4.0").name, "CC BY 4.0")
+        self.assertIsNone(self.index.get("cc-by-4.0"))
+        self.assertEqual(self.index.get_case_insensitive("cc-by-4.0").id, "CC-BY-4.0")
+        self.assertEqual(len(self.index), 5)
+
+    def test_resolve_license_exact_from_index(self):
+        session = MagicMock()
+        results = resolve_license("https://opensource.org/licenses/MIT", db_session=session, license_index=self.index)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].match_type, "exact")
+        self.assertEqual(results[0].matched_catalog_url, "https://opensource.org/licenses/MIT/")
+        session.query.assert_not_called()
+
+    def test_resolve_license_heuristic_checks_index(self):
+        results = resolve_license(
+            "https://choosealicense.com/licenses/mit/", license_index=self.index, allow_fuzzy=False
+        )
+        self.assertEqual(results[0].matched_source, "pattern-heuristics")
+        results = resolve_license(
+            "https://opendatacommons.org/licenses/pddl/1.0/", license_index=self.index, allow_fuzzy=False
+        )
+        self.assertEqual(results, [])
+
+    @patch("shared.common.license_utils.find_exact_match_license_url", return_value=None)
+    def test_fuzzy_matches_db_resolver(self, _mock_find):
+        session = MagicMock()
+        session.scalars.return_value = self.licenses
+        session.query.return_value.filter.return_value.one_or_none.return_value = None
+        for url in ["https://licenses.example.org/pageC", "https://licenses.example.org/page", "licenses.example.org"]:
+            for threshold in (0.5, 0.8, 0.94):
+                self.assertEqual(
+                    resolve_license(url, db_session=session, fuzzy_threshold=threshold, license_index=self.index),
+                    resolve_license(url, db_session=session, fuzzy_threshold=threshold),
+                )
+
+    @patch("shared.common.license_utils.get_license_catalog_version")
+    def test_get_license_index_rebuilds_on_version_change(self, mock_version):
+        session = MagicMock()
+        session.scalars.return_value = self.licenses
+        mock_version.return_value = (5, None, "abc")
+
+        first = get_license_index(session)
+        self.assertIs(get_license_index(session), first)
+        self.assertEqual(session.scalars.call_count, 1)
+
+        mock_version.return_value = (6, None, "def")
+        second = get_license_index(session)
+        self.assertIsNot(second, first)
+        self.assertEqual(session.scalars.call_count, 2)
+
+
+class TestLicenseIndexBenchmark(unittest.TestCase):
+    """Compares the indexed resolver with the DB-backed resolver on a synthetic catalog.
+
+    Both must return the same MatchingLicense lists; timings are logged.
+    """
+
+    HOSTS = 20
+    LICENSES_PER_HOST = 25
+    URLS = 100
+
+    def setUp(self):
+        rng = random.Random(42)
+        self.licenses = [
+            License(
+                id=f"LIC-{host}-{i}",
+                type="custom",
+                name=f"License {host}-{i}",
+                url=f"https://www.host{host}.example.com/terms/{rng.choice(['data', 'open', 'use'])}-license-{i}",
+            )
+            for host in range(self.HOSTS)
+            for i in range(self.LICENSES_PER_HOST)
+        ]
+        self.urls = []
+        for _ in range(self.URLS):
+            lic = rng.choice(self.licenses)
+            # Small edits of catalog URLs, so a part of them is above the fuzzy threshold
+            url = lic.url.replace("license", rng.choice(["license", "licence", "lic", "terms"]))
+            self.urls.append(url + rng.choice(["", "/", "/v2", "?lang=en"]))
+
+    @staticmethod
+    def _exact_match(url_normalized, db_session):
+        """Stand-in for the SQL lookup of find_exact_match_license_url, scanning the catalog."""
+        target = normalize_url_str(url_normalized)
+        for lic in db_session.scalars(None):
+            if not lic.url:
+                continue
+            url = re.sub(r"^www\.", "", re.sub(r"^https?://", "", lic.url, flags=re.I), flags=re.I)
+            if re.sub(r"/$", "", url).strip(" ").lower() == target:
+                return lic
+        return None
+
+    def test_indexed_resolver_matches_db_resolver(self):
+        session = MagicMock()
+        session.scalars.side_effect = lambda *_: list(self.licenses)
+        session.query.return_value.filter.return_value.one_or_none.return_value = None
+
+        start = time.perf_counter()
+        with patch("shared.common.license_utils.find_exact_match_license_url", side_effect=self._exact_match):
+            expected = [resolve_license(url, db_session=session) for url in self.urls]
+        db_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = LicenseIndex(self.licenses)
+        actual = [resolve_license(url, db_session=session, license_index=index) for url in self.urls]
+        index_elapsed = time.perf_counter() - start
+
+        self.assertEqual(actual, expected)
+        self.assertTrue(any(expected))
+        logging.info(
+            "resolve_license over %d licenses and %d URLs: db resolver %.3fs, license index %.3fs",
+            len(self.licenses),
+            len(self.urls),
+            db_elapsed,
+            index_elapsed,
+        )
+
+
 class TestAssignLicenseByUrl(unittest.TestCase):
     """Unit tests for assign_license_by_url."""
 
@@ -410,7 +410,7 @@ class DatasetProcessor:
                 self.logger.info(
                     "Creating pipeline tasks for latest dataset %s", dataset.stable_id
                 )
-                create_pipeline_tasks(dataset)
+                create_pipeline_tasks(dataset, run_id=self.execution_id)
             elif dataset:
                 self.logger.info(
                     "Dataset %s is not the latest, skipping pipeline tasks creation.",
@@ -527,7 +527,7 @@ class DatasetProcessor:
             self.logger.info(f"[{self.feed_stable_id}] No database update required.")
             return None
         dataset, _ = self.create_dataset_entities(dataset_file, db_session=db_session)
-        create_pipeline_tasks(dataset)
+        create_pipeline_tasks(dataset, run_id=self.execution_id)
         return dataset_file
 
 
@@ -1,17 +1,20 @@
 import json
 import logging
 import os
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 
-from google.cloud import tasks_v2
 from sqlalchemy.orm import Session
 
+from shared.common.gcp_utils import (
+    HttpTaskSpec,
+    deterministic_task_name,
+    enqueue_http_tasks,
+)
 from shared.database.database import with_db_session
 from shared.database_gen.sqlacodegen_models import Gtfsdataset, GtfsDatasetChangelog
 from shared.helpers.utils import (
-    create_http_task,
-    create_http_pmtiles_builder_task,
-    create_http_gtfs_datasets_comparer_task,
+    gtfs_datasets_comparer_task_spec,
+    pmtiles_builder_task_spec,
 )
 
 # GTFS files that have a registered extractor in the gtfs_file_data_extractor
@@ -19,66 +22,65 @@ from shared.helpers.utils import (
 EXTRACTABLE_FILES = {"feed_info.txt"}
 
 
-def create_http_reverse_geolocation_processor_task(
+def reverse_geolocation_processor_task_spec(
     stable_id: str,
     dataset_stable_id: str,
     stops_url: str,
-) -> None:
+    run_id: Optional[str] = None,
+) -> HttpTaskSpec:
     """
-    Create a task to process reverse geolocation for a dataset.
+    Spec of a task to process reverse geolocation for a dataset, named after the dataset and
+    run_id.
     """
-    client = tasks_v2.CloudTasksClient()
-    body = json.dumps(
-        {
-            "stable_id": stable_id,
-            "stops_url": stops_url,
-            "dataset_id": dataset_stable_id,
-        }
-    ).encode()
-    queue_name = os.getenv("REVERSE_GEOLOCATION_QUEUE")
     project_id = os.getenv("PROJECT_ID")
     gcp_region = os.getenv("GCP_REGION")
-
-    create_http_task(
-        client,
-        body,
-        f"https://{gcp_region}-{project_id}.cloudfunctions.net/reverse-geolocation-processor",
-        project_id,
-        gcp_region,
-        queue_name,
+    return HttpTaskSpec(
+        url=f"https://{gcp_region}-{project_id}.cloudfunctions.net/reverse-geolocation-processor",
+        body=json.dumps(
+            {
+                "stable_id": stable_id,
+                "stops_url": stops_url,
+                "dataset_id": dataset_stable_id,
+            }
+        ).encode(),
+        queue_name=os.getenv("REVERSE_GEOLOCATION_QUEUE"),
+        task_name=deterministic_task_name(
+            "reverse-geolocation", dataset_stable_id, *((run_id,) if run_id else ())
+        ),
     )
 
 
-def create_http_gtfs_file_data_extractor_task(
+def gtfs_file_data_extractor_task_spec(
     stable_id: str,
     dataset_stable_id: str,
     file_name: str,
     file_url: str,
-) -> None:
+    run_id: Optional[str] = None,
+) -> HttpTaskSpec:
     """
-    Create a task to extract structured data from a single GTFS file
-    (handled by the gtfs_file_data_extractor function).
+    Spec of a task to extract structured data from a single GTFS file
+    (handled by the gtfs_file_data_extractor function), named after the dataset, the file and
+    run_id.
     """
-    client = tasks_v2.CloudTasksClient()
-    body = json.dumps(
-        {
-            "stable_id": stable_id,
-            "dataset_id": dataset_stable_id,
-            "file_name": file_name,
-            "file_url": file_url,
-        }
-    ).encode()
-    queue_name = os.getenv("GTFS_FILE_DATA_EXTRACTOR_QUEUE")
     project_id = os.getenv("PROJECT_ID")
     gcp_region = os.getenv("GCP_REGION")
-
-    create_http_task(
-        client,
-        body,
-        f"https://{gcp_region}-{project_id}.cloudfunctions.net/gtfs-file-data-extractor",
-        project_id,
-        gcp_region,
-        queue_name,
+    return HttpTaskSpec(
+        url=f"https://{gcp_region}-{project_id}.cloudfunctions.net/gtfs-file-data-extractor",
+        body=json.dumps(
+            {
+                "stable_id": stable_id,
+                "dataset_id": dataset_stable_id,
+                "file_name": file_name,
+                "file_url": file_url,
+            }
+        ).encode(),
+        queue_name=os.getenv("GTFS_FILE_DATA_EXTRACTOR_QUEUE"),
+        task_name=deterministic_task_name(
+            "file-data-extractor",
+            dataset_stable_id,
+            file_name,
+            *((run_id,) if run_id else ()),
+        ),
     )
 
 
@@ -126,10 +128,17 @@ def get_changed_files(
 
 
 @with_db_session
-def create_pipeline_tasks(dataset: Gtfsdataset, db_session: Session) -> None:
+def create_pipeline_tasks(
+    dataset: Gtfsdataset, db_session: Session, run_id: Optional[str] = None
+) -> None:
     """
     Create pipeline tasks for a dataset.
+    The tasks are collected first and enqueued together with enqueue_http_tasks, under names
+    derived from the dataset and run_id (the execution processing the dataset), so a dataset
+    processed twice in the same execution does not enqueue its tasks twice, while a new
+    execution enqueues them again.
     """
+    specs: List[HttpTaskSpec] = []
     changed_files = get_changed_files(dataset, db_session=db_session)
 
     stable_id = dataset.feed.stable_id
@@ -142,8 +151,10 @@ def create_pipeline_tasks(dataset: Gtfsdataset, db_session: Session) -> None:
 
     # Create reverse geolocation task
     if stops_url and "stops.txt" in changed_files:
-        create_http_reverse_geolocation_processor_task(
-            stable_id, dataset_stable_id, stops_url
+        specs.append(
+            reverse_geolocation_processor_task_spec(
+                stable_id, dataset_stable_id, stops_url, run_id
+            )
         )
 
     # Create GTFS file data extraction tasks for every extractable file present in
@@ -152,8 +163,14 @@ def create_pipeline_tasks(dataset: Gtfsdataset, db_session: Session) -> None:
     for file_name in EXTRACTABLE_FILES:
         gtfs_file = files_by_name.get(file_name)
         if gtfs_file and gtfs_file.hosted_url:
-            create_http_gtfs_file_data_extractor_task(
-                stable_id, dataset_stable_id, file_name, gtfs_file.hosted_url
+            specs.append(
+                gtfs_file_data_extractor_task_spec(
+                    stable_id,
+                    dataset_stable_id,
+                    file_name,
+                    gtfs_file.hosted_url,
+                    run_id,
+                )
             )
 
     routes_file = next(
@@ -178,7 +195,7 @@ def create_pipeline_tasks(dataset: Gtfsdataset, db_session: Session) -> None:
         and 0 < routes_file.file_size_bytes < 1_000_000
         and not set(changed_files).isdisjoint(expected_file_change)
     ):
-        create_http_pmtiles_builder_task(stable_id, dataset_stable_id)
+        specs.append(pmtiles_builder_task_spec(stable_id, dataset_stable_id, run_id))
     elif routes_file:
         logging.info(
             f"Skipping PMTiles task for dataset {dataset_stable_id} due to constraints --> "
@@ -217,13 +234,34 @@ def create_pipeline_tasks(dataset: Gtfsdataset, db_session: Session) -> None:
                 dataset_stable_id,
             )
         else:
-            create_http_gtfs_datasets_comparer_task(
-                feed_stable_id=stable_id,
-                base_dataset_stable_id=base_dataset.stable_id,
-                new_dataset_stable_id=dataset_stable_id,
+            specs.append(
+                gtfs_datasets_comparer_task_spec(
+                    feed_stable_id=stable_id,
+                    base_dataset_stable_id=base_dataset.stable_id,
+                    new_dataset_stable_id=dataset_stable_id,
+                )
             )
     else:
         logging.info(
             "Skipping change tracker task for dataset %s: no base dataset found.",
             dataset_stable_id,
         )
+
+    results = enqueue_http_tasks(specs)
+    skipped = [
+        result.spec.task_name for result in results if result.status == "already_exists"
+    ]
+    if skipped:
+        logging.info(
+            "Pipeline task(s) of dataset %s already enqueued in this run: %s",
+            dataset_stable_id,
+            skipped,
+        )
+    failed = [result for result in results if not result.ok]
+    if failed:
+        logging.error(
+            "Could not enqueue %d pipeline task(s) for dataset %s: %s",
+            len(failed),
+            dataset_stable_id,
+            [(result.spec.task_name, result.error) for result in failed],
+        )
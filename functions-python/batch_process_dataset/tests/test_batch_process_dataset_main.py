@@ -449,9 +449,9 @@ class TestDatasetProcessor(unittest.TestCase):
     @patch.dict(
         os.environ, {"FEEDS_CREDENTIALS": '{"test_stable_id": "test_credentials"}'}
     )
-    @patch("pipeline_tasks.create_http_gtfs_datasets_comparer_task")
+    @patch("pipeline_tasks.enqueue_http_tasks")
     @with_db_session(db_url=default_db_url)
-    def test_process(self, mock_gtfs_datasets_comparer_task, db_session):
+    def test_process(self, mock_enqueue_http_tasks, db_session):
         feeds = db_session.query(Gtfsfeed).all()
         feed_id = feeds[0].id
 
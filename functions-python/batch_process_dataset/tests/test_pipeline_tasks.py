@@ -1,14 +1,17 @@
 import json
 import os
 import unittest
+from functools import partial
 from unittest.mock import patch, MagicMock
 
 from pipeline_tasks import (
-    create_http_reverse_geolocation_processor_task,
-    create_http_gtfs_file_data_extractor_task,
+    reverse_geolocation_processor_task_spec,
+    gtfs_file_data_extractor_task_spec,
     get_changed_files,
     create_pipeline_tasks,
 )
+from shared.common.gcp_utils import enqueue_http_tasks
+from test_shared.test_utils.fake_cloud_tasks import FakeCloudTasksClient
 
 
 class SimpleFile:
@@ -45,33 +48,19 @@ class TestPipelineTasks(unittest.TestCase):
         },
         clear=False,
     )
-    @patch("pipeline_tasks.create_http_task")
-    @patch("pipeline_tasks.tasks_v2.CloudTasksClient")
-    def test_create_http_reverse_geolocation_processor_task(
-        self, mock_client_cls, mock_create_http_task
-    ):
-        client_instance = MagicMock()
-        mock_client_cls.return_value = client_instance
-
+    def test_reverse_geolocation_processor_task_spec(self):
         stable_id = "feed-123"
         dataset_stable_id = "dataset-abc"
         stops_url = "https://example.com/stops.txt"
 
-        create_http_reverse_geolocation_processor_task(
+        spec = reverse_geolocation_processor_task_spec(
             stable_id=stable_id,
             dataset_stable_id=dataset_stable_id,
             stops_url=stops_url,
         )
 
-        mock_client_cls.assert_called_once()
-        self.assertEqual(mock_create_http_task.call_count, 1)
-        args, _ = mock_create_http_task.call_args
-
-        # (client, body, url, project_id, gcp_region, queue_name)
-        self.assertIs(args[0], client_instance)
-        payload = json.loads(args[1].decode("utf-8"))
         self.assertEqual(
-            payload,
+            json.loads(spec.body.decode("utf-8")),
             {
                 "stable_id": stable_id,
                 "stops_url": stops_url,
@@ -79,12 +68,11 @@ class TestPipelineTasks(unittest.TestCase):
             },
         )
         self.assertEqual(
-            args[2],
+            spec.url,
             "https://northamerica-northeast1-my-project.cloudfunctions.net/reverse-geolocation-processor",
         )
-        self.assertEqual(args[3], "my-project")
-        self.assertEqual(args[4], "northamerica-northeast1")
-        self.assertEqual(args[5], "rev-geo-queue")
+        self.assertEqual(spec.queue_name, "rev-geo-queue")
+        self.assertEqual(spec.task_name, "reverse-geolocation-dataset-abc")
 
     @patch.dict(
         os.environ,
@@ -95,27 +83,16 @@ class TestPipelineTasks(unittest.TestCase):
         },
         clear=False,
     )
-    @patch("pipeline_tasks.create_http_task")
-    @patch("pipeline_tasks.tasks_v2.CloudTasksClient")
-    def test_create_http_gtfs_file_data_extractor_task(
-        self, mock_client_cls, mock_create_http_task
-    ):
-        client_instance = MagicMock()
-        mock_client_cls.return_value = client_instance
-
-        create_http_gtfs_file_data_extractor_task(
+    def test_gtfs_file_data_extractor_task_spec(self):
+        spec = gtfs_file_data_extractor_task_spec(
             stable_id="feed-123",
             dataset_stable_id="dataset-abc",
             file_name="feed_info.txt",
             file_url="https://example.com/feed_info.txt",
         )
 
-        self.assertEqual(mock_create_http_task.call_count, 1)
-        args, _ = mock_create_http_task.call_args
-        self.assertIs(args[0], client_instance)
-        payload = json.loads(args[1].decode("utf-8"))
         self.assertEqual(
-            payload,
+            json.loads(spec.body.decode("utf-8")),
             {
                 "stable_id": "feed-123",
                 "dataset_id": "dataset-abc",
@@ -124,10 +101,13 @@ class TestPipelineTasks(unittest.TestCase):
             },
         )
         self.assertEqual(
-            args[2],
+            spec.url,
             "https://northamerica-northeast1-my-project.cloudfunctions.net/gtfs-file-data-extractor",
         )
-        self.assertEqual(args[5], "file-data-queue")
+        self.assertEqual(spec.queue_name, "file-data-queue")
+        self.assertEqual(
+            spec.task_name, "file-data-extractor-dataset-abc-feed_info-txt"
+        )
 
 
 class TestCreatePipelineTasksFeedInfo(unittest.TestCase):
@@ -141,6 +121,7 @@ class TestCreatePipelineTasksFeedInfo(unittest.TestCase):
         return mock_session
 
     def _run(self, files, changed_files):
+        """Runs create_pipeline_tasks and returns the bodies of the extractor tasks."""
         dataset = SimpleDataset(
             feed_id=1,
             dataset_id=10,
@@ -150,19 +131,16 @@ class TestCreatePipelineTasksFeedInfo(unittest.TestCase):
         )
         with patch(
             "pipeline_tasks.get_changed_files", return_value=changed_files
-        ), patch(
-            "pipeline_tasks.create_http_reverse_geolocation_processor_task"
-        ), patch(
-            "pipeline_tasks.create_http_pmtiles_builder_task"
-        ), patch(
-            "pipeline_tasks.create_http_gtfs_datasets_comparer_task"
-        ), patch(
-            "pipeline_tasks.create_http_gtfs_file_data_extractor_task"
-        ) as mock_extractor_task:
+        ), patch("pipeline_tasks.enqueue_http_tasks") as mock_enqueue:
             create_pipeline_tasks(
                 dataset, db_session=self._mock_session_no_base_dataset()
             )
-        return mock_extractor_task
+        mock_enqueue.assert_called_once()
+        return [
+            json.loads(spec.body)
+            for spec in mock_enqueue.call_args.args[0]
+            if spec.task_name.startswith("file-data-extractor-")
+        ]
 
     def test_enqueues_when_feed_info_present_and_changed(self):
         files = [
@@ -172,9 +150,17 @@ class TestCreatePipelineTasksFeedInfo(unittest.TestCase):
                 file_hash="h1",
             )
         ]
-        mock_task = self._run(files, changed_files=["feed_info.txt"])
-        mock_task.assert_called_once_with(
-            "feed-A", "ds-1", "feed_info.txt", "https://x.com/feed_info.txt"
+        bodies = self._run(files, changed_files=["feed_info.txt"])
+        self.assertEqual(
+            bodies,
+            [
+                {
+                    "stable_id": "feed-A",
+                    "dataset_id": "ds-1",
+                    "file_name": "feed_info.txt",
+                    "file_url": "https://x.com/feed_info.txt",
+                }
+            ],
         )
 
     def test_enqueues_when_feed_info_not_changed(self):
@@ -188,15 +174,87 @@ class TestCreatePipelineTasksFeedInfo(unittest.TestCase):
                 file_hash="h1",
             )
         ]
-        mock_task = self._run(files, changed_files=["stops.txt"])
-        mock_task.assert_called_once_with(
-            "feed-A", "ds-1", "feed_info.txt", "https://x.com/feed_info.txt"
-        )
+        bodies = self._run(files, changed_files=["stops.txt"])
+        self.assertEqual(len(bodies), 1)
+        self.assertEqual(bodies[0]["file_name"], "feed_info.txt")
 
     def test_skips_when_feed_info_absent(self):
         files = [SimpleFile("stops.txt", hosted_url="https://x.com/stops.txt")]
-        mock_task = self._run(files, changed_files=["stops.txt"])
-        mock_task.assert_not_called()
+        bodies = self._run(files, changed_files=["stops.txt"])
+        self.assertEqual(bodies, [])
+
+
+class TestCreatePipelineTasksBulkEnqueue(unittest.TestCase):
+    ENV = {
+        "PROJECT_ID": "my-project",
+        "GCP_REGION": "northamerica-northeast1",
+        "REVERSE_GEOLOCATION_QUEUE": "rev-geo-queue",
+        "GTFS_FILE_DATA_EXTRACTOR_QUEUE": "file-data-queue",
+        "PMTILES_BUILDER_QUEUE": "pmtiles-queue",
+    }
+
+    def _dataset(self):
+        return SimpleDataset(
+            feed_id=1,
+            dataset_id=10,
+            feed_stable_id="feed-A",
+            dataset_stable_id="ds-1",
+            files=[
+                SimpleFile("stops.txt", hosted_url="https://x.com/stops.txt"),
+                SimpleFile("routes.txt", file_size_bytes=250_000),
+                SimpleFile("trips.txt"),
+                SimpleFile("stop_times.txt"),
+                SimpleFile("feed_info.txt", hosted_url="https://x.com/feed_info.txt"),
+            ],
+        )
+
+    def _create_pipeline_tasks(self, client, *run_ids):
+        dataset = self._dataset()
+        session = MagicMock()
+        session.query.return_value.filter.return_value.order_by.return_value.first.return_value = (
+            None
+        )
+        with patch(
+            "pipeline_tasks.get_changed_files", return_value=["stops.txt"]
+        ), patch(
+            "pipeline_tasks.enqueue_http_tasks",
+            partial(enqueue_http_tasks, client=client),
+        ):
+            for run_id in run_ids:
+                create_pipeline_tasks(dataset, db_session=session, run_id=run_id)
+
+    @patch.dict(os.environ, ENV, clear=False)
+    def test_tasks_enqueued_once_per_dataset(self):
+        client = FakeCloudTasksClient()
+        # Processing the same dataset twice in a run must not enqueue its tasks twice
+        self._create_pipeline_tasks(client, None, None)
+
+        self.assertEqual(
+            sorted(client.task_names()),
+            [
+                "file-data-extractor-ds-1-feed_info-txt",
+                "pmtiles-ds-1",
+                "reverse-geolocation-ds-1",
+            ],
+        )
+        self.assertEqual(client.create_calls, 6)
+
+    @patch.dict(os.environ, ENV, clear=False)
+    def test_tasks_enqueued_again_in_another_run(self):
+        client = FakeCloudTasksClient()
+        self._create_pipeline_tasks(client, "exec-1", "exec-1", "exec-2")
+
+        self.assertEqual(
+            sorted(client.task_names()),
+            [
+                "file-data-extractor-ds-1-feed_info-txt-exec-1",
+                "file-data-extractor-ds-1-feed_info-txt-exec-2",
+                "pmtiles-ds-1-exec-1",
+                "pmtiles-ds-1-exec-2",
+                "reverse-geolocation-ds-1-exec-1",
+                "reverse-geolocation-ds-1-exec-2",
+            ],
+        )
 
 
 class TestHasFileChanged(unittest.TestCase):
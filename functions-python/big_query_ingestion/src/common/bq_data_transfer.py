@@ -1,10 +1,13 @@
+import json
 import logging
 import os
 from datetime import datetime
+from typing import Dict, List, Optional
 
 from google.cloud import bigquery, storage
 
 from shared.helpers.big_query_helpers import (
+    append_uris_to_table,
     collect_blobs_and_uris,
     make_staging_table_ref,
     ensure_staging_table_like_target,
@@ -12,6 +15,7 @@ from shared.helpers.big_query_helpers import (
     publish_staging_to_target,
     cleanup_success,
     cleanup_failure,
+    merge_staging_into_target,
 )
 from shared.helpers.bq_schema.schema import json_schema_to_bigquery, load_json_schema
 
@@ -21,16 +25,38 @@ bucket_name = os.getenv("BUCKET_NAME")
 dataset_id = os.getenv("DATASET_ID")
 table_id = f"{os.getenv('TABLE_ID')}_{datetime.now().strftime('%Y%m%d')}"
 dataset_location = os.getenv("BQ_DATASET_LOCATION")
+# "full" rebuilds a table named after the day from all the NDJSON files; "incremental" appends the
+# files not loaded yet to a single partitioned table named TABLE_ID.
+ingestion_mode = os.getenv("BQ_INGESTION_MODE", "full")
+# Incremental mode only: upsert the new rows on the merge keys instead of appending them, so that
+# corrected reports replace the rows loaded before.
+merge_corrections = os.getenv("BQ_MERGE_CORRECTIONS", "false").lower() == "true"
+
+# Blob names (and generations) loaded in incremental mode but not deleted yet, per target table.
+MANIFEST_PREFIX = "bq_ingestion_manifests"
 
 
 class BigQueryDataTransfer:
     """Base class for BigQuery data transfer."""
 
-    def __init__(self):
+    # Incremental mode: the target table is partitioned by day on partition_field (by ingestion
+    # time when None) and clustered on clustering_fields; merge_keys identify a report, and among
+    # new rows with the same keys the one with the greatest merge_order_field is merged.
+    partition_field: Optional[str] = None
+    clustering_fields: Optional[List[str]] = None
+    merge_keys: Optional[List[str]] = None
+    merge_order_field: Optional[str] = None
+
+    def __init__(self, incremental: bool = None, merge: bool = None):
         self.bigquery_client = bigquery.Client(project=project_id)
         self.storage_client = storage.Client(project=project_id)
         self.schema_path = None
         self.nd_json_path_prefix = "ndjson"
+        self.incremental = (
+            ingestion_mode == "incremental" if incremental is None else incremental
+        )
+        self.merge_corrections = merge_corrections if merge is None else merge
+        self.table_id = os.getenv("TABLE_ID") if self.incremental else table_id
 
     def create_bigquery_dataset(self):
         """Creates a BigQuery dataset if it does not exist."""
@@ -47,11 +73,11 @@ class BigQueryDataTransfer:
     def create_bigquery_table(self):
         """Creates a BigQuery table if it does not exist."""
         dataset_ref = bigquery.DatasetReference(project_id, dataset_id)
-        table_ref = dataset_ref.table(table_id)
+        table_ref = dataset_ref.table(self.table_id)
 
         try:
             self.bigquery_client.get_table(table_ref)
-            logging.info("Table %s  already exists.", table_id)
+            logging.info("Table %s  already exists.", self.table_id)
         except Exception:
             if self.schema_path is None:
                 raise Exception("Schema path is not provided")
@@ -59,6 +85,12 @@ class BigQueryDataTransfer:
             schema = json_schema_to_bigquery(json_schema)
 
             table = bigquery.Table(table_ref, schema=schema)
+            if self.incremental:
+                table.time_partitioning = bigquery.TimePartitioning(
+                    type_=bigquery.TimePartitioningType.DAY,
+                    field=self.partition_field,
+                )
+                table.clustering_fields = self.clustering_fields
             table = self.bigquery_client.create_table(table)
             logging.info(
                 "Created table %s.%s.%s",
@@ -75,9 +107,13 @@ class BigQueryDataTransfer:
         3. If load is successful, copy data from staging to target (overwriting).
         4. If all steps succeed, delete the blobs and staging table.
         5. If any step fails, delete the staging table and do not touch blobs or target.
+        In incremental mode, only the new files are loaded, see load_new_data_to_bigquery.
         """
+        if self.incremental:
+            return self.load_new_data_to_bigquery()
+
         dataset_ref = bigquery.DatasetReference(project_id, dataset_id)
-        target_table_ref = dataset_ref.table(table_id)
+        target_table_ref = dataset_ref.table(self.table_id)
 
         blobs, source_uris = collect_blobs_and_uris(
             self.storage_client,
@@ -105,6 +141,131 @@ class BigQueryDataTransfer:
             cleanup_failure(self.bigquery_client, staging_table_ref)
             raise
 
+    def load_new_data_to_bigquery(self):
+        """Loads the NDJSON files not loaded yet into the partitioned target table.
+        The process is:
+        1. List the files and skip those recorded in the manifest: they were loaded by a previous
+           run that failed before deleting them. A file rewritten since (new generation) is new.
+        2. Append the new files to the target, recording each loaded batch in the manifest; or,
+           when merging corrections, load them into a staging table and MERGE it into the target.
+        3. Delete the loaded files and drop them from the manifest.
+        The cost of a run depends on the new files only, the target table is never rewritten.
+        """
+        dataset_ref = bigquery.DatasetReference(project_id, dataset_id)
+        target_table_ref = dataset_ref.table(self.table_id)
+
+        blobs, _ = collect_blobs_and_uris(
+            self.storage_client,
+            bucket_name=bucket_name,
+            prefix=self.nd_json_path_prefix,
+        )
+        manifest = self._load_manifest()
+        new_blobs = [
+            blob for blob in blobs if manifest.get(blob.name) != blob.generation
+        ]
+        logging.info(
+            "%s new files to load, %s already loaded.",
+            len(new_blobs),
+            len(blobs) - len(new_blobs),
+        )
+
+        try:
+            if new_blobs and self.merge_corrections:
+                self._merge_blobs(target_table_ref, new_blobs, manifest)
+            elif new_blobs:
+                self._append_blobs(target_table_ref, new_blobs, manifest)
+        finally:
+            # Files loaded before a failure are deleted too, as the manifest keeps them from
+            # being loaded again.
+            self._delete_loaded_blobs(blobs, manifest)
+
+    def _append_blobs(
+        self,
+        target_table_ref: bigquery.TableReference,
+        blobs: List[storage.Blob],
+        manifest: Dict[str, int],
+    ) -> None:
+        """Appends the files to the target, recording each loaded batch in the manifest."""
+        blobs_by_uri = {f"gs://{bucket_name}/{blob.name}": blob for blob in blobs}
+
+        def record_batch(uri_batch: List[str]) -> None:
+            for uri in uri_batch:
+                manifest[blobs_by_uri[uri].name] = blobs_by_uri[uri].generation
+            self._save_manifest(manifest)
+
+        append_uris_to_table(
+            self.bigquery_client,
+            target_table_ref,
+            list(blobs_by_uri),
+            on_batch_loaded=record_batch,
+        )
+
+    def _merge_blobs(
+        self,
+        target_table_ref: bigquery.TableReference,
+        blobs: List[storage.Blob],
+        manifest: Dict[str, int],
+    ) -> None:
+        """Loads the files into a staging table and merges it into the target on merge_keys."""
+        if not self.merge_keys:
+            raise ValueError("Merge keys are not provided")
+        staging_table_ref = make_staging_table_ref(target_table_ref)
+        try:
+            ensure_staging_table_like_target(
+                self.bigquery_client, target_table_ref, staging_table_ref
+            )
+            load_uris_into_staging(
+                self.bigquery_client,
+                staging_table_ref,
+                [f"gs://{bucket_name}/{blob.name}" for blob in blobs],
+            )
+            merge_staging_into_target(
+                self.bigquery_client,
+                staging_table_ref,
+                target_table_ref,
+                self.merge_keys,
+                self.merge_order_field,
+            )
+            manifest.update({blob.name: blob.generation for blob in blobs})
+            self._save_manifest(manifest)
+            cleanup_success(self.bigquery_client, staging_table_ref, [])
+        except Exception as e:
+            logging.error("An error occurred while merging data to BigQuery: %s", e)
+            cleanup_failure(self.bigquery_client, staging_table_ref)
+            raise
+
+    def _delete_loaded_blobs(
+        self, blobs: List[storage.Blob], manifest: Dict[str, int]
+    ) -> None:
+        """Deletes the files recorded in the manifest, then drops them from the manifest."""
+        loaded_blobs = [
+            blob for blob in blobs if manifest.get(blob.name) == blob.generation
+        ]
+        try:
+            for blob in loaded_blobs:
+                blob.delete()
+                manifest.pop(blob.name)
+            logging.info("Deleted %s loaded files.", len(loaded_blobs))
+        finally:
+            self._save_manifest(manifest)
+
+    def _manifest_blob(self) -> storage.Blob:
+        return self.storage_client.bucket(bucket_name).blob(
+            f"{MANIFEST_PREFIX}/{dataset_id}.{self.table_id}.json"
+        )
+
+    def _load_manifest(self) -> Dict[str, int]:
+        """Returns the generation of each file loaded and not deleted yet, by blob name."""
+        blob = self._manifest_blob()
+        if not blob.exists():
+            return {}
+        return json.loads(blob.download_as_text())
+
+    def _save_manifest(self, manifest: Dict[str, int]) -> None:
+        self._manifest_blob().upload_from_string(
+            json.dumps(manifest), content_type="application/json"
+        )
+
     def send_data_to_bigquery(self):
         """Full process to send data to BigQuery."""
         try:
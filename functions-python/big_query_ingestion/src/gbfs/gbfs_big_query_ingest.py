@@ -6,8 +6,12 @@ from common.bq_data_transfer import BigQueryDataTransfer
 class BigQueryDataTransferGBFS(BigQueryDataTransfer):
     """BigQuery data transfer for GBFS data"""
 
-    def __init__(self):
-        super().__init__()
+    clustering_fields = ["feedId", "snapshotId"]
+    # A snapshot has one report per validator version
+    merge_keys = ["feedId", "snapshotId", "summary.validatorVersion"]
+
+    def __init__(self, incremental: bool = None, merge: bool = None):
+        super().__init__(incremental, merge)
         current_dir = os.path.dirname(os.path.abspath(__file__))
         self.schema_path = os.path.join(
             current_dir, "../shared/helpers/bq_schema/gbfs_schema.json"
@@ -6,8 +6,14 @@ from common.bq_data_transfer import BigQueryDataTransfer
 class BigQueryDataTransferGTFS(BigQueryDataTransfer):
     """BigQuery data transfer for GTFS data"""
 
-    def __init__(self):
-        super().__init__()
+    partition_field = "validatedAt"
+    clustering_fields = ["feedId", "datasetId"]
+    # A dataset has one report per validator version
+    merge_keys = ["feedId", "datasetId", "summary.validatorVersion"]
+    merge_order_field = "validatedAt"
+
+    def __init__(self, incremental: bool = None, merge: bool = None):
+        super().__init__(incremental, merge)
         current_dir = os.path.dirname(os.path.abspath(__file__))
         self.schema_path = os.path.join(
             current_dir, "../shared/helpers/bq_schema/gtfs_schema.json"
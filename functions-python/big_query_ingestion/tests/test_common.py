@@ -1,9 +1,12 @@
+import json
 import unittest
 from unittest.mock import patch, MagicMock
 
 from google.cloud import bigquery
 
 from common.bq_data_transfer import BigQueryDataTransfer
+from test_shared.test_utils.fake_bigquery import FakeBigQueryClient
+from test_shared.test_utils.fake_gcs import FakeStorageClient
 
 
 class TestBigQueryDataTransfer(unittest.TestCase):
@@ -154,3 +157,188 @@ class TestBigQueryDataTransfer(unittest.TestCase):
         mock_create_dataset.assert_called_once()
         self.assertEqual(status, 500)
         self.assertIn("Error while loading data: Dataset creation failed", response)
+
+
+class TestIncrementalBigQueryDataTransfer(unittest.TestCase):
+    @patch("google.cloud.storage.Client")
+    @patch("common.bq_data_transfer.bigquery.Client")
+    def setUp(self, _, __):
+        for name, value in (
+            ("project_id", "project"),
+            ("dataset_id", "dataset"),
+            ("bucket_name", "bucket"),
+        ):
+            patcher = patch(f"common.bq_data_transfer.{name}", value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.storage_client = FakeStorageClient()
+        self.bucket = self.storage_client.bucket("bucket")
+        self.bigquery_client = FakeBigQueryClient(self.storage_client)
+        self.bigquery_client.datasets.add(("project", "dataset"))
+
+        self.transfer = BigQueryDataTransfer(incremental=True)
+        self.transfer.table_id = "reports"
+        self.transfer.schema_path = "fake_schema_path.json"
+        self.transfer.partition_field = "validatedAt"
+        self.transfer.clustering_fields = ["feedId", "datasetId"]
+        self.transfer.merge_keys = ["feedId", "datasetId"]
+        self.transfer.bigquery_client = self.bigquery_client
+        self.transfer.storage_client = self.storage_client
+        with patch("common.bq_data_transfer.load_json_schema") as mock_schema:
+            mock_schema.return_value = {
+                "fields": [
+                    {"name": "feedId", "type": "STRING"},
+                    {"name": "datasetId", "type": "STRING"},
+                    {"name": "validatedAt", "type": "TIMESTAMP"},
+                ]
+            }
+            self.transfer.create_bigquery_table()
+        self.target = self.bigquery_client.tables[("project", "dataset", "reports")]
+
+    def add_report_file(self, name, *dataset_ids):
+        return self.bucket.add_blob(
+            f"ndjson/{name}.ndjson",
+            "\n".join(
+                json.dumps({"feedId": "mdb-1", "datasetId": dataset_id})
+                for dataset_id in dataset_ids
+            ).encode(),
+        )
+
+    def manifest(self):
+        blob = self.bucket.blob("bq_ingestion_manifests/dataset.reports.json")
+        return json.loads(blob.download_as_text())
+
+    def test_target_table_is_partitioned_and_clustered(self):
+        self.assertEqual(self.target.time_partitioning.field, "validatedAt")
+        self.assertEqual(self.target.clustering_fields, ["feedId", "datasetId"])
+
+    def test_appends_new_files_only(self):
+        self.add_report_file("shard-1", "ds-1", "ds-2")
+        self.transfer.load_data_to_bigquery()
+
+        self.add_report_file("shard-2", "ds-3")
+        self.transfer.load_data_to_bigquery()
+
+        self.assertEqual(
+            [row["datasetId"] for row in self.target.rows], ["ds-1", "ds-2", "ds-3"]
+        )
+        self.assertEqual(
+            self.bigquery_client.load_jobs,
+            [
+                ["gs://bucket/ndjson/shard-1.ndjson"],
+                ["gs://bucket/ndjson/shard-2.ndjson"],
+            ],
+        )
+        self.assertEqual(list(self.bucket.list_blobs(prefix="ndjson")), [])
+        self.assertEqual(self.manifest(), {})
+
+    def test_skips_files_recorded_in_manifest(self):
+        # Loaded by a previous run that failed before deleting it
+        blob = self.add_report_file("shard-1", "ds-1")
+        self.transfer._save_manifest({blob.name: blob.generation})
+
+        self.transfer.load_data_to_bigquery()
+
+        self.assertEqual(self.bigquery_client.load_jobs, [])
+        self.assertFalse(blob.exists())
+        self.assertEqual(self.manifest(), {})
+
+    def test_reloads_rewritten_file(self):
+        blob = self.add_report_file("shard-1", "ds-1")
+        self.transfer._save_manifest({blob.name: blob.generation})
+        self.add_report_file("shard-1", "ds-1-corrected")
+
+        self.transfer.load_data_to_bigquery()
+
+        self.assertEqual(
+            [row["datasetId"] for row in self.target.rows], ["ds-1-corrected"]
+        )
+
+    @patch("shared.helpers.big_query_helpers.MAX_URIS_PER_JOB", 1)
+    def test_failed_batch_is_retried_alone(self):
+        self.add_report_file("shard-1", "ds-1")
+        self.add_report_file("shard-2", "ds-2")
+        self.bigquery_client.fail_next_load = [None, Exception("Load job failed")]
+
+        with self.assertRaises(Exception):
+            self.transfer.load_data_to_bigquery()
+
+        # The first batch is loaded and deleted, the failed one is kept
+        self.assertEqual(
+            [blob.name for blob in self.bucket.list_blobs(prefix="ndjson")],
+            ["ndjson/shard-2.ndjson"],
+        )
+
+        self.transfer.load_data_to_bigquery()
+
+        self.assertEqual(
+            [row["datasetId"] for row in self.target.rows], ["ds-1", "ds-2"]
+        )
+        self.assertEqual(
+            self.bigquery_client.load_jobs[-1], ["gs://bucket/ndjson/shard-2.ndjson"]
+        )
+
+    def test_merge_corrections(self):
+        self.transfer.merge_corrections = True
+        self.add_report_file("shard-1", "ds-1")
+
+        self.transfer.load_data_to_bigquery()
+
+        (query,) = self.bigquery_client.queries
+        self.assertTrue(query.startswith("MERGE `project.dataset.reports` T"))
+        self.assertIn(
+            "ON T.`feedId` = S.`feedId` AND T.`datasetId` = S.`datasetId`", query
+        )
+        # Only the target is left, the staging table is deleted
+        self.assertEqual(
+            list(self.bigquery_client.tables), [("project", "dataset", "reports")]
+        )
+        self.assertEqual(list(self.bucket.list_blobs(prefix="ndjson")), [])
+
+    def test_merge_keeps_reports_of_each_validator_version(self):
+        self.transfer.merge_corrections = True
+        self.transfer.merge_keys = ["feedId", "datasetId", "summary.validatorVersion"]
+        self.transfer.merge_order_field = "validatedAt"
+        reports = [
+            {
+                "feedId": "mdb-1",
+                "datasetId": "ds-1",
+                "validatedAt": validated_at,
+                "summary": {"validatorVersion": version},
+            }
+            for version, validated_at in (
+                ("6.0.0", "2026-01-01T00:00:00Z"),
+                ("7.0.0", "2026-01-02T00:00:00Z"),
+            )
+        ]
+        self.bucket.add_blob(
+            "ndjson/shard-1.ndjson",
+            "\n".join(json.dumps(report) for report in reports).encode(),
+        )
+
+        self.transfer.load_data_to_bigquery()
+
+        # Reports of other validator versions are not replaced, and among new reports of the
+        # same version the latest validation is merged
+        (query,) = self.bigquery_client.queries
+        self.assertIn(
+            "PARTITION BY `feedId`, `datasetId`, `summary`.`validatorVersion` "
+            "ORDER BY `validatedAt` DESC",
+            query,
+        )
+        self.assertIn(
+            "T.`summary`.`validatorVersion` = S.`summary`.`validatorVersion`", query
+        )
+
+    def test_failed_merge_keeps_files(self):
+        self.transfer.merge_corrections = True
+        self.add_report_file("shard-1", "ds-1")
+        self.bigquery_client.fail_next_load = [Exception("Load job failed")]
+
+        with self.assertRaises(Exception):
+            self.transfer.load_data_to_bigquery()
+
+        self.assertEqual(self.bigquery_client.queries, [])
+        self.assertEqual(len(list(self.bucket.list_blobs(prefix="ndjson"))), 1)
+        self.assertEqual(self.manifest(), {})
@@ -13,3 +13,10 @@ class TestBigQueryDataTransferGTFS(unittest.TestCase):
 
     def test_attributes(self):
         self.assertIn("gtfs_schema.json", self.transfer.schema_path)
+
+    def test_merge_keeps_one_report_per_validator_version(self):
+        self.assertEqual(
+            self.transfer.merge_keys,
+            ["feedId", "datasetId", "summary.validatorVersion"],
+        )
+        self.assertEqual(self.transfer.merge_order_field, "validatedAt")
@@ -1,5 +1,6 @@
 import json
 import language_tags
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from http import HTTPMethod
 from typing import Dict, Any, Optional, List, Tuple
@@ -13,8 +14,12 @@ from gbfs_utils import (
     GBFSVersion,
     GBFSEndpoint,
     fetch_gbfs_data,
+    create_http_session,
     BUCKET_NAME,
     VALIDATOR_URL,
+    VALIDATOR_MAX_WORKERS,
+    VALIDATOR_MAX_RETRIES,
+    VALIDATOR_TIMEOUT_SECONDS,
 )
 import os
 from shared.database_gen.sqlacodegen_models import (
@@ -52,6 +57,8 @@ class GBFSDataProcessor:
         self.gbfs_endpoints: Dict[str, List[GBFSEndpoint]] = {}
         self.validation_reports: Dict[str, Dict[str, Any]] = {}
         self.logger = get_logger(GBFSDataProcessor.__name__, stable_id)
+        # Pooled session shared by the endpoint probes of this feed
+        self.http_session = create_http_session()
 
     def process_gbfs_data(
         self, autodiscovery_url: str, extract_geolocation: bool = True
@@ -82,7 +89,7 @@ class GBFSDataProcessor:
         """Record the request to the autodiscovery URL."""
         self.logger.info("Accessing auto-discovery URL: %s", autodiscovery_url)
         request_metadata = GBFSEndpoint.get_request_metadata(
-            autodiscovery_url, self.logger
+            autodiscovery_url, self.logger, session=self.http_session
         )
         gbfs_feed = (
             db_session.query(Gbfsfeed).filter(Gbfsfeed.id == self.feed_id).one_or_none()
@@ -137,12 +144,22 @@ class GBFSDataProcessor:
                 )
             except AttributeError:
                 language = None
-            endpoints += GBFSEndpoint.from_dict(feed_match.value, language, latency)
+            endpoints += GBFSEndpoint.from_dict(
+                feed_match.value, language, latency=False
+            )
+
+        # Probe the endpoints of every language at once
+        if latency:
+            endpoints = GBFSEndpoint.probe_all(
+                endpoints, session=self.http_session, logger=self.logger
+            )
 
         # If the autodiscovery endpoint is not listed, then add it
         if not any(endpoint.name == "gbfs" for endpoint in endpoints):
             endpoints += GBFSEndpoint.from_dict(
-                [{"name": "gbfs", "url": gbfs_json_url}], None
+                [{"name": "gbfs", "url": gbfs_json_url}],
+                None,
+                session=self.http_session,
             )
 
         unique_endpoints = list(
@@ -325,44 +342,85 @@ class GBFSDataProcessor:
         return gbfs_endpoint_orm
 
     def validate_gbfs_feed_versions(self) -> None:
-        """Validate the GBFS feed versions and store the reports in GCS."""
+        """
+        Validate the GBFS feed versions and store the reports in GCS.
+        Versions are validated in parallel, each upload overlapping the validator requests of the
+        other versions; the reports are recorded in the order of the versions.
+        """
         storage_client = storage.Client()
         bucket = storage_client.bucket(BUCKET_NAME)
 
         date_time_utc = datetime.utcnow().strftime("%Y%m%d%H%M%S")
 
-        for version in self.gbfs_versions:
-            json_payload = {"url": version.url}
-            try:
-                response = requests.post(VALIDATOR_URL, json=json_payload)
-                response.raise_for_status()
-                json_report_summary = response.json()
-            except RequestException as e:
-                self.logger.error("Validation request failed for %s", version.url)
-                self.logger.error(e)
-                continue
+        if not self.gbfs_versions:
+            return
+        session = create_http_session(
+            pool_size=VALIDATOR_MAX_WORKERS, retries=VALIDATOR_MAX_RETRIES
+        )
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(VALIDATOR_MAX_WORKERS, len(self.gbfs_versions))
+            ) as executor:
+                reports = list(
+                    executor.map(
+                        lambda version: self.validate_gbfs_feed_version(
+                            version, session, bucket, date_time_utc
+                        ),
+                        self.gbfs_versions,
+                    )
+                )
+        finally:
+            session.close()
 
-            report_summary_blob = bucket.blob(
-                f"{self.stable_id}/{version.version}/report_summary_{date_time_utc}.json"
-            )
-            report_summary_blob.upload_from_string(
-                json.dumps(json_report_summary), content_type="application/json"
-            )
-            report_summary_blob.make_public()
+        for version, report in zip(self.gbfs_versions, reports):
+            if report is None:
+                continue
             version_id = f"{self.stable_id}_{version.version}_{version.extracted_from}"
-            self.validation_reports[version_id] = {
-                "report_summary_url": report_summary_blob.public_url,
-                "json_report_summary": json_report_summary,
-                "validation_time": date_time_utc,
-                "features": [
-                    obj["file"].replace(".json", "")
-                    for obj in json_report_summary.get("filesSummary", [])
-                    if not obj.get("required", True) and obj.get("exists", False)
-                ],
-            }
-            self.logger.info(
-                f"Validated GBFS feed version: {version.version} with URL: {version.url}"
+            self.validation_reports[version_id] = report
+
+    def validate_gbfs_feed_version(
+        self,
+        version: GBFSVersion,
+        session: requests.Session,
+        bucket: storage.Bucket,
+        date_time_utc: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Validate a GBFS feed version and store its report summary in GCS.
+        @:returns: the validation report data, or None if the validation request failed.
+        """
+        json_payload = {"url": version.url}
+        try:
+            response = session.post(
+                VALIDATOR_URL, json=json_payload, timeout=VALIDATOR_TIMEOUT_SECONDS
             )
+            response.raise_for_status()
+            json_report_summary = response.json()
+        except RequestException as e:
+            self.logger.error("Validation request failed for %s", version.url)
+            self.logger.error(e)
+            return None
+
+        report_summary_blob = bucket.blob(
+            f"{self.stable_id}/{version.version}/report_summary_{date_time_utc}.json"
+        )
+        report_summary_blob.upload_from_string(
+            json.dumps(json_report_summary), content_type="application/json"
+        )
+        report_summary_blob.make_public()
+        self.logger.info(
+            f"Validated GBFS feed version: {version.version} with URL: {version.url}"
+        )
+        return {
+            "report_summary_url": report_summary_blob.public_url,
+            "json_report_summary": json_report_summary,
+            "validation_time": date_time_utc,
+            "features": [
+                obj["file"].replace(".json", "")
+                for obj in json_report_summary.get("filesSummary", [])
+                if not obj.get("required", True) and obj.get("exists", False)
+            ],
+        }
 
     def create_validation_report_entities(
         self, gbfs_version_orm: Gbfsversion, validation_report_data: Dict
@@ -1,9 +1,12 @@
 import logging
 import os
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from typing import Dict, Any, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from shared.dataset_service.main import Status
 
@@ -12,6 +15,18 @@ VALIDATOR_URL = os.getenv(
     "VALIDATOR_URL",
     "https://gbfs-validator.mobilitydata.org/.netlify/functions/validator-summary",
 )
+# Endpoint probing: timeout of each request, maximum size counted, and parallel requests.
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("GBFS_REQUEST_TIMEOUT_SECONDS", "30"))
+MAX_RESPONSE_SIZE_BYTES = int(
+    os.getenv("GBFS_MAX_RESPONSE_SIZE_BYTES", str(50 * 1024 * 1024))
+)
+PROBE_MAX_WORKERS = int(os.getenv("GBFS_PROBE_MAX_WORKERS", "8"))
+STREAM_CHUNK_SIZE_BYTES = 64 * 1024
+# Validator requests: parallel versions, timeout of each request and retries.
+VALIDATOR_MAX_WORKERS = int(os.getenv("GBFS_VALIDATOR_MAX_WORKERS", "4"))
+VALIDATOR_TIMEOUT_SECONDS = float(os.getenv("GBFS_VALIDATOR_TIMEOUT_SECONDS", "300"))
+VALIDATOR_MAX_RETRIES = int(os.getenv("GBFS_VALIDATOR_MAX_RETRIES", "3"))
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
 
 
 @dataclass(frozen=True)
@@ -25,18 +40,27 @@ class GBFSEndpoint:
 
     @staticmethod
     def get_request_metadata(
-        url: str, logger: Optional[logging.Logger] = None
+        url: str,
+        logger: Optional[logging.Logger] = None,
+        session: Optional[requests.Session] = None,
+        timeout: float = REQUEST_TIMEOUT_SECONDS,
+        max_bytes: int = MAX_RESPONSE_SIZE_BYTES,
     ) -> Optional[Dict[str, Any]]:
-        """Fetch the endpoint and return latency, status code, and response size."""
+        """
+        Fetch the endpoint and return latency, status code, and response size.
+        The body is streamed and only counted, up to max_bytes; the Content-Length header is used
+        instead when it gives the decoded size.
+        """
         try:
             logger = logger or logging.getLogger(__name__)
-            response = requests.get(url)
-            response.raise_for_status()
-            return {
-                "latency": response.elapsed.total_seconds() * 1000,
-                "status_code": response.status_code,
-                "response_size_bytes": len(response.content),
-            }
+            http = session or requests
+            with http.get(url, stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+                return {
+                    "latency": response.elapsed.total_seconds() * 1000,
+                    "status_code": response.status_code,
+                    "response_size_bytes": get_response_size(response, max_bytes),
+                }
         except requests.exceptions.RequestException as error:
             logger.error("Error fetching %s. Error %s", url, error)
             return {
@@ -47,33 +71,120 @@ class GBFSEndpoint:
 
     @staticmethod
     def from_dict(
-        data: List[Dict[str, Any]], language: Optional[str], latency: bool = True
+        data: List[Dict[str, Any]],
+        language: Optional[str],
+        latency: bool = True,
+        session: Optional[requests.Session] = None,
     ) -> List["GBFSEndpoint"]:
         """Creates a list of GBFSEndpoint objects from a list of dictionaries."""
-        endpoints = []
-        for file in data:
-            if "name" in file and "url" in file:
-                if not latency:
-                    metadata = {
-                        "latency": None,
-                        "status_code": None,
-                        "response_size_bytes": None,
-                    }
-                else:
-                    metadata = GBFSEndpoint.get_request_metadata(file["url"])
-                if metadata:
-                    endpoints.append(
-                        GBFSEndpoint(
-                            name=file["name"],
-                            url=file["url"],
-                            latency=metadata["latency"],
-                            status_code=metadata["status_code"],
-                            response_size_bytes=metadata["response_size_bytes"],
-                            language=language,
-                        )
-                    )
+        endpoints = [
+            GBFSEndpoint(
+                name=file["name"],
+                url=file["url"],
+                latency=None,
+                status_code=None,
+                response_size_bytes=None,
+                language=language,
+            )
+            for file in data
+            if "name" in file and "url" in file
+        ]
+        if latency:
+            endpoints = GBFSEndpoint.probe_all(endpoints, session=session)
         return endpoints
 
+    @staticmethod
+    def probe_all(
+        endpoints: List["GBFSEndpoint"],
+        session: Optional[requests.Session] = None,
+        max_workers: int = PROBE_MAX_WORKERS,
+        logger: Optional[logging.Logger] = None,
+    ) -> List["GBFSEndpoint"]:
+        """
+        Returns the endpoints with their request metadata, fetching the distinct URLs concurrently
+        over a pooled session.
+        """
+        urls = list(dict.fromkeys(endpoint.url for endpoint in endpoints))
+        if not urls:
+            return endpoints
+        owns_session = session is None
+        session = session or create_http_session(max_workers)
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(urls))
+            ) as executor:
+                metadata_by_url = dict(
+                    zip(
+                        urls,
+                        executor.map(
+                            lambda url: GBFSEndpoint.get_request_metadata(
+                                url, logger, session=session
+                            ),
+                            urls,
+                        ),
+                    )
+                )
+        finally:
+            if owns_session:
+                session.close()
+        return [
+            replace(
+                endpoint,
+                latency=metadata_by_url[endpoint.url]["latency"],
+                status_code=metadata_by_url[endpoint.url]["status_code"],
+                response_size_bytes=metadata_by_url[endpoint.url][
+                    "response_size_bytes"
+                ],
+            )
+            for endpoint in endpoints
+        ]
+
+
+def create_http_session(
+    pool_size: int = PROBE_MAX_WORKERS, retries: int = 0
+) -> requests.Session:
+    """
+    Session whose connection pool lets pool_size requests to the same host run in parallel.
+    With retries, connection errors and throttling or server error responses are retried with
+    exponential backoff, whatever the request method.
+    """
+    session = requests.Session()
+    max_retries = Retry(
+        total=retries,
+        backoff_factor=1,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=None,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=max_retries
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_response_size(response: requests.Response, max_bytes: int) -> int:
+    """
+    Size in bytes of the decoded body of a streamed response, capped at max_bytes.
+    Content-Length is only trusted without Content-Encoding, as it then is the decoded size.
+    """
+    content_length = response.headers.get("Content-Length")
+    if (
+        content_length
+        and content_length.isdigit()
+        and not response.headers.get("Content-Encoding")
+    ):
+        return min(int(content_length), max_bytes)
+    size = 0
+    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE_BYTES):
+        size += len(chunk)
+        if size >= max_bytes:
+            logging.warning(
+                "Response of %s exceeds %s bytes, size capped.", response.url, max_bytes
+            )
+            return max_bytes
+    return size
+
 
 @dataclass(frozen=True)
 class GBFSVersion:
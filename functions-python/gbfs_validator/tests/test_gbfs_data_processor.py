@@ -76,7 +76,7 @@ class TestGbfsDataProcessor(unittest.TestCase):
     )
     @patch("google.cloud.storage.Client")
     @patch("gbfs_data_processor.fetch_gbfs_data", side_effect=mock_fetch_gbfs_data)
-    @patch("requests.post")
+    @patch("requests.Session.post")
     @patch("requests.get")
     @patch.dict(
         os.environ,
@@ -262,7 +262,7 @@ class TestGbfsDataProcessor(unittest.TestCase):
     )
     @patch("google.cloud.storage.Client")
     @patch("gbfs_data_processor.fetch_gbfs_data", side_effect=mock_fetch_gbfs_data)
-    @patch("requests.post")
+    @patch("requests.Session.post")
     @patch("requests.get")
     @patch.dict(
         os.environ,
@@ -30,17 +30,87 @@ class TestGbfsUtils(unittest.TestCase):
         trace_service.save.assert_called_once_with(trace)
         self.assertEqual(trace.error_message, error)
 
-    @patch("requests.get")
-    def test_get_request_metadata(self, mock_get):
-        mock_get.return_value = MagicMock(
+    @staticmethod
+    def _response(headers=None, chunks=(), status_code=200):
+        response = MagicMock(
             elapsed=MagicMock(total_seconds=MagicMock(return_value=1)),
-            status_code=200,
-            content="content",
+            status_code=status_code,
+            headers=headers or {},
+            url="http://example.com",
         )
+        response.iter_content.return_value = iter(chunks)
+        response.__enter__.return_value = response
+        return response
+
+    @patch("requests.get")
+    def test_get_request_metadata(self, mock_get):
+        mock_get.return_value = self._response(chunks=[b"cont", b"ent"])
         result = GBFSEndpoint.get_request_metadata("http://example.com")
         self.assertEqual(
             result, {"latency": 1000, "status_code": 200, "response_size_bytes": 7}
         )
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+        self.assertIsNotNone(mock_get.call_args.kwargs["timeout"])
+
+    def test_get_request_metadata_uses_content_length(self):
+        session = MagicMock()
+        session.get.return_value = self._response(headers={"Content-Length": "123"})
+        result = GBFSEndpoint.get_request_metadata(
+            "http://example.com", session=session
+        )
+        self.assertEqual(result["response_size_bytes"], 123)
+        session.get.return_value.iter_content.assert_not_called()
+
+    def test_get_request_metadata_ignores_encoded_content_length(self):
+        session = MagicMock()
+        session.get.return_value = self._response(
+            headers={"Content-Length": "3", "Content-Encoding": "gzip"},
+            chunks=[b"decoded"],
+        )
+        result = GBFSEndpoint.get_request_metadata(
+            "http://example.com", session=session
+        )
+        self.assertEqual(result["response_size_bytes"], 7)
+
+    def test_get_request_metadata_caps_size(self):
+        session = MagicMock()
+        session.get.return_value = self._response(chunks=[b"x" * 10] * 5)
+        result = GBFSEndpoint.get_request_metadata(
+            "http://example.com", session=session, max_bytes=25
+        )
+        self.assertEqual(result["response_size_bytes"], 25)
+
+    def test_probe_all_fetches_each_url_once(self):
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: self._response(
+            headers={"Content-Length": str(len(url))}
+        )
+        endpoints = GBFSEndpoint.from_dict(
+            [
+                {"name": "station_information", "url": "http://a.com/si"},
+                {"name": "station_status", "url": "http://a.com/status"},
+                {"name": "system_information", "url": "http://a.com/si"},
+                {"name": "ignored"},
+            ],
+            "en",
+            session=session,
+        )
+        self.assertEqual(
+            [endpoint.name for endpoint in endpoints],
+            ["station_information", "station_status", "system_information"],
+        )
+        self.assertEqual(
+            [endpoint.response_size_bytes for endpoint in endpoints], [15, 19, 15]
+        )
+        self.assertEqual(session.get.call_count, 2)
+
+    def test_from_dict_without_latency(self):
+        with patch("requests.get") as mock_get:
+            endpoints = GBFSEndpoint.from_dict(
+                [{"name": "gbfs", "url": "http://a.com/gbfs"}], None, latency=False
+            )
+        mock_get.assert_not_called()
+        self.assertIsNone(endpoints[0].status_code)
 
     @patch("requests.get")
     def test_get_request_metadata_exception(self, mock_get):
@@ -0,0 +1,104 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from gbfs_data_processor import GBFSDataProcessor
+from gbfs_utils import GBFSVersion
+from test_shared.test_utils.stub_gbfs_validator import (
+    StubGbfsValidatorServer,
+    default_report_summary,
+)
+
+
+class TestValidateGbfsFeedVersions(unittest.TestCase):
+    def setUp(self):
+        self.processor = GBFSDataProcessor(stable_id="gbfs-feed", feed_id="feed-id")
+        self.processor.gbfs_versions = [
+            GBFSVersion(version, f"https://example.com/{version}/gbfs.json", source)
+            for version, source in [
+                ("3.0", "autodiscovery"),
+                ("2.3", "gbfs_versions"),
+                ("2.2", "gbfs_versions"),
+            ]
+        ]
+        storage_patcher = patch("gbfs_data_processor.storage")
+        self.storage = storage_patcher.start()
+        self.addCleanup(storage_patcher.stop)
+        self.bucket = self.storage.Client.return_value.bucket.return_value
+        self.bucket.blob.side_effect = lambda name: MagicMock(
+            public_url=f"https://storage/{name}"
+        )
+
+    def _validate(self, server):
+        with patch("gbfs_data_processor.VALIDATOR_URL", server.url):
+            self.processor.validate_gbfs_feed_versions()
+
+    def test_versions_are_validated_in_parallel(self):
+        with StubGbfsValidatorServer(delay_seconds=0.2) as server:
+            self._validate(server)
+
+        self.assertEqual(
+            sorted(server.requests),
+            sorted(version.url for version in self.processor.gbfs_versions),
+        )
+        self.assertGreater(server.max_in_flight, 1)
+        # Reports are recorded in the order of the versions
+        self.assertEqual(
+            list(self.processor.validation_reports),
+            [
+                "gbfs-feed_3.0_autodiscovery",
+                "gbfs-feed_2.3_gbfs_versions",
+                "gbfs-feed_2.2_gbfs_versions",
+            ],
+        )
+        report = self.processor.validation_reports["gbfs-feed_2.3_gbfs_versions"]
+        self.assertEqual(
+            report["json_report_summary"],
+            default_report_summary("https://example.com/2.3/gbfs.json"),
+        )
+        self.assertTrue(
+            report["report_summary_url"].startswith(
+                "https://storage/gbfs-feed/2.3/report_summary_"
+            )
+        )
+        self.assertEqual(report["features"], [])
+        self.assertEqual(self.bucket.blob.call_count, 3)
+
+    def test_features_are_extracted(self):
+        url = "https://example.com/3.0/gbfs.json"
+        summary = default_report_summary(url)
+        summary["filesSummary"] += [
+            {"file": "vehicle_types.json", "required": False, "exists": True},
+            {"file": "geofencing_zones.json", "required": False, "exists": False},
+        ]
+        self.processor.gbfs_versions = self.processor.gbfs_versions[:1]
+
+        with StubGbfsValidatorServer(summaries={url: summary}) as server:
+            self._validate(server)
+
+        report = self.processor.validation_reports["gbfs-feed_3.0_autodiscovery"]
+        self.assertEqual(report["features"], ["vehicle_types"])
+
+    def test_unavailable_validator_is_retried(self):
+        url = "https://example.com/2.2/gbfs.json"
+
+        with StubGbfsValidatorServer(failures={url: 1}) as server:
+            self._validate(server)
+
+        self.assertEqual(server.requests.count(url), 2)
+        self.assertEqual(len(self.processor.validation_reports), 3)
+
+    @patch("gbfs_data_processor.VALIDATOR_MAX_RETRIES", 0)
+    def test_failed_validation_is_skipped(self):
+        url = "https://example.com/2.2/gbfs.json"
+
+        with StubGbfsValidatorServer(failures={url: 1}) as server:
+            self._validate(server)
+
+        self.assertNotIn(
+            "gbfs-feed_2.2_gbfs_versions", self.processor.validation_reports
+        )
+        self.assertEqual(len(self.processor.validation_reports), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,15 +15,23 @@
 # This module provides the GtfsDatasetsComparer Cloud Function. It orchestrates change tracking
 # between two consecutive GTFS datasets: reads the pre-extracted GTFS files from GCS (uploaded
 # by batch_process_dataset at <feed_stable_id>/<dataset_stable_id>/extracted/), computes a
-# structured diff using gtfs-diff-engine, uploads the changelog JSON to GCS, and persists the
-# record in the gtfs_dataset_changelog database table.
+# structured diff using gtfs-diff-engine, uploads the changelog summary JSON and the gzipped
+# row changes of each file to GCS, and persists the record in the gtfs_dataset_changelog
+# database table.
+import gzip
+import json
 import logging
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
 
 import flask
 import functions_framework
 from google.cloud import storage
 from gtfs_diff.engine import diff_feeds
+from gtfs_diff.gtfs_definitions import get_foreign_keys, get_primary_key
+from gtfs_diff.models import GtfsDiff, Summary, UnsupportedFile
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
@@ -40,6 +48,10 @@ from shared.helpers.runtime_metrics import track_metrics
 init_logger()
 limit_gcp_memory(os.getenv("GTFS_DIFF_DUCKDB_TMPDIR", "/tmp/in-memory"))
 
+# Processes diffing groups of changed files in parallel. Each process is subject to the memory
+# limit set above, so the peak memory use grows with the number of workers.
+GTFS_DIFF_MAX_WORKERS = int(os.getenv("GTFS_DIFF_MAX_WORKERS", "2"))
+
 
 @functions_framework.http
 def gtfs_datasets_comparer(request: flask.Request) -> dict:
@@ -142,8 +154,11 @@ class GtfsDatasetsComparer:
     1. Resolve both datasets from the database using their stable_ids.
     2. Locate the pre-extracted GTFS files on the mounted GCS bucket filesystem
        (<bucket_mount>/<feed_stable_id>/<dataset_stable_id>/extracted/).
-    3. Compute a structured diff using gtfs-diff-engine.
-    4. Upload the changelog JSON to GCS.
+    3. Compute a structured diff using gtfs-diff-engine. Files with the same hash in both
+       datasets are unchanged and never read; the changed files are diffed in parallel
+       processes, grouped by foreign keys, and the results merged into a single changelog.
+    4. Upload the row changes of each file to GCS as gzipped JSON, then the changelog
+       summary JSON pointing to them.
     5. Upsert a row in gtfs_dataset_changelog.
     """
 
@@ -167,6 +182,9 @@ class GtfsDatasetsComparer:
         self.dry_run = dry_run
         self.row_changes_cap_per_file = row_changes_cap_per_file
         self.logger = get_logger(GtfsDatasetsComparer.__name__, new_dataset_stable_id)
+        # Content hash of each GTFS file, by file name, set by _resolve_datasets.
+        self.base_file_hashes: Dict[str, Optional[str]] = {}
+        self.new_file_hashes: Dict[str, Optional[str]] = {}
 
     @track_metrics(metrics=("time", "memory", "cpu"))
     def run(self) -> dict:
@@ -175,7 +193,9 @@ class GtfsDatasetsComparer:
             f"{self.feed_stable_id}/{self.new_dataset_stable_id}/"
             f"{self.new_dataset_stable_id}_{self.base_dataset_stable_id}_changelog.json"
         )
-        blob = storage.Client().bucket(self.bucket_name).blob(changelog_blob_path)
+        # One client for the changelog existence check and every upload of the run.
+        bucket = storage.Client().bucket(self.bucket_name)
+        blob = bucket.blob(changelog_blob_path)
 
         # Idempotency: skip if changelog already exists and disallow_overwrite is set.
         if self.disallow_overwrite and blob.exists():
@@ -198,9 +218,15 @@ class GtfsDatasetsComparer:
         base_dir = self._extracted_dir(self.feed_stable_id, self.base_dataset_stable_id)
         new_dir = self._extracted_dir(self.feed_stable_id, self.new_dataset_stable_id)
 
-        diff_result = diff_feeds(
-            base_dir, new_dir, row_changes_cap_per_file=self.row_changes_cap_per_file
-        )
+        if self.base_file_hashes and self.new_file_hashes:
+            diff_result = self._diff_changed_files(base_dir, new_dir)
+        else:
+            # Without the file hashes of both datasets, every file has to be compared.
+            diff_result = diff_feeds(
+                base_dir,
+                new_dir,
+                row_changes_cap_per_file=self.row_changes_cap_per_file,
+            )
 
         if self.dry_run:
             self.logger.info("Dry run — skipping GCS upload and DB write.")
@@ -209,8 +235,16 @@ class GtfsDatasetsComparer:
                 "summary": diff_result.summary.model_dump(),
             }
 
-        changelog_json = diff_result.model_dump_json(indent=2).encode("utf-8")
+        row_changes_urls = self._upload_row_changes(
+            bucket,
+            diff_result,
+            self.feed_stable_id,
+            self.base_dataset_stable_id,
+            self.new_dataset_stable_id,
+        )
+        changelog_json = changelog_summary_json(diff_result, row_changes_urls)
         changelog_url = self._upload_changelog(
+            bucket,
             changelog_json,
             self.feed_stable_id,
             self.base_dataset_stable_id,
@@ -224,6 +258,7 @@ class GtfsDatasetsComparer:
             new_dataset_uuid=new_dataset_uuid,
             changelog_url=changelog_url,
             diff_summary=diff_summary,
+            row_changes_urls=row_changes_urls,
         )
 
         self.logger.info("Changelog stored at %s", changelog_url)
@@ -235,7 +270,8 @@ class GtfsDatasetsComparer:
     @with_db_session
     def _resolve_datasets(self, db_session: Session = None) -> tuple:
         """
-        Validate both datasets exist and belong to the given feed.
+        Validate both datasets exist and belong to the given feed, and record the content hash
+        of their files.
         Returns (base_dataset_uuid, new_dataset_uuid, feed_uuid) as plain strings.
         """
         base_dataset = (
@@ -263,8 +299,71 @@ class GtfsDatasetsComparer:
                 f"Dataset {self.new_dataset_stable_id} does not belong to feed {self.feed_stable_id}."
             )
 
+        self.base_file_hashes = {f.file_name: f.hash for f in base_dataset.gtfsfiles}
+        self.new_file_hashes = {f.file_name: f.hash for f in new_dataset.gtfsfiles}
         return base_dataset.id, new_dataset.id, new_dataset.feed.id
 
+    def _diff_changed_files(self, base_dir: str, new_dir: str) -> GtfsDiff:
+        """
+        Diff only the files whose content changed between the two datasets.
+
+        A file present in both extracted directories with the same hash in the database is
+        unchanged: diff_feeds would omit it from the changelog anyway, so it is skipped
+        without being read from the mount. The other files are diffed in groups connected
+        by foreign keys, as the engine ignores the foreign keys pointing at a file whose ids
+        were regenerated and so must see both files together. The groups run in parallel
+        processes and their results are merged into a single GtfsDiff.
+        """
+        base_files = _list_gtfs_files(base_dir)
+        new_files = _list_gtfs_files(new_dir)
+        unchanged = sorted(
+            name
+            for name in base_files & new_files
+            if self.base_file_hashes.get(name)
+            and self.base_file_hashes.get(name) == self.new_file_hashes.get(name)
+        )
+        changed = sorted((base_files | new_files) - set(unchanged))
+        groups = group_by_foreign_keys(
+            [name for name in changed if get_primary_key(name) is not None]
+        )
+        self.logger.info(
+            "Skipping %s unchanged files %s; diffing %s changed files in %s groups.",
+            len(unchanged),
+            unchanged,
+            len(changed),
+            len(groups),
+        )
+
+        diff_kwargs = {"row_changes_cap_per_file": self.row_changes_cap_per_file}
+        if len(groups) > 1 and GTFS_DIFF_MAX_WORKERS > 1:
+            # spawn: forking a process running logging and database threads is unsafe.
+            with ProcessPoolExecutor(
+                max_workers=min(len(groups), GTFS_DIFF_MAX_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        diff_feeds, base_dir, new_dir, files=group, **diff_kwargs
+                    )
+                    for group in groups
+                ]
+                diffs = [future.result() for future in futures]
+        else:
+            # With no group, the diff of no file still provides the changelog metadata.
+            diffs = [
+                diff_feeds(base_dir, new_dir, files=group, **diff_kwargs)
+                for group in groups or [[]]
+            ]
+
+        unsupported = [
+            UnsupportedFile(
+                file_name=name, present_in=_present_in(name, base_files, new_files)
+            )
+            for name in sorted(base_files | new_files)
+            if get_primary_key(name) is None
+        ]
+        return merge_diffs(diffs, unsupported)
+
     def _extracted_dir(self, feed_stable_id: str, dataset_stable_id: str) -> str:
         """
         Return the path to the pre-extracted GTFS files on the mounted bucket filesystem.
@@ -284,25 +383,94 @@ class GtfsDatasetsComparer:
 
     def _upload_changelog(
         self,
+        bucket: storage.Bucket,
         json_bytes: bytes,
         feed_stable_id: str,
         base_dataset_id: str,
         new_dataset_id: str,
     ) -> str:
         """
-        Upload the changelog JSON to GCS at:
+        Upload the changelog summary JSON to GCS at:
           <feed_stable_id>/<new_dataset_id>/<new_dataset_id>_<base_dataset_id>_changelog.json
 
         Returns the GCS public URL.
         """
         blob_path = f"{feed_stable_id}/{new_dataset_id}/{new_dataset_id}_{base_dataset_id}_changelog.json"
-        bucket = storage.Client().bucket(self.bucket_name)
-        blob = bucket.blob(blob_path)
-        blob.upload_from_string(json_bytes, content_type="application/json")
-        blob.make_public()
+        url = self._upload_public_blob(bucket, blob_path, json_bytes)
         self.logger.info(
             "Uploaded changelog to gs://%s/%s", self.bucket_name, blob_path
         )
+        return url
+
+    def _upload_row_changes(
+        self,
+        bucket: storage.Bucket,
+        diff_result: GtfsDiff,
+        feed_stable_id: str,
+        base_dataset_id: str,
+        new_dataset_id: str,
+    ) -> Dict[str, str]:
+        """
+        Upload the row changes of each file to GCS as gzipped JSON, at:
+          <feed_stable_id>/<new_dataset_id>/<new_dataset_id>_<base_dataset_id>_changelog/
+          <file_name>.json.gz
+
+        The blobs are stored with Content-Encoding gzip, so GCS serves them decompressed to
+        clients not accepting gzip. The row changes blobs of a previous run of the same pair of
+        datasets whose file has no row changes anymore are deleted. Returns the GCS public URL of
+        each file's row changes, by file name.
+        """
+        blob_prefix = f"{feed_stable_id}/{new_dataset_id}/{new_dataset_id}_{base_dataset_id}_changelog"
+        row_changes_urls = {}
+        for file_diff in diff_result.file_diffs:
+            if file_diff.row_changes is None:
+                continue
+            row_changes_urls[file_diff.file_name] = self._upload_public_blob(
+                bucket,
+                f"{blob_prefix}/{file_diff.file_name}.json.gz",
+                gzip.compress(
+                    file_diff.row_changes.model_dump_json().encode("utf-8"), mtime=0
+                ),
+                content_encoding="gzip",
+            )
+        self.logger.info(
+            "Uploaded row changes of %d files to gs://%s/%s/",
+            len(row_changes_urls),
+            self.bucket_name,
+            blob_prefix,
+        )
+        uploaded = {
+            f"{blob_prefix}/{file_name}.json.gz" for file_name in row_changes_urls
+        }
+        stale_blobs = [
+            blob
+            for blob in bucket.list_blobs(prefix=f"{blob_prefix}/")
+            if blob.name not in uploaded
+        ]
+        if stale_blobs:
+            # A blob already deleted by a concurrent run of the same datasets is not an error.
+            bucket.delete_blobs(stale_blobs, on_error=lambda blob: None)
+            self.logger.info(
+                "Deleted %d stale row changes files from gs://%s/%s/",
+                len(stale_blobs),
+                self.bucket_name,
+                blob_prefix,
+            )
+        return row_changes_urls
+
+    def _upload_public_blob(
+        self,
+        bucket: storage.Bucket,
+        blob_path: str,
+        data: bytes,
+        content_encoding: Optional[str] = None,
+    ) -> str:
+        """Upload a public JSON blob to the bucket and return its GCS public URL."""
+        blob = bucket.blob(blob_path)
+        if content_encoding:
+            blob.content_encoding = content_encoding
+        blob.upload_from_string(data, content_type="application/json")
+        blob.make_public()
         return f"https://storage.googleapis.com/{self.bucket_name}/{blob_path}"
 
     @with_db_session
@@ -313,6 +481,7 @@ class GtfsDatasetsComparer:
         new_dataset_uuid: str,
         changelog_url: str,
         diff_summary: dict,
+        row_changes_urls: Dict[str, str],
         db_session: Session = None,
     ) -> None:
         """
@@ -327,12 +496,14 @@ class GtfsDatasetsComparer:
                 new_dataset_id=new_dataset_uuid,
                 changelog_url=changelog_url,
                 diff_summary=diff_summary,
+                row_changes_urls=row_changes_urls,
             )
             .on_conflict_do_update(
                 constraint="gtfs_dataset_changelog_base_new_key",
                 set_={
                     "changelog_url": changelog_url,
                     "diff_summary": diff_summary,
+                    "row_changes_urls": row_changes_urls,
                     "generated_at": func.now(),
                 },
             )
@@ -344,3 +515,88 @@ class GtfsDatasetsComparer:
             self.base_dataset_stable_id,
             self.new_dataset_stable_id,
         )
+
+
+def _list_gtfs_files(directory: str) -> set:
+    """Names of the GTFS files of an extracted dataset directory (a metadata-only listing)."""
+    return {name for name in os.listdir(directory) if name.endswith(".txt")}
+
+
+def _present_in(name: str, base_files: set, new_files: set) -> str:
+    if name in base_files and name in new_files:
+        return "both"
+    return "base" if name in base_files else "new"
+
+
+def group_by_foreign_keys(files: List[str]) -> List[List[str]]:
+    """
+    Split files into groups connected by GTFS foreign keys, so that a file is always
+    diffed together with the files among `files` that it references or that reference it.
+    Groups and their files are sorted by name.
+    """
+    parents: Dict[str, str] = {name: name for name in files}
+
+    def root(name: str) -> str:
+        while parents[name] != name:
+            parents[name] = parents[parents[name]]
+            name = parents[name]
+        return name
+
+    for child in files:
+        for referenced_files in get_foreign_keys(child).values():
+            for parent in referenced_files:
+                if parent in parents:
+                    parents[root(child)] = root(parent)
+
+    groups: Dict[str, List[str]] = {}
+    for name in sorted(files):
+        groups.setdefault(root(name), []).append(name)
+    return sorted(groups.values())
+
+
+def merge_diffs(
+    diffs: List[GtfsDiff], unsupported_files: List[UnsupportedFile]
+) -> GtfsDiff:
+    """
+    Merge the diffs of disjoint sets of files of the same two feeds into one GtfsDiff, as
+    if diff_feeds had compared all the files at once. The metadata is taken from the
+    first diff, with unsupported_files replacing the unsupported files found by the diffs.
+    """
+
+    def total(attribute: str) -> int:
+        return sum(getattr(diff.summary, attribute) for diff in diffs)
+
+    summary = Summary(
+        total_changes=total("total_changes"),
+        files_added_count=total("files_added_count"),
+        files_deleted_count=total("files_deleted_count"),
+        files_modified_count=total("files_modified_count"),
+        files_not_compared_count=total("files_not_compared_count"),
+        files=sorted(
+            (file for diff in diffs for file in diff.summary.files),
+            key=lambda file: file.file_name,
+        ),
+    )
+    file_diffs = sorted(
+        (file_diff for diff in diffs for file_diff in diff.file_diffs),
+        key=lambda file_diff: file_diff.file_name,
+    )
+    metadata = diffs[0].metadata.model_copy(
+        update={"unsupported_files": unsupported_files}
+    )
+    return GtfsDiff(metadata=metadata, summary=summary, file_diffs=file_diffs)
+
+
+def changelog_summary_json(
+    diff_result: GtfsDiff, row_changes_urls: Dict[str, str]
+) -> bytes:
+    """
+    Serialize the changelog without its row changes, compactly. Each file diff points to
+    its uploaded row changes with row_changes_url, null when the file has none.
+    """
+    changelog = diff_result.model_dump(
+        mode="json", exclude={"file_diffs": {"__all__": {"row_changes"}}}
+    )
+    for file_diff in changelog["file_diffs"]:
+        file_diff["row_changes_url"] = row_changes_urls.get(file_diff["file_name"])
+    return json.dumps(changelog, separators=(",", ":")).encode("utf-8")
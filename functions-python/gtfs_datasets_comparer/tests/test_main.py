@@ -11,14 +11,22 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+import gzip
+import json
 import os
 import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
 import flask
+from gtfs_diff.engine import diff_feeds
 
-from main import GtfsDatasetsComparer, gtfs_datasets_comparer
+from main import (
+    GtfsDatasetsComparer,
+    changelog_summary_json,
+    group_by_foreign_keys,
+    gtfs_datasets_comparer,
+)
 
 
 def _make_dataset(
@@ -182,10 +190,17 @@ class TestGtfsDatasetsComparerRun(unittest.TestCase):
     @patch("main.storage.Client")
     @patch("main.GtfsDatasetsComparer._save_changelog_record")
     @patch("main.GtfsDatasetsComparer._upload_changelog")
+    @patch("main.GtfsDatasetsComparer._upload_row_changes")
     @patch("main.GtfsDatasetsComparer._extracted_dir")
     @patch("main.GtfsDatasetsComparer._resolve_datasets")
     def test_run_happy_path(
-        self, mock_resolve, mock_extracted_dir, mock_upload, mock_save, mock_storage
+        self,
+        mock_resolve,
+        mock_extracted_dir,
+        mock_upload_row_changes,
+        mock_upload,
+        mock_save,
+        mock_storage,
     ):
         mock_storage.return_value.bucket.return_value.blob.return_value.exists.return_value = (
             False
@@ -200,9 +215,15 @@ class TestGtfsDatasetsComparerRun(unittest.TestCase):
         fake_summary.model_dump.return_value = {"total_changes": 42}
         fake_diff = MagicMock()
         fake_diff.summary = fake_summary
-        fake_diff.model_dump_json.return_value = (
-            '{"metadata": {}, "summary": {}, "file_diffs": []}'
-        )
+        fake_diff.model_dump.return_value = {
+            "metadata": {},
+            "summary": {},
+            "file_diffs": [{"file_name": "stops.txt"}],
+        }
+        row_changes_urls = {
+            "stops.txt": "https://storage.googleapis.com/test-bucket/stops.txt.json.gz"
+        }
+        mock_upload_row_changes.return_value = row_changes_urls
 
         changelog_url = (
             "https://storage.googleapis.com/test-bucket/mdb-1/"
@@ -219,8 +240,17 @@ class TestGtfsDatasetsComparerRun(unittest.TestCase):
         self.assertEqual(extracted_calls[0].args, ("mdb-1", "mdb-1-20240101"))
         self.assertEqual(extracted_calls[1].args, ("mdb-1", "mdb-1-20240201"))
         mock_diff.assert_called_once()
+        # A single client and bucket serve the whole run
+        mock_storage.assert_called_once()
+        bucket = mock_storage.return_value.bucket.return_value
+        mock_upload_row_changes.assert_called_once_with(
+            bucket, fake_diff, "mdb-1", "mdb-1-20240101", "mdb-1-20240201"
+        )
         mock_upload.assert_called_once_with(
-            fake_diff.model_dump_json.return_value.encode("utf-8"),
+            bucket,
+            b'{"metadata":{},"summary":{},"file_diffs":[{"file_name":"stops.txt",'
+            b'"row_changes_url":"https://storage.googleapis.com/test-bucket/'
+            b'stops.txt.json.gz"}]}',
             "mdb-1",
             "mdb-1-20240101",
             "mdb-1-20240201",
@@ -231,6 +261,7 @@ class TestGtfsDatasetsComparerRun(unittest.TestCase):
             new_dataset_uuid="curr-uuid",
             changelog_url=changelog_url,
             diff_summary={"total_changes": 42},
+            row_changes_urls=row_changes_urls,
         )
         self.assertEqual(result["changelog_url"], changelog_url)
 
@@ -281,10 +312,17 @@ class TestGtfsDatasetsComparerRun(unittest.TestCase):
     @patch("main.storage.Client")
     @patch("main.GtfsDatasetsComparer._save_changelog_record")
     @patch("main.GtfsDatasetsComparer._upload_changelog")
+    @patch("main.GtfsDatasetsComparer._upload_row_changes", return_value={})
     @patch("main.GtfsDatasetsComparer._extracted_dir")
     @patch("main.GtfsDatasetsComparer._resolve_datasets")
     def test_overwrite_proceeds_when_exists_by_default(
-        self, mock_resolve, mock_extracted_dir, mock_upload, mock_save, mock_storage
+        self,
+        mock_resolve,
+        mock_extracted_dir,
+        _,
+        mock_upload,
+        mock_save,
+        mock_storage,
     ):
         """By default (disallow_overwrite=False) the changelog is overwritten even if it exists."""
         mock_storage.return_value.bucket.return_value.blob.return_value.exists.return_value = (
@@ -297,7 +335,7 @@ class TestGtfsDatasetsComparerRun(unittest.TestCase):
         ]
         fake_diff = MagicMock()
         fake_diff.summary.model_dump.return_value = {}
-        fake_diff.model_dump_json.return_value = "{}"
+        fake_diff.model_dump.return_value = {"file_diffs": []}
         mock_upload.return_value = (
             "https://storage.googleapis.com/test-bucket/changelog.json"
         )
@@ -419,6 +457,129 @@ class TestResolveDatasets(unittest.TestCase):
         with self.assertRaises(ValueError, msg="should reject dataset from wrong feed"):
             self.tracker._resolve_datasets(db_session=mock_session)
 
+    @patch("main.with_db_session", lambda f: f)
+    def test_records_file_hashes(self):
+        mock_session = self._mock_session_with_datasets()
+        base_ds, new_ds = [
+            mock_session.query.return_value.filter.return_value.one_or_none()
+            for _ in range(2)
+        ]
+        base_ds.gtfsfiles = [MagicMock(file_name="stops.txt", hash="h1")]
+        new_ds.gtfsfiles = [MagicMock(file_name="stops.txt", hash="h2")]
+        mock_session.query.return_value.filter.return_value.one_or_none.side_effect = [
+            base_ds,
+            new_ds,
+        ]
+
+        self.tracker._resolve_datasets(db_session=mock_session)
+
+        self.assertEqual(self.tracker.base_file_hashes, {"stops.txt": "h1"})
+        self.assertEqual(self.tracker.new_file_hashes, {"stops.txt": "h2"})
+
+
+class TestDiffChangedFiles(unittest.TestCase):
+    """Tests for the hash-aware diff, against the real diff engine."""
+
+    BASE = {
+        "agency.txt": "agency_id,agency_name,agency_url,agency_timezone\nA,Agency,http://a,UTC\n",
+        "routes.txt": "route_id,agency_id,route_short_name,route_type\nR1,A,1,3\nR2,A,2,3\n",
+        "trips.txt": "route_id,service_id,trip_id\nR1,W,T1\nR2,W,T2\n",
+        "stops.txt": "stop_id,stop_name,stop_lat,stop_lon\nS1,One,1,1\n",
+        "extra.txt": "x\n1\n",
+    }
+    NEW = {
+        **BASE,
+        "routes.txt": "route_id,agency_id,route_short_name,route_type\nR1,A,1b,3\nR3,A,3,3\n",
+        "trips.txt": "route_id,service_id,trip_id\nR1,W,T1\nR3,W,T3\n",
+        "feed_info.txt": "feed_publisher_name,feed_publisher_url,feed_lang\nP,http://p,en\n",
+    }
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.base_dir = self._write("base", self.BASE)
+        self.new_dir = self._write("new", self.NEW)
+        self.tracker = GtfsDatasetsComparer(
+            feed_stable_id="mdb-1",
+            base_dataset_stable_id="mdb-1-20240101",
+            new_dataset_stable_id="mdb-1-20240201",
+            bucket_name="my-bucket",
+            bucket_mount=self.tmp.name,
+            row_changes_cap_per_file=10,
+        )
+        unchanged = {"agency.txt": "h-agency", "stops.txt": "h-stops", "extra.txt": "h"}
+        self.tracker.base_file_hashes = {
+            **unchanged,
+            "routes.txt": "h-routes-1",
+            "trips.txt": "h-trips-1",
+        }
+        self.tracker.new_file_hashes = {
+            **unchanged,
+            "routes.txt": "h-routes-2",
+            "trips.txt": "h-trips-2",
+            "feed_info.txt": None,
+        }
+
+    def _write(self, name, files):
+        directory = os.path.join(self.tmp.name, name)
+        os.makedirs(directory)
+        for file_name, content in files.items():
+            with open(os.path.join(directory, file_name), "w") as f:
+                f.write(content)
+        return directory
+
+    @staticmethod
+    def _comparable(diff):
+        result = diff.model_dump(mode="json")
+        result["metadata"].pop("generated_at")
+        for feed in ("base_feed", "new_feed"):
+            result["metadata"][feed].pop("downloaded_at")
+        return result
+
+    @patch("main.GTFS_DIFF_MAX_WORKERS", 1)
+    def test_diffs_changed_files_only(self):
+        with patch("main.diff_feeds", wraps=diff_feeds) as mock_diff:
+            result = self.tracker._diff_changed_files(self.base_dir, self.new_dir)
+
+        # routes.txt and trips.txt are linked by a foreign key and diffed together
+        self.assertEqual(
+            [call.kwargs["files"] for call in mock_diff.call_args_list],
+            [["feed_info.txt"], ["routes.txt", "trips.txt"]],
+        )
+        self.assertEqual(
+            self._comparable(result),
+            self._comparable(
+                diff_feeds(self.base_dir, self.new_dir, row_changes_cap_per_file=10)
+            ),
+        )
+
+    @patch("main.GTFS_DIFF_MAX_WORKERS", 1)
+    def test_identical_datasets(self):
+        self.tracker.base_file_hashes = {name: "h" for name in self.BASE}
+        self.tracker.new_file_hashes = {name: "h" for name in self.BASE}
+        os.remove(os.path.join(self.new_dir, "feed_info.txt"))
+        with open(os.path.join(self.new_dir, "routes.txt"), "w") as f:
+            f.write(self.BASE["routes.txt"])
+
+        with patch("main.diff_feeds", wraps=diff_feeds) as mock_diff:
+            result = self.tracker._diff_changed_files(self.base_dir, self.new_dir)
+
+        mock_diff.assert_called_once()
+        self.assertEqual(mock_diff.call_args.kwargs["files"], [])
+        self.assertEqual(result.summary.total_changes, 0)
+        self.assertEqual(
+            [file.file_name for file in result.metadata.unsupported_files],
+            ["extra.txt"],
+        )
+
+    def test_group_by_foreign_keys(self):
+        self.assertEqual(
+            group_by_foreign_keys(
+                ["stop_times.txt", "stops.txt", "feed_info.txt", "shapes.txt"]
+            ),
+            [["feed_info.txt"], ["shapes.txt"], ["stop_times.txt", "stops.txt"]],
+        )
+
 
 class TestExtractedDir(unittest.TestCase):
     def setUp(self):
@@ -453,15 +614,13 @@ class TestUploadChangelog(unittest.TestCase):
             bucket_mount="/mobilitydata-datasets",
         )
 
-    @patch("main.storage.Client")
-    def test_uploads_one_blob_and_returns_url(self, mock_storage_cls):
+    def test_uploads_one_blob_and_returns_url(self):
         mock_bucket = MagicMock()
         mock_blob = MagicMock()
-        mock_storage_cls.return_value.bucket.return_value = mock_bucket
         mock_bucket.blob.return_value = mock_blob
 
         url = self.tracker._upload_changelog(
-            b'{"data": 1}', "mdb-1", "mdb-1-20240101", "mdb-1-20240201"
+            mock_bucket, b'{"data": 1}', "mdb-1", "mdb-1-20240101", "mdb-1-20240201"
         )
 
         mock_bucket.blob.assert_called_once_with(
@@ -475,3 +634,97 @@ class TestUploadChangelog(unittest.TestCase):
             "https://storage.googleapis.com/my-bucket/"
             "mdb-1/mdb-1-20240201/mdb-1-20240201_mdb-1-20240101_changelog.json",
         )
+
+
+class TestChangelogArtifacts(unittest.TestCase):
+    """Tests for the split of the changelog into a summary and per-file row changes."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for name, files in (
+            ("base", TestDiffChangedFiles.BASE),
+            ("new", TestDiffChangedFiles.NEW),
+        ):
+            os.makedirs(os.path.join(tmp.name, name))
+            for file_name, content in files.items():
+                with open(os.path.join(tmp.name, name, file_name), "w") as f:
+                    f.write(content)
+        self.diff = diff_feeds(
+            os.path.join(tmp.name, "base"), os.path.join(tmp.name, "new")
+        )
+        self.tracker = GtfsDatasetsComparer(
+            feed_stable_id="mdb-1",
+            base_dataset_stable_id="mdb-1-20240101",
+            new_dataset_stable_id="mdb-1-20240201",
+            bucket_name="my-bucket",
+            bucket_mount="/mobilitydata-datasets",
+        )
+
+    def test_uploads_gzipped_row_changes_per_file(self):
+        blobs = {}
+        bucket = MagicMock()
+        bucket.blob.side_effect = lambda path: blobs.setdefault(path, MagicMock())
+        bucket.list_blobs.return_value = []
+
+        urls = self.tracker._upload_row_changes(
+            bucket, self.diff, "mdb-1", "mdb-1-20240101", "mdb-1-20240201"
+        )
+
+        prefix = "mdb-1/mdb-1-20240201/mdb-1-20240201_mdb-1-20240101_changelog"
+        self.assertEqual(
+            sorted(blobs),
+            [
+                f"{prefix}/routes.txt.json.gz",
+                f"{prefix}/trips.txt.json.gz",
+            ],
+        )
+        self.assertEqual(
+            urls["routes.txt"],
+            f"https://storage.googleapis.com/my-bucket/{prefix}/routes.txt.json.gz",
+        )
+        routes_blob = blobs[f"{prefix}/routes.txt.json.gz"]
+        self.assertEqual(routes_blob.content_encoding, "gzip")
+        routes_blob.make_public.assert_called_once()
+        data = routes_blob.upload_from_string.call_args.args[0]
+        routes_diff = next(
+            d for d in self.diff.file_diffs if d.file_name == "routes.txt"
+        )
+        self.assertEqual(
+            json.loads(gzip.decompress(data)),
+            routes_diff.row_changes.model_dump(mode="json"),
+        )
+
+    def test_deletes_row_changes_of_a_previous_run(self):
+        prefix = "mdb-1/mdb-1-20240201/mdb-1-20240201_mdb-1-20240101_changelog"
+        previous_blobs = []
+        for file_name in ("routes.txt", "stops.txt"):
+            blob = MagicMock()
+            blob.name = f"{prefix}/{file_name}.json.gz"
+            previous_blobs.append(blob)
+        bucket = MagicMock()
+        bucket.list_blobs.return_value = previous_blobs
+
+        urls = self.tracker._upload_row_changes(
+            bucket, self.diff, "mdb-1", "mdb-1-20240101", "mdb-1-20240201"
+        )
+
+        self.assertNotIn("stops.txt", urls)
+        bucket.list_blobs.assert_called_once_with(prefix=f"{prefix}/")
+        bucket.delete_blobs.assert_called_once()
+        self.assertEqual(bucket.delete_blobs.call_args.args[0], [previous_blobs[1]])
+
+    def test_summary_json_points_to_row_changes(self):
+        urls = {"routes.txt": "https://storage.googleapis.com/b/routes.txt.json.gz"}
+
+        summary = json.loads(changelog_summary_json(self.diff, urls))
+
+        self.assertEqual(summary["summary"], self.diff.summary.model_dump(mode="json"))
+        file_diffs = {d["file_name"]: d for d in summary["file_diffs"]}
+        self.assertNotIn("row_changes", file_diffs["routes.txt"])
+        self.assertEqual(
+            file_diffs["routes.txt"]["row_changes_url"], urls["routes.txt"]
+        )
+        self.assertIsNone(file_diffs["trips.txt"]["row_changes_url"])
+        self.assertIsNone(file_diffs["feed_info.txt"]["row_changes_url"])
+        self.assertEqual(file_diffs["routes.txt"]["stats"]["rows_added_count"], 1)
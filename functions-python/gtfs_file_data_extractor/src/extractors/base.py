@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Tuple
 
 import pandas as pd
 from sqlalchemy.orm import Session
@@ -27,6 +27,10 @@ class FileDataExtractor(ABC):
 
     # The GTFS file this extractor handles, e.g. "feed_info.txt".
     file_name: str
+    # The columns and number of rows of the file the extractor needs; the file is
+    # read up to max_rows and only these columns are parsed. None reads everything.
+    columns: Optional[Tuple[str, ...]] = None
+    max_rows: Optional[int] = None
 
     @abstractmethod
     def extract(
@@ -38,7 +42,8 @@ class FileDataExtractor(ABC):
     ) -> None:
         """
         Parse ``df`` (the parsed contents of ``file_name``, whose content hash is
-        ``file_hash``), persist the extracted data and link ``dataset`` to it.
+        ``file_hash``, restricted to ``columns`` and ``max_rows``; declared
+        columns absent from the file are absent from ``df``), persist the extracted data and link ``dataset`` to it.
 
         Implementations must be idempotent: re-running for the same content
         updates the existing data in place rather than duplicating it.
@@ -54,6 +54,9 @@ class FeedInfoExtractor(FileDataExtractor):
     """
 
     file_name = "feed_info.txt"
+    columns = STRING_FIELDS + DATE_FIELDS
+    # feed_info.txt holds a single record.
+    max_rows = 1
 
     @staticmethod
     def _get_by_hash(
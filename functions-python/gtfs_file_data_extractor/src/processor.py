@@ -1,6 +1,5 @@
-import io
 import logging
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 
 import flask
 import pandas as pd
@@ -54,10 +53,40 @@ def load_dataset(dataset_id: str, db_session: Session) -> Gtfsdataset:
     return dataset
 
 
-def read_csv_from_url(file_url: str) -> pd.DataFrame:
-    response = requests.get(file_url)
-    response.raise_for_status()
-    return pd.read_csv(io.StringIO(response.content.decode("utf-8")))
+def read_csv_from_url(
+    file_url: str,
+    columns: Optional[Iterable[str]] = None,
+    max_rows: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Read the CSV file at ``file_url`` while it downloads, keeping only ``columns``
+    (all when None) and the first ``max_rows`` rows (all when None).
+
+    The response is parsed as a stream instead of being decoded to a string first,
+    and the download stops once ``max_rows`` rows are read. Requested columns
+    missing from the file are ignored; header names are compared trimmed, as some
+    producers pad them.
+    """
+    response = requests.get(file_url, stream=True)
+    try:
+        response.raise_for_status()
+        # Let urllib3 undo any Content-Encoding (gzip) while streaming.
+        response.raw.decode_content = True
+        usecols = None
+        if columns is not None:
+            wanted = set(columns)
+            usecols = lambda column: column.strip() in wanted  # noqa: E731
+        df = pd.read_csv(
+            response.raw,
+            usecols=usecols,
+            nrows=max_rows,
+            # utf-8-sig also drops the BOM some producers write before the header.
+            encoding="utf-8-sig",
+        )
+    finally:
+        response.close()
+    df.columns = df.columns.str.strip()
+    return df
 
 
 def get_file_hash(dataset: Gtfsdataset, file_name: str) -> Optional[str]:
@@ -122,7 +151,7 @@ def process_file_data(request: flask.Request, db_session: Session) -> Tuple[str,
             logging.info(message)
             return message, 200
 
-        df = read_csv_from_url(file_url)
+        df = read_csv_from_url(file_url, extractor.columns, extractor.max_rows)
         extractor.extract(df, dataset, file_hash, db_session)
         db_session.commit()
     except Exception as error:
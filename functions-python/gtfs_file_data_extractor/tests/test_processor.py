@@ -1,4 +1,5 @@
 import datetime
+import io
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -50,6 +51,59 @@ class TestParseRequestParameters(unittest.TestCase):
             parse_request_parameters(make_request(None))
 
 
+class TestReadCsvFromUrl(unittest.TestCase):
+    CSV = (
+        "\ufefffeed_publisher_name, feed_lang ,feed_start_date,feed_id\n"
+        "Agency,en,20240101,1\n"
+        "Other,fr,20240201,2\n"
+    )
+
+    def _read(self, requests_mock, **kwargs):
+        from processor import read_csv_from_url
+
+        requests_mock.get.return_value.raw = io.BytesIO(self.CSV.encode("utf-8"))
+        return read_csv_from_url("http://example.com/feed_info.txt", **kwargs)
+
+    @patch("processor.requests")
+    def test_reads_whole_file_by_default(self, requests_mock):
+        df = self._read(requests_mock)
+
+        self.assertEqual(
+            list(df.columns),
+            ["feed_publisher_name", "feed_lang", "feed_start_date", "feed_id"],
+        )
+        self.assertEqual(len(df), 2)
+        requests_mock.get.assert_called_once_with(
+            "http://example.com/feed_info.txt", stream=True
+        )
+        requests_mock.get.return_value.close.assert_called_once()
+
+    @patch("processor.requests")
+    def test_reads_requested_columns_and_rows(self, requests_mock):
+        df = self._read(
+            requests_mock,
+            columns=("feed_publisher_name", "feed_lang", "feed_end_date"),
+            max_rows=1,
+        )
+
+        # feed_end_date is not in the file and is ignored
+        self.assertEqual(list(df.columns), ["feed_publisher_name", "feed_lang"])
+        self.assertEqual(
+            df.to_dict("records"),
+            [{"feed_publisher_name": "Agency", "feed_lang": "en"}],
+        )
+
+    @patch("processor.requests")
+    def test_closes_response_on_http_error(self, requests_mock):
+        from processor import read_csv_from_url
+
+        requests_mock.get.return_value.raise_for_status.side_effect = Exception("404")
+
+        with self.assertRaises(Exception):
+            read_csv_from_url("http://example.com/feed_info.txt")
+        requests_mock.get.return_value.close.assert_called_once()
+
+
 class TestProcessFileData(unittest.TestCase):
     def setUp(self):
         clean_testing_db()
@@ -112,7 +166,7 @@ class TestProcessFileData(unittest.TestCase):
             "feed_publisher_name,feed_start_date,feed_end_date\n"
             "Agency,20240101,20241231\n"
         )
-        requests_mock.get.return_value.content = csv.encode("utf-8")
+        requests_mock.get.return_value.raw = io.BytesIO(csv.encode("utf-8"))
 
         from processor import process_file_data
 
@@ -165,7 +219,9 @@ class TestProcessFileData(unittest.TestCase):
     def test_process_missing_dataset_does_not_trigger_retry(
         self, requests_mock, db_session
     ):
-        requests_mock.get.return_value.content = b"feed_publisher_name\nAgency\n"
+        requests_mock.get.return_value.raw = io.BytesIO(
+            b"feed_publisher_name\nAgency\n"
+        )
 
         from processor import process_file_data
 
@@ -223,7 +279,9 @@ class TestProcessFileData(unittest.TestCase):
         """Unchanged file that was never extracted -> download and extract."""
         source = self._create_dataset_with_file(db_session)
         target = self._create_dataset_with_file(db_session, feed=source.feed)
-        requests_mock.get.return_value.content = b"feed_publisher_name\nAgency\n"
+        requests_mock.get.return_value.raw = io.BytesIO(
+            b"feed_publisher_name\nAgency\n"
+        )
 
         from processor import process_file_data
 
@@ -246,7 +304,7 @@ class TestProcessFileData(unittest.TestCase):
         )
         source.feed_info = Feedinfo(file_hash="h1", feed_publisher_name="Old")
         db_session.commit()
-        requests_mock.get.return_value.content = b"feed_publisher_name\nNew\n"
+        requests_mock.get.return_value.raw = io.BytesIO(b"feed_publisher_name\nNew\n")
 
         from processor import process_file_data
 
@@ -282,7 +340,9 @@ class TestProcessFileData(unittest.TestCase):
     ):
         """Without a hash the data cannot be shared, so this fails loudly - once."""
         dataset = self._create_dataset_with_file(db_session, file_hash=None)
-        requests_mock.get.return_value.content = b"feed_publisher_name\nAgency\n"
+        requests_mock.get.return_value.raw = io.BytesIO(
+            b"feed_publisher_name\nAgency\n"
+        )
 
         from processor import process_file_data
 
@@ -1,6 +1,6 @@
 import logging
 import time
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple
 
 from google.cloud import bigquery
 from google.cloud.bigquery import LoadJobConfig, CopyJobConfig, SourceFormat
@@ -105,6 +105,114 @@ def load_uris_into_staging(
         raise
 
 
+def append_uris_to_table(
+    bigquery_client,
+    table_ref: bigquery.TableReference,
+    source_uris: List[str],
+    on_batch_loaded: Optional[Callable[[List[str]], None]] = None,
+) -> None:
+    """
+    Append NDJSON files to a table in batches (10k URIs max/job). on_batch_loaded is called with
+    the URIs of each batch once its job succeeded, so callers can record what was loaded.
+    """
+    try:
+        for batch_idx, uri_batch in enumerate(
+            chunked(source_uris, MAX_URIS_PER_JOB), start=1
+        ):
+            logging.info(
+                "Appending batch %s to %s (%s files)...",
+                batch_idx,
+                table_ref.table_id,
+                len(uri_batch),
+            )
+            job_cfg = LoadJobConfig(
+                source_format=SourceFormat.NEWLINE_DELIMITED_JSON,
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            )
+            job = bigquery_client.load_table_from_uri(
+                uri_batch, table_ref, job_config=job_cfg
+            )
+            job.result()  # fail fast
+            if on_batch_loaded:
+                on_batch_loaded(uri_batch)
+    except Exception as e:
+        logging.error("Failed to append URIs to table: %s", e)
+        raise
+
+
+def table_path(table_ref: bigquery.TableReference) -> str:
+    """Quoted `project.dataset.table` path of a table, for SQL statements."""
+    return f"`{table_ref.project}.{table_ref.dataset_id}.{table_ref.table_id}`"
+
+
+def column_path(column: str) -> str:
+    """Quoted path of a column, nested columns being dotted, e.g. `summary`.`validatorVersion`."""
+    return ".".join(f"`{part}`" for part in column.split("."))
+
+
+def build_merge_query(
+    staging_table_ref: bigquery.TableReference,
+    target_table_ref: bigquery.TableReference,
+    merge_keys: List[str],
+    columns: List[str],
+    order_field: Optional[str] = None,
+) -> str:
+    """
+    MERGE statement upserting the staging rows into the target on merge_keys, which can be nested
+    columns. Staging rows sharing the same keys are deduplicated first, as a MERGE fails if a
+    target row matches several rows: the row with the greatest order_field is kept.
+    """
+    keys = ", ".join(column_path(key) for key in merge_keys)
+    if order_field:
+        keys += f" ORDER BY {column_path(order_field)} DESC"
+    on_clause = " AND ".join(
+        f"T.{column_path(key)} = S.{column_path(key)}" for key in merge_keys
+    )
+    set_clause = ", ".join(
+        f"`{column}` = S.`{column}`" for column in columns if column not in merge_keys
+    )
+    return (
+        f"MERGE {table_path(target_table_ref)} T\n"
+        f"USING (\n"
+        f"  SELECT * FROM {table_path(staging_table_ref)}\n"
+        f"  WHERE TRUE\n"
+        f"  QUALIFY ROW_NUMBER() OVER (PARTITION BY {keys}) = 1\n"
+        f") S\n"
+        f"ON {on_clause}\n"
+        f"WHEN MATCHED THEN UPDATE SET {set_clause}\n"
+        f"WHEN NOT MATCHED THEN INSERT ROW"
+    )
+
+
+def merge_staging_into_target(
+    bigquery_client,
+    staging_table_ref: bigquery.TableReference,
+    target_table_ref: bigquery.TableReference,
+    merge_keys: List[str],
+    order_field: Optional[str] = None,
+) -> None:
+    """
+    Upsert staging into target on merge_keys: rows of the target with the same keys as a staging
+    row are replaced by it (late-arriving corrections), the other staging rows are inserted.
+    Among staging rows with the same keys, the one with the greatest order_field wins.
+    """
+    try:
+        target_tbl = bigquery_client.get_table(target_table_ref)
+        query = build_merge_query(
+            staging_table_ref,
+            target_table_ref,
+            merge_keys,
+            [field.name for field in target_tbl.schema],
+            order_field,
+        )
+        logging.info("Merging staging into target on %s...", merge_keys)
+        bigquery_client.query(query).result()
+        logging.info("Merge complete.")
+    except Exception as e:
+        logging.error("Failed to merge staging into target: %s", e)
+        raise
+
+
 def publish_staging_to_target(
     bigquery_client,
     staging_table_ref: bigquery.TableReference,
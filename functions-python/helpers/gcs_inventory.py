@@ -0,0 +1,131 @@
+#
+#   MobilityData 2026
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""
+In-memory inventory of the blobs of a GCS bucket.
+
+Checking blobs one by one (`blob.exists()`, `blob.reload()`) costs one metadata request per blob.
+GcsInventory lists the blobs of a whole prefix instead, requesting only the fields it keeps, and
+answers existence and hash lookups from memory. By default a lookup lists the top-level folder of
+the blob name (the feed stable id in the datasets bucket) the first time that folder is seen, so
+looking up every dataset of a feed costs a single paginated listing.
+
+Lookups are thread-safe: concurrent lookups under the same prefix wait for a single listing, while
+different prefixes are listed in parallel.
+"""
+
+import base64
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+# Partial response requested from the objects.list API: only the fields kept in BlobInfo.
+LIST_BLOBS_FIELDS = "items(name,size,md5Hash,updated),nextPageToken"
+
+
+@dataclass(frozen=True)
+class BlobInfo:
+    """Metadata of a listed blob."""
+
+    name: str
+    size: Optional[int]
+    # Base64 encoded MD5, as returned by GCS
+    md5_hash: Optional[str]
+    updated: Optional[datetime]
+
+    @property
+    def md5_hex(self) -> Optional[str]:
+        """MD5 of the blob as a hex string, or None if GCS did not report one."""
+        if not self.md5_hash:
+            return None
+        return base64.b64decode(self.md5_hash).hex()
+
+
+class GcsInventory:
+    """
+    Lazily built map of blob name -> BlobInfo for a bucket.
+
+    Args:
+        bucket: google.cloud.storage Bucket, or any object with a compatible `list_blobs`.
+        whole_bucket: If True, the first lookup lists the whole bucket instead of the blob's
+            top-level folder. Use when most folders of the bucket will be looked up.
+        match_glob: Optional glob passed to `list_blobs` (e.g. "**/*.zip") so blobs that can never
+            be looked up are not listed.
+    """
+
+    def __init__(self, bucket, whole_bucket: bool = False, match_glob: str = None):
+        self._bucket = bucket
+        self._whole_bucket = whole_bucket
+        self._match_glob = match_glob
+        self._blobs: Dict[str, BlobInfo] = {}
+        self._loaded_prefixes: Set[str] = set()
+        self._lock = threading.Lock()
+        self._prefix_locks: Dict[str, threading.Lock] = {}
+
+    def load_prefix(self, prefix: str = "") -> None:
+        """
+        Lists the blobs under prefix (the whole bucket when empty) unless already listed.
+        """
+        if self._is_loaded(prefix):
+            return
+        with self._lock:
+            prefix_lock = self._prefix_locks.setdefault(prefix, threading.Lock())
+        with prefix_lock:
+            if self._is_loaded(prefix):
+                return
+            kwargs = {"prefix": prefix or None, "fields": LIST_BLOBS_FIELDS}
+            if self._match_glob:
+                kwargs["match_glob"] = self._match_glob
+            blobs = {
+                blob.name: BlobInfo(
+                    name=blob.name,
+                    size=blob.size,
+                    md5_hash=blob.md5_hash,
+                    updated=blob.updated,
+                )
+                for blob in self._bucket.list_blobs(**kwargs)
+            }
+            with self._lock:
+                self._blobs.update(blobs)
+                self._loaded_prefixes.add(prefix)
+        logging.debug("Listed %s blobs under prefix '%s'.", len(blobs), prefix)
+
+    def get(self, name: str) -> Optional[BlobInfo]:
+        """Returns the metadata of the blob, or None if it does not exist."""
+        self.load_prefix(self._prefix_of(name))
+        return self._blobs.get(name)
+
+    def exists(self, name: str) -> bool:
+        """Returns True if the blob exists."""
+        return self.get(name) is not None
+
+    def md5_hex(self, name: str) -> Optional[str]:
+        """Returns the MD5 of the blob as a hex string, or None if missing or not reported."""
+        blob = self.get(name)
+        return blob.md5_hex if blob else None
+
+    def _is_loaded(self, prefix: str) -> bool:
+        with self._lock:
+            return prefix in self._loaded_prefixes or "" in self._loaded_prefixes
+
+    def _prefix_of(self, name: str) -> str:
+        """Prefix listed to look up name: its top-level folder, or the whole bucket."""
+        if self._whole_bucket:
+            return ""
+        folder, separator, _ = name.partition("/")
+        return f"{folder}{separator}" if separator else name
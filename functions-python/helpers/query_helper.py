@@ -18,6 +18,11 @@ from shared.database_gen.sqlacodegen_models import (
 
 feed_mapping = {"gtfs_rt": Gtfsrealtimefeed, "gtfs": Gtfsfeed, "gbfs": Gbfsfeed}
 
+# get_feeds_query sort values: alphabetical (provider, stable_id) or, when a
+# search_query is given, best trigram similarity first.
+FEEDS_SORT_PROVIDER = "provider"
+FEEDS_SORT_RELEVANCE = "relevance"
+
 
 def get_model(data_type: str | None) -> Type[Feed]:
     """
@@ -73,6 +78,15 @@ def get_eager_loading_options(model: Type[Feed]):
         ]
 
 
+def escape_like(value: str, escape: str = "\\") -> str:
+    """Escape the LIKE wildcards (``%`` and ``_``) of a user supplied search term."""
+    return (
+        value.replace(escape, escape + escape)
+        .replace("%", escape + "%")
+        .replace("_", escape + "_")
+    )
+
+
 def get_feeds_query(
     db_session: Session,
     search_query: str | None = None,
@@ -81,10 +95,16 @@ def get_feeds_query(
     limit: int | None = None,
     offset: int | None = None,
     model: Type[Feed | Gtfsfeed | Gtfsrealtimefeed] | None = Feed,
+    sort: str | None = None,
+    with_total: bool = False,
 ) -> Query:
     """
     Build a consolidated query for feeds with filtering options.
 
+    The search_query filter is an ILIKE '%term%' on stable_id, feed_name and provider,
+    applied to the bare columns so the trigram GIN indexes on feed
+    (idx_feed_*_trgm) are used.
+
     Args:
         db_session: SQLAlchemy session
         search_query: Optional general search query
@@ -92,6 +112,10 @@ def get_feeds_query(
         data_type: Optional filter for feed type (gtfs or gtfs_rt)
         limit: Maximum number of items to return
         offset: Number of items to skip
+        sort: FEEDS_SORT_PROVIDER (default) or FEEDS_SORT_RELEVANCE to order by
+            trigram similarity to search_query (ignored without a search_query)
+        with_total: When True, each row is a (feed, total) tuple where total is the
+            number of feeds matching the filters, regardless of limit and offset
 
     Returns:
         Query: SQLAlchemy query object
@@ -116,17 +140,22 @@ def get_feeds_query(
             conditions.append(model.operational_status == operation_status)
             logging.info("Added operational_status filter: %s", operation_status)
 
-        if search_query and search_query.strip():
-            search_pattern = f"%{search_query.strip()}%"
+        search_term = search_query.strip() if search_query else ""
+        if search_term:
+            search_pattern = f"%{escape_like(search_term)}%"
             conditions.append(
                 or_(
-                    model.stable_id.ilike(search_pattern),
-                    model.feed_name.ilike(search_pattern),
-                    model.provider.ilike(search_pattern),
+                    model.stable_id.ilike(search_pattern, escape="\\"),
+                    model.feed_name.ilike(search_pattern, escape="\\"),
+                    model.provider.ilike(search_pattern, escape="\\"),
                 )
             )
             logging.info("Added search_query filter: %s", search_query)
-        query = db_session.query(model)
+        if with_total:
+            # The window is evaluated over every filtered row, before LIMIT/OFFSET.
+            query = db_session.query(model, func.count().over().label("total"))
+        else:
+            query = db_session.query(model)
         logging.info("Created base query with model %s", model.__name__)
 
         eager_loading_options = get_eager_loading_options(model)
@@ -136,7 +165,15 @@ def get_feeds_query(
             query = query.filter(and_(*conditions))
             logging.info("Applied conditions: %s", conditions)
 
-        query = query.order_by(model.provider, model.stable_id)
+        if sort == FEEDS_SORT_RELEVANCE and search_term:
+            relevance = func.greatest(
+                func.similarity(model.stable_id, search_term),
+                func.similarity(model.feed_name, search_term),
+                func.similarity(model.provider, search_term),
+            )
+            query = query.order_by(relevance.desc(), model.provider, model.stable_id)
+        else:
+            query = query.order_by(model.provider, model.stable_id)
 
         if offset is not None:
             query = query.offset(offset)
@@ -151,6 +188,44 @@ def get_feeds_query(
         raise
 
 
+def get_feeds_page(
+    db_session: Session,
+    search_query: str | None = None,
+    operation_status: str | None = None,
+    data_type: str | None = None,
+    limit: int | None = None,
+    offset: int | None = None,
+    model: Type[Feed | Gtfsfeed | Gtfsrealtimefeed] | None = Feed,
+    sort: str | None = None,
+) -> tuple[list[Feed], int]:
+    """
+    Get a page of feeds and the total number of matching feeds with a single query.
+
+    Same filters as get_feeds_query. The total comes from a count(*) OVER () window
+    on the page query, so the matching feeds are read once instead of once for the
+    count and once for the page. A separate count is only issued when the page is
+    empty past the first row (offset beyond the last feed).
+
+    Returns:
+        A (feeds, total) tuple.
+    """
+    filters = dict(
+        db_session=db_session,
+        search_query=search_query,
+        operation_status=operation_status,
+        data_type=data_type,
+        model=model,
+    )
+    rows = get_feeds_query(
+        **filters, limit=limit, offset=offset, sort=sort, with_total=True
+    ).all()
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+    if not offset:
+        return [], 0
+    return [], get_feeds_query(**filters).count()
+
+
 def get_datasets_with_missing_reports_query(
     db_session: Session,
     filter_after: datetime | None = None,
@@ -33,6 +33,10 @@ Usage:
         execute_workflow(...)
         tracker.mark_triggered(dataset_id, execution_ref=execution.name)
 
+    # Loops over many entities should use the bulk variants, one statement each:
+    to_trigger = tracker.filter_untriggered(dataset_ids)
+    tracker.mark_triggered_many(to_trigger, execution_refs={...})
+
     # Later, in process_validation_report:
     tracker.mark_completed(dataset_id)
 
@@ -46,9 +50,21 @@ import os
 import re
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
-
-from sqlalchemy.dialects.postgresql import insert
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import (
+    Text,
+    any_,
+    bindparam,
+    cast,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert
 from sqlalchemy.orm import Session
 
 from shared.database_gen.sqlacodegen_models import TaskExecutionLog, TaskRun
@@ -174,16 +190,31 @@ class TaskExecutionTracker:
         Return True if an execution log entry already exists for this entity
         with status triggered or completed (i.e. should not be re-triggered).
         """
-        query = self.db_session.query(TaskExecutionLog).filter(
-            TaskExecutionLog.task_name == self.task_name,
-            TaskExecutionLog.run_id == self.run_id,
-            TaskExecutionLog.status.in_([STATUS_TRIGGERED, STATUS_COMPLETED]),
+        return not self.filter_untriggered([entity_id])
+
+    def filter_untriggered(
+        self, entity_ids: Iterable[Optional[str]]
+    ) -> list[Optional[str]]:
+        """
+        Return the entity_ids that are not yet triggered or completed for this run,
+        in input order and without duplicates. Bulk counterpart of is_triggered,
+        answered with a single query.
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        if not entity_ids:
+            return []
+        rows = (
+            self.db_session.query(TaskExecutionLog.entity_id)
+            .filter(
+                TaskExecutionLog.task_name == self.task_name,
+                TaskExecutionLog.run_id == self.run_id,
+                TaskExecutionLog.status.in_([STATUS_TRIGGERED, STATUS_COMPLETED]),
+                self._entity_id_condition(entity_ids),
+            )
+            .all()
         )
-        if entity_id is None:
-            query = query.filter(TaskExecutionLog.entity_id.is_(None))
-        else:
-            query = query.filter(TaskExecutionLog.entity_id == entity_id)
-        return query.first() is not None
+        tracked = {row.entity_id for row in rows}
+        return [entity_id for entity_id in entity_ids if entity_id not in tracked]
 
     def mark_triggered(
         self,
@@ -196,62 +227,121 @@ class TaskExecutionTracker:
         Idempotent: if a row already exists for this (task_name, entity_id, run_id),
         it updates execution_ref and metadata.
         """
-        task_run_id = self._resolve_task_run_id()
-        stmt = (
-            insert(TaskExecutionLog)
-            .values(
-                task_run_id=task_run_id,
-                task_name=self.task_name,
-                entity_id=entity_id,
-                run_id=self.run_id,
-                status=STATUS_TRIGGERED,
-                execution_ref=execution_ref,
-                metadata_=metadata,
-            )
-            .on_conflict_do_update(
-                constraint="task_execution_log_task_name_entity_id_run_id_key",
-                set_={
-                    "execution_ref": execution_ref,
-                    "metadata": metadata,
-                    "status": STATUS_TRIGGERED,
-                },
+        self.mark_triggered_many(
+            [entity_id],
+            execution_refs={entity_id: execution_ref},
+            metadata={entity_id: metadata},
+        )
+
+    def mark_triggered_many(
+        self,
+        entity_ids: Iterable[Optional[str]],
+        execution_refs: Optional[dict[Optional[str], Optional[str]]] = None,
+        metadata: Optional[dict[Optional[str], Optional[dict[str, Any]]]] = None,
+    ) -> None:
+        """
+        Bulk counterpart of mark_triggered: upserts one triggered row per entity with a
+        single INSERT ... SELECT FROM unnest(...) ON CONFLICT DO UPDATE.
+
+        execution_refs and metadata are optional maps of entity_id -> value; entities
+        missing from them get NULL.
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        if not entity_ids:
+            return
+        execution_refs = execution_refs or {}
+        metadata = metadata or {}
+        entries = (
+            func.unnest(
+                bindparam("entity_ids", entity_ids, type_=ARRAY(Text)),
+                bindparam(
+                    "execution_refs",
+                    [execution_refs.get(entity_id) for entity_id in entity_ids],
+                    type_=ARRAY(Text),
+                ),
+                cast(
+                    bindparam(
+                        "metadata",
+                        [
+                            (
+                                json.dumps(metadata[entity_id])
+                                if metadata.get(entity_id) is not None
+                                else None
+                            )
+                            for entity_id in entity_ids
+                        ],
+                        type_=ARRAY(Text),
+                    ),
+                    ARRAY(JSONB),
+                ),
             )
+            .table_valued("entity_id", "execution_ref", "metadata")
+            .render_derived(name="entries")
+        )
+        task_run_id = self._resolve_task_run_id()
+        stmt = insert(TaskExecutionLog).from_select(
+            [
+                TaskExecutionLog.task_run_id,
+                TaskExecutionLog.task_name,
+                TaskExecutionLog.entity_id,
+                TaskExecutionLog.run_id,
+                TaskExecutionLog.status,
+                TaskExecutionLog.execution_ref,
+                TaskExecutionLog.metadata_,
+            ],
+            select(
+                cast(task_run_id, TaskExecutionLog.task_run_id.type),
+                literal(self.task_name),
+                entries.c.entity_id,
+                literal(self.run_id),
+                literal(STATUS_TRIGGERED),
+                entries.c.execution_ref,
+                entries.c.metadata,
+            ),
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="task_execution_log_task_name_entity_id_run_id_key",
+            set_={
+                "execution_ref": stmt.excluded.execution_ref,
+                "metadata": literal_column("excluded.metadata"),
+                "status": STATUS_TRIGGERED,
+            },
         )
         self.db_session.execute(stmt)
         self.db_session.flush()
         logging.debug(
-            "TaskExecutionTracker: marked triggered entity=%s run=%s/%s ref=%s",
-            entity_id,
+            "TaskExecutionTracker: marked %s entities triggered run=%s/%s",
+            len(entity_ids),
             self.task_name,
             self.run_id,
-            execution_ref,
         )
 
     def mark_completed(self, entity_id: Optional[str]) -> None:
         """Mark an entity execution as completed."""
-        self._update_entity_status(entity_id, STATUS_COMPLETED)
+        self.mark_completed_many([entity_id])
+
+    def mark_completed_many(self, entity_ids: Iterable[Optional[str]]) -> None:
+        """Mark many entity executions as completed."""
+        self._update_entity_statuses(entity_ids, STATUS_COMPLETED)
 
     def mark_failed(
         self, entity_id: Optional[str], error_message: Optional[str] = None
     ) -> None:
         """Mark an entity execution as failed, optionally storing an error message."""
-        query = self.db_session.query(TaskExecutionLog).filter(
-            TaskExecutionLog.task_name == self.task_name,
-            TaskExecutionLog.run_id == self.run_id,
-        )
-        if entity_id is None:
-            query = query.filter(TaskExecutionLog.entity_id.is_(None))
-        else:
-            query = query.filter(TaskExecutionLog.entity_id == entity_id)
-        query.update(
-            {
-                "status": STATUS_FAILED,
-                "error_message": error_message,
-                "completed_at": datetime.now(timezone.utc),
-            },
-            synchronize_session=False,
+        self.mark_failed_many([entity_id], error_messages={entity_id: error_message})
+
+    def mark_failed_many(
+        self,
+        entity_ids: Iterable[Optional[str]],
+        error_messages: Optional[dict[Optional[str], Optional[str]]] = None,
+    ) -> None:
+        """
+        Mark many entity executions as failed. error_messages is an optional map of
+        entity_id -> error message; entities missing from it get NULL.
+        """
+        self._update_entity_statuses(
+            entity_ids, STATUS_FAILED, error_messages=error_messages or {}
         )
-        self.db_session.flush()
 
     # ------------------------------------------------------------------
     # Reporting
@@ -442,17 +532,80 @@ class TaskExecutionTracker:
             self.task_run_id = task_run.id
         return self.task_run_id
 
-    def _update_entity_status(self, entity_id: Optional[str], status: str) -> None:
-        query = self.db_session.query(TaskExecutionLog).filter(
-            TaskExecutionLog.task_name == self.task_name,
-            TaskExecutionLog.run_id == self.run_id,
-        )
-        if entity_id is None:
-            query = query.filter(TaskExecutionLog.entity_id.is_(None))
-        else:
-            query = query.filter(TaskExecutionLog.entity_id == entity_id)
-        query.update(
-            {"status": status, "completed_at": datetime.now(timezone.utc)},
-            synchronize_session=False,
-        )
+    def _entity_id_condition(self, entity_ids: list[Optional[str]]):
+        """
+        WHERE clause matching the given entity_ids, None included. Non-null ids are
+        sent as a single array parameter so the query does not grow with the list.
+        """
+        ids = [entity_id for entity_id in entity_ids if entity_id is not None]
+        conditions = []
+        if ids:
+            conditions.append(
+                TaskExecutionLog.entity_id
+                == any_(bindparam("entity_ids", ids, type_=ARRAY(Text)))
+            )
+        if len(ids) < len(entity_ids):
+            conditions.append(TaskExecutionLog.entity_id.is_(None))
+        return or_(*conditions)
+
+    def _update_entity_statuses(
+        self,
+        entity_ids: Iterable[Optional[str]],
+        status: str,
+        error_messages: Optional[dict[Optional[str], Optional[str]]] = None,
+    ) -> None:
+        """
+        Set status and completed_at on the already tracked rows of entity_ids, and
+        error_message when error_messages is given. Entities without a row are left
+        untracked, so that completions reported for entities outside the run do not
+        count towards it.
+
+        Rows are matched against an unnest of the entity ids (and their error
+        messages) in a single UPDATE ... FROM; a None entity_id, which cannot be
+        matched by equality, is updated separately.
+        """
+        entity_ids = list(dict.fromkeys(entity_ids))
+        if not entity_ids:
+            return
+        completed_at = datetime.now(timezone.utc)
+        ids = [entity_id for entity_id in entity_ids if entity_id is not None]
+        if ids:
+            columns = ["entity_id"]
+            arrays = [bindparam("entity_ids", ids, type_=ARRAY(Text))]
+            if error_messages is not None:
+                columns.append("error_message")
+                arrays.append(
+                    bindparam(
+                        "error_messages",
+                        [error_messages.get(entity_id) for entity_id in ids],
+                        type_=ARRAY(Text),
+                    )
+                )
+            entries = (
+                func.unnest(*arrays)
+                .table_valued(*columns)
+                .render_derived(name="entries")
+            )
+            values = {"status": status, "completed_at": completed_at}
+            if error_messages is not None:
+                values["error_message"] = entries.c.error_message
+            self.db_session.execute(
+                update(TaskExecutionLog)
+                .where(
+                    TaskExecutionLog.task_name == self.task_name,
+                    TaskExecutionLog.run_id == self.run_id,
+                    TaskExecutionLog.entity_id == entries.c.entity_id,
+                )
+                .values(values)
+                .execution_options(synchronize_session=False)
+            )
+        if len(ids) < len(entity_ids):
+            values = {"status": status, "completed_at": completed_at}
+            if error_messages is not None:
+                values["error_message"] = error_messages.get(None)
+            self.db_session.query(TaskExecutionLog).filter(
+                TaskExecutionLog.task_name == self.task_name,
+                TaskExecutionLog.run_id == self.run_id,
+                TaskExecutionLog.entity_id.is_(None),
+            ).update(values, synchronize_session=False)
         self.db_session.flush()
@@ -11,6 +11,9 @@ from big_query_helpers import (
     publish_staging_to_target,
     cleanup_success,
     cleanup_failure,
+    append_uris_to_table,
+    build_merge_query,
+    merge_staging_into_target,
 )
 
 
@@ -174,6 +177,112 @@ class TestPublishStagingToTarget(unittest.TestCase):
         copy_job.result.assert_called_once()
 
 
+class TestAppendUrisToTable(unittest.TestCase):
+    def test_append_uris_to_table_reports_each_batch(self):
+        client = MagicMock()
+        table_ref = DummyTableReference("project", "dataset", "target")
+        loaded_batches = []
+
+        with patch("big_query_helpers.MAX_URIS_PER_JOB", 2):
+            append_uris_to_table(
+                client,
+                table_ref,
+                ["a", "b", "c"],
+                on_batch_loaded=loaded_batches.append,
+            )
+
+        self.assertEqual(loaded_batches, [["a", "b"], ["c"]])
+        self.assertEqual(client.load_table_from_uri.call_count, 2)
+        for call in client.load_table_from_uri.call_args_list:
+            self.assertEqual(
+                call.kwargs["job_config"].write_disposition, "WRITE_APPEND"
+            )
+
+    def test_append_uris_to_table_stops_on_failure(self):
+        client = MagicMock()
+        client.load_table_from_uri.return_value.result.side_effect = RuntimeError(
+            "boom"
+        )
+        loaded_batches = []
+
+        with self.assertRaises(RuntimeError):
+            append_uris_to_table(
+                client,
+                DummyTableReference("project", "dataset", "target"),
+                ["a"],
+                on_batch_loaded=loaded_batches.append,
+            )
+
+        self.assertEqual(loaded_batches, [])
+
+
+class TestMergeStagingIntoTarget(unittest.TestCase):
+    def test_build_merge_query(self):
+        query = build_merge_query(
+            DummyTableReference("project", "dataset", "staging"),
+            DummyTableReference("project", "dataset", "target"),
+            ["feedId", "datasetId"],
+            ["feedId", "datasetId", "summary"],
+        )
+
+        self.assertEqual(
+            query,
+            "MERGE `project.dataset.target` T\n"
+            "USING (\n"
+            "  SELECT * FROM `project.dataset.staging`\n"
+            "  WHERE TRUE\n"
+            "  QUALIFY ROW_NUMBER() OVER (PARTITION BY `feedId`, `datasetId`) = 1\n"
+            ") S\n"
+            "ON T.`feedId` = S.`feedId` AND T.`datasetId` = S.`datasetId`\n"
+            "WHEN MATCHED THEN UPDATE SET `summary` = S.`summary`\n"
+            "WHEN NOT MATCHED THEN INSERT ROW",
+        )
+
+    def test_build_merge_query_nested_keys_and_order(self):
+        query = build_merge_query(
+            DummyTableReference("project", "dataset", "staging"),
+            DummyTableReference("project", "dataset", "target"),
+            ["feedId", "summary.validatorVersion"],
+            ["feedId", "summary", "validatedAt"],
+            order_field="validatedAt",
+        )
+
+        self.assertIn(
+            "QUALIFY ROW_NUMBER() OVER (PARTITION BY `feedId`, "
+            "`summary`.`validatorVersion` ORDER BY `validatedAt` DESC) = 1\n",
+            query,
+        )
+        self.assertIn(
+            "ON T.`feedId` = S.`feedId` AND "
+            "T.`summary`.`validatorVersion` = S.`summary`.`validatorVersion`\n",
+            query,
+        )
+        self.assertIn(
+            "UPDATE SET `summary` = S.`summary`, `validatedAt` = S.`validatedAt`",
+            query,
+        )
+
+    def test_merge_staging_into_target_uses_target_columns(self):
+        client = MagicMock()
+        client.get_table.return_value.schema = [
+            SimpleNamespace(name="feedId"),
+            SimpleNamespace(name="summary"),
+        ]
+        target_ref = DummyTableReference("project", "dataset", "target")
+
+        merge_staging_into_target(
+            client,
+            DummyTableReference("project", "dataset", "staging"),
+            target_ref,
+            ["feedId"],
+        )
+
+        client.get_table.assert_called_once_with(target_ref)
+        query = client.query.call_args[0][0]
+        self.assertIn("UPDATE SET `summary` = S.`summary`", query)
+        client.query.return_value.result.assert_called_once_with()
+
+
 class TestCleanup(unittest.TestCase):
     def test_cleanup_success_removes_table_and_blobs(self):
         client = MagicMock()
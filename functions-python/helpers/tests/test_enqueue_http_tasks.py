@@ -0,0 +1,150 @@
+#
+#   MobilityData 2026
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+from datetime import datetime, timezone
+
+from google.api_core import exceptions
+
+from shared.common.gcp_utils import (
+    MAX_TASK_NAME_LENGTH,
+    HttpTaskSpec,
+    deterministic_task_name,
+    enqueue_http_tasks,
+)
+from test_shared.test_utils.fake_cloud_tasks import FakeCloudTasksClient
+
+
+def _spec(name: str, queue: str = "queue") -> HttpTaskSpec:
+    return HttpTaskSpec(
+        url="https://example.com/function",
+        body=b'{"id": "%s"}' % name.encode(),
+        queue_name=queue,
+        task_name=name,
+    )
+
+
+class TestEnqueueHttpTasks(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeCloudTasksClient()
+
+    def _enqueue(self, specs, **kwargs):
+        return enqueue_http_tasks(
+            specs,
+            client=self.client,
+            project_id="project",
+            gcp_region="region",
+            backoff_seconds=0,
+            **kwargs,
+        )
+
+    def test_results_follow_spec_order(self):
+        specs = [_spec(f"task-{i}") for i in range(20)]
+
+        results = self._enqueue(specs, max_workers=4)
+
+        self.assertEqual([result.spec for result in results], specs)
+        self.assertTrue(all(result.status == "created" for result in results))
+        self.assertEqual(
+            sorted(self.client.task_names()), sorted(f"task-{i}" for i in range(20))
+        )
+        self.assertEqual(
+            self.client.tasks[0].name,
+            f"projects/project/locations/region/queues/queue/tasks/"
+            f"{self.client.task_names()[0]}",
+        )
+
+    def test_existing_name_is_deduplicated(self):
+        self._enqueue([_spec("task-1")])
+
+        (result,) = self._enqueue([_spec("task-1")])
+
+        self.assertEqual(result.status, "already_exists")
+        self.assertTrue(result.ok)
+        self.assertEqual(len(self.client.tasks), 1)
+
+    def test_transient_errors_are_retried(self):
+        self.client.fail_next(
+            exceptions.ServiceUnavailable("unavailable"),
+            exceptions.DeadlineExceeded("deadline"),
+        )
+
+        (result,) = self._enqueue([_spec("task-1")], max_attempts=3)
+
+        self.assertEqual(result.status, "created")
+        self.assertEqual(result.attempts, 3)
+
+    def test_gives_up_after_max_attempts(self):
+        self.client.fail_next(*[exceptions.TooManyRequests("throttled")] * 2)
+
+        (result,) = self._enqueue([_spec("task-1")], max_attempts=2)
+
+        self.assertEqual(result.status, "failed")
+        self.assertFalse(result.ok)
+        self.assertIn("throttled", result.error)
+        self.assertEqual(self.client.tasks, [])
+
+    def test_permanent_error_is_not_retried(self):
+        self.client.fail_next(exceptions.PermissionDenied("denied"))
+
+        results = self._enqueue([_spec("task-1"), _spec("task-2")], max_workers=1)
+
+        self.assertEqual([result.status for result in results], ["failed", "created"])
+        self.assertEqual(results[0].attempts, 1)
+
+    def test_schedule_time_and_unnamed_tasks(self):
+        spec = HttpTaskSpec(
+            url="https://example.com/function",
+            body=b"{}",
+            queue_name="queue",
+            schedule_time=datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+        )
+
+        (result,) = self._enqueue([spec])
+
+        self.assertEqual(result.status, "created")
+        task = self.client.tasks[0]
+        self.assertFalse(task.name)
+        self.assertEqual(task.schedule_time.timestamp(), spec.schedule_time.timestamp())
+
+    def test_no_specs(self):
+        self.assertEqual(self._enqueue([]), [])
+        self.assertEqual(self.client.create_calls, 0)
+
+
+class TestDeterministicTaskName(unittest.TestCase):
+    def test_same_parts_same_name(self):
+        self.assertEqual(
+            deterministic_task_name("pmtiles", "mdb-1-202601010000"),
+            deterministic_task_name("pmtiles", "mdb-1-202601010000"),
+        )
+
+    def test_invalid_characters_replaced(self):
+        self.assertEqual(
+            deterministic_task_name("file", "ds.1", "feed_info.txt"),
+            "file-ds-1-feed_info-txt",
+        )
+
+    def test_long_names_are_truncated_and_unique(self):
+        first = deterministic_task_name("x" * 600, 1)
+        second = deterministic_task_name("x" * 600, 2)
+
+        self.assertEqual(len(first), MAX_TASK_NAME_LENGTH)
+        self.assertNotEqual(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
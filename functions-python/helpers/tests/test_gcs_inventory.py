@@ -0,0 +1,103 @@
+#
+#   MobilityData 2026
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from gcs_inventory import GcsInventory, LIST_BLOBS_FIELDS
+from test_shared.test_utils.fake_gcs import FakeBucket
+
+
+class TestGcsInventory(unittest.TestCase):
+    def setUp(self):
+        self.bucket = FakeBucket()
+        self.updated = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.bucket.add_blob(
+            "feed-1/ds-1/ds-1.zip", content=b"test", updated=self.updated
+        )
+        self.bucket.add_blob("feed-1/ds-1/report.json", content=b"{}")
+        self.bucket.add_blob("feed-2/ds-2/ds-2.zip", content=b"other")
+
+    def test_get_returns_listed_metadata(self):
+        inventory = GcsInventory(self.bucket)
+
+        blob = inventory.get("feed-1/ds-1/ds-1.zip")
+
+        self.assertEqual(blob.size, 4)
+        self.assertEqual(blob.updated, self.updated)
+        self.assertEqual(blob.md5_hex, "098f6bcd4621d373cade4e832627b4f6")
+        self.assertEqual(
+            inventory.md5_hex("feed-1/ds-1/ds-1.zip"),
+            "098f6bcd4621d373cade4e832627b4f6",
+        )
+
+    def test_lists_top_level_folder_once(self):
+        inventory = GcsInventory(self.bucket)
+
+        self.assertTrue(inventory.exists("feed-1/ds-1/ds-1.zip"))
+        self.assertTrue(inventory.exists("feed-1/ds-1/report.json"))
+        self.assertFalse(inventory.exists("feed-1/ds-9/ds-9.zip"))
+
+        self.assertEqual(
+            self.bucket.list_calls,
+            [{"prefix": "feed-1/", "match_glob": None, "fields": LIST_BLOBS_FIELDS}],
+        )
+
+        self.assertTrue(inventory.exists("feed-2/ds-2/ds-2.zip"))
+        self.assertEqual(len(self.bucket.list_calls), 2)
+
+    def test_whole_bucket_lists_once(self):
+        inventory = GcsInventory(self.bucket, whole_bucket=True)
+
+        self.assertTrue(inventory.exists("feed-1/ds-1/ds-1.zip"))
+        self.assertTrue(inventory.exists("feed-2/ds-2/ds-2.zip"))
+        self.assertFalse(inventory.exists("feed-3/ds-3/ds-3.zip"))
+
+        self.assertEqual(len(self.bucket.list_calls), 1)
+        self.assertIsNone(self.bucket.list_calls[0]["prefix"])
+
+    def test_match_glob_restricts_listing(self):
+        inventory = GcsInventory(self.bucket, match_glob="**/*.zip")
+
+        self.assertTrue(inventory.exists("feed-1/ds-1/ds-1.zip"))
+        self.assertFalse(inventory.exists("feed-1/ds-1/report.json"))
+        self.assertEqual(self.bucket.list_calls[0]["match_glob"], "**/*.zip")
+
+    def test_concurrent_lookups_list_each_prefix_once(self):
+        inventory = GcsInventory(self.bucket)
+        names = ["feed-1/ds-1/ds-1.zip", "feed-2/ds-2/ds-2.zip"] * 20
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            found = list(executor.map(inventory.exists, names))
+
+        self.assertTrue(all(found))
+        self.assertEqual(
+            sorted(call["prefix"] for call in self.bucket.list_calls),
+            ["feed-1/", "feed-2/"],
+        )
+
+    def test_missing_md5(self):
+        self.bucket.add_blob("feed-3/ds-3/ds-3.zip").md5_hash = None
+        inventory = GcsInventory(self.bucket)
+
+        self.assertTrue(inventory.exists("feed-3/ds-3/ds-3.zip"))
+        self.assertIsNone(inventory.md5_hex("feed-3/ds-3/ds-3.zip"))
+        self.assertIsNone(inventory.md5_hex("feed-3/ds-4/ds-4.zip"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -84,31 +84,51 @@ class TestTaskExecutionTrackerStartRun(unittest.TestCase):
 class TestTaskExecutionTrackerIsTriggered(unittest.TestCase):
     def test_returns_true_when_triggered_row_exists(self):
         tracker, session = _make_tracker()
-        existing_row = MagicMock()
-        session.query.return_value.filter.return_value.filter.return_value.first.return_value = (
-            existing_row
-        )
+        session.query.return_value.filter.return_value.all.return_value = [
+            MagicMock(entity_id="ds-123")
+        ]
 
         result = tracker.is_triggered("ds-123")
         self.assertTrue(result)
 
     def test_returns_false_when_no_row(self):
         tracker, session = _make_tracker()
-        session.query.return_value.filter.return_value.filter.return_value.first.return_value = (
-            None
-        )
+        session.query.return_value.filter.return_value.all.return_value = []
 
         result = tracker.is_triggered("ds-999")
         self.assertFalse(result)
 
     def test_handles_none_entity_id(self):
         tracker, session = _make_tracker()
-        session.query.return_value.filter.return_value.filter.return_value.first.return_value = (
-            None
-        )
+        session.query.return_value.filter.return_value.all.return_value = []
 
         result = tracker.is_triggered(None)
         self.assertFalse(result)
+        condition = session.query.return_value.filter.call_args[0][-1]
+        self.assertIn("entity_id IS NULL", str(condition))
+
+
+class TestTaskExecutionTrackerFilterUntriggered(unittest.TestCase):
+    def test_returns_untracked_ids_in_order_with_one_query(self):
+        tracker, session = _make_tracker()
+        session.query.return_value.filter.return_value.all.return_value = [
+            MagicMock(entity_id="ds-2")
+        ]
+
+        result = tracker.filter_untriggered(["ds-3", "ds-2", "ds-1", "ds-3"])
+
+        self.assertEqual(result, ["ds-3", "ds-1"])
+        session.query.assert_called_once()
+        condition = session.query.return_value.filter.call_args[0][-1]
+        self.assertEqual(
+            condition.compile().params["entity_ids"], ["ds-3", "ds-2", "ds-1"]
+        )
+
+    def test_empty_list_skips_query(self):
+        tracker, session = _make_tracker()
+
+        self.assertEqual(tracker.filter_untriggered([]), [])
+        session.query.assert_not_called()
 
 
 class TestTaskExecutionTrackerMarkTriggered(unittest.TestCase):
@@ -128,34 +148,95 @@ class TestTaskExecutionTrackerMarkTriggered(unittest.TestCase):
         tracker.mark_triggered("ds-1", metadata={"feed_id": "f-1"})
 
         session.execute.assert_called_once()
+        params = session.execute.call_args[0][0].compile().params
+        self.assertEqual(params["metadata"], ['{"feed_id": "f-1"}'])
+
+    def test_mark_triggered_many_upserts_in_one_statement(self):
+        tracker, session = _make_tracker()
+        tracker.task_run_id = uuid.uuid4()
+
+        tracker.mark_triggered_many(
+            ["ds-1", "ds-2", "ds-1"],
+            execution_refs={"ds-2": "projects/x/executions/def"},
+            metadata={"ds-1": {"feed_id": "f-1"}},
+        )
+
+        session.execute.assert_called_once()
+        stmt = session.execute.call_args[0][0]
+        compiled = str(stmt)
+        self.assertIn("unnest", compiled)
+        self.assertIn("DO UPDATE SET", compiled)
+        params = stmt.compile().params
+        self.assertEqual(params["entity_ids"], ["ds-1", "ds-2"])
+        self.assertEqual(params["execution_refs"], [None, "projects/x/executions/def"])
+        self.assertEqual(params["metadata"], ['{"feed_id": "f-1"}', None])
+
+    def test_mark_triggered_many_empty_list(self):
+        tracker, session = _make_tracker()
+
+        tracker.mark_triggered_many([])
+
+        session.execute.assert_not_called()
 
 
 class TestTaskExecutionTrackerMarkCompleted(unittest.TestCase):
     def test_mark_completed_updates_status(self):
         tracker, session = _make_tracker()
-        query_mock = MagicMock()
-        session.query.return_value.filter.return_value.filter.return_value = query_mock
 
         tracker.mark_completed("ds-1")
 
+        session.execute.assert_called_once()
+        stmt = session.execute.call_args[0][0]
+        self.assertTrue(str(stmt).startswith("UPDATE task_execution_log"))
+        params = stmt.compile().params
+        self.assertEqual(params["status"], STATUS_COMPLETED)
+        self.assertIn("completed_at", params)
+        self.assertEqual(params["entity_ids"], ["ds-1"])
+
+    def test_mark_completed_many_updates_in_one_statement(self):
+        tracker, session = _make_tracker()
+
+        tracker.mark_completed_many(["ds-1", "ds-2"])
+
+        session.execute.assert_called_once()
+        params = session.execute.call_args[0][0].compile().params
+        self.assertEqual(params["entity_ids"], ["ds-1", "ds-2"])
+        session.flush.assert_called_once()
+
+    def test_mark_completed_none_entity_id(self):
+        tracker, session = _make_tracker()
+        query_mock = MagicMock()
+        session.query.return_value.filter.return_value = query_mock
+
+        tracker.mark_completed(None)
+
+        session.execute.assert_not_called()
         query_mock.update.assert_called_once()
-        update_args = query_mock.update.call_args[0][0]
-        self.assertEqual(update_args["status"], STATUS_COMPLETED)
-        self.assertIn("completed_at", update_args)
+        self.assertEqual(query_mock.update.call_args[0][0]["status"], STATUS_COMPLETED)
 
 
 class TestTaskExecutionTrackerMarkFailed(unittest.TestCase):
     def test_mark_failed_sets_error_message(self):
         tracker, session = _make_tracker()
-        query_mock = MagicMock()
-        session.query.return_value.filter.return_value.filter.return_value = query_mock
 
         tracker.mark_failed("ds-1", error_message="Workflow timed out")
 
-        query_mock.update.assert_called_once()
-        update_args = query_mock.update.call_args[0][0]
-        self.assertEqual(update_args["status"], STATUS_FAILED)
-        self.assertEqual(update_args["error_message"], "Workflow timed out")
+        session.execute.assert_called_once()
+        params = session.execute.call_args[0][0].compile().params
+        self.assertEqual(params["status"], STATUS_FAILED)
+        self.assertEqual(params["error_messages"], ["Workflow timed out"])
+
+    def test_mark_failed_many_pairs_messages_with_ids(self):
+        tracker, session = _make_tracker()
+
+        tracker.mark_failed_many(
+            ["ds-1", "ds-2"], error_messages={"ds-2": "Workflow timed out"}
+        )
+
+        session.execute.assert_called_once()
+        params = session.execute.call_args[0][0].compile().params
+        self.assertEqual(params["entity_ids"], ["ds-1", "ds-2"])
+        self.assertEqual(params["error_messages"], [None, "Workflow timed out"])
 
 
 class TestTaskExecutionTrackerGetSummary(unittest.TestCase):
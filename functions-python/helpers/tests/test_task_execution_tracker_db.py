@@ -0,0 +1,205 @@
+#
+#   MobilityData 2026
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+"""Integration tests for the bulk statements of TaskExecutionTracker against the
+real test database.
+
+The unit tests in ``test_task_execution_tracker.py`` only inspect the compiled
+statements; these run the ``INSERT ... SELECT FROM unnest ... ON CONFLICT`` and
+``UPDATE ... FROM unnest`` statements on Postgres. Every test tracks its own run
+of a dedicated task name, removed afterwards.
+"""
+
+import unittest
+import uuid
+
+from sqlalchemy.orm import Session
+
+from shared.database.database import with_db_session
+from shared.database_gen.sqlacodegen_models import TaskExecutionLog, TaskRun
+from task_execution.task_execution_tracker import (
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+    STATUS_TRIGGERED,
+    TaskExecutionTracker,
+)
+from test_shared.test_utils.database_utils import default_db_url
+
+TASK_NAME = "task_execution_tracker_db_test"
+
+
+@with_db_session(db_url=default_db_url)
+def clean(db_session: Session = None):
+    """Remove every row this module created."""
+    db_session.query(TaskExecutionLog).filter(
+        TaskExecutionLog.task_name == TASK_NAME
+    ).delete(synchronize_session=False)
+    db_session.query(TaskRun).filter(TaskRun.task_name == TASK_NAME).delete(
+        synchronize_session=False
+    )
+    db_session.commit()
+
+
+def setUpModule():
+    clean()
+
+
+def tearDownModule():
+    clean()
+
+
+def _start_tracker(db_session: Session) -> TaskExecutionTracker:
+    tracker = TaskExecutionTracker(
+        task_name=TASK_NAME, run_id=str(uuid.uuid4()), db_session=db_session
+    )
+    tracker.start_run(total_count=10)
+    return tracker
+
+
+def _rows(tracker: TaskExecutionTracker) -> dict:
+    """The execution log rows of the tracker's run, by entity_id."""
+    rows = (
+        tracker.db_session.query(TaskExecutionLog)
+        .filter(
+            TaskExecutionLog.task_name == tracker.task_name,
+            TaskExecutionLog.run_id == tracker.run_id,
+        )
+        .all()
+    )
+    return {row.entity_id: row for row in rows}
+
+
+class TestFilterUntriggered(unittest.TestCase):
+    @with_db_session(db_url=default_db_url)
+    def test_skips_triggered_and_completed_entries(self, db_session: Session = None):
+        tracker = _start_tracker(db_session)
+        tracker.mark_triggered_many(["ds-1", "ds-2", "ds-3"])
+        tracker.mark_completed("ds-2")
+        tracker.mark_failed("ds-3", error_message="Workflow timed out")
+
+        self.assertEqual(
+            tracker.filter_untriggered(["ds-4", "ds-1", "ds-2", "ds-3", "ds-4"]),
+            ["ds-4", "ds-3"],
+        )
+
+    @with_db_session(db_url=default_db_url)
+    def test_none_entity_id(self, db_session: Session = None):
+        tracker = _start_tracker(db_session)
+        self.assertEqual(tracker.filter_untriggered([None, "ds-1"]), [None, "ds-1"])
+
+        tracker.mark_triggered(None)
+
+        self.assertEqual(tracker.filter_untriggered([None, "ds-1"]), ["ds-1"])
+        self.assertTrue(tracker.is_triggered(None))
+
+
+class TestMarkTriggeredMany(unittest.TestCase):
+    @with_db_session(db_url=default_db_url)
+    def test_mixed_new_and_existing_entries(self, db_session: Session = None):
+        tracker = _start_tracker(db_session)
+        tracker.mark_triggered_many(
+            ["ds-1", "ds-2"], execution_refs={"ds-1": "exec-1", "ds-2": "exec-2"}
+        )
+        tracker.mark_failed("ds-2", error_message="Workflow timed out")
+
+        tracker.mark_triggered_many(
+            ["ds-2", "ds-3"],
+            execution_refs={"ds-2": "exec-2b", "ds-3": "exec-3"},
+            metadata={"ds-3": {"attempt": 1}},
+        )
+
+        rows = _rows(tracker)
+        self.assertEqual(set(rows), {"ds-1", "ds-2", "ds-3"})
+        self.assertEqual(rows["ds-1"].execution_ref, "exec-1")
+        self.assertEqual(rows["ds-2"].status, STATUS_TRIGGERED)
+        self.assertEqual(rows["ds-2"].execution_ref, "exec-2b")
+        self.assertEqual(rows["ds-3"].execution_ref, "exec-3")
+        self.assertEqual(rows["ds-3"].metadata_, {"attempt": 1})
+        for row in rows.values():
+            self.assertEqual(row.task_run_id, tracker.task_run_id)
+
+    @with_db_session(db_url=default_db_url)
+    def test_already_triggered_entry_is_updated_in_place(
+        self, db_session: Session = None
+    ):
+        tracker = _start_tracker(db_session)
+        tracker.mark_triggered("ds-1", execution_ref="exec-1", metadata={"a": 1})
+
+        tracker.mark_triggered_many(["ds-1"], execution_refs={"ds-1": "exec-1b"})
+
+        rows = _rows(tracker)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows["ds-1"].status, STATUS_TRIGGERED)
+        self.assertEqual(rows["ds-1"].execution_ref, "exec-1b")
+        # metadata missing from the map is stored as NULL
+        self.assertIsNone(rows["ds-1"].metadata_)
+
+
+class TestUpdateEntityStatuses(unittest.TestCase):
+    @with_db_session(db_url=default_db_url)
+    def test_mark_completed_many_leaves_untracked_entities_out(
+        self, db_session: Session = None
+    ):
+        tracker = _start_tracker(db_session)
+        tracker.mark_triggered_many(["ds-1", "ds-2", None])
+
+        tracker.mark_completed_many(["ds-1", None, "ds-untracked"])
+
+        rows = _rows(tracker)
+        self.assertEqual(set(rows), {"ds-1", "ds-2", None})
+        self.assertEqual(rows["ds-1"].status, STATUS_COMPLETED)
+        self.assertIsNotNone(rows["ds-1"].completed_at)
+        self.assertEqual(rows[None].status, STATUS_COMPLETED)
+        self.assertIsNotNone(rows[None].completed_at)
+        self.assertEqual(rows["ds-2"].status, STATUS_TRIGGERED)
+        self.assertIsNone(rows["ds-2"].completed_at)
+
+    @with_db_session(db_url=default_db_url)
+    def test_mark_failed_many_with_missing_error_messages(
+        self, db_session: Session = None
+    ):
+        tracker = _start_tracker(db_session)
+        tracker.mark_triggered_many(["ds-1", "ds-2", None])
+
+        tracker.mark_failed_many(
+            ["ds-1", "ds-2", None], error_messages={"ds-1": "Workflow timed out"}
+        )
+
+        rows = _rows(tracker)
+        for row in rows.values():
+            self.assertEqual(row.status, STATUS_FAILED)
+            self.assertIsNotNone(row.completed_at)
+        self.assertEqual(rows["ds-1"].error_message, "Workflow timed out")
+        self.assertIsNone(rows["ds-2"].error_message)
+        self.assertIsNone(rows[None].error_message)
+
+    @with_db_session(db_url=default_db_url)
+    def test_mark_failed_none_entity_id_with_error_message(
+        self, db_session: Session = None
+    ):
+        tracker = _start_tracker(db_session)
+        tracker.mark_triggered_many([None, "ds-1"])
+
+        tracker.mark_failed(None, error_message="Workflow timed out")
+
+        rows = _rows(tracker)
+        self.assertEqual(rows[None].status, STATUS_FAILED)
+        self.assertEqual(rows[None].error_message, "Workflow timed out")
+        self.assertEqual(rows["ds-1"].status, STATUS_TRIGGERED)
+        self.assertIsNone(rows["ds-1"].error_message)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -506,6 +506,33 @@ def create_http_task(
     )
 
 
+def pmtiles_builder_task_spec(
+    stable_id: str, dataset_stable_id: str, run_id: Optional[str] = None
+):
+    """
+    HttpTaskSpec of a task generating the PMTiles of a dataset, for enqueue_http_tasks.
+    Named after the dataset and run_id so a dataset is only enqueued once per run. Cloud Tasks
+    keeps the name of a task reserved for a while after it ran, so enqueuing the dataset again
+    requires another run_id.
+    """
+    from shared.common.gcp_utils import HttpTaskSpec, deterministic_task_name
+    import json
+
+    project_id = os.getenv("PROJECT_ID")
+    gcp_region = os.getenv("GCP_REGION")
+    gcp_env = os.getenv("ENVIRONMENT")
+    return HttpTaskSpec(
+        url=f"https://{gcp_region}-{project_id}.cloudfunctions.net/pmtiles-builder-{gcp_env}",
+        body=json.dumps(
+            {"feed_stable_id": stable_id, "dataset_stable_id": dataset_stable_id}
+        ).encode(),
+        queue_name=os.getenv("PMTILES_BUILDER_QUEUE"),
+        task_name=deterministic_task_name(
+            "pmtiles", dataset_stable_id, *((run_id,) if run_id else ())
+        ),
+    )
+
+
 def create_http_pmtiles_builder_task(
     stable_id: str,
     dataset_stable_id: str,
@@ -514,24 +541,54 @@ def create_http_pmtiles_builder_task(
     Create a task to generate PMTiles for a dataset.
     """
     from google.cloud import tasks_v2
-    import json
 
     client = tasks_v2.CloudTasksClient()
-    body = json.dumps(
-        {"feed_stable_id": stable_id, "dataset_stable_id": dataset_stable_id}
-    ).encode()
-    queue_name = os.getenv("PMTILES_BUILDER_QUEUE")
-    project_id = os.getenv("PROJECT_ID")
-    gcp_region = os.getenv("GCP_REGION")
-    gcp_env = os.getenv("ENVIRONMENT")
+    spec = pmtiles_builder_task_spec(stable_id, dataset_stable_id)
 
     create_http_task(
         client,
-        body,
-        f"https://{gcp_region}-{project_id}.cloudfunctions.net/pmtiles-builder-{gcp_env}",
-        project_id,
-        gcp_region,
-        queue_name,
+        spec.body,
+        spec.url,
+        os.getenv("PROJECT_ID"),
+        os.getenv("GCP_REGION"),
+        spec.queue_name,
+    )
+
+
+def gtfs_datasets_comparer_task_spec(
+    feed_stable_id: str,
+    base_dataset_stable_id: str,
+    new_dataset_stable_id: str,
+    disallow_overwrite: bool = True,
+):
+    """
+    HttpTaskSpec of a task running the gtfs-datasets-comparer function for a pair of datasets,
+    for enqueue_http_tasks. Named after the pair so a pair is only enqueued once.
+    """
+    from shared.common.gcp_utils import HttpTaskSpec, deterministic_task_name
+    import json
+
+    project_id = os.getenv("PROJECT_ID")
+    gcp_region = os.getenv("GCP_REGION")
+    gcp_env = os.getenv("ENVIRONMENT")
+    return HttpTaskSpec(
+        url=f"https://{gcp_region}-{project_id}.cloudfunctions.net/gtfs-datasets-comparer-{gcp_env}",
+        body=json.dumps(
+            {
+                "feed_stable_id": feed_stable_id,
+                "base_dataset_stable_id": base_dataset_stable_id,
+                "new_dataset_stable_id": new_dataset_stable_id,
+                "disallow_overwrite": disallow_overwrite,
+            }
+        ).encode(),
+        queue_name=os.getenv("GTFS_CHANGE_TRACKER_QUEUE"),
+        # A forced rerun must not be deduplicated against the regular task of the pair.
+        task_name=deterministic_task_name(
+            "changelog",
+            base_dataset_stable_id,
+            new_dataset_stable_id,
+            *(() if disallow_overwrite else ("overwrite",)),
+        ),
     )
 
 
@@ -548,29 +605,22 @@ def create_http_gtfs_datasets_comparer_task(
     already exists; pass False to force regeneration/overwrite.
     """
     from google.cloud import tasks_v2
-    import json
 
     client = tasks_v2.CloudTasksClient()
-    body = json.dumps(
-        {
-            "feed_stable_id": feed_stable_id,
-            "base_dataset_stable_id": base_dataset_stable_id,
-            "new_dataset_stable_id": new_dataset_stable_id,
-            "disallow_overwrite": disallow_overwrite,
-        }
-    ).encode()
-    queue_name = os.getenv("GTFS_CHANGE_TRACKER_QUEUE")
-    project_id = os.getenv("PROJECT_ID")
-    gcp_region = os.getenv("GCP_REGION")
-    gcp_env = os.getenv("ENVIRONMENT")
+    spec = gtfs_datasets_comparer_task_spec(
+        feed_stable_id,
+        base_dataset_stable_id,
+        new_dataset_stable_id,
+        disallow_overwrite=disallow_overwrite,
+    )
 
     create_http_task(
         client,
-        body,
-        f"https://{gcp_region}-{project_id}.cloudfunctions.net/gtfs-datasets-comparer-{gcp_env}",
-        project_id,
-        gcp_region,
-        queue_name,
+        spec.body,
+        spec.url,
+        os.getenv("PROJECT_ID"),
+        os.getenv("GCP_REGION"),
+        spec.queue_name,
     )
 
 
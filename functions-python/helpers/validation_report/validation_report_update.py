@@ -68,8 +68,13 @@ def execute_workflows(
     sleep_time = int(os.getenv("SLEEP_TIME", 5))
     count = 0
     logging.info(f"Executing workflow for {len(latest_datasets)} datasets")
+    # Single lookup of the datasets already tracked for this run, instead of one per dataset
+    untriggered_datasets = None
+    if tracker:
+        dataset_ids = [dataset_id for _, dataset_id in latest_datasets]
+        untriggered_datasets = set(tracker.filter_untriggered(dataset_ids))
     for feed_id, dataset_id in latest_datasets:
-        if tracker and tracker.is_triggered(dataset_id):
+        if untriggered_datasets is not None and dataset_id not in untriggered_datasets:
             logging.info(f"Skipping already triggered dataset {feed_id}/{dataset_id}")
             continue
         try:
@@ -33,6 +33,9 @@ from feeds_gen.models.get_feeds200_response import GetFeeds200Response
 from feeds_gen.models.gtfs_feed_availability_response import (
     GtfsFeedAvailabilityResponse,
 )
+from feeds_gen.models.gtfs_feed_daily_availability_response import (
+    GtfsFeedDailyAvailabilityResponse,
+)
 from feeds_gen.models.operation_create_request_gtfs_feed import (
     OperationCreateRequestGtfsFeed,
 )
@@ -57,19 +60,24 @@ from shared.database.database import with_db_session, refresh_materialized_view
 from shared.database_gen.sqlacodegen_models import (
     Gtfsfeed,
     GtfsFeedAvailabilityCheck,
+    GtfsFeedAvailabilityDaily,
     t_feedsearch,
     Feed,
     Gtfsrealtimefeed,
 )
+from shared.common.date_utils import utc_date
 from shared.common.license_utils import assign_license_by_url, propagate_license_by_url
 from shared.common.gcp_utils import create_web_revalidation_task
 from shared.db_models.gtfs_feed_availability_check_impl import (
     GtfsFeedAvailabilityCheckImpl,
 )
+from shared.db_models.gtfs_feed_daily_availability_impl import (
+    GtfsFeedDailyAvailabilityImpl,
+)
 from shared.helpers.pub_sub import get_execution_id, trigger_dataset_download
 from shared.helpers.query_helper import (
     query_feed_by_stable_id,
-    get_feeds_query,
+    get_feeds_page,
     get_feed_by_normalized_url,
 )
 from shared.notifications.notification_event_service import (
@@ -164,6 +172,7 @@ class OperationsApiImpl(BaseOperationsApi):
         data_type: Optional[str] = None,
         offset: str = "0",
         limit: str = "50",
+        sort: Optional[str] = None,
         db_session: Session = None,
     ) -> GetFeeds200Response:
         """Get a list of feeds with optional filtering and pagination."""
@@ -171,19 +180,9 @@ class OperationsApiImpl(BaseOperationsApi):
             limit_int = int(limit) if limit else 50
             offset_int = int(offset) if offset else 0
 
-            # filtered but unpaginated for total
-            total_query = get_feeds_query(
-                db_session=db_session,
-                search_query=search_query,
-                operation_status=operation_status,
-                data_type=data_type,
-                limit=None,
-                offset=None,
-                model=Feed,
-            )
-            total = total_query.count()
-
-            query = get_feeds_query(
+            logging.info("Executing query with data_type: %s", data_type)
+            # page and filtered total from one query
+            feeds, total = get_feeds_page(
                 db_session=db_session,
                 search_query=search_query,
                 operation_status=operation_status,
@@ -191,11 +190,8 @@ class OperationsApiImpl(BaseOperationsApi):
                 limit=limit_int,
                 offset=offset_int,
                 model=Feed,
+                sort=sort,
             )
-
-            logging.info("Executing query with data_type: %s", data_type)
-
-            feeds = query.all()
             logging.info("Retrieved %d feeds from database", len(feeds))
 
             feed_list = [OperationFeedImpl.from_orm(feed) for feed in feeds]
@@ -218,11 +214,12 @@ class OperationsApiImpl(BaseOperationsApi):
         data_type: Optional[str] = None,
         offset: str = "0",
         limit: str = "50",
+        sort: Optional[str] = None,
         db_session: Session = None,
     ) -> GetFeeds200Response:
         """Get a list of feeds with optional filtering and pagination."""
         return self.handle_get_feeds(
-            search_query, operation_status, data_type, offset, limit
+            search_query, operation_status, data_type, offset, limit, sort
         )
 
     @with_db_session
@@ -285,6 +282,53 @@ class OperationsApiImpl(BaseOperationsApi):
             checks=[GtfsFeedAvailabilityCheckImpl.from_orm(c) for c in checks],
         )
 
+    @with_db_session
+    def get_gtfs_feed_daily_availability(
+        self,
+        id: Annotated[
+            StrictStr, Field(description="The feed ID of the requested feed.")
+        ],
+        var_from: Optional[datetime] = None,
+        to: Optional[datetime] = None,
+        limit: Optional[int] = 100,
+        offset: Optional[int] = 0,
+        sort: Optional[str] = "desc",
+        db_session: Session = None,
+    ) -> GtfsFeedDailyAvailabilityResponse:
+        """Get the daily availability roll-up for the specified GTFS feed.
+
+        Served from gtfs_feed_availability_daily; var_from/to select the UTC days containing them.
+        """
+        gtfs_feed = (
+            db_session.query(Gtfsfeed).filter(Gtfsfeed.stable_id == id).one_or_none()
+        )
+        if gtfs_feed is None:
+            raise HTTPException(status_code=404, detail="GTFS feed not found")
+
+        query = db_session.query(GtfsFeedAvailabilityDaily).filter(
+            GtfsFeedAvailabilityDaily.feed_id == gtfs_feed.id
+        )
+        if var_from is not None:
+            query = query.filter(GtfsFeedAvailabilityDaily.day >= utc_date(var_from))
+        if to is not None:
+            query = query.filter(GtfsFeedAvailabilityDaily.day <= utc_date(to))
+
+        total = query.count()
+        order = (
+            GtfsFeedAvailabilityDaily.day.asc()
+            if sort == "asc"
+            else GtfsFeedAvailabilityDaily.day.desc()
+        )
+        days = query.order_by(order).offset(offset).limit(limit).all()
+
+        return GtfsFeedDailyAvailabilityResponse(
+            feed_id=id,
+            total=total,
+            offset=offset,
+            limit=limit,
+            days=[GtfsFeedDailyAvailabilityImpl.from_orm(d) for d in days],
+        )
+
     @with_db_session
     def get_gtfs_rt_feed(
         self,
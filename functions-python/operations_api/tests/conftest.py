@@ -15,11 +15,12 @@
 #
 import os
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 from shared.database.database import with_db_session
 from shared.database_gen.sqlacodegen_models import (
     GtfsFeedAvailabilityCheck,
+    GtfsFeedAvailabilityDaily,
     Gtfsfeed,
     Gtfsrealtimefeed,
     Entitytype,
@@ -123,6 +124,34 @@ availability_checks_mdb_40 = [
     ),
 ]
 
+# Daily roll-up rows of mdb-40, one per day with checks in availability_checks_mdb_40.
+availability_daily_mdb_40 = [
+    GtfsFeedAvailabilityDaily(
+        feed_id="mdb-40",
+        day=check.checked_at.date(),
+        total_checks=1,
+        successful_checks=1 if check.success else 0,
+        success_ratio=1.0 if check.success else 0.0,
+        latency_p50_ms=check.latency_ms,
+        latency_p95_ms=check.latency_ms,
+        last_error_type=check.error_type,
+        last_checked_at=check.checked_at,
+    )
+    for check in availability_checks_mdb_40
+] + [
+    GtfsFeedAvailabilityDaily(
+        feed_id="mdb-40",
+        day=date(2025, 5, 2),
+        total_checks=4,
+        successful_checks=3,
+        success_ratio=0.75,
+        latency_p50_ms=100.0,
+        latency_p95_ms=380.5,
+        last_error_type="connection_timeout",
+        last_checked_at=datetime(2025, 5, 2, 23, 0, 0, tzinfo=timezone.utc),
+    )
+]
+
 feed_mdb_400 = Gtfsfeed(
     id="mdb-400",
     data_type="gtfs",
@@ -192,6 +221,8 @@ def populate_database(db_session):
     db_session.add(feed_mdb_400)
     for check in availability_checks_mdb_40:
         db_session.add(check)
+    for daily in availability_daily_mdb_40:
+        db_session.add(daily)
     db_session.add(rule_attribution)
     db_session.add(rule_share_alike)
     db_session.add(license_std_mit)
@@ -0,0 +1,88 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from conftest import availability_daily_mdb_40, feed_mdb_40
+from feeds_operations.impl.feeds_operations_impl import OperationsApiImpl
+from feeds_gen.models.gtfs_feed_daily_availability_response import (
+    GtfsFeedDailyAvailabilityResponse,
+)
+
+
+@pytest.mark.asyncio
+async def test_get_gtfs_feed_daily_availability_basic():
+    """Returns all roll-up days for a known feed, newest first by default."""
+    api = OperationsApiImpl()
+    response: GtfsFeedDailyAvailabilityResponse = api.get_gtfs_feed_daily_availability(
+        id=feed_mdb_40.stable_id, var_from=None, to=None, limit=100, offset=0
+    )
+    assert response.feed_id == feed_mdb_40.stable_id
+    assert response.total == len(availability_daily_mdb_40)
+    days = [d.day for d in response.days]
+    assert days == sorted(days, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_get_gtfs_feed_daily_availability_aggregates():
+    """Aggregated values are returned as stored in the roll-up."""
+    api = OperationsApiImpl()
+    response = api.get_gtfs_feed_daily_availability(
+        id=feed_mdb_40.stable_id,
+        var_from=datetime(2025, 5, 2, 12, 0, tzinfo=timezone.utc),
+        to=datetime(2025, 5, 2, 12, 0, tzinfo=timezone.utc),
+        limit=100,
+        offset=0,
+    )
+    assert response.total == 1
+    day = response.days[0]
+    assert day.day == date(2025, 5, 2)
+    assert day.total_checks == 4
+    assert day.successful_checks == 3
+    assert day.success_ratio == 0.75
+    assert day.latency_p95_ms == 380.5
+    assert day.last_error_type == "connection_timeout"
+
+
+@pytest.mark.asyncio
+async def test_get_gtfs_feed_daily_availability_range_uses_utc_days():
+    """from/to select the UTC days containing them, whatever their offset."""
+    api = OperationsApiImpl()
+    # 2025-05-01T22:00-03:00 is 2025-05-02T01:00Z: only May 2 matches.
+    tz = timezone(timedelta(hours=-3))
+    response = api.get_gtfs_feed_daily_availability(
+        id=feed_mdb_40.stable_id,
+        var_from=datetime(2025, 5, 1, 22, 0, tzinfo=tz),
+        to=None,
+        limit=100,
+        offset=0,
+        sort="asc",
+    )
+    assert [d.day for d in response.days] == [date(2025, 5, 2)]
+
+
+@pytest.mark.asyncio
+async def test_get_gtfs_feed_daily_availability_pagination():
+    """Pagination respects limit and offset; total is always the full count."""
+    api = OperationsApiImpl()
+    response = api.get_gtfs_feed_daily_availability(
+        id=feed_mdb_40.stable_id,
+        var_from=None,
+        to=None,
+        limit=2,
+        offset=1,
+        sort="asc",
+    )
+    assert response.total == len(availability_daily_mdb_40)
+    assert [d.day for d in response.days] == [date(2025, 2, 10), date(2025, 3, 5)]
+
+
+@pytest.mark.asyncio
+async def test_get_gtfs_feed_daily_availability_not_found():
+    """Returns 404 for an unknown feed ID."""
+    api = OperationsApiImpl()
+    with pytest.raises(HTTPException) as exc_info:
+        api.get_gtfs_feed_daily_availability(
+            id="mdb-9999", var_from=None, to=None, limit=100, offset=0
+        )
+    assert exc_info.value.status_code == 404
@@ -253,3 +253,63 @@ async def test_get_feeds_search_query():
     assert response is not None
     assert response.total == 3
     assert len(response.feeds) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_feeds_search_query_escapes_like_wildcards():
+    """
+    Test get_feeds endpoint with LIKE wildcards in the search query.
+    Wildcards must be matched literally, not as patterns.
+    """
+    api = OperationsApiImpl()
+
+    response = api.get_feeds(search_query="%")
+    assert response.total == 0
+    assert len(response.feeds) == 0
+
+    response = api.get_feeds(search_query="mdb_4")
+    assert response.total == 0
+    assert len(response.feeds) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_feeds_relevance_sort():
+    """
+    Test get_feeds endpoint with relevance sort.
+    The filter is unchanged and the closest match comes first.
+    """
+    api = OperationsApiImpl()
+
+    response = api.get_feeds(search_query="mdb-41", sort="relevance")
+    assert response.total == 1
+    assert response.feeds[0].stable_id == "mdb-41"
+
+    by_provider = api.get_feeds(search_query="mdb")
+    by_relevance = api.get_feeds(search_query="mdb", sort="relevance")
+    assert by_relevance.total == by_provider.total
+    assert {f.stable_id for f in by_relevance.feeds} == {
+        f.stable_id for f in by_provider.feeds
+    }
+
+    # Without a search query, relevance falls back to the provider order.
+    no_search = api.get_feeds(sort="relevance")
+    assert [f.stable_id for f in no_search.feeds] == [
+        f.stable_id for f in api.get_feeds().feeds
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_feeds_total_with_search_and_pagination():
+    """
+    Test get_feeds total when the page is a subset of the matches.
+    The total counts every match, not only the returned page.
+    """
+    api = OperationsApiImpl()
+
+    response = api.get_feeds(search_query="mdb", limit=1, offset=1)
+    assert response.total == 3
+    assert len(response.feeds) == 1
+
+    response = api.get_feeds(search_query="mdb", offset=5)
+    assert response.total == 3
+    assert len(response.feeds) == 0
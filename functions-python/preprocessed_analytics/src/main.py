@@ -29,6 +29,17 @@ def get_compute_date(request: flask.Request) -> datetime:
     return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
 
 
+def is_full_aggregation(request: flask.Request) -> bool:
+    """
+    Whether the request asks to aggregate every summary file instead of only the new ones.
+    """
+    try:
+        json_request = request.get_json()
+        return bool(json_request.get("full_aggregation", False))
+    except Exception:
+        return False
+
+
 def preprocess_analytics(request: flask.Request, processor_class) -> Response:
     """
     Common logic to process analytics using the given processor class.
@@ -37,7 +48,9 @@ def preprocess_analytics(request: flask.Request, processor_class) -> Response:
     compute_date = get_compute_date(request)
     logging.info("Compute date: %s", compute_date)
     try:
-        processor = processor_class(compute_date)
+        processor = processor_class(
+            compute_date, incremental=not is_full_aggregation(request)
+        )
         processor.run()
     except NoFeedDataException as e:
         logging.warning("No feed data found for date %s: %s", compute_date, e)
@@ -1,9 +1,12 @@
 import logging
 import os
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
+import io
 import json
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from google.cloud import storage
 from sqlalchemy.orm import Query
 from sqlalchemy.orm.session import Session
@@ -15,14 +18,27 @@ from shared.database_gen.sqlacodegen_models import (
 )
 from shared.database.database import with_db_session
 
+SUMMARY_PREFIX = "summary/summary_"
+# Also write the outputs as zstd-compressed Parquet, used to reload the metrics history
+PARQUET_OUTPUT = os.getenv("ANALYTICS_PARQUET_OUTPUT", "true").lower() == "true"
+PARQUET_COMPRESSION = "zstd"
+AGGREGATION_MANIFEST_FILE = "summary/aggregation_manifest.json"
+
 
 class NoFeedDataException(Exception):
     pass
 
 
 class BaseAnalyticsProcessor:
-    def __init__(self, run_date):
+    # Parquet schemas of the analytics file and of the metrics files (by name without extension).
+    # Outputs without a schema are only written as JSON.
+    analytics_schema: Optional[pa.Schema] = None
+    metrics_schemas: Dict[str, pa.Schema] = {}
+
+    def __init__(self, run_date, incremental: bool = True):
         self.run_date = run_date
+        # Merge only the summary files newer than the previous aggregation
+        self.incremental = incremental
         self.processed_feeds = set()
         self.data = []
         self.feed_metrics_data = []
@@ -88,46 +104,224 @@ class BaseAnalyticsProcessor:
     def aggregate_summary_files(
         self, metrics_file_data: Dict[str, List], merging_keys: Dict[str, List[str]]
     ) -> None:
-        blobs = self.analytics_bucket.list_blobs(prefix="summary/summary_")
-        for blob in blobs:
+        """
+        Merges the daily summary files into the metrics files. In incremental mode the metrics files
+        saved by the previous run are extended with the summaries not merged yet; otherwise, without
+        a usable manifest, or when the new summaries cannot simply be appended, every summary is
+        merged from scratch.
+        """
+        manifest = self._load_manifest() if self.incremental else None
+        summary_blobs = None
+        if manifest:
+            summary_blobs = self._list_new_summary_blobs(manifest)
+        if summary_blobs is None:
+            merged_summaries = {}
+            summary_blobs = sorted(
+                self.analytics_bucket.list_blobs(prefix=SUMMARY_PREFIX),
+                key=lambda blob: blob.name,
+            )
+        else:
+            if not summary_blobs:
+                logging.info("No summary file added since %s", manifest["watermark"])
+                return
+            merged_summaries = dict(manifest["summaries"])
+            for file_name in metrics_file_data:
+                metrics_file_data[file_name] = self._load_metrics(file_name)
+
+        indexes = {
+            key: self.index_by_keys(data, merging_keys[key])
+            for key, data in metrics_file_data.items()
+        }
+        for blob in summary_blobs:
             logging.info("Aggregating data from %s", blob.name)
             summary_data, _ = self._load_json(blob.name)
             for key, new_data in summary_data.items():
                 if key in metrics_file_data:
-                    metrics_file_data[key] = self.append_new_data_if_not_exists(
-                        metrics_file_data[key], new_data, merging_keys[key]
+                    self.merge_into_index(
+                        metrics_file_data[key],
+                        indexes[key],
+                        new_data,
+                        merging_keys[key],
                     )
+            merged_summaries[blob.name] = blob.generation
+        # The manifest must never list fewer summaries than the saved metrics hold, or the next
+        # incremental run would merge some of them twice: it is removed before the metrics are
+        # saved and written again last, so a run interrupted in between leads to a full aggregation.
+        self._delete_manifest()
         # Save metrics to the bucket
         for file_name, data in metrics_file_data.items():
             self._save_json(f"{file_name}.json", data)
+            self._save_parquet(
+                f"{file_name}.parquet", data, self.metrics_schemas.get(file_name)
+            )
+        if merged_summaries:
+            self._save_manifest(merged_summaries)
+
+    def _load_manifest(self) -> Optional[Dict]:
+        """Returns the aggregation manifest of the previous run, or None if there is none."""
+        blob = self.analytics_bucket.blob(AGGREGATION_MANIFEST_FILE)
+        if not blob.exists():
+            return None
+        try:
+            manifest = json.loads(blob.download_as_text())
+        except ValueError as e:
+            logging.warning("Ignoring unreadable aggregation manifest: %s", e)
+            return None
+        return manifest if manifest.get("summaries") else None
+
+    def _save_manifest(self, merged_summaries: Dict[str, int]) -> None:
+        """
+        Records the merged summary files with their generation, and the newest one as watermark,
+        for the next run.
+        """
+        blob = self.analytics_bucket.blob(AGGREGATION_MANIFEST_FILE)
+        manifest = {
+            "watermark": max(merged_summaries),
+            "summaries": merged_summaries,
+            "aggregated_on": self.run_date.isoformat(),
+        }
+        blob.upload_from_string(json.dumps(manifest), content_type="application/json")
+
+    def _delete_manifest(self) -> None:
+        """Deletes the aggregation manifest of the previous run, if any."""
+        blob = self.analytics_bucket.blob(AGGREGATION_MANIFEST_FILE)
+        if blob.exists():
+            blob.delete()
+
+    def _list_new_summary_blobs(self, manifest: Dict) -> Optional[List[storage.Blob]]:
+        """
+        Lists the summary files not merged by the previous aggregations, or returns None when they
+        cannot be appended to the metrics, which needs a full aggregation: a merged summary was
+        rewritten or deleted (e.g. a day processed again), or a new summary is older than the
+        watermark (e.g. a backfilled day), as the metrics values are in date order.
+        """
+        merged = manifest["summaries"]
+        blobs = sorted(
+            self.analytics_bucket.list_blobs(prefix=SUMMARY_PREFIX),
+            key=lambda blob: blob.name,
+        )
+        generations = {blob.name: blob.generation for blob in blobs}
+        changed = [
+            name
+            for name, generation in merged.items()
+            if generations.get(name) != generation
+        ]
+        if changed:
+            logging.info("Summaries changed since last aggregation: %s", changed)
+            return None
+        new_blobs = [blob for blob in blobs if blob.name not in merged]
+        if new_blobs and new_blobs[0].name < manifest["watermark"]:
+            logging.info(
+                "Summary %s is older than the last aggregated summary %s",
+                new_blobs[0].name,
+                manifest["watermark"],
+            )
+            return None
+        return new_blobs
+
+    def _load_metrics(self, file_name: str) -> List[Dict]:
+        """
+        Loads a metrics file, without extension, as saved by the previous aggregation: from its
+        Parquet version when there is one, otherwise from its JSON version.
+        """
+        schema = self.metrics_schemas.get(file_name)
+        if PARQUET_OUTPUT and schema is not None:
+            blob = self.analytics_bucket.blob(f"{file_name}.parquet")
+            if blob.exists():
+                return self._load_parquet(blob, schema.names)
+        blob = self.analytics_bucket.blob(f"{file_name}.json")
+        if not blob.exists():
+            return []
+        return json.loads(blob.download_as_text())
+
+    @staticmethod
+    def _load_parquet(blob: storage.Blob, columns: List[str]) -> List[Dict]:
+        """Reads the columns of a Parquet blob as a list of records."""
+        table = pq.read_table(io.BytesIO(blob.download_as_bytes()), columns=columns)
+        return table.to_pylist()
+
+    def _save_parquet(
+        self, file_name: str, data: List[Dict], schema: Optional[pa.Schema]
+    ) -> None:
+        """
+        Saves data as a zstd-compressed Parquet file with the given schema. Does nothing when
+        Parquet output is disabled or the file has no schema. If the data does not fit the schema,
+        including fields the schema does not have, the JSON file remains the reference: the Parquet
+        file of a previous run is deleted so that it is not loaded instead of the newer JSON.
+        """
+        if not PARQUET_OUTPUT or schema is None:
+            return
+        blob = self.analytics_bucket.blob(file_name)
+        extra_fields = set().union(*(entry.keys() for entry in data)) - set(
+            schema.names
+        )
+        try:
+            if extra_fields:
+                raise ValueError(f"fields not in the schema: {sorted(extra_fields)}")
+            table = pa.Table.from_pylist(data, schema=schema)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            logging.warning("Unable to convert %s to Parquet: %s", file_name, e)
+            if blob.exists():
+                blob.delete()
+                logging.info("Deleted the outdated %s", file_name)
+            return
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer, compression=PARQUET_COMPRESSION)
+        blob.upload_from_string(
+            buffer.getvalue(), content_type="application/vnd.apache.parquet"
+        )
+        logging.info("%s saved to bucket", file_name)
+
+    @staticmethod
+    def index_by_keys(data: List[Dict], keys: List[str]) -> Dict[Tuple, List[Dict]]:
+        """Groups the entries of data by the tuple of their keys values."""
+        index = {}
+        for entry in data:
+            index.setdefault(tuple(entry[key] for key in keys), []).append(entry)
+        return index
+
+    @staticmethod
+    def merge_into_index(
+        data: List[Dict],
+        index: Dict[Tuple, List[Dict]],
+        new_data: List[Dict],
+        keys: List[str],
+    ) -> List[Dict]:
+        """
+        Merges new_data into data in O(len(new_data)) using index, the entries of data grouped by
+        keys: entries with new keys are appended, otherwise their non-key values are appended to the
+        lists of the matching entries.
+        """
+        for new_entry in new_data:
+            index_key = tuple(new_entry[key] for key in keys)
+            matching_entries = index.get(index_key)
+            if not matching_entries:
+                data.append(new_entry)
+                index[index_key] = [new_entry]
+                continue
+            list_to_append = [key for key in new_entry if key not in keys]
+            for entry in matching_entries:
+                for key in list_to_append:
+                    entry[key].extend(new_entry[key])
+        return data
 
     @staticmethod
     def append_new_data_if_not_exists(
         old_data: List[Dict], new_data: List[Dict], keys: List[str]
     ) -> List[Dict]:
-        for new_entry in new_data:
-            exists = any(
-                all(new_entry[key] == old_entry[key] for key in keys)
-                for old_entry in old_data
-            )
-            if not exists:
-                old_data.append(new_entry)
-            else:
-                matching_entries = [
-                    old_entry
-                    for old_entry in old_data
-                    if all(new_entry[key] == old_entry[key] for key in keys)
-                ]
-                list_to_append = [key for key in new_entry if key not in keys]
-                if len(list_to_append) > 0:
-                    for entry in matching_entries:
-                        for key in list_to_append:
-                            entry[key].extend(new_entry[key])
-        return old_data
+        return BaseAnalyticsProcessor.merge_into_index(
+            old_data,
+            BaseAnalyticsProcessor.index_by_keys(old_data, keys),
+            new_data,
+            keys,
+        )
 
     def save_analytics(self) -> None:
         file_name = f"analytics_{self.run_date.strftime('%Y-%m-%d')}.json"
         self._save_json(file_name, self.data)
+        self._save_parquet(
+            file_name.replace(".json", ".parquet"), self.data, self.analytics_schema
+        )
         self.save()
         logging.info("Analytics saved to bucket as %s", file_name)
 
@@ -11,12 +11,42 @@
 #     Gbfsvalidationreport,
 #     Gbfsnotice,
 # )
+import pyarrow as pa
+
 from .base_analytics_processor import BaseAnalyticsProcessor
 
+COMPUTED_ON = pa.field("computed_on", pa.list_(pa.string()))
+
 
 class GBFSAnalyticsProcessor(BaseAnalyticsProcessor):
-    def __init__(self, run_date):
-        super().__init__(run_date)
+    metrics_schemas = {
+        "feed_metrics": pa.schema(
+            [
+                pa.field("feed_id", pa.string()),
+                COMPUTED_ON,
+                pa.field("errors_count", pa.list_(pa.int64())),
+            ]
+        ),
+        "versions_metrics": pa.schema(
+            [
+                pa.field("version", pa.string()),
+                COMPUTED_ON,
+                pa.field("feeds_count", pa.list_(pa.int64())),
+            ]
+        ),
+        "notices_metrics": pa.schema(
+            [
+                pa.field("keyword", pa.string()),
+                pa.field("gbfs_file", pa.string()),
+                pa.field("schema_path", pa.string()),
+                COMPUTED_ON,
+                pa.field("feeds_count", pa.list_(pa.int64())),
+            ]
+        ),
+    }
+
+    def __init__(self, run_date, incremental: bool = True):
+        super().__init__(run_date, incremental)
         self.versions_metrics_data = []
 
     # def get_latest_data(self, db_session: Session) -> sqlalchemy.orm.Query:
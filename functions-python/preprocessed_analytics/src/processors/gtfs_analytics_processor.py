@@ -1,5 +1,6 @@
 from typing import List
 
+import pyarrow as pa
 import sqlalchemy
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.session import Session
@@ -15,10 +16,70 @@ from shared.database_gen.sqlacodegen_models import (
 )
 from .base_analytics_processor import BaseAnalyticsProcessor
 
+# Dates of the metrics files are kept as the ISO strings of their JSON version, so both reload to
+# the same values.
+COMPUTED_ON = pa.field("computed_on", pa.list_(pa.string()))
+LOCATION = pa.struct(
+    [
+        pa.field("country_code", pa.string()),
+        pa.field("country", pa.string()),
+        pa.field("municipality", pa.string()),
+        pa.field("subdivision_name", pa.string()),
+    ]
+)
+
 
 class GTFSAnalyticsProcessor(BaseAnalyticsProcessor):
-    def __init__(self, run_date):
-        super().__init__(run_date)
+    analytics_schema = pa.schema(
+        [
+            pa.field("feed_id", pa.string()),
+            pa.field("dataset_id", pa.string()),
+            pa.field(
+                "notices",
+                pa.struct(
+                    [
+                        pa.field("errors", pa.list_(pa.string())),
+                        pa.field("warnings", pa.list_(pa.string())),
+                        pa.field("infos", pa.list_(pa.string())),
+                    ]
+                ),
+            ),
+            pa.field("features", pa.list_(pa.string())),
+            pa.field("created_on", pa.timestamp("us", tz="UTC")),
+            pa.field("last_modified", pa.timestamp("us", tz="UTC")),
+            pa.field("provider", pa.string()),
+            pa.field("locations", pa.list_(LOCATION)),
+        ]
+    )
+    metrics_schemas = {
+        "feed_metrics": pa.schema(
+            [
+                pa.field("feed_id", pa.string()),
+                COMPUTED_ON,
+                pa.field("errors_count", pa.list_(pa.int64())),
+                pa.field("warnings_count", pa.list_(pa.int64())),
+                pa.field("infos_count", pa.list_(pa.int64())),
+            ]
+        ),
+        "features_metrics": pa.schema(
+            [
+                pa.field("feature", pa.string()),
+                COMPUTED_ON,
+                pa.field("feeds_count", pa.list_(pa.int64())),
+            ]
+        ),
+        "notices_metrics": pa.schema(
+            [
+                pa.field("notice", pa.string()),
+                pa.field("severity", pa.string()),
+                COMPUTED_ON,
+                pa.field("feeds_count", pa.list_(pa.int64())),
+            ]
+        ),
+    }
+
+    def __init__(self, run_date, incremental: bool = True):
+        super().__init__(run_date, incremental)
         self.features_metrics_data = []
 
     def get_latest_data(self, db_session: Session) -> sqlalchemy.orm.Query:
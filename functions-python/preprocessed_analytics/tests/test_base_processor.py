@@ -1,8 +1,12 @@
+import io
+import json
 import os
 import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from processors.base_analytics_processor import (
     BaseAnalyticsProcessor,
@@ -73,6 +77,347 @@ class TestBaseAnalyticsProcessor(unittest.TestCase):
 
         mock_save_json.assert_called_once()
 
+    def test_append_new_data_if_not_exists(self):
+        old_data = [
+            {"notice": "a", "severity": "ERROR", "feeds_count": [1]},
+            {"notice": "a", "severity": "WARNING", "feeds_count": [2]},
+        ]
+        new_data = [
+            {"notice": "a", "severity": "ERROR", "feeds_count": [3]},
+            {"notice": "b", "severity": "ERROR", "feeds_count": [4]},
+            {"notice": "b", "severity": "ERROR", "feeds_count": [5]},
+        ]
+
+        result = BaseAnalyticsProcessor.append_new_data_if_not_exists(
+            old_data, new_data, ["notice", "severity"]
+        )
+
+        self.assertEqual(
+            result,
+            [
+                {"notice": "a", "severity": "ERROR", "feeds_count": [1, 3]},
+                {"notice": "a", "severity": "WARNING", "feeds_count": [2]},
+                {"notice": "b", "severity": "ERROR", "feeds_count": [4, 5]},
+            ],
+        )
+
+    def _summary_blob(self, name, generation=1):
+        blob = MagicMock(generation=generation)
+        blob.name = f"summary/summary_{name}.json"
+        return blob
+
+    def _aggregate(self, blobs, summaries, manifest=None, metrics=None):
+        self.mock_bucket.list_blobs.side_effect = lambda prefix: [
+            blob for blob in blobs if blob.name.startswith(prefix)
+        ]
+        metrics_file_data = {"feed_metrics": []}
+        with patch.object(
+            self.processor, "_load_manifest", return_value=manifest
+        ), patch.object(
+            self.processor,
+            "_load_json",
+            side_effect=lambda name: (summaries[name], None),
+        ) as mock_load_json, patch.object(
+            self.processor,
+            "_load_metrics",
+            side_effect=lambda name: (metrics or {})[name],
+        ), patch.object(
+            self.processor, "_save_json"
+        ) as mock_save_json, patch.object(
+            self.processor, "_save_manifest"
+        ) as mock_save_manifest:
+            self.processor.aggregate_summary_files(
+                metrics_file_data, {"feed_metrics": ["feed_id"]}
+            )
+        return mock_load_json, mock_save_json, mock_save_manifest
+
+    def test_aggregate_summary_files_full(self):
+        blobs = [self._summary_blob("2024-08-22"), self._summary_blob("2024-08-21")]
+        summaries = {
+            "summary/summary_2024-08-21.json": {
+                "feed_metrics": [{"feed_id": "f1", "computed_on": ["2024-08-21"]}]
+            },
+            "summary/summary_2024-08-22.json": {
+                "feed_metrics": [{"feed_id": "f1", "computed_on": ["2024-08-22"]}]
+            },
+        }
+
+        _, mock_save_json, mock_save_manifest = self._aggregate(blobs, summaries)
+
+        mock_save_json.assert_called_once_with(
+            "feed_metrics.json",
+            [{"feed_id": "f1", "computed_on": ["2024-08-21", "2024-08-22"]}],
+        )
+        mock_save_manifest.assert_called_once_with(
+            {
+                "summary/summary_2024-08-21.json": 1,
+                "summary/summary_2024-08-22.json": 1,
+            }
+        )
+
+    def test_aggregate_summary_files_incremental(self):
+        blobs = [self._summary_blob("2024-08-21"), self._summary_blob("2024-08-22")]
+        summaries = {
+            "summary/summary_2024-08-22.json": {
+                "feed_metrics": [{"feed_id": "f1", "computed_on": ["2024-08-22"]}]
+            },
+        }
+        manifest = {
+            "watermark": "summary/summary_2024-08-21.json",
+            "summaries": {"summary/summary_2024-08-21.json": 1},
+        }
+        metrics = {"feed_metrics": [{"feed_id": "f1", "computed_on": ["2024-08-21"]}]}
+
+        mock_load_json, mock_save_json, mock_save_manifest = self._aggregate(
+            blobs, summaries, manifest, metrics
+        )
+
+        # Only the summary not merged yet is read
+        mock_load_json.assert_called_once_with("summary/summary_2024-08-22.json")
+        mock_save_json.assert_called_once_with(
+            "feed_metrics.json",
+            [{"feed_id": "f1", "computed_on": ["2024-08-21", "2024-08-22"]}],
+        )
+        mock_save_manifest.assert_called_once_with(
+            {
+                "summary/summary_2024-08-21.json": 1,
+                "summary/summary_2024-08-22.json": 1,
+            }
+        )
+
+    def test_aggregate_summary_files_nothing_new(self):
+        blobs = [self._summary_blob("2024-08-21")]
+        manifest = {
+            "watermark": "summary/summary_2024-08-21.json",
+            "summaries": {"summary/summary_2024-08-21.json": 1},
+        }
+
+        mock_load_json, mock_save_json, mock_save_manifest = self._aggregate(
+            blobs, {}, manifest
+        )
+
+        mock_load_json.assert_not_called()
+        mock_save_json.assert_not_called()
+        mock_save_manifest.assert_not_called()
+
+    def test_aggregate_summary_files_rewritten_watermark(self):
+        # The watermark summary was written again since it was merged: rebuild everything
+        blobs = [self._summary_blob("2024-08-21", generation=2)]
+        summaries = {
+            "summary/summary_2024-08-21.json": {
+                "feed_metrics": [{"feed_id": "f1", "computed_on": ["2024-08-21"]}]
+            },
+        }
+        manifest = {
+            "watermark": "summary/summary_2024-08-21.json",
+            "summaries": {"summary/summary_2024-08-21.json": 1},
+        }
+
+        _, mock_save_json, _ = self._aggregate(blobs, summaries, manifest)
+
+        mock_save_json.assert_called_once_with(
+            "feed_metrics.json", [{"feed_id": "f1", "computed_on": ["2024-08-21"]}]
+        )
+
+    def test_aggregate_summary_files_backfilled_day(self):
+        # A day older than the watermark was computed after it was merged: the metrics are
+        # rebuilt so the backfilled values are in date order
+        blobs = [
+            self._summary_blob("2024-08-20"),
+            self._summary_blob("2024-08-21"),
+            self._summary_blob("2024-08-22"),
+        ]
+        summaries = {
+            blob.name: {
+                "feed_metrics": [{"feed_id": "f1", "computed_on": [blob.name[16:26]]}]
+            }
+            for blob in blobs
+        }
+        manifest = {
+            "watermark": "summary/summary_2024-08-22.json",
+            "summaries": {
+                "summary/summary_2024-08-21.json": 1,
+                "summary/summary_2024-08-22.json": 1,
+            },
+        }
+
+        _, mock_save_json, mock_save_manifest = self._aggregate(
+            blobs, summaries, manifest
+        )
+
+        mock_save_json.assert_called_once_with(
+            "feed_metrics.json",
+            [
+                {
+                    "feed_id": "f1",
+                    "computed_on": ["2024-08-20", "2024-08-21", "2024-08-22"],
+                }
+            ],
+        )
+        self.assertEqual(len(mock_save_manifest.call_args.args[0]), 3)
+
+    def test_aggregate_summary_files_rewritten_older_day(self):
+        # A merged day before the watermark was processed again
+        blobs = [
+            self._summary_blob("2024-08-21", generation=2),
+            self._summary_blob("2024-08-22"),
+        ]
+        summaries = {
+            blob.name: {
+                "feed_metrics": [{"feed_id": "f1", "computed_on": [blob.name[16:26]]}]
+            }
+            for blob in blobs
+        }
+        manifest = {
+            "watermark": "summary/summary_2024-08-22.json",
+            "summaries": {
+                "summary/summary_2024-08-21.json": 1,
+                "summary/summary_2024-08-22.json": 1,
+            },
+        }
+
+        mock_load_json, _, mock_save_manifest = self._aggregate(
+            blobs, summaries, manifest
+        )
+
+        self.assertEqual(mock_load_json.call_count, 2)
+        mock_save_manifest.assert_called_once_with(
+            {
+                "summary/summary_2024-08-21.json": 2,
+                "summary/summary_2024-08-22.json": 1,
+            }
+        )
+
+    def test_aggregate_summary_files_interrupted_before_manifest(self):
+        self.processor.metrics_schemas = {}
+        files = {}
+        self._bucket_files(files)
+        blobs = [self._summary_blob("2024-08-21")]
+        self.mock_bucket.list_blobs.side_effect = lambda prefix: list(blobs)
+        summaries = {
+            f"summary/summary_{day}.json": {
+                "feed_metrics": [{"feed_id": "f1", "computed_on": [day]}]
+            }
+            for day in ("2024-08-21", "2024-08-22")
+        }
+
+        def aggregate():
+            with patch.object(
+                self.processor,
+                "_load_json",
+                side_effect=lambda name: (summaries[name], None),
+            ):
+                self.processor.aggregate_summary_files(
+                    {"feed_metrics": []}, {"feed_metrics": ["feed_id"]}
+                )
+
+        aggregate()
+        # The next run fails after saving the metrics, before saving the manifest
+        blobs.append(self._summary_blob("2024-08-22"))
+        with patch.object(
+            self.processor, "_save_manifest", side_effect=RuntimeError("crash")
+        ), self.assertRaises(RuntimeError):
+            aggregate()
+        self.assertNotIn("summary/aggregation_manifest.json", files)
+
+        aggregate()
+
+        self.assertEqual(
+            self.processor._load_metrics("feed_metrics"),
+            [{"feed_id": "f1", "computed_on": ["2024-08-21", "2024-08-22"]}],
+        )
+        self.assertEqual(
+            json.loads(files["summary/aggregation_manifest.json"])["summaries"],
+            {
+                "summary/summary_2024-08-21.json": 1,
+                "summary/summary_2024-08-22.json": 1,
+            },
+        )
+
+    def test_parquet_round_trip(self):
+        schema = pa.schema(
+            [
+                pa.field("feed_id", pa.string()),
+                pa.field("computed_on", pa.list_(pa.string())),
+                pa.field("errors_count", pa.list_(pa.int64())),
+            ]
+        )
+        self.processor.metrics_schemas = {"feed_metrics": schema}
+        data = [
+            {
+                "feed_id": "f1",
+                "computed_on": ["2024-08-21T00:00:00.000"],
+                "errors_count": [2],
+            }
+        ]
+        uploaded = MagicMock()
+        self.mock_bucket.blob.return_value = uploaded
+
+        self.processor._save_parquet("feed_metrics.parquet", data, schema)
+
+        content = uploaded.upload_from_string.call_args.args[0]
+        self.assertEqual(pq.read_metadata(io.BytesIO(content)).num_rows, 1)
+        self.assertEqual(
+            pq.read_metadata(io.BytesIO(content)).row_group(0).column(0).compression,
+            "ZSTD",
+        )
+        uploaded.make_public.assert_not_called()
+
+        uploaded.exists.return_value = True
+        uploaded.download_as_bytes.return_value = content
+        self.assertEqual(self.processor._load_metrics("feed_metrics"), data)
+        self.mock_bucket.blob.assert_called_with("feed_metrics.parquet")
+
+    def _bucket_files(self, files):
+        """Backs the blobs of the mock bucket with the files dict (name -> content)."""
+
+        def blob(name):
+            mock_blob = MagicMock()
+            mock_blob.name = name
+            mock_blob.exists.side_effect = lambda: name in files
+            mock_blob.download_as_text.side_effect = lambda: files[name]
+            mock_blob.download_as_bytes.side_effect = lambda: files[name]
+            mock_blob.upload_from_string.side_effect = (
+                lambda content, content_type: files.__setitem__(name, content)
+            )
+            mock_blob.delete.side_effect = lambda: files.pop(name)
+            return mock_blob
+
+        self.mock_bucket.blob.side_effect = blob
+
+    def test_parquet_skipped_when_data_does_not_fit_schema(self):
+        schema = pa.schema([pa.field("feeds_count", pa.list_(pa.int64()))])
+        self.processor.metrics_schemas = {"features_metrics": schema}
+        files = {}
+        self._bucket_files(files)
+        self.processor._save_parquet(
+            "features_metrics.parquet", [{"feeds_count": [1]}], schema
+        )
+        self.assertIn("features_metrics.parquet", files)
+
+        # The data of the next run does not fit the schema: the Parquet file of the previous run
+        # must not be loaded instead of the newer JSON file
+        data = [{"feeds_count": ["many"]}]
+        self.processor._save_json("features_metrics.json", data)
+        self.processor._save_parquet("features_metrics.parquet", data, schema)
+
+        self.assertNotIn("features_metrics.parquet", files)
+        self.assertEqual(self.processor._load_metrics("features_metrics"), data)
+
+    def test_parquet_skipped_when_data_has_fields_not_in_schema(self):
+        schema = pa.schema([pa.field("feed_id", pa.string())])
+        self.processor.metrics_schemas = {"feed_metrics": schema}
+        files = {}
+        self._bucket_files(files)
+        data = [{"feed_id": "f1", "new_metric": [3]}]
+
+        self.processor._save_json("feed_metrics.json", data)
+        self.processor._save_parquet("feed_metrics.parquet", data, schema)
+
+        # Reloading from Parquet would drop new_metric
+        self.assertNotIn("feed_metrics.parquet", files)
+        self.assertEqual(self.processor._load_metrics("feed_metrics"), data)
+
     @patch("processors.base_analytics_processor.BaseAnalyticsProcessor.get_latest_data")
     @patch(
         "processors.base_analytics_processor.BaseAnalyticsProcessor.process_feed_data"
@@ -124,11 +124,18 @@ class TestGBFSAnalyticsProcessor(unittest.TestCase):
             MagicMock(),
         )
 
-        self.mock_bucket.list_blobs.return_value = [
-            MagicMock(name="summary/summary_2024-08-22.json"),
-            MagicMock(name="feed_metrics/feed_metrics_2024-08-22.json"),
-            MagicMock(name="versions_metrics/versions_metrics_2024-08-22.json"),
-        ]
+        blobs = []
+        for name in [
+            "summary/summary_2024-08-22.json",
+            "feed_metrics/feed_metrics_2024-08-22.json",
+            "versions_metrics/versions_metrics_2024-08-22.json",
+        ]:
+            blob = MagicMock(generation=1)
+            blob.name = name
+            blobs.append(blob)
+        self.mock_bucket.list_blobs.return_value = blobs
+        # No aggregation manifest: every summary file is merged
+        self.mock_bucket.blob.return_value.exists.return_value = False
         self.processor.save()
         self.assertEqual(mock_load_json.call_count, 3)
         self.assertEqual(mock_save_blob.call_count, 3)
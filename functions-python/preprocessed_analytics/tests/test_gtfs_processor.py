@@ -125,11 +125,18 @@ class TestGTFSAnalyticsProcessor(unittest.TestCase):
         )
 
         # Mock the list_blobs method to return some blobs
-        self.mock_bucket.list_blobs.return_value = [
-            MagicMock(name="summary/summary_2024-08-22.json"),
-            MagicMock(name="feed_metrics/feed_metrics_2024-08-22.json"),
-            MagicMock(name="features_metrics/features_metrics_2024-08-22.json"),
-        ]
+        blobs = []
+        for name in [
+            "summary/summary_2024-08-22.json",
+            "feed_metrics/feed_metrics_2024-08-22.json",
+            "features_metrics/features_metrics_2024-08-22.json",
+        ]:
+            blob = MagicMock(generation=1)
+            blob.name = name
+            blobs.append(blob)
+        self.mock_bucket.list_blobs.return_value = blobs
+        # No aggregation manifest: every summary file is merged
+        self.mock_bucket.blob.return_value.exists.return_value = False
 
         # Call save
         self.processor.save()
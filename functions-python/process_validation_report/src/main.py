@@ -17,7 +17,11 @@
 import os
 import logging
 from datetime import datetime
+from typing import List, Optional
+
+import ijson
 import requests
+from sqlalchemy import distinct, func, insert, select, update
 from sqlalchemy.orm import Session
 
 from shared.database.database import with_db_session
@@ -41,6 +45,21 @@ from shared.common.gcp_utils import create_web_revalidation_task
 init_logger()
 
 FILES_ENDPOINT = os.getenv("FILES_ENDPOINT")
+# When enabled (default), the JSON report is parsed incrementally and notices are written with a
+# single multi-row INSERT instead of one ORM entity per notice attached to dataset.notices.
+STREAMING_INGEST_ENV = "VALIDATION_REPORT_STREAMING_INGEST"
+# Notice fields kept by the streaming parser, everything else (e.g. sampleNotices) is skipped.
+STREAMED_NOTICE_FIELDS = ("code", "severity", "totalNotices")
+# Number of validation reports updated per transaction by compute_validation_report_counters.
+COUNTERS_BATCH_SIZE = 1000
+
+
+def is_streaming_ingest_enabled():
+    """
+    Returns True unless streaming ingestion is disabled with VALIDATION_REPORT_STREAMING_INGEST.
+    """
+    value = os.getenv(STREAMING_INGEST_ENV, "true").strip().lower()
+    return value not in ("false", "0", "no", "off")
 
 
 def read_json_report(json_report_url):
@@ -54,6 +73,60 @@ def read_json_report(json_report_url):
     return response.json(), response.status_code
 
 
+def stream_json_report(json_report_url):
+    """
+    Fetches the JSON report and parses it incrementally.
+    The response body is never held in memory as a whole: `summary` is materialized and only the
+    code, severity and totalNotices of each notice are kept.
+
+    :param json_report_url: URL to the JSON report
+    :return: Dict with the `summary` and the pruned `notices` of the report, and the status code
+    """
+    response = requests.get(json_report_url, stream=True)
+    try:
+        if response.status_code != 200:
+            return None, response.status_code
+        # Let urllib3 undo any Content-Encoding (e.g. gzip) while reading the raw stream
+        response.raw.decode_content = True
+        return parse_json_report_stream(response.raw), response.status_code
+    finally:
+        response.close()
+
+
+def parse_json_report_stream(stream):
+    """
+    Parses a JSON report from a file-like object without building the whole document.
+
+    :param stream: File-like object returning the JSON report bytes
+    :return: Dict with the `summary` and the pruned `notices` of the report
+    """
+    summary = {}
+    notices = []
+    summary_builder = None
+    notice = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if prefix == "summary" and event == "start_map":
+            summary_builder = ijson.ObjectBuilder()
+        if summary_builder is not None:
+            summary_builder.event(event, value)
+            if prefix == "summary" and event == "end_map":
+                summary = summary_builder.value
+                summary_builder = None
+            continue
+
+        if prefix == "notices.item":
+            if event == "start_map":
+                notice = {}
+            elif event == "end_map":
+                notices.append(notice)
+                notice = None
+        elif notice is not None and prefix.startswith("notices.item."):
+            field = prefix[len("notices.item.") :]
+            if field in STREAMED_NOTICE_FIELDS:
+                notice[field] = value
+    return {"summary": summary, "notices": notices}
+
+
 def get_feature(feature_name, session):
     """
     Retrieves a Feature object by its name from the database.
@@ -84,14 +157,18 @@ def get_dataset(dataset_stable_id, session):
     )
 
 
-def validate_json_report(json_report_url):
+def validate_json_report(json_report_url, streaming=False):
     """
     Validates the JSON report by fetching and reading it.
     :param json_report_url: The URL of the JSON report
+    :param streaming: If True, the report is parsed incrementally with stream_json_report
     :return: Tuple containing the JSON report or an error message and the status code
     """
     try:
-        json_report, code = read_json_report(json_report_url)
+        if streaming:
+            json_report, code = stream_json_report(json_report_url)
+        else:
+            json_report, code = read_json_report(json_report_url)
         if code != 200:
             logging.error("Error reading JSON report: %s", code)
             return f"Error reading JSON report at url {json_report_url}.", code
@@ -125,7 +202,13 @@ def parse_json_report(json_report):
 
 
 def generate_report_entities(
-    version, validated_at, json_report, dataset_stable_id, session, feed_stable_id
+    version,
+    validated_at,
+    json_report,
+    dataset_stable_id,
+    session,
+    feed_stable_id,
+    notice_rows: Optional[List[dict]] = None,
 ):
     """
     Creates validation report entities based on the JSON report.
@@ -135,7 +218,10 @@ def generate_report_entities(
     :param dataset_stable_id: Stable ID of the dataset
     :param session: The database session
     :param feed_stable_id: Stable ID of the feed
-    :return: List of entities created
+    :param notice_rows: If given, notices are appended to this list as Notice column mappings for
+     insert_notices instead of being attached to dataset.notices as entities
+    :return: List of entities created. The counters of the report are computed from its notices by
+     recompute_validation_report_counters once they are written.
     """
     entities = []
     report_id = f"{dataset_stable_id}_{version}"
@@ -178,6 +264,20 @@ def generate_report_entities(
         feature.validations.append(validation_report_entity)
         entities.append(feature)
 
+    if notice_rows is not None:
+        # The dataset.notices relationship is never loaded.
+        for notice in json_report["notices"]:
+            notice_rows.append(
+                {
+                    "dataset_id": dataset.id,
+                    "validation_report_id": report_id,
+                    "notice_code": notice["code"],
+                    "severity": notice["severity"],
+                    "total_notices": notice["totalNotices"],
+                }
+            )
+        return entities
+
     for notice in json_report["notices"]:
         notice_entity = Notice(
             dataset_id=dataset.id,
@@ -188,27 +288,19 @@ def generate_report_entities(
         )
         dataset.notices.append(notice_entity)
         entities.append(notice_entity)
-
-    # Process notices and compute counters
-    populate_counters(dataset.notices, validation_report_entity)
     return entities
 
 
-def populate_counters(notices, validation_report_entity):
+def insert_notices(session, notice_rows):
     """
-    Populates the validation report entity with counters based on the notices.
-    :param notices: Notices
-    :param validation_report_entity: validation report entity
+    Writes the notices with a single multi-row INSERT.
+    The validation report referenced by the rows must already be flushed.
+    :param session: The database session
+    :param notice_rows: Notice column mappings built by generate_report_entities
     """
-    counters = process_validation_report_notices(notices)
-
-    # Update the validation report entity with computed counters
-    validation_report_entity.total_info = counters["total_info"]
-    validation_report_entity.total_warning = counters["total_warning"]
-    validation_report_entity.total_error = counters["total_error"]
-    validation_report_entity.unique_info_count = counters["unique_info_count"]
-    validation_report_entity.unique_warning_count = counters["unique_warning_count"]
-    validation_report_entity.unique_error_count = counters["unique_error_count"]
+    if not notice_rows:
+        return
+    session.execute(insert(Notice).values(notice_rows))
 
 
 def populate_service_date(dataset, json_report, timezone=None):
@@ -251,7 +343,8 @@ def create_validation_report_entities(
         f"{FILES_ENDPOINT}/{feed_stable_id}/{dataset_stable_id}/report_{version}.json"
     )
     logging.info(f"Accessing JSON report at {json_report_url}.")
-    json_report, code = validate_json_report(json_report_url)
+    streaming = is_streaming_ingest_enabled()
+    json_report, code = validate_json_report(json_report_url, streaming=streaming)
     if code != 200:
         return json_report, code
 
@@ -263,6 +356,7 @@ def create_validation_report_entities(
     try:
         # Generate the database entities required for the report
         # If an error is thrown we should let the retry mechanism to do its work
+        notice_rows = [] if streaming else None
         entities = generate_report_entities(
             # default to the version parameter
             version_from_json if version_from_json else version,
@@ -271,6 +365,7 @@ def create_validation_report_entities(
             dataset_stable_id,
             db_session,
             feed_stable_id,
+            notice_rows=notice_rows,
         )
 
         for entity in entities:
@@ -278,6 +373,19 @@ def create_validation_report_entities(
         # In this case the report entities are already in the DB or cannot be saved for other reasons
         # In any case, this will fail in any retried event
         try:
+            if entities:
+                db_session.flush()
+                if notice_rows:
+                    insert_notices(db_session, notice_rows)
+                    logging.info("Inserted %s notices.", len(notice_rows))
+                recompute_validation_report_counters(
+                    db_session,
+                    [
+                        entity.id
+                        for entity in entities
+                        if isinstance(entity, Validationreport)
+                    ],
+                )
             logging.info("Committing %s entities to the database.", len(entities))
             db_session.commit()
             logging.info("Entities committed successfully.")
@@ -313,7 +421,7 @@ def create_validation_report_entities(
                 revalidation_error,
             )
 
-        result = f"Created {len(entities)} entities."
+        result = f"Created {len(entities) + len(notice_rows or [])} entities."
         logging.info(result)
         return result, 200
     except Exception as error:
@@ -379,95 +487,106 @@ def compute_validation_report_counters(request, db_session: Session):
     Compute the total number of errors, warnings, and info notices,
     as well as the number of distinct codes for each severity level
     across all validation reports in the database, and write the results to the database.
+    By default only the reports with notices and no counters yet are updated, the request body can
+    set `recompute_all` to true to refresh every report with notices, and `batch_size` to change
+    the number of reports updated per transaction.
     """
-    batch_size = 100  # Number of reports to process in each batch
-    offset = 0
+    request_json = request.get_json(silent=True)
+    if not isinstance(request_json, dict):
+        request_json = {}
+    batch_size = int(request_json.get("batch_size", COUNTERS_BATCH_SIZE))
+    recompute_all = bool(request_json.get("recompute_all", False))
+
     notice_exists = (
-        db_session.query(Notice)
-        .filter(Notice.validation_report_id == Validationreport.id)
+        select(Notice.validation_report_id)
+        .where(Notice.validation_report_id == Validationreport.id)
         .exists()
     )
+    candidates = select(Validationreport.id).where(notice_exists)
+    if not recompute_all:
+        candidates = candidates.where(
+            (Validationreport.unique_info_count == 0)
+            & (Validationreport.unique_warning_count == 0)
+            & (Validationreport.unique_error_count == 0)
+        )
 
+    # Keyset pagination on the primary key: updated reports leaving the filter cannot shift the
+    # next page, unlike an increasing OFFSET.
+    last_id = None
+    updated = 0
     while True:
-        validation_reports = (
-            db_session.query(Validationreport)
-            .filter(
-                (Validationreport.unique_info_count == 0)
-                & (Validationreport.unique_warning_count == 0)
-                & (Validationreport.unique_error_count == 0)
-                & notice_exists
-            )
-            .order_by(Validationreport.validated_at.desc())
-            .limit(batch_size)
-            .offset(offset)
-            .all()
-        )
-        logging.info(
-            "Processing %s validation reports from offset: %s.",
-            len(validation_reports),
-            offset,
-        )
-        # Break the loop if no more reports are found
-        if len(validation_reports) == 0:
+        page = candidates.order_by(Validationreport.id).limit(batch_size)
+        if last_id is not None:
+            page = page.where(Validationreport.id > last_id)
+        report_ids = db_session.execute(page).scalars().all()
+        if not report_ids:
             break
 
-        for report in validation_reports:
-            populate_counters(report.notices, report)
-            logging.info(
-                "Updated ValidationReport %s with counters: "
-                "INFO=%s, WARNING=%s, ERROR=%s, "
-                "Unique INFO Code=%s, Unique WARNING Code=%s, "
-                "Unique ERROR Code=%s",
-                report.id,
-                report.total_info,
-                report.total_warning,
-                report.total_error,
-                report.unique_info_count,
-                report.unique_warning_count,
-                report.unique_error_count,
-            )
-
-        # Commit the changes for the current batch
+        updated += recompute_validation_report_counters(db_session, report_ids)
         db_session.commit()
+        logging.info(
+            "Updated counters of %s validation reports up to %s.",
+            len(report_ids),
+            report_ids[-1],
+        )
 
-        # Last page
-        if len(validation_reports) < batch_size:
+        if len(report_ids) < batch_size:
             break
+        last_id = report_ids[-1]
 
-    return {"message": "Validation report counters computed successfully."}, 200
+    return {
+        "message": "Validation report counters computed successfully.",
+        "updated_reports": updated,
+    }, 200
 
 
-def process_validation_report_notices(notices):
+def recompute_validation_report_counters(db_session: Session, report_ids) -> int:
     """
-    Processes the notices of a validation report and computes counters for different severities.
-
-    :param report: A Validationreport object containing associated notices.
-    :return: A dictionary with computed counters for total and unique counts of INFO, WARNING, and ERROR severities.
+    Recomputes the counters of the given validation reports from their notices with a single
+    UPDATE ... FROM (SELECT ... GROUP BY validation_report_id) statement.
+    Reports without notices are left untouched. The caller owns the transaction.
+    :param db_session: The database session
+    :param report_ids: IDs of the validation reports to update
+    :return: Number of validation reports updated
     """
-    # Initialize counters for the current report
-    total_info, total_warning, total_error = 0, 0, 0
-    info_codes, warning_codes, error_codes = set(), set(), set()
+    if not report_ids:
+        return 0
 
-    # Process associated notices
-    for notice in notices:
-        match notice.severity:
-            case "INFO":
-                total_info += notice.total_notices
-                info_codes.add(notice.notice_code)
-            case "WARNING":
-                total_warning += notice.total_notices
-                warning_codes.add(notice.notice_code)
-            case "ERROR":
-                total_error += notice.total_notices
-                error_codes.add(notice.notice_code)
-            case _:
-                logging.warning("Unknown severity: %s", notice.severity)
+    def total(severity):
+        return func.coalesce(
+            func.sum(Notice.total_notices).filter(Notice.severity == severity), 0
+        )
 
-    return {
-        "total_info": total_info,
-        "total_warning": total_warning,
-        "total_error": total_error,
-        "unique_info_count": len(info_codes),
-        "unique_warning_count": len(warning_codes),
-        "unique_error_count": len(error_codes),
-    }
+    def unique(severity):
+        return func.count(distinct(Notice.notice_code)).filter(
+            Notice.severity == severity
+        )
+
+    counters = (
+        select(
+            Notice.validation_report_id.label("validation_report_id"),
+            total("INFO").label("total_info"),
+            total("WARNING").label("total_warning"),
+            total("ERROR").label("total_error"),
+            unique("INFO").label("unique_info_count"),
+            unique("WARNING").label("unique_warning_count"),
+            unique("ERROR").label("unique_error_count"),
+        )
+        .where(Notice.validation_report_id.in_(report_ids))
+        .group_by(Notice.validation_report_id)
+        .subquery()
+    )
+    result = db_session.execute(
+        update(Validationreport)
+        .where(Validationreport.id == counters.c.validation_report_id)
+        .values(
+            total_info=counters.c.total_info,
+            total_warning=counters.c.total_warning,
+            total_error=counters.c.total_error,
+            unique_info_count=counters.c.unique_info_count,
+            unique_warning_count=counters.c.unique_warning_count,
+            unique_error_count=counters.c.unique_error_count,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -1,3 +1,5 @@
+import io
+import json
 import unittest
 from unittest import mock
 from unittest.mock import MagicMock, patch
@@ -10,11 +12,15 @@ from shared.database_gen.sqlacodegen_models import (
     Feature,
     Gtfsdataset,
     Gtfsfeed,
+    Notice,
     Validationreport,
 )
 
 from test_shared.test_utils.database_utils import default_db_url
-from main import compute_validation_report_counters
+from main import (
+    compute_validation_report_counters,
+    recompute_validation_report_counters,
+)
 from main import (
     read_json_report,
     get_feature,
@@ -22,11 +28,22 @@ from main import (
     create_validation_report_entities,
     process_validation_report,
     populate_service_date,
+    parse_json_report_stream,
+    stream_json_report,
 )
 
 faker = Faker()
 
 
+def mock_report_response(report, status_code=200):
+    """Mocked requests response serving the report for both read_json_report and stream_json_report."""
+    return MagicMock(
+        status_code=status_code,
+        json=lambda: report,
+        raw=io.BytesIO(json.dumps(report).encode()),
+    )
+
+
 class TestValidationReportProcessor(unittest.TestCase):
     @mock.patch("requests.get")
     def test_read_json_report_success(self, mock_get):
@@ -103,9 +120,8 @@ class TestValidationReportProcessor(unittest.TestCase):
     @with_db_session(db_url=default_db_url)
     def test_create_validation_report_entities(self, mock_get, db_session):
         """Test create_validation_report_entities function."""
-        mock_get.return_value = MagicMock(
-            status_code=200,
-            json=lambda: {
+        mock_get.return_value = mock_report_response(
+            {
                 "summary": {
                     "validatedAt": "2021-01-01T00:00:00Z",
                     "validatorVersion": "1.0",
@@ -114,7 +130,7 @@ class TestValidationReportProcessor(unittest.TestCase):
                 "notices": [
                     {"code": "notice_code", "severity": "ERROR", "totalNotices": 1}
                 ],
-            },
+            }
         )
         feed_stable_id = faker.word()
         dataset_stable_id = faker.word()
@@ -150,9 +166,8 @@ class TestValidationReportProcessor(unittest.TestCase):
     @mock.patch("requests.get")
     def test_create_validation_report_entities_json_error1(self, mock_get):
         """Test create_validation_report_entities function with a JSON error."""
-        mock_get.return_value = MagicMock(
-            status_code=400,
-            json=lambda: {
+        mock_get.return_value = mock_report_response(
+            {
                 "summary": {
                     "validatedAt": "2021-01-01T00:00:00Z",
                     "validatorVersion": "1.0",
@@ -162,6 +177,7 @@ class TestValidationReportProcessor(unittest.TestCase):
                     {"code": "notice_code", "severity": "ERROR", "totalNotices": 1}
                 ],
             },
+            status_code=400,
         )
         feed_stable_id = faker.word()
         dataset_stable_id = faker.word()
@@ -188,9 +204,8 @@ class TestValidationReportProcessor(unittest.TestCase):
         """
         Test the create_validation_report_entities function when the dataset is not found in the DB
         """
-        mock_get.return_value = MagicMock(
-            status_code=200,
-            json=lambda: {
+        mock_get.return_value = mock_report_response(
+            {
                 "summary": {
                     "validatedAt": "2021-01-01T00:00:00Z",
                     "validatorVersion": "1.0",
@@ -199,7 +214,7 @@ class TestValidationReportProcessor(unittest.TestCase):
                 "notices": [
                     {"code": "notice_code", "severity": "ERROR", "totalNotices": 1}
                 ],
-            },
+            }
         )
         feed_stable_id = faker.word()
         dataset_stable_id = "MISSING_ID"
@@ -335,6 +350,72 @@ class TestValidationReportProcessor(unittest.TestCase):
         self.assertEqual(validation_report.unique_warning_count, 1)
         self.assertEqual(validation_report.unique_error_count, 2)
 
+    @with_db_session(db_url=default_db_url)
+    def test_compute_validation_report_counters_all_in_batches(self, db_session):
+        """Test compute_validation_report_counters pages through every report with notices."""
+        report = Validationreport(
+            id="report_batches", validator_version="6.0.1", total_info=99
+        )
+        dataset = db_session.get(Gtfsdataset, "dataset_1")
+        dataset.validation_reports.append(report)
+        db_session.add_all(
+            [
+                report,
+                Notice(
+                    dataset_id="dataset_1",
+                    validation_report_id="report_batches",
+                    severity="WARNING",
+                    total_notices=7,
+                    notice_code="warning_code_1",
+                ),
+            ]
+        )
+        db_session.commit()
+        try:
+            request = MagicMock()
+            request.get_json.return_value = {"batch_size": 1, "recompute_all": True}
+            response, status = compute_validation_report_counters(request)
+
+            self.assertEqual(status, 200)
+            self.assertEqual(response["updated_reports"], 2)
+            db_session.expire_all()
+            report = db_session.get(Validationreport, "report_batches")
+            self.assertEqual(report.total_info, 0)
+            self.assertEqual(report.total_warning, 7)
+            self.assertEqual(report.unique_warning_count, 1)
+            self.assertEqual(db_session.get(Validationreport, "report1").total_error, 3)
+        finally:
+            db_session.rollback()
+            db_session.query(Notice).filter(
+                Notice.validation_report_id == "report_batches"
+            ).delete()
+            dataset = db_session.get(Gtfsdataset, "dataset_1")
+            dataset.validation_reports.remove(
+                db_session.get(Validationreport, "report_batches")
+            )
+            db_session.query(Validationreport).filter(
+                Validationreport.id == "report_batches"
+            ).delete()
+            db_session.commit()
+
+    @with_db_session(db_url=default_db_url)
+    def test_recompute_validation_report_counters(self, db_session):
+        """Test recompute_validation_report_counters only updates the given reports."""
+        try:
+            updated = recompute_validation_report_counters(
+                db_session, ["report1", "missing_report"]
+            )
+            self.assertEqual(updated, 1)
+            self.assertEqual(recompute_validation_report_counters(db_session, []), 0)
+            db_session.expire_all()
+            report = db_session.get(Validationreport, "report1")
+            self.assertEqual(report.total_info, 5)
+            self.assertEqual(report.total_warning, 3)
+            self.assertEqual(report.total_error, 3)
+            self.assertEqual(report.unique_error_count, 2)
+        finally:
+            db_session.rollback()
+
     @mock.patch("requests.get")
     @with_db_session(db_url=default_db_url)
     def test_create_validation_report_entities_missing_validator_version(
@@ -342,9 +423,8 @@ class TestValidationReportProcessor(unittest.TestCase):
     ):
         """Test create_validation_report_entities function
         when the validator version is missing from the JSON report."""
-        mock_get.return_value = MagicMock(
-            status_code=200,
-            json=lambda: {
+        mock_get.return_value = mock_report_response(
+            {
                 "summary": {
                     "validatedAt": "2021-01-01T00:00:00Z",
                     "gtfsFeatures": ["stops", "routes"],
@@ -352,7 +432,7 @@ class TestValidationReportProcessor(unittest.TestCase):
                 "notices": [
                     {"code": "notice_code", "severity": "ERROR", "totalNotices": 1}
                 ],
-            },
+            }
         )
         feed_stable_id = faker.uuid4()
         dataset_stable_id = faker.uuid4()
@@ -395,9 +475,8 @@ class TestValidationReportProcessor(unittest.TestCase):
         """Test create_validation_report_entities function
         when the validation report already exists."""
         version = "1.0"
-        mock_get.return_value = MagicMock(
-            status_code=200,
-            json=lambda: {
+        mock_get.return_value = mock_report_response(
+            {
                 "summary": {
                     "validatedAt": "2021-01-01T00:00:00Z",
                     "gtfsFeatures": ["stops", "routes"],
@@ -406,7 +485,7 @@ class TestValidationReportProcessor(unittest.TestCase):
                 "notices": [
                     {"code": "notice_code", "severity": "ERROR", "totalNotices": 1}
                 ],
-            },
+            }
         )
         feed_stable_id = faker.word()
         dataset_stable_id = faker.word()
@@ -452,3 +531,120 @@ class TestValidationReportProcessor(unittest.TestCase):
         finally:
             db_session.rollback()
             db_session.close()
+
+    def test_parse_json_report_stream(self):
+        """Test parse_json_report_stream keeps the summary and prunes the notices."""
+        report = {
+            "notices": [
+                {
+                    "code": "missing_feed_info",
+                    "severity": "WARNING",
+                    "totalNotices": 1,
+                    "sampleNotices": [{"filename": "feed_info.txt"}],
+                },
+                {"code": "unknown_column", "severity": "INFO", "totalNotices": 4},
+            ],
+            "summary": {
+                "validatedAt": "2021-01-01T00:00:00Z",
+                "feedInfo": {"feedServiceWindowStart": "2024-01-01"},
+                "gtfsFeatures": ["stops"],
+            },
+        }
+        parsed = parse_json_report_stream(io.BytesIO(json.dumps(report).encode()))
+
+        self.assertEqual(parsed["summary"], report["summary"])
+        self.assertEqual(
+            parsed["notices"],
+            [
+                {
+                    "code": "missing_feed_info",
+                    "severity": "WARNING",
+                    "totalNotices": 1,
+                },
+                {"code": "unknown_column", "severity": "INFO", "totalNotices": 4},
+            ],
+        )
+
+    @mock.patch("requests.get")
+    def test_stream_json_report(self, mock_get):
+        """Test stream_json_report requests a streamed response and closes it."""
+        report = {"summary": {"validatedAt": "2021-01-01T00:00:00Z"}, "notices": []}
+        response = mock_report_response(report)
+        mock_get.return_value = response
+
+        result, status = stream_json_report("http://example.com/report.json")
+
+        self.assertEqual(result, report)
+        self.assertEqual(status, 200)
+        mock_get.assert_called_once_with("http://example.com/report.json", stream=True)
+        response.close.assert_called_once()
+
+    def _assert_notices_ingested(self, db_session, streaming):
+        """Ingests a report and checks its notices and counters."""
+        feed_stable_id = faker.uuid4()
+        dataset_stable_id = faker.uuid4()
+        feed = Gtfsfeed(id=faker.uuid4(), data_type="gtfs", stable_id=feed_stable_id)
+        dataset = Gtfsdataset(
+            id=faker.uuid4(), feed_id=feed.id, stable_id=dataset_stable_id
+        )
+        report = {
+            "summary": {
+                "validatedAt": "2021-01-01T00:00:00Z",
+                "validatorVersion": "1.0",
+                "gtfsFeatures": [],
+            },
+            "notices": [
+                {"code": "code_error", "severity": "ERROR", "totalNotices": 2},
+                {"code": "code_warning", "severity": "WARNING", "totalNotices": 3},
+                {"code": "code_info", "severity": "INFO", "totalNotices": 4},
+            ],
+        }
+        try:
+            db_session.add(feed)
+            db_session.flush()
+            db_session.add(dataset)
+            db_session.flush()
+            feed.latest_dataset_id = dataset.id
+            db_session.commit()
+            with mock.patch(
+                "requests.get", return_value=mock_report_response(report)
+            ), mock.patch.dict(
+                "os.environ",
+                {"VALIDATION_REPORT_STREAMING_INGEST": str(streaming).lower()},
+            ):
+                _, status = create_validation_report_entities(
+                    feed_stable_id, dataset_stable_id, "1.0"
+                )
+            self.assertEqual(status, 200)
+
+            report_id = f"{dataset_stable_id}_1.0"
+            notices = (
+                db_session.query(Notice)
+                .filter(Notice.validation_report_id == report_id)
+                .all()
+            )
+            self.assertEqual(
+                sorted((n.notice_code, n.total_notices) for n in notices),
+                [("code_error", 2), ("code_info", 4), ("code_warning", 3)],
+            )
+            self.assertTrue(all(n.dataset_id == dataset.id for n in notices))
+            validation_report = db_session.get(Validationreport, report_id)
+            self.assertEqual(validation_report.total_error, 2)
+            self.assertEqual(validation_report.total_warning, 3)
+            self.assertEqual(validation_report.total_info, 4)
+            self.assertEqual(validation_report.unique_error_count, 1)
+            self.assertEqual(validation_report.unique_warning_count, 1)
+            self.assertEqual(validation_report.unique_info_count, 1)
+        finally:
+            db_session.rollback()
+            db_session.close()
+
+    @with_db_session(db_url=default_db_url)
+    def test_create_validation_report_entities_streaming(self, db_session):
+        """Test the streaming ingestion inserts the notices and counters of the report."""
+        self._assert_notices_ingested(db_session, streaming=True)
+
+    @with_db_session(db_url=default_db_url)
+    def test_create_validation_report_entities_without_streaming(self, db_session):
+        """Test the entity based ingestion inserts the notices and counters of the report."""
+        self._assert_notices_ingested(db_session, streaming=False)
@@ -60,7 +60,10 @@ from tasks.data_import.odpt.import_odpt_feeds import import_odpt_handler
 from tasks.licenses.populate_licenses import (
     populate_licenses_handler,
 )
-from tasks.web_revalidation.revalidate_feed import revalidate_feed_handler
+from tasks.web_revalidation.revalidate_feed import (
+    revalidate_feed_handler,
+    revalidate_feeds_handler,
+)
 from tasks.feed_availability.check_gtfs_feed_availability import (
     check_gtfs_feed_availability_handler,
 )
@@ -177,6 +180,11 @@ tasks = {
         "description": "Revalidate the website cache for a specific feed detail page.",
         "handler": revalidate_feed_handler,
     },
+    "revalidate_feeds": {
+        "description": "Revalidate the website cache for every feed buffered in "
+        "web_revalidation_request, with chunked multi-feed requests.",
+        "handler": revalidate_feeds_handler,
+    },
     "check_gtfs_feed_availability": {
         "description": (
             "Check availability of active/published GTFS feeds via HTTP HEAD requests "
@@ -217,7 +225,8 @@ tasks = {
     "notifications_dispatch_batch": {
         "description": (
             "Cloud Tasks producer for notification dispatch. Triggered by Cloud "
-            "Scheduler. Resolves cadences, finds active subscriptions (users DB), "
+            "Scheduler. Resolves cadences, plans the due events of every active "
+            "subscription in one query (users DB), "
             "registers a run in TaskExecutionTracker (feeds DB), and enqueues one "
             "'notifications_dispatch' worker task per subscription plus "
             "a single 'notifications_dispatch_monitor' barrier task. "
@@ -229,7 +238,11 @@ tasks = {
             "user_ids (list of user IDs for manual trigger, default []), "
             "force (bypass cadence when user_ids set, default false), "
             "max_retries (default 5), stale_claim_seconds (default 1800), "
-            "monitor_delay_seconds (default 60), deadline_seconds (default 21600)."
+            "monitor_delay_seconds (default 60), deadline_seconds (default 21600), "
+            "subscriptions_per_task (subscriptions per worker task; >1 enables "
+            "batched Brevo sends, default 1), "
+            "plan_events (compute every subscription's due events in one query "
+            "and pass them to workers, default true)."
         ),
         "handler": notifications_dispatch_batch_handler,
     },
@@ -239,7 +252,8 @@ tasks = {
             "events. Lock-free claim-then-send into notification_log (no duplicate "
             "emails under concurrency), sends via Brevo, and marks the run entry "
             "completed/failed in TaskExecutionTracker. "
-            "Parameters: subscription_id (required), run_id (required), "
+            "Parameters: subscription_id (required, or subscription_ids for a "
+            "batch of subscriptions sharing Brevo batch sends), run_id (required), "
             "status_filter, max_retries, stale_claim_seconds."
         ),
         "handler": notifications_dispatch_handler,
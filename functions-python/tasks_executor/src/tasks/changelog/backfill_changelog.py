@@ -27,15 +27,19 @@ The task is:
     which sets disallow_overwrite=False to regenerate even existing changelogs).
   * rate-limited — `limit` caps how many feeds are processed per invocation, and the
     dedicated Cloud Tasks queue throttles the actual comparer invocations.
+  * planned in a single query — the consecutive pairs of every eligible feed and whether
+    they already have a changelog are computed by one SQL statement (see
+    get_backfill_pairs_query), streamed back instead of queried feed by feed.
 """
 
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import exists, func, select
 from sqlalchemy.orm import Session
 
+from shared.common.gcp_utils import HttpTaskSpec, enqueue_http_tasks
 from shared.database.database import with_db_session
 from shared.database_gen.sqlacodegen_models import (
     Feed,
@@ -43,7 +47,7 @@ from shared.database_gen.sqlacodegen_models import (
     Gtfsdataset,
     Gtfsfeed,
 )
-from shared.helpers.utils import create_http_gtfs_datasets_comparer_task
+from shared.helpers.utils import gtfs_datasets_comparer_task_spec
 
 # Default number of most recent datasets to consider per feed. With 3 datasets we
 # compute 2 diffs from consecutive pairs: (d-2 -> d-1) and (d-1 -> latest).
@@ -51,6 +55,10 @@ DEFAULT_DATASETS_PER_FEED: int = 3
 DEFAULT_LIMIT: int = 100
 # Minimum datasets a feed must have to form at least one (base, new) pair.
 MIN_DATASETS_FOR_PAIR: int = 2
+# Rows fetched per round trip while streaming the planned pairs.
+PAIRS_BATCH_SIZE: int = 500
+# Comparer tasks submitted together to enqueue_http_tasks.
+ENQUEUE_BATCH_SIZE: int = 100
 
 
 def get_parameters(payload: dict):
@@ -141,47 +149,111 @@ def get_feeds_query(
     return query.order_by(Feed.stable_id)
 
 
-def get_recent_datasets(
-    db_session: Session, feed_id: str, datasets_per_feed: int
-) -> list[Gtfsdataset]:
-    """Return the `datasets_per_feed` most recent comparable datasets, oldest first.
-
-    Only datasets with extracted GTFS files (gtfsfile rows) are considered, since the
-    comparer reads those pre-extracted files; a dataset without them can't be compared.
-
-    We order by downloaded_at DESC + LIMIT to grab the *most recent* N datasets
-    (ASC + LIMIT would grab the oldest N), then reverse in Python so the list is
-    oldest-first, which lets us build consecutive (base, new) pairs directly.
+def get_backfill_pairs_query(
+    db_session: Session,
+    limit: Optional[int] = DEFAULT_LIMIT,
+    datasets_per_feed: int = DEFAULT_DATASETS_PER_FEED,
+    stable_feed_ids: Optional[list[str]] = None,
+):
+    """Return a statement listing the consecutive (base, new) pairs of every eligible feed.
+
+    Plans the whole backfill in one query instead of one dataset query per feed and one
+    changelog lookup per pair:
+      * feeds: the same feeds as get_feeds_query(min_datasets=2), ordered by stable_id
+        and capped by `limit`;
+      * recent: the `datasets_per_feed` most recent comparable datasets of each feed
+        (row_number() over downloaded_at DESC), comparable meaning downloaded and with
+        extracted GTFS files, since the comparer reads those;
+      * pairs: LAG() over the recent datasets of each feed, ordered by downloaded_at,
+        gives the base dataset of every new dataset but the oldest;
+      * already_done: anti-join flag against gtfs_dataset_changelog.
+
+    Rows are ordered by feed then by new dataset downloaded_at, oldest first, and carry
+    latest_downloaded_at, the downloaded_at of the newest dataset of the feed.
     """
-    datasets = (
-        db_session.query(Gtfsdataset)
-        .filter(
-            Gtfsdataset.feed_id == feed_id,
+    feeds = (
+        get_feeds_query(
+            db_session,
+            stable_feed_ids=stable_feed_ids,
+            min_datasets=MIN_DATASETS_FOR_PAIR,
+        )
+        .with_entities(Feed.id, Feed.stable_id)
+        .limit(limit)
+        .subquery("feeds")
+    )
+    ranked = (
+        select(
+            Gtfsdataset.id,
+            Gtfsdataset.stable_id,
+            Gtfsdataset.feed_id,
+            Gtfsdataset.downloaded_at,
+            func.row_number()
+            .over(
+                partition_by=Gtfsdataset.feed_id,
+                order_by=(Gtfsdataset.downloaded_at.desc(), Gtfsdataset.id.desc()),
+            )
+            .label("recency"),
+        )
+        .where(
+            Gtfsdataset.feed_id.in_(select(feeds.c.id)),
             Gtfsdataset.downloaded_at.isnot(None),
             Gtfsdataset.gtfsfiles.any(),
         )
-        .order_by(Gtfsdataset.downloaded_at.desc())
-        .limit(datasets_per_feed)
-        .all()
+        .subquery("ranked")
+    )
+    # The WHERE clause is applied before the window functions, so LAG() and max() only
+    # see the `datasets_per_feed` most recent datasets of the feed.
+    feed_window = {
+        "partition_by": ranked.c.feed_id,
+        "order_by": (ranked.c.downloaded_at, ranked.c.id),
+    }
+    recent = (
+        select(
+            ranked.c.feed_id,
+            ranked.c.id.label("new_dataset_id"),
+            ranked.c.stable_id.label("new_dataset_stable_id"),
+            ranked.c.downloaded_at,
+            func.lag(ranked.c.id).over(**feed_window).label("base_dataset_id"),
+            func.lag(ranked.c.stable_id)
+            .over(**feed_window)
+            .label("base_dataset_stable_id"),
+            func.max(ranked.c.downloaded_at)
+            .over(partition_by=ranked.c.feed_id)
+            .label("latest_downloaded_at"),
+        )
+        .where(ranked.c.recency <= datasets_per_feed)
+        .subquery("recent")
+    )
+    already_done = exists().where(
+        GtfsDatasetChangelog.base_dataset_id == recent.c.base_dataset_id,
+        GtfsDatasetChangelog.new_dataset_id == recent.c.new_dataset_id,
     )
-    return list(reversed(datasets))
-
-
-def changelog_exists(
-    db_session: Session, base_dataset_id: str, new_dataset_id: str
-) -> bool:
-    """Authoritative idempotency check against the gtfs_dataset_changelog table."""
     return (
-        db_session.query(GtfsDatasetChangelog.id)
-        .filter_by(
-            base_dataset_id=base_dataset_id,
-            new_dataset_id=new_dataset_id,
+        select(
+            feeds.c.stable_id.label("feed_stable_id"),
+            recent.c.base_dataset_stable_id,
+            recent.c.new_dataset_stable_id,
+            recent.c.latest_downloaded_at,
+            already_done.label("already_done"),
         )
-        .first()
-        is not None
+        .join(feeds, feeds.c.id == recent.c.feed_id)
+        .where(recent.c.base_dataset_id.isnot(None))
+        .order_by(feeds.c.stable_id, recent.c.downloaded_at, recent.c.new_dataset_id)
     )
 
 
+def enqueue_comparer_tasks(specs: list[HttpTaskSpec]) -> int:
+    """Enqueue comparer tasks concurrently; returns how many could not be enqueued."""
+    failed = [result for result in enqueue_http_tasks(specs) if not result.ok]
+    for result in failed:
+        logging.error(
+            "Could not enqueue comparer task %s: %s",
+            result.spec.task_name,
+            result.error,
+        )
+    return len(failed)
+
+
 @with_db_session
 def backfill_changelog(
     db_session: Session,
@@ -198,7 +270,8 @@ def backfill_changelog(
     For each eligible GTFS feed, take its `datasets_per_feed` most recent datasets,
     form consecutive (base, new) pairs, and — for each pair without an existing
     changelog row (unless `force`) — dispatch a Cloud Task to the gtfs-datasets-comparer
-    function.
+    function. The pairs of all feeds are planned by a single query and streamed, and the
+    comparer tasks are enqueued concurrently by batches of ENQUEUE_BATCH_SIZE.
 
     Args:
         db_session: SQLAlchemy session (injected by @with_db_session).
@@ -212,7 +285,7 @@ def backfill_changelog(
 
     Returns:
         dict: Summary with feeds processed, pairs found, pairs skipped (already done),
-              and pairs dispatched.
+              pairs dispatched and pairs that failed to enqueue.
     """
     if datasets_per_feed < MIN_DATASETS_FOR_PAIR:
         raise ValueError(
@@ -238,60 +311,72 @@ def backfill_changelog(
         if missing:
             raise ValueError(f"stable_feed_ids not found: {missing}")
 
-    # Only feeds with enough datasets to form at least one pair are processed.
-    query = get_feeds_query(
-        db_session,
-        stable_feed_ids=stable_feed_ids,
-        min_datasets=MIN_DATASETS_FOR_PAIR,
-    )
-    if limit is not None:
-        query = query.limit(limit)
-    feeds = query.all()
-
     feeds_processed = 0
     feeds_skipped_recent = 0
     pairs_found = 0
     pairs_already_done = 0
     pairs_dispatched = 0
+    pairs_failed = 0
     dispatched: list[dict] = []
+    pending: list[HttpTaskSpec] = []
+
+    # stream_results=True iterates the planned pairs without buffering them all at once.
+    pairs = db_session.execute(
+        get_backfill_pairs_query(
+            db_session,
+            limit=limit,
+            datasets_per_feed=datasets_per_feed,
+            stable_feed_ids=stable_feed_ids,
+        ).execution_options(stream_results=True, yield_per=PAIRS_BATCH_SIZE)
+    )
 
-    for feed in feeds:
-        datasets = get_recent_datasets(db_session, feed.id, datasets_per_feed)
-
-        if cutoff is not None and datasets[-1].downloaded_at >= cutoff:
-            # Most recent dataset is newer than the cutoff — feed updated recently, skip.
-            feeds_skipped_recent += 1
+    current_feed_stable_id = None
+    for pair in pairs:
+        if pair.feed_stable_id != current_feed_stable_id:
+            current_feed_stable_id = pair.feed_stable_id
+            if cutoff is None or pair.latest_downloaded_at < cutoff:
+                feeds_processed += 1
+            else:
+                # Most recent dataset is newer than the cutoff — feed updated recently.
+                feeds_skipped_recent += 1
+        if cutoff is not None and pair.latest_downloaded_at >= cutoff:
             continue
 
-        feeds_processed += 1
-
-        for base, new in zip(datasets, datasets[1:]):
-            pairs_found += 1
-            if not force and changelog_exists(db_session, base.id, new.id):
-                pairs_already_done += 1
-                continue
-            pairs_dispatched += 1
-            dispatched.append(
-                {
-                    "feed_stable_id": feed.stable_id,
-                    "base_dataset_stable_id": base.stable_id,
-                    "new_dataset_stable_id": new.stable_id,
-                }
-            )
-            if not dry_run:
-                create_http_gtfs_datasets_comparer_task(
-                    feed_stable_id=feed.stable_id,
-                    base_dataset_stable_id=base.stable_id,
-                    new_dataset_stable_id=new.stable_id,
+        pairs_found += 1
+        if not force and pair.already_done:
+            pairs_already_done += 1
+            continue
+        pairs_dispatched += 1
+        dispatched.append(
+            {
+                "feed_stable_id": pair.feed_stable_id,
+                "base_dataset_stable_id": pair.base_dataset_stable_id,
+                "new_dataset_stable_id": pair.new_dataset_stable_id,
+            }
+        )
+        if not dry_run:
+            pending.append(
+                gtfs_datasets_comparer_task_spec(
+                    feed_stable_id=pair.feed_stable_id,
+                    base_dataset_stable_id=pair.base_dataset_stable_id,
+                    new_dataset_stable_id=pair.new_dataset_stable_id,
                     disallow_overwrite=not force,
                 )
+            )
+            if len(pending) >= ENQUEUE_BATCH_SIZE:
+                pairs_failed += enqueue_comparer_tasks(pending)
+                pending = []
+    if pending:
+        pairs_failed += enqueue_comparer_tasks(pending)
+    pairs_dispatched -= pairs_failed
 
     result = {
         "message": (
             f"{'Dry run: ' if dry_run else ''}"
             f"{feeds_processed} feed(s) processed, {pairs_dispatched} pair(s) "
             f"{'to dispatch' if dry_run else 'dispatched'}, "
-            f"{pairs_already_done} already done."
+            f"{pairs_already_done} already done, "
+            f"{pairs_failed} failed to enqueue."
         ),
         "dry_run": dry_run,
         "force": force,
@@ -300,6 +385,7 @@ def backfill_changelog(
         "pairs_found": pairs_found,
         "pairs_already_done": pairs_already_done,
         "pairs_dispatched": pairs_dispatched,
+        "pairs_failed": pairs_failed,
     }
     if dry_run:
         result["dispatched"] = dispatched
@@ -1,16 +1,19 @@
-import base64
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from google.cloud import storage
-from google.cloud.exceptions import NotFound
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import String, column, update, values
+from sqlalchemy.orm import Session
 
 from shared.database.database import with_db_session
 from shared.database_gen.sqlacodegen_models import Gtfsdataset, Gtfsfeed
+from shared.helpers.gcs_inventory import GcsInventory
 
-BATCH_COMMIT_SIZE = 50
+BATCH_COMMIT_SIZE = 500
+READ_PAGE_SIZE = 1000
 DEFAULT_LIMIT = 10
+DEFAULT_CONCURRENCY = 16
 
 
 def backfill_dataset_hash_md5_handler(payload) -> dict:
@@ -24,6 +27,7 @@ def backfill_dataset_hash_md5_handler(payload) -> dict:
             only_missing_hashes (bool): Skip datasets that already have hash_md5 set. Default: True.
             limit (int | None): Maximum number of datasets to process.
                 Omit or pass null to process all matching datasets without a limit. Default: 10.
+            concurrency (int): Number of threads resolving MD5s from GCS. Default: 16.
 
     Returns:
         dict: Result summary.
@@ -50,6 +54,7 @@ def backfill_dataset_hash_md5_handler(payload) -> dict:
         only_latest=only_latest,
         only_missing_hashes=only_missing_hashes,
         limit=limit,
+        concurrency=int(payload.get("concurrency", DEFAULT_CONCURRENCY)),
     )
 
 
@@ -58,40 +63,91 @@ def _build_blob_path(feed_stable_id: str, dataset_stable_id: str) -> str:
     return f"{feed_stable_id}/{dataset_stable_id}/{dataset_stable_id}.zip"
 
 
-def _read_md5_from_gcs(bucket, blob_path: str) -> str | None:
+def _read_md5_from_gcs(inventory: GcsInventory, blob_path: str) -> str | None:
     """
-    Reads the MD5 hash from a GCS blob and returns it as a hex string.
+    Reads the MD5 hash of a GCS blob from the bucket inventory and returns it as a hex string.
 
     Args:
-        bucket: GCS bucket object.
+        inventory: Inventory of the datasets bucket.
         blob_path: Path to the blob within the bucket.
 
     Returns:
         Hex-encoded MD5 string, or None if the blob is missing or has no MD5.
     """
     try:
-        blob = bucket.blob(blob_path)
-        blob.reload()
-        if blob.md5_hash:
-            return base64.b64decode(blob.md5_hash).hex()
-    except NotFound:
-        logging.warning("GCS blob not found: %s", blob_path)
+        blob = inventory.get(blob_path)
+        if blob is None:
+            logging.warning("GCS blob not found: %s", blob_path)
+            return None
+        return blob.md5_hex
     except Exception as e:
         logging.warning("Failed to read MD5 from GCS blob %s: %s", blob_path, e)
     return None
 
 
 def _build_query(db_session: Session, only_latest: bool, only_missing_hashes: bool):
-    """Build the SQLAlchemy query for datasets to backfill."""
-    query = db_session.query(Gtfsdataset)
+    """
+    Build the SQLAlchemy query of the (dataset id, dataset stable id, feed stable id) rows to
+    backfill.
+    """
+    query = db_session.query(
+        Gtfsdataset.id,
+        Gtfsdataset.stable_id,
+        Gtfsfeed.stable_id.label("feed_stable_id"),
+    )
 
     if only_latest:
         query = query.join(Gtfsfeed, Gtfsfeed.latest_dataset_id == Gtfsdataset.id)
+    else:
+        query = query.join(Gtfsfeed, Gtfsfeed.id == Gtfsdataset.feed_id)
 
     if only_missing_hashes:
         query = query.filter(Gtfsdataset.hash_md5.is_(None))
 
-    return query.options(joinedload(Gtfsdataset.feed))
+    return query
+
+
+def _iter_dataset_pages(query, limit: int | None, page_size: int = READ_PAGE_SIZE):
+    """
+    Yields the rows of query in pages of at most page_size, paginating on the dataset id.
+
+    Keyset pagination keeps every page an index range scan, and rows updated by earlier pages
+    (which no longer match only_missing_hashes) cannot shift later pages as OFFSET would.
+    """
+    last_id = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        page_query = query.order_by(Gtfsdataset.id)
+        if last_id is not None:
+            page_query = page_query.filter(Gtfsdataset.id > last_id)
+        size = page_size if remaining is None else min(page_size, remaining)
+        page = page_query.limit(size).all()
+        if not page:
+            return
+        yield page
+        last_id = page[-1].id
+        if remaining is not None:
+            remaining -= len(page)
+        if len(page) < size:
+            return
+
+
+def _write_md5_hashes(db_session: Session, hashes: list[tuple[str, str]]) -> None:
+    """
+    Sets hash_md5 on the given (dataset id, md5) pairs with a single
+    UPDATE gtfsdataset ... FROM (VALUES ...) statement, and commits.
+    """
+    rows = values(column("id", String), column("hash_md5", String), name="v").data(
+        hashes
+    )
+    db_session.execute(
+        update(Gtfsdataset)
+        .where(Gtfsdataset.id == rows.c.id)
+        .values(hash_md5=rows.c.hash_md5)
+        .execution_options(synchronize_session=False)
+    )
+    db_session.commit()
+    logging.info("Committed batch of %d datasets.", len(hashes))
 
 
 @with_db_session
@@ -101,12 +157,16 @@ def backfill_dataset_hash_md5(
     only_latest: bool = True,
     only_missing_hashes: bool = True,
     limit: int | None = 10,
+    concurrency: int = DEFAULT_CONCURRENCY,
 ) -> dict:
     """
     Backfills the MD5 hash for existing GTFS datasets by reading it from GCS blob metadata.
+    The metadata is listed per feed prefix with a GcsInventory rather than fetched per blob.
 
-    Commits progress in batches of BATCH_COMMIT_SIZE so partial progress is preserved
-    if the function fails mid-run.
+    Runs as a pipeline: datasets are read in keyset-paginated pages, the MD5 of each page is
+    resolved by a pool of `concurrency` threads sharing the inventory, and the hashes found are
+    written with one set-based UPDATE per BATCH_COMMIT_SIZE datasets. Every batch is committed so
+    partial progress is preserved if the function fails mid-run.
 
     Args:
         db_session: SQLAlchemy DB session.
@@ -114,6 +174,7 @@ def backfill_dataset_hash_md5(
         only_latest: Process only datasets that are the latest for their feed.
         only_missing_hashes: Skip datasets that already have hash_md5 set.
         limit: Maximum number of datasets to process. None means no limit.
+        concurrency: Number of threads resolving MD5s from GCS.
 
     Returns:
         dict: Result summary.
@@ -121,9 +182,9 @@ def backfill_dataset_hash_md5(
     bucket_name = os.environ.get("DATASETS_BUCKET_NAME")
 
     query = _build_query(db_session, only_latest, only_missing_hashes)
-    total_candidates = query.count()
 
     if dry_run:
+        total_candidates = query.count()
         logging.info(
             "Dry run: %d datasets eligible for MD5 backfill (limit=%s).",
             total_candidates,
@@ -140,40 +201,42 @@ def backfill_dataset_hash_md5(
             },
         }
 
-    datasets = (query.limit(limit) if limit is not None else query).all()
     gcs_client = storage.Client()
-    bucket = gcs_client.bucket(bucket_name)
+    # One listing per feed instead of one metadata request per dataset
+    inventory = GcsInventory(gcs_client.bucket(bucket_name), match_glob="**/*.zip")
+
+    def resolve(row) -> str | None:
+        return _read_md5_from_gcs(
+            inventory, _build_blob_path(row.feed_stable_id, row.stable_id)
+        )
 
     total_updated = 0
     total_skipped = 0
-    pending_commit: list[Gtfsdataset] = []
-
-    for dataset in datasets:
-        blob_path = _build_blob_path(dataset.feed.stable_id, dataset.stable_id)
-        md5_hex = _read_md5_from_gcs(bucket, blob_path)
-        if not md5_hex:
-            logging.warning(
-                "No MD5 found in GCS for dataset %s (blob: %s).",
-                dataset.stable_id,
-                blob_path,
-            )
-            total_skipped += 1
-            continue
-
-        dataset.hash_md5 = md5_hex
-        pending_commit.append(dataset)
-        total_updated += 1
-        logging.info("Dataset %s: MD5 set to %s", dataset.stable_id, md5_hex)
-
-        if len(pending_commit) >= BATCH_COMMIT_SIZE:
-            db_session.commit()
-            logging.info("Committed batch of %d datasets.", len(pending_commit))
-            pending_commit = []
+    pending_commit: list[tuple[str, str]] = []
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for page in _iter_dataset_pages(query, limit):
+            for row, md5_hex in zip(page, executor.map(resolve, page)):
+                if not md5_hex:
+                    logging.warning(
+                        "No MD5 found in GCS for dataset %s (blob: %s).",
+                        row.stable_id,
+                        _build_blob_path(row.feed_stable_id, row.stable_id),
+                    )
+                    total_skipped += 1
+                    continue
+
+                pending_commit.append((row.id, md5_hex))
+                total_updated += 1
+                logging.info("Dataset %s: MD5 set to %s", row.stable_id, md5_hex)
+
+                if len(pending_commit) >= BATCH_COMMIT_SIZE:
+                    _write_md5_hashes(db_session, pending_commit)
+                    pending_commit = []
 
     # Commit any remaining datasets
     if pending_commit:
-        db_session.commit()
-        logging.info("Committed final batch of %d datasets.", len(pending_commit))
+        _write_md5_hashes(db_session, pending_commit)
 
     result = {
         "message": "MD5 hash backfill completed.",
@@ -184,6 +247,7 @@ def backfill_dataset_hash_md5(
             "only_latest": only_latest,
             "only_missing_hashes": only_missing_hashes,
             "limit": limit,
+            "concurrency": concurrency,
             "bucket_name": bucket_name,
         },
     }
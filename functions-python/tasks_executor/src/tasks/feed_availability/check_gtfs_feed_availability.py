@@ -17,9 +17,10 @@ import logging
 import os
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 
+from sqlalchemy import insert, text
 from sqlalchemy.orm import Session
 
 from shared.database.database import with_db_session
@@ -34,6 +35,22 @@ DEFAULT_CONCURRENCY: int = 15
 DEFAULT_TIMEOUT_SECONDS: int = 20
 DEFAULT_BATCH_SIZE: int = 50
 DEFAULT_FALLBACK_TO_GET: bool = True
+DEFAULT_BULK_INSERT: bool = True
+
+# Columns written by the bulk insert path. id and created_at are filled by the DB defaults.
+AVAILABILITY_CHECK_COLUMNS: tuple[str, ...] = (
+    "feed_id",
+    "checked_at",
+    "request_url",
+    "request_type",
+    "status_code",
+    "latency_ms",
+    "error_message",
+    "error_type",
+    "success",
+    "content_type",
+    "is_zip",
+)
 
 
 def get_feed_credentials(stable_id: str) -> Optional[str]:
@@ -58,6 +75,7 @@ def get_parameters(payload: dict):
     stable_feed_ids = payload.get("stable_feed_ids", None)
     verbose = payload.get("verbose", False)
     fallback_to_get = payload.get("fallback_to_get", DEFAULT_FALLBACK_TO_GET)
+    bulk_insert = payload.get("bulk_insert", DEFAULT_BULK_INSERT)
     return (
         dry_run,
         skip_db_update,
@@ -68,6 +86,7 @@ def get_parameters(payload: dict):
         stable_feed_ids,
         verbose,
         fallback_to_get,
+        bulk_insert,
     )
 
 
@@ -88,6 +107,8 @@ def check_gtfs_feed_availability_handler(payload: dict) -> dict:
                         reason for each failed check. Default: False.
         fallback_to_get (bool): If True, retry failed HEAD requests with a lightweight GET
                                 (reads only 4 bytes to verify ZIP magic bytes). Default: True.
+        bulk_insert (bool): If True, write each batch with a single multi-row INSERT instead of
+                            adding ORM objects to the session. Default: True.
     """
     (
         dry_run,
@@ -99,6 +120,7 @@ def check_gtfs_feed_availability_handler(payload: dict) -> dict:
         stable_feed_ids,
         verbose,
         fallback_to_get,
+        bulk_insert,
     ) = get_parameters(payload)
     return check_gtfs_feed_availability(
         dry_run=dry_run,
@@ -110,6 +132,7 @@ def check_gtfs_feed_availability_handler(payload: dict) -> dict:
         stable_feed_ids=stable_feed_ids,
         verbose=verbose,
         fallback_to_get=fallback_to_get,
+        bulk_insert=bulk_insert,
     )
 
 
@@ -129,16 +152,80 @@ def get_feeds_query(db_session: Session, stable_feed_ids: Optional[list[str]] =
     return query
 
 
+def ensure_availability_check_partitions(
+    db_session: Session, checked_at: datetime
+) -> list[str]:
+    """Create the monthly gtfs_feed_availability_check partitions of checked_at and the next month.
+
+    Rows of a month without partition would land in the default partition, which then blocks the
+    creation of that month's partition, so partitions are created before any write. The next month
+    is included so a run crossing a month boundary still writes to a dedicated partition. The DDL
+    is committed right away to release the lock on the parent table before the HTTP checks start.
+    """
+    next_month = (checked_at.replace(day=1) + timedelta(days=32)).replace(day=1)
+    partition_names = [
+        db_session.execute(
+            text("SELECT create_gtfs_feed_availability_check_partition(:checked_at)"),
+            {"checked_at": month},
+        ).scalar()
+        for month in (checked_at, next_month)
+    ]
+    db_session.commit()
+    return partition_names
+
+
+def refresh_availability_daily_rollup(
+    db_session: Session, from_day: date, to_day: date
+) -> int:
+    """Recompute the gtfs_feed_availability_daily rows of the UTC days in [from_day, to_day].
+
+    Only the raw checks of those days are read, so the cost depends on the days touched by the
+    run and not on the size of the history. Returns the number of roll-up rows written.
+    """
+    rows_written = db_session.execute(
+        text("SELECT refresh_gtfs_feed_availability_daily(:from_day, :to_day)"),
+        {"from_day": from_day, "to_day": to_day},
+    ).scalar()
+    db_session.commit()
+    return rows_written
+
+
+def to_availability_check_row(check: GtfsFeedAvailabilityCheck) -> tuple:
+    """Flatten a check into a plain tuple ordered as AVAILABILITY_CHECK_COLUMNS."""
+    return tuple(getattr(check, column) for column in AVAILABILITY_CHECK_COLUMNS)
+
+
+def bulk_insert_availability_checks(db_session: Session, rows: list[tuple]) -> None:
+    """Insert availability check rows with a single multi-row INSERT statement.
+
+    Bypasses the ORM unit of work: no identity map bookkeeping, no per-row flush and no
+    primary key fetch-back, which makes a batch a single round-trip.
+    """
+    if not rows:
+        return
+    db_session.execute(
+        insert(GtfsFeedAvailabilityCheck).values(
+            [dict(zip(AVAILABILITY_CHECK_COLUMNS, row)) for row in rows]
+        )
+    )
+
+
 def _commit_batch(
     db_session: Session,
     batch: list[GtfsFeedAvailabilityCheck],
     batch_num: int,
     skip_db_update: bool,
+    bulk_insert: bool = DEFAULT_BULK_INSERT,
 ) -> None:
     succeeded = sum(1 for r in batch if r.success)
     failed = len(batch) - succeeded
     if not skip_db_update:
-        db_session.add_all(batch)
+        if bulk_insert:
+            bulk_insert_availability_checks(
+                db_session, [to_availability_check_row(check) for check in batch]
+            )
+        else:
+            db_session.add_all(batch)
         db_session.commit()
         logging.info(
             "Batch %d committed: %d record(s) (%d succeeded, %d failed).",
@@ -182,13 +269,15 @@ def check_gtfs_feed_availability(
     stable_feed_ids: Optional[list[str]] = None,
     verbose: bool = False,
     fallback_to_get: bool = DEFAULT_FALLBACK_TO_GET,
+    bulk_insert: bool = DEFAULT_BULK_INSERT,
 ) -> dict:
     """
     Check availability of non-deprecated/published GTFS feeds via HTTP HEAD and store results.
 
     All feeds are checked concurrently. Results are committed to the DB every
     `batch_size` completions so a failure partway through does not discard
-    previously completed checks.
+    previously completed checks. Once all checks are stored, the daily roll-up
+    (gtfs_feed_availability_daily) of the days covered by the run is refreshed.
 
     Args:
         db_session: SQLAlchemy session (injected by @with_db_session).
@@ -203,6 +292,8 @@ def check_gtfs_feed_availability(
                  reason, content_type, and is_zip for each failed check.
         fallback_to_get: If True, retry failed HEAD requests with a lightweight GET
                          (reads only 4 bytes to verify ZIP magic bytes).
+        bulk_insert: If True, each batch is written with one multi-row INSERT; otherwise the
+                     check objects are added to the session.
 
     Returns:
         dict: Summary with counts of total, successful, and failed checks.
@@ -238,13 +329,20 @@ def check_gtfs_feed_availability(
     start_time = time.monotonic()
     logging.info(
         "Checking availability for %d GTFS feed(s) "
-        "(concurrency=%d, timeout=%ds, batch_size=%d, skip_db_update=%s).",
+        "(concurrency=%d, timeout=%ds, batch_size=%d, skip_db_update=%s, bulk_insert=%s).",
         total,
         concurrency,
         timeout_seconds,
         batch_size,
         skip_db_update,
+        bulk_insert,
     )
+    run_started_at = datetime.now(timezone.utc)
+    if not skip_db_update and total:
+        partition_names = ensure_availability_check_partitions(
+            db_session, run_started_at
+        )
+        logging.info("Availability check partitions ready: %s.", partition_names)
 
     results: list[GtfsFeedAvailabilityCheck] = []
     batch: list[GtfsFeedAvailabilityCheck] = []
@@ -291,12 +389,20 @@ def check_gtfs_feed_availability(
             batch.append(check)
             if count % batch_size == 0:
                 batch_num += 1
-                _commit_batch(db_session, batch, batch_num, skip_db_update)
+                _commit_batch(db_session, batch, batch_num, skip_db_update, bulk_insert)
                 batch.clear()
 
     if batch:
         batch_num += 1
-        _commit_batch(db_session, batch, batch_num, skip_db_update)
+        _commit_batch(db_session, batch, batch_num, skip_db_update, bulk_insert)
+
+    if not skip_db_update and total:
+        rollup_rows = refresh_availability_daily_rollup(
+            db_session,
+            run_started_at.date(),
+            datetime.now(timezone.utc).date(),
+        )
+        logging.info("Daily availability roll-up refreshed: %s row(s).", rollup_rows)
 
     total_succeeded = sum(1 for r in results if r.success)
     total_failed = total - total_succeeded
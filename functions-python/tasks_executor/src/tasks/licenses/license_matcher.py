@@ -3,7 +3,12 @@ import logging
 from sqlalchemy import asc, func
 from sqlalchemy.orm import Session
 
-from shared.common.license_utils import resolve_license, MatchingLicense
+from shared.common.license_utils import (
+    LicenseIndex,
+    MatchingLicense,
+    get_license_index,
+    resolve_license,
+)
 from shared.database.database import with_db_session
 from shared.database_gen.sqlacodegen_models import Feed, FeedLicenseChange
 from shared.helpers.runtime_metrics import track_metrics
@@ -63,10 +68,15 @@ def assign_feed_license(feed: Feed, license_match: MatchingLicense):
         logging.info("Feed %s license unchanged: %s", feed.stable_id, feed.license_id)
 
 
-def process_feed(feed, dry_run, db_session):
-    """Process a single feed to match its license."""
+def process_feed(feed, dry_run, db_session, license_index: LicenseIndex = None):
+    """Process a single feed to match its license.
+
+    When license_index is given, the license catalog lookups are answered from it instead of the DB.
+    """
     result = None
-    license_matches = resolve_license(feed.license_url, db_session=db_session)
+    license_matches = resolve_license(
+        feed.license_url, db_session=db_session, license_index=license_index
+    )
     if license_matches:
         license_first_match = sorted(
             license_matches, key=lambda x: x.confidence, reverse=True
@@ -115,6 +125,8 @@ def process_all_feeds(dry_run: bool, only_unmatched: bool, db_session: Session |
     result = []
     batch_size = 500
     last_id = None
+    # The catalog is loaded and normalized once instead of queried for every feed
+    license_index = get_license_index(db_session)
     i = 0
     total_processed = 0
     while True:
@@ -131,7 +143,7 @@ def process_all_feeds(dry_run: bool, only_unmatched: bool, db_session: Session |
             break
         total_processed += len(batch)
         for feed in batch:
-            feed_match = process_feed(feed, dry_run, db_session)
+            feed_match = process_feed(feed, dry_run, db_session, license_index)
             if feed_match:
                 result.append(feed_match)
         if not dry_run:
@@ -19,14 +19,21 @@
 Triggered by Cloud Scheduler. For each resolved cadence it:
   1. picks a fresh ``run_id`` (cadence + invocation timestamp) so every task name
      is DYNAMIC — re-running never collides with Cloud Tasks' name tombstones;
-  2. finds the active subscriptions for that cadence (users DB);
+  2. computes, in one SQL statement (``plan_due_events``), the events due for
+     every active subscription of that cadence (users DB); subscriptions with
+     nothing due get no worker;
   3. registers the run + one entry per subscription in TaskExecutionTracker
      (feeds DB) and enqueues one ``notifications_dispatch`` Cloud
-     Task each;
+     Task each (or one per ``subscriptions_per_task`` subscriptions, so workers
+     can share Brevo batch requests between recipients), concurrently through
+     ``enqueue_http_tasks``;
   4. enqueues a single ``notifications_dispatch_monitor`` barrier task.
 
 Idempotency is enforced by the DB claim in ``process_subscription`` (lock-free),
-not by task-name dedup — so dynamic names are safe.
+not by task-name dedup — so dynamic names are safe. The same claim makes the
+pre-computed work lists safe to hand to workers even if they are stale by the
+time a worker runs. ``plan_events: false`` falls back to enqueueing every active
+subscription and letting each worker look up its own events.
 
 Payload (all optional)::
 
@@ -36,7 +43,8 @@ Payload (all optional)::
         "status_filter": "new" | "failed" | "all",
         "max_retries": int, "stale_claim_seconds": int,
         "user_ids": [str], "force": bool, "dry_run": bool,
-        "monitor_delay_seconds": int, "deadline_seconds": int
+        "monitor_delay_seconds": int, "deadline_seconds": int,
+        "subscriptions_per_task": int, "plan_events": bool
     }
 """
 
@@ -44,9 +52,10 @@ import json
 import logging
 import os
 import re
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
+from shared.common.gcp_utils import HttpTaskSpec, enqueue_http_tasks
 from shared.database.database import with_db_session
 from shared.database.users_database import with_users_db_session
 from shared.helpers.task_execution.task_execution_tracker import TaskExecutionTracker
@@ -57,12 +66,16 @@ from tasks.notifications.dispatch_notifications import (
     SCHEDULED_CADENCE,
     _resolve_scheduled_cadences,
     find_subscriptions,
+    plan_due_events,
 )
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_MONITOR_DELAY_SECONDS = 60
 DEFAULT_DEADLINE_SECONDS = 6 * 60 * 60  # 6h wall-clock cap for a run
+# 1 keeps one worker task per subscription; larger values group subscriptions
+# into one worker task that batches Brevo sends (see process_subscriptions).
+DEFAULT_SUBSCRIPTIONS_PER_TASK = 1
 
 
 def notifications_dispatch_batch_handler(payload: dict) -> dict:
@@ -98,17 +111,36 @@ def _plan_cadence(
         payload.get("monitor_delay_seconds", DEFAULT_MONITOR_DELAY_SECONDS)
     )
     deadline_seconds = int(payload.get("deadline_seconds", DEFAULT_DEADLINE_SECONDS))
+    subscriptions_per_task = max(
+        1,
+        int(payload.get("subscriptions_per_task", DEFAULT_SUBSCRIPTIONS_PER_TASK)),
+    )
 
     now = datetime.now(timezone.utc)
     run_id = f"{run_cadence}-{now.strftime('%Y%m%dT%H%M%S')}"
 
-    subscriptions = find_subscriptions(
-        db_session=db_session,
-        cadence=run_cadence,
-        user_ids=user_ids,
-        force=force,
-    )
-    subscription_ids = [s.id for s in subscriptions]
+    plan_events = bool(payload.get("plan_events", True))
+    work: Optional[Dict[str, List[str]]] = None
+    if plan_events:
+        work = plan_due_events(
+            db_session=db_session,
+            cadence=run_cadence,
+            user_ids=user_ids,
+            force=force,
+            status_filter=status_filter,
+            max_retries=max_retries,
+            stale_claim_seconds=stale_claim_seconds,
+            now=now,
+        )
+        subscription_ids = list(work)
+    else:
+        subscriptions = find_subscriptions(
+            db_session=db_session,
+            cadence=run_cadence,
+            user_ids=user_ids,
+            force=force,
+        )
+        subscription_ids = [s.id for s in subscriptions]
     logger.info(
         "plan cadence=%s run_id=%s subscriptions=%d dry_run=%s",
         run_cadence,
@@ -117,10 +149,12 @@ def _plan_cadence(
         dry_run,
     )
 
+    planned_events = sum(len(ids) for ids in work.values()) if work else None
     if dry_run or not subscription_ids:
         return {
             "run_id": run_id,
             "subscriptions": len(subscription_ids),
+            "planned_events": planned_events,
             "enqueued": 0,
             "dry_run": dry_run,
         }
@@ -132,27 +166,44 @@ def _plan_cadence(
         "stale_claim_seconds": stale_claim_seconds,
         "run_started_at": now.isoformat(),
         "deadline_seconds": deadline_seconds,
+        "subscriptions_per_task": subscriptions_per_task,
+        "plan_events": plan_events,
     }
     _start_run(run_id, subscription_ids, run_params)
 
-    enqueued = 0
-    for subscription_id in subscription_ids:
+    worker_tasks: List[Tuple[str, dict]] = []
+    chunk_sizes: Dict[str, int] = {}
+    for start in range(0, len(subscription_ids), subscriptions_per_task):
+        chunk = subscription_ids[start : start + subscriptions_per_task]
         worker_payload = {
-            "subscription_id": subscription_id,
             "run_id": run_id,
             "status_filter": status_filter,
             "max_retries": max_retries,
             "stale_claim_seconds": stale_claim_seconds,
         }
-        if _enqueue(
-            in_body_task="notifications_dispatch",
-            payload=worker_payload,
-            queue_env="NOTIFICATION_DISPATCH_QUEUE",
-            task_name=_safe_task_name(
-                f"notifications-dispatch-{run_id}-{subscription_id}"
-            ),
-        ):
-            enqueued += 1
+        if subscriptions_per_task == 1:
+            worker_payload["subscription_id"] = chunk[0]
+            if work is not None:
+                worker_payload["event_ids"] = work[chunk[0]]
+            task_name = f"notifications-dispatch-{run_id}-{chunk[0]}"
+        else:
+            worker_payload["subscription_ids"] = chunk
+            if work is not None:
+                worker_payload["event_ids_by_subscription"] = {
+                    subscription_id: work[subscription_id] for subscription_id in chunk
+                }
+            task_name = f"notifications-dispatch-{run_id}-{chunk[0]}-x{len(chunk)}"
+        task_name = _safe_task_name(task_name)
+        worker_tasks.append((task_name, worker_payload))
+        chunk_sizes[task_name] = len(chunk)
+
+    # Workers are enqueued concurrently rather than one blocking RPC at a time.
+    enqueued_names = _enqueue_many(
+        in_body_task="notifications_dispatch",
+        tasks=worker_tasks,
+        queue_env="NOTIFICATION_DISPATCH_QUEUE",
+    )
+    enqueued = sum(chunk_sizes[task_name] for task_name in enqueued_names)
 
     # Single barrier/summary task; polls until the run drains, then emits one
     # admin.event_summary. Delayed slightly so it doesn't fire before workers.
@@ -167,6 +218,7 @@ def _plan_cadence(
     return {
         "run_id": run_id,
         "subscriptions": len(subscription_ids),
+        "planned_events": planned_events,
         "enqueued": enqueued,
         "dry_run": False,
     }
@@ -186,8 +238,7 @@ def _start_run(
         db_session=db_session,
     )
     tracker.start_run(total_count=len(subscription_ids), params=run_params)
-    for subscription_id in subscription_ids:
-        tracker.mark_triggered(subscription_id)
+    tracker.mark_triggered_many(subscription_ids)
     db_session.commit()
 
 
@@ -195,18 +246,14 @@ def _safe_task_name(name: str) -> str:
     return re.sub(r"[^a-zA-Z0-9_-]", "-", name)[:500]
 
 
-def _enqueue(
-    *,
+def _task_spec(
     in_body_task: str,
     payload: dict,
     queue_env: str,
     task_name: str,
     schedule_seconds: int = 0,
-) -> bool:
-    """Enqueue a Cloud Task targeting the tasks_executor function.
-
-    Returns True on enqueue (or already-exists), False when misconfigured.
-    """
+) -> Optional[HttpTaskSpec]:
+    """Spec of a Cloud Task targeting the tasks_executor function, None when misconfigured."""
     project = os.getenv("PROJECT_ID")
     queue = os.getenv(queue_env)
     gcp_region = os.getenv("GCP_REGION")
@@ -218,41 +265,67 @@ def _enqueue(
             queue_env,
             task_name,
         )
-        return False
+        return None
+
+    schedule_time: Optional[datetime] = None
+    if schedule_seconds > 0:
+        run_at = datetime.now(timezone.utc) + timedelta(seconds=schedule_seconds)
+        schedule_time = run_at.replace(tzinfo=None)
+    return HttpTaskSpec(
+        url=(
+            f"https://{gcp_region}-{project}.cloudfunctions.net/"
+            f"tasks_executor-{environment}"
+        ),
+        body=json.dumps({"task": in_body_task, "payload": payload}).encode(),
+        queue_name=queue,
+        task_name=task_name,
+        schedule_time=schedule_time,
+    )
+
+
+def _enqueue_many(
+    *,
+    in_body_task: str,
+    tasks: List[Tuple[str, dict]],
+    queue_env: str,
+) -> List[str]:
+    """Enqueue (task_name, payload) Cloud Tasks targeting the tasks_executor function.
 
+    The tasks are submitted concurrently through enqueue_http_tasks, which retries
+    transient errors. Returns the names of the tasks enqueued (or already existing);
+    none when misconfigured.
+    """
+    specs = [
+        _task_spec(in_body_task, payload, queue_env, task_name)
+        for task_name, payload in tasks
+    ]
+    if not specs or None in specs:
+        return []
     try:
-        from google.cloud import tasks_v2
-        from google.protobuf import timestamp_pb2
-        from datetime import timedelta
-        from shared.common.gcp_utils import create_http_task_with_name
+        results = enqueue_http_tasks(specs)
+    except Exception as e:  # pragma: no cover - network/env dependent
+        logger.warning("_enqueue: could not enqueue %s tasks: %s", in_body_task, e)
+        return []
+    return [result.spec.task_name for result in results if result.ok]
 
-        url = (
-            f"https://{gcp_region}-{project}.cloudfunctions.net/"
-            f"tasks_executor-{environment}"
-        )
-        body = json.dumps({"task": in_body_task, "payload": payload}).encode()
-
-        schedule_time: Optional[Any] = None
-        if schedule_seconds > 0:
-            run_at = datetime.now(timezone.utc) + timedelta(seconds=schedule_seconds)
-            schedule_time = timestamp_pb2.Timestamp()
-            schedule_time.FromDatetime(run_at.replace(tzinfo=None))
-
-        create_http_task_with_name(
-            client=tasks_v2.CloudTasksClient(),
-            body=body,
-            url=url,
-            project_id=project,
-            gcp_region=gcp_region,
-            queue_name=queue,
-            task_name=task_name,
-            task_time=schedule_time,
-            http_method=tasks_v2.HttpMethod.POST,
-        )
-        return True
+
+def _enqueue(
+    *,
+    in_body_task: str,
+    payload: dict,
+    queue_env: str,
+    task_name: str,
+    schedule_seconds: int = 0,
+) -> bool:
+    """Enqueue a Cloud Task targeting the tasks_executor function.
+
+    Returns True on enqueue (or already-exists), False when misconfigured or failed.
+    """
+    spec = _task_spec(in_body_task, payload, queue_env, task_name, schedule_seconds)
+    if spec is None:
+        return False
+    try:
+        return all(result.ok for result in enqueue_http_tasks([spec]))
     except Exception as e:  # pragma: no cover - network/env dependent
-        if "already exists" in str(e).lower() or "ALREADY_EXISTS" in str(e):
-            logger.info("_enqueue: task %s already exists — skipping", task_name)
-            return True
         logger.warning("_enqueue: could not enqueue %s: %s", task_name, e)
         return False
@@ -27,10 +27,13 @@ from __future__ import annotations
 import logging
 import time
 import uuid
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, not_, or_, select, update
+from sqlalchemy import and_, case, exists, func, not_, or_, select, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
@@ -38,8 +41,14 @@ from shared.database.users_database import with_users_db_session
 from shared.notifications.brevo_notification_sender import (
     BrevoSendError,
     EmailRecipient,
+    PreparedEmail,
+    get_brevo_batch_max_versions,
     get_brevo_rate_limiter,
+    prepare_digest,
+    prepare_single,
+    send_batch,
     send_digest,
+    send_prepared,
     send_single,
 )
 from shared.notifications.notification_constants import (
@@ -52,6 +61,7 @@ from shared.notifications.notification_constants import (
 from shared.users_database_gen.sqlacodegen_models import (
     AppUser,
     NotificationEvent,
+    NotificationEventFeed,
     NotificationLog,
     NotificationSubscription,
 )
@@ -124,11 +134,49 @@ def _commit_delivery_logs(db_session, subscription) -> None:
         db_session.rollback()
 
 
+def _commit_batch_delivery_logs(db_session, template_id: int, size: int) -> None:
+    """Durably persist the notification_log rows written for one Brevo batch.
+
+    Same best-effort semantics as ``_commit_delivery_logs``.
+    """
+    try:
+        db_session.commit()
+    except Exception:
+        logger.exception(
+            "Failed to commit notification logs for batch (template %s, %d emails); "
+            "rolling back",
+            template_id,
+            size,
+        )
+        db_session.rollback()
+
+
 # ---------------------------------------------------------------------------
 # Query helpers
 # ---------------------------------------------------------------------------
 
 
+def _subscription_criteria(cadence: str, user_ids: List[str], force: bool) -> List:
+    """WHERE criteria selecting the subscriptions a dispatch run processes.
+
+    ``api.announcements`` subscriptions are excluded: that notification type is
+    delivered through Brevo contact lists (managed at opt-in time), not by this
+    dispatcher, so it must never be batched into a dispatch run.
+    """
+    criteria = [
+        NotificationSubscription.active == True,  # noqa: E712
+        NotificationSubscription.notification_type_id
+        != NotificationTypeId.API_ANNOUNCEMENTS,
+    ]
+    if not (force and user_ids):
+        # Normal (non-forced) run: filter by cadence.
+        if cadence != "all":
+            criteria.append(NotificationSubscription.cadence == cadence)
+    if user_ids:
+        criteria.append(NotificationSubscription.user_id.in_(user_ids))
+    return criteria
+
+
 def find_subscriptions(
     *,
     db_session: Session,
@@ -138,26 +186,131 @@ def find_subscriptions(
 ) -> List[NotificationSubscription]:
     """Return active subscriptions matching the cadence (or all if force=True).
 
-    ``api.announcements`` subscriptions are excluded: that notification type is
-    delivered through Brevo contact lists (managed at opt-in time), not by this
-    dispatcher, so it must never be batched into a dispatch run.
+    ``api.announcements`` subscriptions are excluded (see ``_subscription_criteria``).
     """
-    q = (
+    return (
         db_session.query(NotificationSubscription)
         .join(AppUser, NotificationSubscription.user_id == AppUser.id)
-        .filter(NotificationSubscription.active == True)  # noqa: E712
-        .filter(
-            NotificationSubscription.notification_type_id
-            != NotificationTypeId.API_ANNOUNCEMENTS
+        .filter(*_subscription_criteria(cadence, user_ids, force))
+        .all()
+    )
+
+
+def plan_due_events(
+    *,
+    db_session: Session,
+    cadence: str,
+    user_ids: List[str],
+    force: bool,
+    status_filter: str,
+    max_retries: int,
+    stale_claim_seconds: int = DEFAULT_STALE_CLAIM_SECONDS,
+    now: Optional[datetime] = None,
+) -> Dict[str, List[str]]:
+    """Return the event ids due per subscription for a run, in ONE SQL statement.
+
+    Set-based equivalent of calling ``find_subscriptions`` and then
+    ``find_events_for_subscription`` for each subscription: every (subscription,
+    event) pair of the same notification type is joined against the
+    subscription's notification_log row and kept when it is
+
+    * new — no log row and created on or after ``active_since``
+      (``status_filter`` 'new' / 'all'),
+    * a stale ``pending`` claim below ``max_retries`` (always), or
+    * ``failed`` below ``max_retries`` (``status_filter`` 'failed' / 'all'),
+
+    and when one of the event's feeds is in ``filter_params.feed_ids`` (if the
+    subscription has a non-empty feed filter; see ``apply_filter_params``).
+
+    Returns ``{subscription_id: [event_id, ...]}`` with events oldest first.
+    Subscriptions with nothing due are absent. The result is only a work list:
+    workers still claim each event, so a stale plan can never cause a duplicate.
+    """
+    now = now or datetime.now(timezone.utc)
+    stale_before = now - timedelta(seconds=stale_claim_seconds)
+
+    # filter_params.feed_ids only filters when it is a non-empty JSON array.
+    feed_ids = NotificationSubscription.filter_params["feed_ids"]
+    feed_ids_count = case(
+        (func.jsonb_typeof(feed_ids) == "array", func.jsonb_array_length(feed_ids)),
+        else_=0,
+    )
+    feed_match = exists().where(
+        NotificationEventFeed.notification_event_id == NotificationEvent.id,
+        feed_ids.has_key(NotificationEventFeed.feed_stable_id),
+    )
+
+    due = [
+        and_(
+            NotificationLog.status == NotificationLogStatus.PENDING,
+            NotificationLog.retry_count < max_retries,
+            NotificationLog.sent_at < stale_before,
+        )
+    ]
+    if status_filter in ("new", "all"):
+        due.append(
+            and_(
+                NotificationLog.id.is_(None),
+                NotificationEvent.created_at
+                >= func.coalesce(
+                    NotificationSubscription.active_since,
+                    NotificationSubscription.created_at,
+                ),
+            )
+        )
+    if status_filter in ("failed", "all"):
+        due.append(
+            and_(
+                NotificationLog.status == NotificationLogStatus.FAILED,
+                NotificationLog.retry_count < max_retries,
+            )
+        )
+
+    stmt = (
+        select(NotificationSubscription.id, NotificationEvent.id)
+        .select_from(NotificationSubscription)
+        .join(AppUser, NotificationSubscription.user_id == AppUser.id)
+        .join(
+            NotificationEvent,
+            NotificationEvent.notification_type_id
+            == NotificationSubscription.notification_type_id,
+        )
+        .outerjoin(
+            NotificationLog,
+            and_(
+                NotificationLog.notification_event_id == NotificationEvent.id,
+                NotificationLog.subscription_id == NotificationSubscription.id,
+                NotificationLog.channel == "email",
+            ),
+        )
+        .where(
+            *_subscription_criteria(cadence, user_ids, force),
+            or_(feed_ids_count == 0, feed_match),
+            or_(*due),
+        )
+        .order_by(
+            NotificationSubscription.id,
+            NotificationEvent.created_at,
+            NotificationEvent.id,
         )
     )
-    if not (force and user_ids):
-        # Normal (non-forced) run: filter by cadence.
-        if cadence != "all":
-            q = q.filter(NotificationSubscription.cadence == cadence)
-    if user_ids:
-        q = q.filter(NotificationSubscription.user_id.in_(user_ids))
-    return q.all()
+
+    plan: Dict[str, List[str]] = {}
+    for subscription_id, event_id in db_session.execute(stmt):
+        plan.setdefault(subscription_id, []).append(event_id)
+    return plan
+
+
+def _load_events(db_session: Session, event_ids: List[str]) -> List[NotificationEvent]:
+    """Load a planned work list of events, oldest first."""
+    if not event_ids:
+        return []
+    return (
+        db_session.query(NotificationEvent)
+        .filter(NotificationEvent.id.in_(event_ids))
+        .order_by(NotificationEvent.created_at.asc(), NotificationEvent.id.asc())
+        .all()
+    )
 
 
 def find_events_for_subscription(
@@ -410,7 +563,26 @@ def _send_and_log_digest(
     """Attempt to send a digest email; write or update NotificationLog rows for all events."""
     # For digests: attempt the send once; apply the same result to all event logs.
     error = _attempt_send(lambda: send_digest(recipient, events, subscription))
+    _record_outcome(
+        db_session=db_session,
+        events=events,
+        subscription=subscription,
+        error=error,
+        stats=stats,
+        max_retries=max_retries,
+    )
+
 
+def _record_outcome(
+    *,
+    db_session: Session,
+    events: List[NotificationEvent],
+    subscription: NotificationSubscription,
+    error: Optional[str],
+    stats: Dict[str, int],
+    max_retries: int,
+) -> None:
+    """Apply the result of one email attempt to the NotificationLog row of every event it covered."""
     # Count each event exactly once across the sent / failed / skipped / permanently
     # buckets so the admin.event_summary stats stay accurate.
     for event in events:
@@ -615,23 +787,23 @@ def _new_stats() -> Dict[str, int]:
     }
 
 
-@with_users_db_session
-def process_subscription(
+def _claim_subscription_events(
     *,
+    db_session: Session,
     subscription_id: str,
-    status_filter: str = "new",
-    max_retries: int = DEFAULT_MAX_RETRIES,
-    stale_claim_seconds: int = DEFAULT_STALE_CLAIM_SECONDS,
-    db_session: Session = None,
-) -> Dict[str, int]:
-    """Process a single subscription's pending notifications (Cloud Tasks worker).
-
-    Finds candidate events, atomically claims each (claim-then-send, so concurrent
-    workers never duplicate an email), sends via Brevo, and commits the log after
-    every send so an already-delivered email can never be rolled back.
+    status_filter: str,
+    max_retries: int,
+    stale_claim_seconds: int,
+    stats: Dict[str, int],
+    event_ids: Optional[List[str]] = None,
+) -> Optional[Tuple[NotificationSubscription, EmailRecipient, List[NotificationEvent]]]:
+    """Find and claim a subscription's pending events.
+
+    Returns ``(subscription, recipient, claimed_events)``, or None when there is
+    nothing for this worker to send. The claims are committed before returning so
+    a crash can't lose them. ``event_ids`` is the work list computed by
+    ``plan_due_events``; when None, the candidates are looked up here.
     """
-    stats = _new_stats()
-
     subscription = (
         db_session.query(NotificationSubscription)
         .filter(NotificationSubscription.id == subscription_id)
@@ -642,7 +814,7 @@ def process_subscription(
             "process_subscription: %s missing or inactive; nothing to do",
             subscription_id,
         )
-        return stats
+        return None
 
     user = subscription.user
     if user is None or not user.email:
@@ -650,18 +822,21 @@ def process_subscription(
             "process_subscription: subscription %s has no usable user/email",
             subscription_id,
         )
-        return stats
+        return None
 
-    events = find_events_for_subscription(
-        db_session=db_session,
-        subscription=subscription,
-        status_filter=status_filter,
-        max_retries=max_retries,
-        stale_claim_seconds=stale_claim_seconds,
-    )
-    stats["events_found"] = len(events)
+    if event_ids is not None:
+        events = _load_events(db_session, event_ids)
+    else:
+        events = find_events_for_subscription(
+            db_session=db_session,
+            subscription=subscription,
+            status_filter=status_filter,
+            max_retries=max_retries,
+            stale_claim_seconds=stale_claim_seconds,
+        )
+    stats["events_found"] += len(events)
     if not events:
-        return stats
+        return None
 
     # Claim every candidate atomically; only the events this worker wins proceed.
     claimed: List[NotificationEvent] = []
@@ -680,11 +855,45 @@ def process_subscription(
         claimed.append(event)
     # Persist the claims before sending so a crash can't lose them.
     _commit_delivery_logs(db_session, subscription)
-    stats["events_claimed"] = len(claimed)
+    stats["events_claimed"] += len(claimed)
     if not claimed:
-        return stats
+        return None
 
     recipient = EmailRecipient(email=user.email, name=user.full_name)
+    return subscription, recipient, claimed
+
+
+@with_users_db_session
+def process_subscription(
+    *,
+    subscription_id: str,
+    status_filter: str = "new",
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    stale_claim_seconds: int = DEFAULT_STALE_CLAIM_SECONDS,
+    event_ids: Optional[List[str]] = None,
+    db_session: Session = None,
+) -> Dict[str, int]:
+    """Process a single subscription's pending notifications (Cloud Tasks worker).
+
+    Finds candidate events (or loads the ``event_ids`` work list computed by
+    ``plan_due_events``), atomically claims each (claim-then-send, so concurrent
+    workers never duplicate an email), sends via Brevo, and commits the log after
+    every send so an already-delivered email can never be rolled back.
+    """
+    stats = _new_stats()
+
+    claim = _claim_subscription_events(
+        db_session=db_session,
+        subscription_id=subscription_id,
+        status_filter=status_filter,
+        max_retries=max_retries,
+        stale_claim_seconds=stale_claim_seconds,
+        stats=stats,
+        event_ids=event_ids,
+    )
+    if claim is None:
+        return stats
+    subscription, recipient, claimed = claim
 
     if subscription.digest:
         _send_and_log_digest(
@@ -719,6 +928,129 @@ def process_subscription(
     return stats
 
 
+# ---------------------------------------------------------------------------
+# Worker core, batch mode: claim-then-send for several subscriptions, sharing
+# Brevo requests between recipients of the same template
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _PendingEmail:
+    """One email to send and the claimed events whose logs record its outcome."""
+
+    subscription: NotificationSubscription
+    events: List[NotificationEvent]
+    email: PreparedEmail
+
+
+@with_users_db_session
+def process_subscriptions(
+    *,
+    subscription_ids: List[str],
+    status_filter: str = "new",
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    stale_claim_seconds: int = DEFAULT_STALE_CLAIM_SECONDS,
+    event_ids_by_subscription: Optional[Dict[str, List[str]]] = None,
+    db_session: Session = None,
+) -> Dict[str, int]:
+    """Process several subscriptions, batching emails that share a Brevo template.
+
+    Events are claimed per subscription exactly like ``process_subscription``
+    (from the ``plan_due_events`` work lists in ``event_ids_by_subscription``
+    when given).
+    Emails rendered by a Brevo template are then grouped by template id and sent
+    ``get_brevo_batch_max_versions()`` recipients at a time through
+    ``send_batch`` (one Brevo request, one rate-limiter token per batch). The
+    outcome of a batch is recorded on the notification_log row of every event
+    of every recipient in it and committed once per batch. Emails on the HTML
+    fallback (no template configured) cannot be batched and are sent one by one.
+    """
+    stats = _new_stats()
+    stats["brevo_requests"] = 0
+    by_template: Dict[int, List[_PendingEmail]] = defaultdict(list)
+
+    for subscription_id in subscription_ids:
+        claim = _claim_subscription_events(
+            db_session=db_session,
+            subscription_id=subscription_id,
+            status_filter=status_filter,
+            max_retries=max_retries,
+            stale_claim_seconds=stale_claim_seconds,
+            stats=stats,
+            event_ids=(
+                event_ids_by_subscription.get(subscription_id, [])
+                if event_ids_by_subscription is not None
+                else None
+            ),
+        )
+        if claim is None:
+            continue
+        subscription, recipient, claimed = claim
+
+        if subscription.digest:
+            pending = [
+                _PendingEmail(
+                    subscription=subscription,
+                    events=claimed,
+                    email=prepare_digest(recipient, claimed, subscription),
+                )
+            ]
+        else:
+            pending = [
+                _PendingEmail(
+                    subscription=subscription,
+                    events=[event],
+                    email=prepare_single(recipient, event, subscription),
+                )
+                for event in claimed
+            ]
+
+        for item in pending:
+            if item.email.template_id is not None:
+                by_template[item.email.template_id].append(item)
+                continue
+            error = _attempt_send(partial(send_prepared, item.email))
+            stats["brevo_requests"] += 1
+            _record_outcome(
+                db_session=db_session,
+                events=item.events,
+                subscription=item.subscription,
+                error=error,
+                stats=stats,
+                max_retries=max_retries,
+            )
+            _commit_delivery_logs(db_session, item.subscription)
+
+    max_versions = get_brevo_batch_max_versions()
+    for template_id, items in by_template.items():
+        for start in range(0, len(items), max_versions):
+            chunk = items[start : start + max_versions]
+            error = _attempt_send(partial(send_batch, [i.email for i in chunk]))
+            stats["brevo_requests"] += 1
+            for item in chunk:
+                _record_outcome(
+                    db_session=db_session,
+                    events=item.events,
+                    subscription=item.subscription,
+                    error=error,
+                    stats=stats,
+                    max_retries=max_retries,
+                )
+            _commit_batch_delivery_logs(db_session, template_id, len(chunk))
+
+    logger.info(
+        "process_subscriptions (%d subscriptions): found=%d claimed=%d sent=%d "
+        "failed=%d brevo_requests=%d",
+        len(subscription_ids),
+        stats["events_found"],
+        stats["events_claimed"],
+        stats["emails_sent"],
+        stats["emails_failed"],
+        stats["brevo_requests"],
+    )
+    return stats
+
+
 # ---------------------------------------------------------------------------
 # admin.event_summary
 # ---------------------------------------------------------------------------
@@ -14,10 +14,11 @@
 #  limitations under the License.
 #
 
-"""Cloud Tasks worker: process a single subscription's pending notifications.
+"""Cloud Tasks worker: process a subscription's pending notifications.
 
 One ``notifications_dispatch`` task is enqueued per subscription by
-the ``notifications_dispatch_batch`` producer. The worker claims-then-sends each
+the ``notifications_dispatch_batch`` producer (or per group of
+``subscriptions_per_task`` subscriptions, see batch mode below). The worker claims-then-sends each
 pending event (so concurrent workers never duplicate an email — see
 ``process_subscription``) and reports completion to the shared
 ``TaskExecutionTracker`` so the monitor knows when the run has drained.
@@ -27,10 +28,19 @@ them durably in ``notification_log`` and they are retried by later scheduled
 runs. The worker only raises (→ HTTP 500 → Cloud Tasks retry) on unexpected
 infrastructure errors, so a retry re-claims any stale/unfinished work.
 
+Batch mode: when the payload carries ``subscription_ids`` instead of
+``subscription_id``, the subscriptions are processed by
+``process_subscriptions``, which sends the emails sharing a Brevo template with
+one API call per batch of recipients. Every subscription of the task is then
+reported to the tracker with the same outcome.
+
 Payload::
 
     {
-        "subscription_id": str,   # required
+        "subscription_id": str,   # required (or "subscription_ids")
+        "subscription_ids": [str],  # batch mode, replaces subscription_id
+        "event_ids": [str],       # optional work list from plan_due_events
+        "event_ids_by_subscription": {str: [str]},  # same, batch mode
         "run_id": str,            # required — TaskExecutionTracker run id
         "status_filter": str,     # optional, default "new"
         "max_retries": int,       # optional, default DEFAULT_MAX_RETRIES
@@ -39,7 +49,7 @@ Payload::
 """
 
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 
 from shared.database.database import with_db_session
 from shared.helpers.task_execution.task_execution_tracker import TaskExecutionTracker
@@ -48,6 +58,7 @@ from tasks.notifications.dispatch_notifications import (
     DEFAULT_STALE_CLAIM_SECONDS,
     DISPATCH_TASK_NAME,
     process_subscription,
+    process_subscriptions,
 )
 
 logger = logging.getLogger(__name__)
@@ -56,8 +67,9 @@ logger = logging.getLogger(__name__)
 def notifications_dispatch_handler(payload: dict) -> dict:
     """Entry point for the ``notifications_dispatch`` task."""
     subscription_id = (payload or {}).get("subscription_id")
+    subscription_ids = (payload or {}).get("subscription_ids") or []
     run_id = (payload or {}).get("run_id")
-    if not subscription_id:
+    if not subscription_id and not subscription_ids:
         raise ValueError("subscription_id is required")
 
     status_filter = payload.get("status_filter", "new")
@@ -66,30 +78,70 @@ def notifications_dispatch_handler(payload: dict) -> dict:
         payload.get("stale_claim_seconds", DEFAULT_STALE_CLAIM_SECONDS)
     )
 
+    if subscription_ids:
+        return _dispatch_subscriptions(
+            run_id,
+            subscription_ids,
+            status_filter,
+            max_retries,
+            stale_claim_seconds,
+            payload.get("event_ids_by_subscription"),
+        )
+
     try:
         stats = process_subscription(
             subscription_id=subscription_id,
             status_filter=status_filter,
             max_retries=max_retries,
             stale_claim_seconds=stale_claim_seconds,
+            event_ids=payload.get("event_ids"),
         )
     except Exception as error:  # infra failure — let Cloud Tasks retry
         logger.exception("notifications_dispatch failed for %s", subscription_id)
-        _mark_entry(run_id, subscription_id, error=str(error))
+        _mark_entries(run_id, [subscription_id], error=str(error))
         raise
 
-    _mark_entry(run_id, subscription_id)
+    _mark_entries(run_id, [subscription_id])
     return {"status": "ok", "subscription_id": subscription_id, **stats}
 
 
+def _dispatch_subscriptions(
+    run_id: Optional[str],
+    subscription_ids: List[str],
+    status_filter: str,
+    max_retries: int,
+    stale_claim_seconds: int,
+    event_ids_by_subscription: Optional[Dict[str, List[str]]] = None,
+) -> dict:
+    """Batch mode: process several subscriptions in one task."""
+    try:
+        stats = process_subscriptions(
+            subscription_ids=subscription_ids,
+            status_filter=status_filter,
+            max_retries=max_retries,
+            stale_claim_seconds=stale_claim_seconds,
+            event_ids_by_subscription=event_ids_by_subscription,
+        )
+    except Exception as error:  # infra failure — let Cloud Tasks retry
+        logger.exception(
+            "notifications_dispatch failed for %d subscriptions", len(subscription_ids)
+        )
+        _mark_entries(run_id, subscription_ids, error=str(error))
+        raise
+
+    _mark_entries(run_id, subscription_ids)
+    return {"status": "ok", "subscription_ids": subscription_ids, **stats}
+
+
 @with_db_session
-def _mark_entry(
+def _mark_entries(
     run_id: Optional[str],
-    subscription_id: str,
+    subscription_ids: List[str],
     error: Optional[str] = None,
     db_session=None,
 ) -> None:
-    """Record this subscription's completion in the run's TaskExecutionTracker.
+    """Record the completion of the task's subscriptions in the run's
+    TaskExecutionTracker, with one update and one commit for all of them.
 
     No-op when ``run_id`` is absent (e.g. a manual single-subscription trigger).
     """
@@ -101,7 +153,12 @@ def _mark_entry(
         db_session=db_session,
     )
     if error is None:
-        tracker.mark_completed(subscription_id)
+        tracker.mark_completed_many(subscription_ids)
     else:
-        tracker.mark_failed(subscription_id, error_message=error)
+        tracker.mark_failed_many(
+            subscription_ids,
+            error_messages={
+                subscription_id: error for subscription_id in subscription_ids
+            },
+        )
     db_session.commit()
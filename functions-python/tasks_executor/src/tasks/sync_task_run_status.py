@@ -183,6 +183,8 @@ def _sync_workflow_statuses(
         len(triggered_entries),
     )
     client = executions_v1.ExecutionsClient()
+    completed_ids = []
+    failed_errors = {}
 
     for entry in triggered_entries:
         try:
@@ -190,7 +192,7 @@ def _sync_workflow_statuses(
             state = execution.state
 
             if state == executions_v1.Execution.State.SUCCEEDED:
-                tracker.mark_completed(entry.entity_id)
+                completed_ids.append(entry.entity_id)
                 logging.info(
                     "Execution %s SUCCEEDED for entity %s",
                     entry.execution_ref,
@@ -201,7 +203,7 @@ def _sync_workflow_statuses(
                 executions_v1.Execution.State.CANCELLED,
             ):
                 error_msg = getattr(execution.error, "payload", str(state))
-                tracker.mark_failed(entry.entity_id, error_message=error_msg)
+                failed_errors[entry.entity_id] = error_msg
                 logging.warning(
                     "Execution %s %s for entity %s: %s",
                     entry.execution_ref,
@@ -214,3 +216,7 @@ def _sync_workflow_statuses(
             logging.error(
                 "Error fetching execution status for %s: %s", entry.execution_ref, e
             )
+
+    # Record the settled executions with one statement per status
+    tracker.mark_completed_many(completed_ids)
+    tracker.mark_failed_many(list(failed_errors), error_messages=failed_errors)
@@ -31,6 +31,7 @@ from shared.database_gen.sqlacodegen_models import (
     Gtfsdataset,
     Validationreport,
 )
+from shared.helpers.gcs_inventory import GcsInventory
 from shared.helpers.gtfs_validator_common import (
     get_gtfs_validator_results_bucket,
     get_gtfs_validator_url,
@@ -384,18 +385,21 @@ def _filter_out_datasets_without_blob(
     Filter out datasets whose zip file does not exist in GCS.
     This avoids triggering workflows for feeds that have no data to validate.
 
+    Existence is answered by a GcsInventory: the zip files of a feed are listed once, the first
+    time one of its datasets is checked, instead of one metadata request per dataset.
     When limit is provided, stops as soon as limit valid datasets are found,
-    avoiding unnecessary GCS calls for the remaining candidates.
+    avoiding listing the feeds of the remaining candidates.
     """
     storage_client = storage.Client()
-    bucket = storage_client.bucket(datasets_bucket_name)
+    inventory = GcsInventory(
+        storage_client.bucket(datasets_bucket_name), match_glob="**/*.zip"
+    )
     valid = []
     for feed_id, dataset_id in datasets:
         if limit is not None and len(valid) >= limit:
             break
         try:
-            blob = bucket.blob(f"{feed_id}/{dataset_id}/{dataset_id}.zip")
-            if blob.exists():
+            if inventory.exists(f"{feed_id}/{dataset_id}/{dataset_id}.zip"):
                 valid.append((feed_id, dataset_id))
             else:
                 logging.warning(
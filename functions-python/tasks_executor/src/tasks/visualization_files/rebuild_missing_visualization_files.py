@@ -15,6 +15,8 @@
 #
 
 import logging
+from collections import Counter
+from datetime import datetime, timezone
 from typing import List, Final, Optional
 
 from sqlalchemy import func, distinct
@@ -22,7 +24,8 @@ from sqlalchemy.orm import Session, selectinload
 
 from shared.database.database import with_db_session
 from shared.database_gen.sqlacodegen_models import Gtfsfeed, Gtfsdataset, Gtfsfile
-from shared.helpers.utils import create_http_pmtiles_builder_task
+from shared.common.gcp_utils import enqueue_http_tasks
+from shared.helpers.utils import pmtiles_builder_task_spec
 
 REQUIRED_FILES: Final[List[str]] = [
     "stops.txt",
@@ -45,6 +48,9 @@ def rebuild_missing_visualization_files_handler(payload) -> dict:
         "include_feed_op_status": list[str],  # [optional] List of feed operational statuses to include
          # e.g., ["published", "wip"]. Default is ["published"].
         "limit": int,  # [optional] Limit the number of datasets to process
+        "run_id": str,  # [optional] Scope of the task names, default: rebuild-<UTC date>.
+         # A dataset is enqueued once per run_id, so re-running the same day skips the datasets
+         # already enqueued; pass another run_id to enqueue them again.
     }
     Args:
         payload (dict): The payload containing the task details.
@@ -58,6 +64,7 @@ def rebuild_missing_visualization_files_handler(payload) -> dict:
         include_deprecated_feeds,
         include_feed_op_status,
         limit,
+        run_id,
     ) = get_parameters(payload)
 
     return rebuild_missing_visualization_files(
@@ -67,6 +74,7 @@ def rebuild_missing_visualization_files_handler(payload) -> dict:
         include_feed_op_status=include_feed_op_status,
         include_deprecated_feeds=include_deprecated_feeds,
         limit=limit,
+        run_id=run_id,
     )
 
 
@@ -78,6 +86,7 @@ def rebuild_missing_visualization_files(
     include_deprecated_feeds: bool = False,
     include_feed_op_status: list[str] = ["published"],
     limit: Optional[int] = None,
+    run_id: Optional[str] = None,
     db_session: Session | None = None,
 ) -> dict:
     """
@@ -89,6 +98,8 @@ def rebuild_missing_visualization_files(
         include_deprecated_feeds (bool): If True, include datasets from deprecated feeds. Default: False
         include_feed_op_status (list[str]): List of feed operational statuses to include. Default: ['published']
         limit (Optional[int]): Limit the number of datasets to process. Default: None (no limit)
+        run_id (Optional[str]): Scope of the task names, a dataset is enqueued once per run_id.
+            Default: rebuild-<UTC date>
         db_session: DB session
 
     Returns:
@@ -139,12 +150,38 @@ def rebuild_missing_visualization_files(
     total_processed = len(tasks_to_create)
     logging.info("Total datasets to process: %s", total_processed)
 
+    run_id = run_id or f"rebuild-{datetime.now(timezone.utc):%Y%m%d}"
+    task_counts = Counter()
     # Create tasks to rebuild visualization files
     if not dry_run:
-        for task in tasks_to_create:
-            create_http_pmtiles_builder_task(
-                task["feed_stable_id"], task["dataset_stable_id"]
+        results = enqueue_http_tasks(
+            [
+                pmtiles_builder_task_spec(
+                    task["feed_stable_id"], task["dataset_stable_id"], run_id
+                )
+                for task in tasks_to_create
+            ]
+        )
+        task_counts.update(result.status for result in results)
+        skipped = [
+            result.spec.task_name
+            for result in results
+            if result.status == "already_exists"
+        ]
+        if skipped:
+            logging.info(
+                "Skipped %s dataset(s) already enqueued in run %s: %s",
+                len(skipped),
+                run_id,
+                skipped,
             )
+        for result in results:
+            if not result.ok:
+                logging.error(
+                    "Failed to enqueue task %s: %s",
+                    result.spec.task_name,
+                    result.error,
+                )
 
     message = (
         "Dry run: no datasets processed."
@@ -154,12 +191,18 @@ def rebuild_missing_visualization_files(
     result = {
         "message": message,
         "total_processed": total_processed,
+        "tasks": {
+            "created": task_counts["created"],
+            "already_exists": task_counts["already_exists"],
+            "failed": task_counts["failed"],
+        },
         "params": {
             "dry_run": dry_run,
             "check_existing": check_existing,
             "latest_only": latest_only,
             "include_deprecated_feeds": include_deprecated_feeds,
             "limit": limit,
+            "run_id": run_id,
         },
     }
     logging.info(result)
@@ -173,7 +216,8 @@ def get_parameters(payload):
     Args:
         payload (dict): dictionary containing the payload data.
     Returns:
-        tuple: tuple with: dry_run, bucket_name, check_existing parameters
+        tuple: tuple with: dry_run, check_existing, latest_only, include_deprecated_feeds,
+            include_feed_op_status, limit, run_id parameters
     """
     dry_run = payload.get("dry_run", True)
     dry_run = dry_run if isinstance(dry_run, bool) else str(dry_run).lower() == "true"
@@ -198,6 +242,7 @@ def get_parameters(payload):
     include_feed_op_status = payload.get("include_feed_op_status", ["published"])
     limit = payload.get("limit", None)
     limit = limit if isinstance(limit, int) and limit > 0 else None
+    run_id = payload.get("run_id") or None
     return (
         dry_run,
         check_existing,
@@ -205,4 +250,5 @@ def get_parameters(payload):
         include_deprecated_feeds,
         include_feed_op_status,
         limit,
+        run_id,
     )
@@ -15,11 +15,28 @@
 
 import logging
 import os
+import time
+from typing import List, Optional
 
 import requests
+from sqlalchemy import delete, tuple_, update
+from sqlalchemy.orm import Session
+
+from shared.common.gcp_utils import create_revalidate_feeds_task
+from shared.database.database import with_db_session
+from shared.database_gen.sqlacodegen_models import WebRevalidationRequest
 
 logger = logging.getLogger(__name__)
 
+# Feed IDs sent per revalidation call
+DEFAULT_CHUNK_SIZE = 50
+# Attempts per chunk within one run, waiting backoff_seconds * 2**attempt in between
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 1.0
+# Runs a buffered feed can fail before it is dropped from web_revalidation_request
+MAX_BUFFERED_ATTEMPTS = 5
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
 
 def revalidate_feed_handler(payload: dict | None = None) -> dict:
     """
@@ -84,3 +101,190 @@ def revalidate_feed_handler(payload: dict | None = None) -> dict:
             "feed_stable_id": feed_stable_id,
             "status": "error",
         }
+
+
+def revalidate_feeds_handler(payload: dict | None = None) -> dict:
+    """
+    Revalidate the website cache of every feed waiting in web_revalidation_request,
+    plus the optional feed_stable_ids of the payload, with chunked multi-feed calls.
+
+    Payload:
+        feed_stable_ids (list[str], optional): Additional feeds to revalidate.
+        chunk_size (int, optional): Feed IDs per revalidation call. Default 50.
+        max_retries (int, optional): Attempts per call on network errors, 429 and 5xx. Default 3.
+        backoff_seconds (float, optional): Initial wait between attempts, doubled each time.
+            Default 1.0.
+    """
+    payload = payload or {}
+    return revalidate_feeds(
+        feed_stable_ids=payload.get("feed_stable_ids"),
+        chunk_size=int(payload.get("chunk_size") or DEFAULT_CHUNK_SIZE),
+        max_retries=int(payload.get("max_retries") or DEFAULT_MAX_RETRIES),
+        backoff_seconds=float(payload.get("backoff_seconds", DEFAULT_BACKOFF_SECONDS)),
+    )
+
+
+@with_db_session
+def revalidate_feeds(
+    feed_stable_ids: Optional[List[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+    db_session: Session | None = None,
+) -> dict:
+    """
+    Drain the web_revalidation_request buffer.
+
+    Buffered rows are read without locks, so no lock is held during the revalidation calls and
+    their retries. Feeds of a successful call are deleted from the buffer. Feeds of a failed call
+    stay buffered with their attempts incremented, are dropped after MAX_BUFFERED_ATTEMPTS runs,
+    and another revalidate_feeds task is scheduled for the next window to retry them.
+    Rows are only deleted or updated if their requested_at is still the one read: a feed buffered
+    again during the calls has a newer requested_at and stays buffered for the next run.
+    """
+    revalidate_url = os.getenv("WEB_APP_REVALIDATE_URL")
+    revalidate_secret = os.getenv("WEB_APP_REVALIDATE_SECRET")
+    if not revalidate_url or not revalidate_secret:
+        logger.warning(
+            "WEB_APP_REVALIDATE_URL or WEB_APP_REVALIDATE_SECRET not configured; "
+            "skipping revalidation."
+        )
+        return {
+            "message": "Revalidation skipped: WEB_APP_REVALIDATE_URL or "
+            "WEB_APP_REVALIDATE_SECRET not configured.",
+            "status": "skipped",
+        }
+
+    buffered = {
+        request.feed_stable_id: request
+        for request in db_session.query(
+            WebRevalidationRequest.feed_stable_id,
+            WebRevalidationRequest.requested_at,
+            WebRevalidationRequest.attempts,
+        ).all()
+    }
+    stable_ids = sorted(set(buffered) | set(feed_stable_ids or []))
+    if not stable_ids:
+        logger.info("No feed waiting for revalidation.")
+        return {"message": "No feed to revalidate.", "status": "success", "feeds": 0}
+
+    chunk_size = max(1, chunk_size)
+    chunks = [
+        stable_ids[i : i + chunk_size] for i in range(0, len(stable_ids), chunk_size)
+    ]
+    logger.info(
+        "Revalidating %d feed(s) (%d buffered) in %d call(s)",
+        len(stable_ids),
+        len(buffered),
+        len(chunks),
+    )
+
+    revalidated, failed = [], []
+    for chunk in chunks:
+        if post_revalidation(
+            revalidate_url, revalidate_secret, chunk, max_retries, backoff_seconds
+        ):
+            revalidated.extend(chunk)
+        else:
+            failed.extend(chunk)
+
+    failed_buffered = [stable_id for stable_id in failed if stable_id in buffered]
+    dropped = [
+        stable_id
+        for stable_id in failed_buffered
+        if buffered[stable_id].attempts + 1 >= MAX_BUFFERED_ATTEMPTS
+    ]
+    done = [stable_id for stable_id in revalidated if stable_id in buffered] + dropped
+    if done:
+        db_session.execute(
+            delete(WebRevalidationRequest).where(_read_requests(buffered, done))
+        )
+    retried = [stable_id for stable_id in failed_buffered if stable_id not in dropped]
+    if retried:
+        db_session.execute(
+            update(WebRevalidationRequest)
+            .where(_read_requests(buffered, retried))
+            .values(attempts=WebRevalidationRequest.attempts + 1)
+        )
+    db_session.commit()
+
+    if dropped:
+        logger.error(
+            "Dropping %d feed(s) after %d failed revalidation runs: %s",
+            len(dropped),
+            MAX_BUFFERED_ATTEMPTS,
+            dropped,
+        )
+    if retried:
+        create_revalidate_feeds_task()
+
+    return {
+        "message": f"Revalidated {len(revalidated)} of {len(stable_ids)} feed(s) "
+        f"in {len(chunks)} call(s).",
+        "status": "success" if not failed else "error",
+        "feeds": len(stable_ids),
+        "calls": len(chunks),
+        "revalidated": len(revalidated),
+        "failed": failed,
+        "dropped": dropped,
+    }
+
+
+def _read_requests(buffered: dict, stable_ids: List[str]):
+    """Condition matching the buffered requests of stable_ids not requested again since read."""
+    return tuple_(
+        WebRevalidationRequest.feed_stable_id, WebRevalidationRequest.requested_at
+    ).in_([(stable_id, buffered[stable_id].requested_at) for stable_id in stable_ids])
+
+
+def post_revalidation(
+    revalidate_url: str,
+    revalidate_secret: str,
+    feed_stable_ids: List[str],
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+) -> bool:
+    """
+    Call the revalidation endpoint for a list of feeds.
+    Network errors, 429 and 5xx responses are retried with exponential backoff; other
+    errors are not. Returns True if the call eventually succeeded.
+    """
+    for attempt in range(max(1, max_retries)):
+        if attempt:
+            time.sleep(backoff_seconds * 2 ** (attempt - 1))
+        try:
+            response = requests.post(
+                revalidate_url,
+                json={"feedIds": feed_stable_ids, "type": "specific-feeds"},
+                headers={
+                    "x-revalidate-secret": revalidate_secret,
+                    "Content-Type": "application/json",
+                },
+                timeout=30,
+            )
+            response.raise_for_status()
+            return True
+        except requests.HTTPError as e:
+            status_code = e.response.status_code if e.response is not None else None
+            if status_code not in RETRYABLE_STATUS_CODES:
+                logger.error("Revalidation failed for %s: %s", feed_stable_ids, e)
+                return False
+            logger.warning(
+                "Revalidation attempt %d failed for %d feed(s): %s",
+                attempt + 1,
+                len(feed_stable_ids),
+                e,
+            )
+        except requests.RequestException as e:
+            logger.warning(
+                "Revalidation attempt %d failed for %d feed(s): %s",
+                attempt + 1,
+                len(feed_stable_ids),
+                e,
+            )
+    logger.error(
+        "Revalidation failed after %d attempt(s) for %s",
+        max(1, max_retries),
+        feed_stable_ids,
+    )
+    return False
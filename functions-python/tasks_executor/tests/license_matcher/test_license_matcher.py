@@ -97,8 +97,9 @@ class TestLicenseMatcher(unittest.TestCase):
             result = match_license_handler(payload)
             self.assertEqual(result, [{"feed_id": "f1"}])
 
+    @patch("tasks.licenses.license_matcher.get_license_index")
     @patch("tasks.licenses.license_matcher.resolve_license")
-    def test_process_all_feeds_sequential(self, mock_resolve):
+    def test_process_all_feeds_sequential(self, mock_resolve, mock_get_index):
         # Prepare feeds
         feed1 = MagicMock()
         feed1.id = "a"
@@ -166,6 +167,10 @@ class TestLicenseMatcher(unittest.TestCase):
         self.assertEqual(len(matches), 2)
         self.assertEqual(feed1.license_id, "MIT")
         self.assertEqual(feed2.license_id, "BSD")
+        # The index is built once and shared by every feed
+        mock_get_index.assert_called_once_with(db_session)
+        for call in mock_resolve.call_args_list:
+            self.assertIs(call.kwargs["license_index"], mock_get_index.return_value)
 
 
 if __name__ == "__main__":
@@ -13,12 +13,15 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 #
+import json
 import unittest
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from unittest.mock import patch
 
 from sqlalchemy.orm import Session
 
+from shared.common.gcp_utils import enqueue_http_tasks
 from shared.database.database import with_db_session
 from shared.database_gen.sqlacodegen_models import (
     Feed,
@@ -32,12 +35,12 @@ from tasks.changelog.backfill_changelog import (
     DEFAULT_LIMIT,
     backfill_changelog,
     backfill_changelog_handler,
+    get_backfill_pairs_query,
 )
 from test_shared.test_utils.database_utils import default_db_url
+from test_shared.test_utils.fake_cloud_tasks import FakeCloudTasksClient
 
-PATCH_DISPATCH = (
-    "tasks.changelog.backfill_changelog.create_http_gtfs_datasets_comparer_task"
-)
+PATCH_DISPATCH = "tasks.changelog.backfill_changelog.enqueue_http_tasks"
 # Scope every query to our own feeds so the shared conftest seed data does not
 # affect counts (and so we never wipe it).
 SCOPE = ["stable_a", "stable_b"]
@@ -212,12 +215,18 @@ class TestBackfillChangelog(unittest.TestCase):
     def test_dispatches_missing_pair(self, mock_dispatch):
         result = backfill_changelog(dry_run=False, stable_feed_ids=SCOPE)
         self.assertEqual(result["pairs_dispatched"], 1)
-        mock_dispatch.assert_called_once_with(
-            feed_stable_id="stable_a",
-            base_dataset_stable_id="stable_a1",
-            new_dataset_stable_id="stable_a2",
-            disallow_overwrite=True,
+        mock_dispatch.assert_called_once()
+        (spec,) = mock_dispatch.call_args.args[0]
+        self.assertEqual(
+            json.loads(spec.body),
+            {
+                "feed_stable_id": "stable_a",
+                "base_dataset_stable_id": "stable_a1",
+                "new_dataset_stable_id": "stable_a2",
+                "disallow_overwrite": True,
+            },
         )
+        self.assertEqual(spec.task_name, "changelog-stable_a1-stable_a2")
 
     @patch(PATCH_DISPATCH)
     def test_force_dispatch_allows_overwrite(self, mock_dispatch):
@@ -225,8 +234,21 @@ class TestBackfillChangelog(unittest.TestCase):
         # comparer regenerates even existing changelogs.
         result = backfill_changelog(dry_run=False, force=True, stable_feed_ids=SCOPE)
         self.assertEqual(result["pairs_dispatched"], 2)
-        for call in mock_dispatch.call_args_list:
-            self.assertFalse(call.kwargs["disallow_overwrite"])
+        specs = mock_dispatch.call_args.args[0]
+        self.assertEqual(len(specs), 2)
+        for spec in specs:
+            self.assertFalse(json.loads(spec.body)["disallow_overwrite"])
+
+    def test_failed_enqueue_not_counted_as_dispatched(self):
+        client = FakeCloudTasksClient()
+        client.fail_next(Exception("permission denied"))
+        with patch(PATCH_DISPATCH, partial(enqueue_http_tasks, client=client)):
+            result = backfill_changelog(
+                dry_run=False, force=True, stable_feed_ids=SCOPE
+            )
+        self.assertEqual(result["pairs_dispatched"], 1)
+        self.assertEqual(result["pairs_failed"], 1)
+        self.assertEqual(len(client.tasks), 1)
 
     @patch(PATCH_DISPATCH)
     def test_idempotent_when_all_pairs_done(self, mock_dispatch):
@@ -332,6 +354,31 @@ class TestBackfillChangelog(unittest.TestCase):
         self.assertEqual(result["feeds_processed"], 0)
         self.assertEqual(result["pairs_found"], 0)
 
+    def test_plans_pairs_of_every_feed_in_one_query(self):
+        @with_db_session(db_url=default_db_url)
+        def plan(db_session: Session):
+            query = get_backfill_pairs_query(
+                db_session, stable_feed_ids=["stable_a", "stable_b", "stable_c"]
+            )
+            return [
+                (
+                    row.feed_stable_id,
+                    row.base_dataset_stable_id,
+                    row.new_dataset_stable_id,
+                    row.already_done,
+                )
+                for row in db_session.execute(query)
+            ]
+
+        self.assertEqual(
+            plan(),
+            [
+                ("stable_a", "stable_a0", "stable_a1", True),
+                ("stable_a", "stable_a1", "stable_a2", False),
+                ("stable_c", "stable_c0", "stable_c1", False),
+            ],
+        )
+
     @patch(PATCH_DISPATCH)
     def test_invalid_datasets_per_feed_raises(self, mock_dispatch):
         with self.assertRaises(ValueError):
@@ -1,16 +1,20 @@
-import base64
 import os
 import unittest
 from types import SimpleNamespace
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 from shared.database.database import with_db_session
+from shared.helpers.gcs_inventory import GcsInventory
 from test_shared.test_utils.database_utils import default_db_url
+from test_shared.test_utils.fake_gcs import FakeBucket
 from tasks.dataset_files.backfill_dataset_hash_md5 import (
     backfill_dataset_hash_md5,
     backfill_dataset_hash_md5_handler,
     _build_blob_path,
+    _iter_dataset_pages,
     _read_md5_from_gcs,
+    _write_md5_hashes,
+    DEFAULT_CONCURRENCY,
     DEFAULT_LIMIT,
 )
 
@@ -29,38 +33,36 @@ class TestBuildBlobPath(unittest.TestCase):
 
 class TestReadMd5FromGcs(unittest.TestCase):
     def test_returns_hex_md5(self):
-        raw_md5 = b"\x09\x8f\x6b\xcd\x46\x21\xd3\x73\xca\xde\x4e\x83\x26\x27\xb4\xf6"
-        b64_md5 = base64.b64encode(raw_md5).decode()
+        bucket = FakeBucket()
+        bucket.add_blob("some/path.zip", content=b"test")
 
-        mock_blob = MagicMock()
-        mock_blob.md5_hash = b64_md5
-        mock_bucket = MagicMock()
-        mock_bucket.blob.return_value = mock_blob
-
-        result = _read_md5_from_gcs(mock_bucket, "some/path.zip")
-        self.assertEqual(result, raw_md5.hex())
-        mock_blob.reload.assert_called_once()
+        result = _read_md5_from_gcs(GcsInventory(bucket), "some/path.zip")
+        self.assertEqual(result, "098f6bcd4621d373cade4e832627b4f6")
 
     def test_returns_none_when_blob_not_found(self):
-        from google.cloud.exceptions import NotFound
-
-        mock_bucket = MagicMock()
-        mock_blob = MagicMock()
-        mock_blob.reload.side_effect = NotFound("blob not found")
-        mock_bucket.blob.return_value = mock_blob
+        bucket = FakeBucket()
+        bucket.add_blob("some/path.zip")
 
-        result = _read_md5_from_gcs(mock_bucket, "missing/path.zip")
+        result = _read_md5_from_gcs(GcsInventory(bucket), "missing/path.zip")
         self.assertIsNone(result)
 
     def test_returns_none_when_md5_hash_is_none(self):
-        mock_blob = MagicMock()
-        mock_blob.md5_hash = None
-        mock_bucket = MagicMock()
-        mock_bucket.blob.return_value = mock_blob
+        bucket = FakeBucket()
+        bucket.add_blob("some/path.zip").md5_hash = None
 
-        result = _read_md5_from_gcs(mock_bucket, "some/path.zip")
+        result = _read_md5_from_gcs(GcsInventory(bucket), "some/path.zip")
         self.assertIsNone(result)
 
+    def test_lists_each_feed_prefix_once(self):
+        bucket = FakeBucket()
+        bucket.add_blob("mdb-1/mdb-1-1/mdb-1-1.zip", content=b"a")
+        bucket.add_blob("mdb-1/mdb-1-2/mdb-1-2.zip", content=b"b")
+        inventory = GcsInventory(bucket)
+
+        self.assertIsNotNone(_read_md5_from_gcs(inventory, "mdb-1/mdb-1-1/mdb-1-1.zip"))
+        self.assertIsNotNone(_read_md5_from_gcs(inventory, "mdb-1/mdb-1-2/mdb-1-2.zip"))
+        self.assertEqual(len(bucket.list_calls), 1)
+
 
 class TestBackfillDatasetHashMd5Handler(unittest.TestCase):
     @patch("tasks.dataset_files.backfill_dataset_hash_md5.backfill_dataset_hash_md5")
@@ -75,6 +77,7 @@ class TestBackfillDatasetHashMd5Handler(unittest.TestCase):
             only_latest=True,
             only_missing_hashes=True,
             limit=10,
+            concurrency=DEFAULT_CONCURRENCY,
         )
         self.assertEqual(result["total_candidates"], 5)
 
@@ -87,6 +90,7 @@ class TestBackfillDatasetHashMd5Handler(unittest.TestCase):
                 "only_latest": False,
                 "only_missing_hashes": False,
                 "limit": 100,
+                "concurrency": 4,
             }
         )
         mock_backfill.assert_called_once_with(
@@ -94,6 +98,7 @@ class TestBackfillDatasetHashMd5Handler(unittest.TestCase):
             only_latest=False,
             only_missing_hashes=False,
             limit=100,
+            concurrency=4,
         )
 
     @patch("tasks.dataset_files.backfill_dataset_hash_md5.backfill_dataset_hash_md5")
@@ -134,60 +139,79 @@ class TestBackfillDatasetHashMd5DryRun(unittest.TestCase):
         self.assertGreaterEqual(result["total_candidates"], 0)
 
 
-class TestBackfillDatasetHashMd5Processing(unittest.TestCase):
-    def _make_fake_dataset(self, dataset_stable_id, feed_stable_id="mdb-1"):
-        fake_feed = SimpleNamespace(stable_id=feed_stable_id)
-        return SimpleNamespace(
-            stable_id=dataset_stable_id,
-            hash_md5=None,
-            feed=fake_feed,
+class TestIterDatasetPages(unittest.TestCase):
+    def test_paginates_on_dataset_id_until_limit(self):
+        rows = [SimpleNamespace(id=f"ds-{i}") for i in range(5)]
+        query = MagicMock()
+        ordered = query.order_by.return_value
+        ordered.limit.return_value.all.return_value = rows[:2]
+        ordered.filter.return_value.limit.return_value.all.side_effect = [
+            rows[2:4],
+            rows[4:],
+        ]
+
+        pages = list(_iter_dataset_pages(query, limit=5, page_size=2))
+
+        self.assertEqual(pages, [rows[:2], rows[2:4], rows[4:]])
+        self.assertEqual(
+            [c.args for c in ordered.filter.return_value.limit.call_args_list],
+            [(2,), (1,)],
         )
 
-    def _make_mock_db_session(self, datasets):
+    def test_stops_on_short_page_without_limit(self):
+        rows = [SimpleNamespace(id="ds-1")]
+        query = MagicMock()
+        query.order_by.return_value.limit.return_value.all.return_value = rows
+
+        pages = list(_iter_dataset_pages(query, limit=None, page_size=2))
+
+        self.assertEqual(pages, [rows])
+        query.order_by.return_value.filter.assert_not_called()
+
+
+class TestWriteMd5Hashes(unittest.TestCase):
+    def test_updates_from_values_and_commits(self):
         db_session = MagicMock()
-        query_mock = MagicMock()
-        filter1 = MagicMock()
-        filter2 = MagicMock()
-        filter3 = MagicMock()
-        options_mock = MagicMock()
-        join_mock = MagicMock()
-
-        db_session.query.return_value = query_mock
-        query_mock.filter.return_value = filter1
-        filter1.join.return_value = join_mock
-        join_mock.filter.return_value = filter2
-        filter2.filter.return_value = filter3
-        filter3.options.return_value = options_mock
-        # Support the full chain used in _build_query
-        query_mock.filter.return_value.join.return_value.filter.return_value.options.return_value = (
-            options_mock
+
+        _write_md5_hashes(db_session, [("ds-1", "abc"), ("ds-2", "def")])
+
+        db_session.execute.assert_called_once()
+        sql = str(
+            db_session.execute.call_args[0][0].compile(
+                compile_kwargs={"literal_binds": True}
+            )
+        )
+        self.assertIn("UPDATE gtfsdataset SET hash_md5=v.hash_md5", sql)
+        self.assertIn("FROM (VALUES ('ds-1', 'abc'), ('ds-2', 'def')) AS v", sql)
+        db_session.commit.assert_called_once()
+
+
+class TestBackfillDatasetHashMd5Processing(unittest.TestCase):
+    def _make_fake_row(self, dataset_stable_id, feed_stable_id="mdb-1"):
+        return SimpleNamespace(
+            id=f"id-{dataset_stable_id}",
+            stable_id=dataset_stable_id,
+            feed_stable_id=feed_stable_id,
         )
-        options_mock.count.return_value = len(datasets)
-        options_mock.limit.return_value.all.return_value = datasets
-        return db_session, options_mock
 
     @patch.dict(os.environ, {"DATASETS_BUCKET_NAME": "test-bucket"})
     @patch("tasks.dataset_files.backfill_dataset_hash_md5._build_query")
+    @patch("tasks.dataset_files.backfill_dataset_hash_md5._iter_dataset_pages")
+    @patch("tasks.dataset_files.backfill_dataset_hash_md5._write_md5_hashes")
     @patch("tasks.dataset_files.backfill_dataset_hash_md5._read_md5_from_gcs")
     @patch("tasks.dataset_files.backfill_dataset_hash_md5.storage.Client")
     def test_updates_md5_and_commits_in_batches(
-        self, mock_storage_client, mock_read_md5, mock_build_query
+        self,
+        mock_storage_client,
+        mock_read_md5,
+        mock_write,
+        mock_iter_pages,
+        mock_build_query,
     ):
         raw_md5 = "098f6bcd4621d373cade4e832627b4f6"
-
-        datasets = [
-            self._make_fake_dataset(f"mdb-1-2024010{i}", "mdb-1") for i in range(3)
-        ]
-
-        mock_query = MagicMock()
-        mock_query.count.return_value = 3
-        mock_query.limit.return_value.all.return_value = datasets
-        mock_build_query.return_value = mock_query
-
+        rows = [self._make_fake_row(f"mdb-1-2024010{i}", "mdb-1") for i in range(3)]
+        mock_iter_pages.return_value = iter([rows])
         mock_read_md5.return_value = raw_md5
-        mock_bucket = MagicMock()
-        mock_storage_client.return_value.bucket.return_value = mock_bucket
-
         db_session = MagicMock()
 
         result = backfill_dataset_hash_md5(
@@ -200,31 +224,27 @@ class TestBackfillDatasetHashMd5Processing(unittest.TestCase):
 
         self.assertEqual(result["total_updated"], 3)
         self.assertEqual(result["total_skipped"], 0)
-        for ds in datasets:
-            self.assertEqual(ds.hash_md5, raw_md5)
-        # Final commit called for remaining datasets (3 < BATCH_COMMIT_SIZE=50)
-        db_session.commit.assert_called_once()
+        mock_iter_pages.assert_called_once_with(mock_build_query.return_value, 3)
+        # Single final write for the remaining datasets (3 < BATCH_COMMIT_SIZE)
+        mock_write.assert_called_once_with(
+            db_session, [(row.id, raw_md5) for row in rows]
+        )
 
         # Verify blob paths are constructed from stable IDs
-        for i, ds in enumerate(datasets):
+        for i in range(3):
             expected_blob = f"mdb-1/mdb-1-2024010{i}/mdb-1-2024010{i}.zip"
-            mock_read_md5.assert_any_call(mock_bucket, expected_blob)
+            mock_read_md5.assert_any_call(ANY, expected_blob)
 
     @patch.dict(os.environ, {"DATASETS_BUCKET_NAME": "test-bucket"}, clear=False)
     @patch("tasks.dataset_files.backfill_dataset_hash_md5._build_query")
+    @patch("tasks.dataset_files.backfill_dataset_hash_md5._iter_dataset_pages")
     @patch("tasks.dataset_files.backfill_dataset_hash_md5._read_md5_from_gcs")
     @patch("tasks.dataset_files.backfill_dataset_hash_md5.storage.Client")
     def test_skips_datasets_when_gcs_blob_missing(
-        self, mock_storage_client, mock_read_md5, mock_build_query
+        self, mock_storage_client, mock_read_md5, mock_iter_pages, mock_build_query
     ):
-        datasets = [self._make_fake_dataset("mdb-1-20240101", "mdb-1")]
-        mock_query = MagicMock()
-        mock_query.count.return_value = 1
-        mock_query.limit.return_value.all.return_value = datasets
-        mock_build_query.return_value = mock_query
-
+        mock_iter_pages.return_value = iter([[self._make_fake_row("mdb-1-20240101")]])
         mock_read_md5.return_value = None  # blob not found in GCS
-        mock_storage_client.return_value.bucket.return_value = MagicMock()
         db_session = MagicMock()
 
         result = backfill_dataset_hash_md5(
@@ -237,32 +257,27 @@ class TestBackfillDatasetHashMd5Processing(unittest.TestCase):
 
         self.assertEqual(result["total_updated"], 0)
         self.assertEqual(result["total_skipped"], 1)
+        db_session.execute.assert_not_called()
         db_session.commit.assert_not_called()
 
     @patch.dict(os.environ, {"DATASETS_BUCKET_NAME": "test-bucket"})
     @patch("tasks.dataset_files.backfill_dataset_hash_md5._build_query")
+    @patch("tasks.dataset_files.backfill_dataset_hash_md5._iter_dataset_pages")
     @patch("tasks.dataset_files.backfill_dataset_hash_md5._read_md5_from_gcs")
     @patch("tasks.dataset_files.backfill_dataset_hash_md5.storage.Client")
-    def test_commits_in_batches_of_50(
-        self, mock_storage_client, mock_read_md5, mock_build_query
+    def test_commits_in_batches(
+        self, mock_storage_client, mock_read_md5, mock_iter_pages, mock_build_query
     ):
-        """Verify that commits happen every BATCH_COMMIT_SIZE=50 datasets."""
+        """Verify that one UPDATE is written and committed every BATCH_COMMIT_SIZE datasets."""
         from tasks.dataset_files.backfill_dataset_hash_md5 import BATCH_COMMIT_SIZE
 
-        num_datasets = BATCH_COMMIT_SIZE + 10  # 60 total → 1 mid-batch commit + 1 final
-
-        datasets = [
-            self._make_fake_dataset(f"mdb-1-2024010{i}", "mdb-1")
-            for i in range(num_datasets)
-        ]
-
-        mock_query = MagicMock()
-        mock_query.count.return_value = num_datasets
-        mock_query.limit.return_value.all.return_value = datasets
-        mock_build_query.return_value = mock_query
-
+        num_datasets = BATCH_COMMIT_SIZE + 10  # 1 mid-run batch + 1 final
+        rows = [self._make_fake_row(f"mdb-1-{i}", "mdb-1") for i in range(num_datasets)]
+        # Spread over pages that do not align with the batches
+        mock_iter_pages.return_value = iter(
+            [rows[i : i + 7] for i in range(0, num_datasets, 7)]
+        )
         mock_read_md5.return_value = "abc123"
-        mock_storage_client.return_value.bucket.return_value = MagicMock()
         db_session = MagicMock()
 
         result = backfill_dataset_hash_md5(
@@ -271,40 +286,42 @@ class TestBackfillDatasetHashMd5Processing(unittest.TestCase):
             only_latest=True,
             only_missing_hashes=True,
             limit=num_datasets,
+            concurrency=4,
         )
 
         self.assertEqual(result["total_updated"], num_datasets)
-        # 1 mid-batch commit (at 50) + 1 final commit (remaining 10) = 2 total
+        self.assertEqual(db_session.execute.call_count, 2)
         self.assertEqual(db_session.commit.call_count, 2)
 
     @patch.dict(os.environ, {"DATASETS_BUCKET_NAME": "test-bucket"})
     @patch("tasks.dataset_files.backfill_dataset_hash_md5._build_query")
-    @patch("tasks.dataset_files.backfill_dataset_hash_md5._read_md5_from_gcs")
+    @patch("tasks.dataset_files.backfill_dataset_hash_md5._write_md5_hashes")
     @patch("tasks.dataset_files.backfill_dataset_hash_md5.storage.Client")
-    def test_no_limit_processes_all_datasets(
-        self, mock_storage_client, mock_read_md5, mock_build_query
+    def test_resolves_md5_concurrently_from_inventory(
+        self, mock_storage_client, mock_write, mock_build_query
     ):
-        """When limit=None, query.all() is called directly without .limit()."""
-        datasets = [
-            self._make_fake_dataset(f"mdb-1-2024010{i}", "mdb-1") for i in range(5)
-        ]
-
-        mock_query = MagicMock()
-        mock_query.count.return_value = 5
-        mock_query.all.return_value = datasets
-        mock_build_query.return_value = mock_query
-
-        mock_read_md5.return_value = "abc123"
-        mock_storage_client.return_value.bucket.return_value = MagicMock()
-        db_session = MagicMock()
+        """Rows are streamed through the pool and resolved against one shared inventory."""
+        bucket = FakeBucket()
+        rows = []
+        for feed in ("mdb-1", "mdb-2"):
+            for i in range(3):
+                dataset = f"{feed}-{i}"
+                bucket.add_blob(f"{feed}/{dataset}/{dataset}.zip", content=b"test")
+                rows.append(self._make_fake_row(dataset, feed))
+        rows.append(self._make_fake_row("mdb-3-0", "mdb-3"))
+        mock_storage_client.return_value.bucket.return_value = bucket
+        query = MagicMock()
+        query.order_by.return_value.limit.return_value.all.return_value = rows
+        mock_build_query.return_value = query
 
         result = backfill_dataset_hash_md5(
-            db_session=db_session,
-            dry_run=False,
-            limit=None,
+            db_session=MagicMock(), dry_run=False, limit=None, concurrency=4
         )
 
-        self.assertEqual(result["total_updated"], 5)
-        # .limit() should NOT be called when limit is None
-        mock_query.limit.assert_not_called()
-        mock_query.all.assert_called_once()
+        self.assertEqual(result["total_updated"], 6)
+        self.assertEqual(result["total_skipped"], 1)
+        self.assertEqual(
+            mock_write.call_args[0][1],
+            [(row.id, "098f6bcd4621d373cade4e832627b4f6") for row in rows[:6]],
+        )
+        self.assertEqual(len(bucket.list_calls), 3)
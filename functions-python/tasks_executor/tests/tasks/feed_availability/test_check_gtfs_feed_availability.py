@@ -14,16 +14,24 @@
 #  limitations under the License.
 #
 import unittest
+from datetime import date, datetime, timezone
 from unittest.mock import patch, MagicMock
 
 import urllib3.exceptions
+from sqlalchemy.sql.dml import Insert
 
 from shared.helpers.utils import perform_request
+
 from tasks.feed_availability.check_gtfs_feed_availability import (
+    AVAILABILITY_CHECK_COLUMNS,
+    bulk_insert_availability_checks,
     check_gtfs_feed_availability,
     check_gtfs_feed_availability_handler,
+    ensure_availability_check_partitions,
     get_feeds_query,
     get_feed_credentials,
+    refresh_availability_daily_rollup,
+    to_availability_check_row,
 )
 
 
@@ -60,6 +68,7 @@ class TestCheckGtfsFeedAvailabilityHandler(unittest.TestCase):
             stable_feed_ids=None,
             verbose=False,
             fallback_to_get=True,
+            bulk_insert=True,
         )
         self.assertEqual(result["total_feeds"], 0)
 
@@ -78,6 +87,7 @@ class TestCheckGtfsFeedAvailabilityHandler(unittest.TestCase):
             "stable_feed_ids": ["f1", "f2"],
             "verbose": True,
             "fallback_to_get": False,
+            "bulk_insert": False,
         }
         check_gtfs_feed_availability_handler(payload)
         mock_fn.assert_called_once_with(
@@ -90,6 +100,7 @@ class TestCheckGtfsFeedAvailabilityHandler(unittest.TestCase):
             stable_feed_ids=["f1", "f2"],
             verbose=True,
             fallback_to_get=False,
+            bulk_insert=False,
         )
 
 
@@ -342,8 +353,16 @@ class TestCheckGtfsFeedAvailability(unittest.TestCase):
             db_session=db_session, dry_run=False, skip_db_update=False
         )
 
-        db_session.add_all.assert_called_once()
-        db_session.commit.assert_called_once()
+        # Bulk insert is the default: no ORM objects are added to the session.
+        db_session.add_all.assert_not_called()
+        insert_statements = [
+            c.args[0]
+            for c in db_session.execute.call_args_list
+            if isinstance(c.args[0], Insert)
+        ]
+        self.assertEqual(len(insert_statements), 1)
+        # One commit for the partition DDL, one for the batch, one for the daily roll-up.
+        self.assertEqual(db_session.commit.call_count, 3)
         self.assertEqual(result["total_feeds"], 2)
         self.assertEqual(result["succeeded"], 2)
         self.assertEqual(result["failed"], 0)
@@ -358,6 +377,7 @@ class TestCheckGtfsFeedAvailability(unittest.TestCase):
         )
 
         db_session.add_all.assert_not_called()
+        db_session.execute.assert_not_called()
         db_session.commit.assert_not_called()
         self.assertTrue(result["skip_db_update"])
         self.assertEqual(result["total_feeds"], 1)
@@ -435,9 +455,58 @@ class TestCheckGtfsFeedAvailability(unittest.TestCase):
             db_session=db_session, dry_run=False, skip_db_update=False, batch_size=2
         )
 
-        # 6 feeds / batch_size=2 → 3 commits
-        self.assertEqual(db_session.commit.call_count, 3)
+        # 6 feeds / batch_size=2 → 3 batch commits + partition and roll-up commits
+        self.assertEqual(db_session.commit.call_count, 5)
+        insert_statements = [
+            c.args[0]
+            for c in db_session.execute.call_args_list
+            if isinstance(c.args[0], Insert)
+        ]
+        self.assertEqual(len(insert_statements), 3)
+
+    def test_orm_path_adds_objects_when_bulk_insert_disabled(self):
+        feeds = [_make_feed(f"f{i}", f"http://feed{i}.com") for i in range(6)]
+        db_session = self._make_mock_session(feeds)
+
+        check_gtfs_feed_availability(
+            db_session=db_session,
+            dry_run=False,
+            skip_db_update=False,
+            batch_size=2,
+            bulk_insert=False,
+        )
+
         self.assertEqual(db_session.add_all.call_count, 3)
+        self.assertEqual(db_session.commit.call_count, 5)
+
+    @patch(
+        "tasks.feed_availability.check_gtfs_feed_availability.refresh_availability_daily_rollup"
+    )
+    def test_daily_rollup_refreshed_after_checks_are_stored(self, mock_refresh):
+        mock_refresh.return_value = 2
+        feeds = [_make_feed("f1", "http://a.com"), _make_feed("f2", "http://b.com")]
+        db_session = self._make_mock_session(feeds)
+
+        check_gtfs_feed_availability(
+            db_session=db_session, dry_run=False, skip_db_update=False
+        )
+
+        mock_refresh.assert_called_once()
+        _, from_day, to_day = mock_refresh.call_args.args
+        self.assertLessEqual(from_day, to_day)
+
+    @patch(
+        "tasks.feed_availability.check_gtfs_feed_availability.refresh_availability_daily_rollup"
+    )
+    def test_daily_rollup_not_refreshed_when_skip_db_update(self, mock_refresh):
+        feeds = [_make_feed("f1", "http://a.com")]
+        db_session = self._make_mock_session(feeds)
+
+        check_gtfs_feed_availability(
+            db_session=db_session, dry_run=False, skip_db_update=True
+        )
+
+        mock_refresh.assert_not_called()
 
     def test_future_exception_captured_as_failed_check(self):
         self.mock_perform_head.side_effect = RuntimeError("unexpected failure")
@@ -586,5 +655,76 @@ class TestCheckGtfsFeedAvailability(unittest.TestCase):
         self.assertIn(False, call_args)  # fallback_to_get=False should be in the args
 
 
+class TestBulkInsertHelpers(unittest.TestCase):
+    def test_to_availability_check_row_follows_column_order(self):
+        check = MagicMock()
+        for column in AVAILABILITY_CHECK_COLUMNS:
+            setattr(check, column, f"value_{column}")
+
+        row = to_availability_check_row(check)
+
+        self.assertEqual(
+            row, tuple(f"value_{column}" for column in AVAILABILITY_CHECK_COLUMNS)
+        )
+
+    def test_bulk_insert_executes_single_statement(self):
+        db_session = MagicMock()
+        rows = [
+            ("f1", datetime.now(timezone.utc), "http://a.com", "http_head")
+            + (200, 10, None, None, True, "application/zip", True),
+            ("f2", datetime.now(timezone.utc), "http://b.com", "http_get")
+            + (None, None, "refused", "ConnectionError", False, None, None),
+        ]
+
+        bulk_insert_availability_checks(db_session, rows)
+
+        db_session.execute.assert_called_once()
+        statement = db_session.execute.call_args.args[0]
+        self.assertIsInstance(statement, Insert)
+        self.assertEqual(len(statement._multi_values[0]), 2)
+
+    def test_bulk_insert_skips_empty_batch(self):
+        db_session = MagicMock()
+        bulk_insert_availability_checks(db_session, [])
+        db_session.execute.assert_not_called()
+
+    def test_ensure_partitions_creates_current_and_next_month(self):
+        db_session = MagicMock()
+        db_session.execute.return_value.scalar.side_effect = [
+            "gtfs_feed_availability_check_y2026m12",
+            "gtfs_feed_availability_check_y2027m01",
+        ]
+
+        names = ensure_availability_check_partitions(
+            db_session, datetime(2026, 12, 31, 23, 59, tzinfo=timezone.utc)
+        )
+
+        self.assertEqual(
+            names,
+            [
+                "gtfs_feed_availability_check_y2026m12",
+                "gtfs_feed_availability_check_y2027m01",
+            ],
+        )
+        months = [c.args[1]["checked_at"] for c in db_session.execute.call_args_list]
+        self.assertEqual(months[1], datetime(2027, 1, 1, 23, 59, tzinfo=timezone.utc))
+        db_session.commit.assert_called_once()
+
+    def test_refresh_daily_rollup_passes_day_range(self):
+        db_session = MagicMock()
+        db_session.execute.return_value.scalar.return_value = 7
+
+        rows = refresh_availability_daily_rollup(
+            db_session, date(2026, 5, 31), date(2026, 6, 1)
+        )
+
+        self.assertEqual(rows, 7)
+        params = db_session.execute.call_args.args[1]
+        self.assertEqual(
+            params, {"from_day": date(2026, 5, 31), "to_day": date(2026, 6, 1)}
+        )
+        db_session.commit.assert_called_once()
+
+
 if __name__ == "__main__":
     unittest.main()
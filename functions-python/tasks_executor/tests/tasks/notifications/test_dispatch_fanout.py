@@ -21,11 +21,15 @@ claim-then-send behaviour is covered by ``TestProcessSubscription`` in
 ``test_dispatch_notifications.py`` against the real users database.
 """
 
+import os
 import unittest
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from unittest.mock import MagicMock, patch
 
+from shared.common.gcp_utils import enqueue_http_tasks
 from shared.helpers.task_execution.task_execution_tracker import TaskInProgressError
+from test_shared.test_utils.fake_cloud_tasks import FakeCloudTasksClient
 
 # ---------------------------------------------------------------------------
 # notifications_dispatch_batch (producer)
@@ -34,21 +38,45 @@ from shared.helpers.task_execution.task_execution_tracker import TaskInProgressE
 _PLAN = "tasks.notifications.dispatch_batch"
 
 
+def _enqueue_each(*, in_body_task, tasks, queue_env):
+    """Routes the bulk worker enqueue through the (patched) single-task _enqueue."""
+    from tasks.notifications import dispatch_batch
+
+    return [
+        task_name
+        for task_name, payload in tasks
+        if dispatch_batch._enqueue(
+            in_body_task=in_body_task,
+            payload=payload,
+            queue_env=queue_env,
+            task_name=task_name,
+        )
+    ]
+
+
 class TestPlanHandler(unittest.TestCase):
+    def setUp(self):
+        patcher = patch(f"{_PLAN}._enqueue_many", side_effect=_enqueue_each)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def _subs(self, *ids):
         return [MagicMock(id=i) for i in ids]
 
+    def _work(self, *ids):
+        return {i: [f"evt-{i}"] for i in ids}
+
     @patch(f"{_PLAN}._start_run")
     @patch(f"{_PLAN}._enqueue", return_value=True)
-    @patch(f"{_PLAN}.find_subscriptions")
+    @patch(f"{_PLAN}.plan_due_events")
     def test_enqueues_worker_per_subscription_plus_monitor(
-        self, find_mock, enqueue_mock, start_run_mock
+        self, plan_mock, enqueue_mock, start_run_mock
     ):
         from tasks.notifications.dispatch_batch import (
             notifications_dispatch_batch_handler,
         )
 
-        find_mock.return_value = self._subs("sub-1", "sub-2")
+        plan_mock.return_value = self._work("sub-1", "sub-2")
 
         result = notifications_dispatch_batch_handler(
             {"cadence": "weekly", "dry_run": False}
@@ -65,15 +93,66 @@ class TestPlanHandler(unittest.TestCase):
 
     @patch(f"{_PLAN}._start_run")
     @patch(f"{_PLAN}._enqueue", return_value=True)
+    @patch(f"{_PLAN}.plan_due_events")
+    def test_workers_receive_planned_event_ids(
+        self, plan_mock, enqueue_mock, start_run_mock
+    ):
+        from tasks.notifications.dispatch_batch import (
+            notifications_dispatch_batch_handler,
+        )
+
+        plan_mock.return_value = {"sub-1": ["evt-1", "evt-2"], "sub-2": ["evt-3"]}
+        result = notifications_dispatch_batch_handler(
+            {"cadence": "weekly", "dry_run": False, "status_filter": "all"}
+        )
+
+        self.assertEqual(plan_mock.call_args.kwargs["cadence"], "weekly")
+        self.assertEqual(plan_mock.call_args.kwargs["status_filter"], "all")
+        worker_payloads = {
+            c.kwargs["payload"]["subscription_id"]: c.kwargs["payload"]
+            for c in enqueue_mock.call_args_list
+            if c.kwargs["in_body_task"] == "notifications_dispatch"
+        }
+        self.assertEqual(worker_payloads["sub-1"]["event_ids"], ["evt-1", "evt-2"])
+        self.assertEqual(worker_payloads["sub-2"]["event_ids"], ["evt-3"])
+        self.assertEqual(result["by_cadence"]["weekly"]["planned_events"], 3)
+
+    @patch(f"{_PLAN}._start_run")
+    @patch(f"{_PLAN}._enqueue", return_value=True)
+    @patch(f"{_PLAN}.plan_due_events")
     @patch(f"{_PLAN}.find_subscriptions")
+    def test_plan_events_disabled_enqueues_every_subscription(
+        self, find_mock, plan_mock, enqueue_mock, start_run_mock
+    ):
+        from tasks.notifications.dispatch_batch import (
+            notifications_dispatch_batch_handler,
+        )
+
+        find_mock.return_value = self._subs("sub-1", "sub-2")
+        notifications_dispatch_batch_handler(
+            {"cadence": "weekly", "dry_run": False, "plan_events": False}
+        )
+
+        plan_mock.assert_not_called()
+        worker_payloads = [
+            c.kwargs["payload"]
+            for c in enqueue_mock.call_args_list
+            if c.kwargs["in_body_task"] == "notifications_dispatch"
+        ]
+        self.assertEqual(len(worker_payloads), 2)
+        self.assertTrue(all("event_ids" not in p for p in worker_payloads))
+
+    @patch(f"{_PLAN}._start_run")
+    @patch(f"{_PLAN}._enqueue", return_value=True)
+    @patch(f"{_PLAN}.plan_due_events")
     def test_dynamic_task_names_use_prefix(
-        self, find_mock, enqueue_mock, start_run_mock
+        self, plan_mock, enqueue_mock, start_run_mock
     ):
         from tasks.notifications.dispatch_batch import (
             notifications_dispatch_batch_handler,
         )
 
-        find_mock.return_value = self._subs("sub-1")
+        plan_mock.return_value = self._work("sub-1")
         notifications_dispatch_batch_handler({"cadence": "weekly", "dry_run": False})
 
         names = [c.kwargs["task_name"] for c in enqueue_mock.call_args_list]
@@ -85,13 +164,45 @@ class TestPlanHandler(unittest.TestCase):
 
     @patch(f"{_PLAN}._start_run")
     @patch(f"{_PLAN}._enqueue", return_value=True)
-    @patch(f"{_PLAN}.find_subscriptions")
-    def test_dry_run_enqueues_nothing(self, find_mock, enqueue_mock, start_run_mock):
+    @patch(f"{_PLAN}.plan_due_events")
+    def test_subscriptions_per_task_groups_workers(
+        self, plan_mock, enqueue_mock, start_run_mock
+    ):
         from tasks.notifications.dispatch_batch import (
             notifications_dispatch_batch_handler,
         )
 
-        find_mock.return_value = self._subs("sub-1", "sub-2")
+        plan_mock.return_value = self._work("sub-1", "sub-2", "sub-3")
+        result = notifications_dispatch_batch_handler(
+            {"cadence": "weekly", "dry_run": False, "subscriptions_per_task": 2}
+        )
+
+        # every subscription is still tracked individually
+        self.assertEqual(start_run_mock.call_args.args[1], ["sub-1", "sub-2", "sub-3"])
+        worker_payloads = [
+            c.kwargs["payload"]
+            for c in enqueue_mock.call_args_list
+            if c.kwargs["in_body_task"] == "notifications_dispatch"
+        ]
+        self.assertEqual(
+            [p["subscription_ids"] for p in worker_payloads],
+            [["sub-1", "sub-2"], ["sub-3"]],
+        )
+        self.assertTrue(all("subscription_id" not in p for p in worker_payloads))
+        self.assertEqual(
+            worker_payloads[1]["event_ids_by_subscription"], {"sub-3": ["evt-sub-3"]}
+        )
+        self.assertEqual(result["by_cadence"]["weekly"]["enqueued"], 3)
+
+    @patch(f"{_PLAN}._start_run")
+    @patch(f"{_PLAN}._enqueue", return_value=True)
+    @patch(f"{_PLAN}.plan_due_events")
+    def test_dry_run_enqueues_nothing(self, plan_mock, enqueue_mock, start_run_mock):
+        from tasks.notifications.dispatch_batch import (
+            notifications_dispatch_batch_handler,
+        )
+
+        plan_mock.return_value = self._work("sub-1", "sub-2")
         result = notifications_dispatch_batch_handler(
             {"cadence": "weekly", "dry_run": True}
         )
@@ -102,21 +213,66 @@ class TestPlanHandler(unittest.TestCase):
 
     @patch(f"{_PLAN}._start_run")
     @patch(f"{_PLAN}._enqueue", return_value=True)
-    @patch(f"{_PLAN}.find_subscriptions")
+    @patch(f"{_PLAN}.plan_due_events")
     def test_no_subscriptions_enqueues_nothing(
-        self, find_mock, enqueue_mock, start_run_mock
+        self, plan_mock, enqueue_mock, start_run_mock
     ):
         from tasks.notifications.dispatch_batch import (
             notifications_dispatch_batch_handler,
         )
 
-        find_mock.return_value = []
+        plan_mock.return_value = {}
         notifications_dispatch_batch_handler({"cadence": "weekly", "dry_run": False})
 
         enqueue_mock.assert_not_called()
         start_run_mock.assert_not_called()
 
 
+@patch.dict(
+    os.environ,
+    {
+        "PROJECT_ID": "test-project",
+        "GCP_REGION": "us-central1",
+        "ENVIRONMENT": "dev",
+        "NOTIFICATION_DISPATCH_QUEUE": "dispatch-queue",
+        "NOTIFICATION_DISPATCH_MONITOR_QUEUE": "monitor-queue",
+    },
+)
+class TestPlanHandlerBulkEnqueue(unittest.TestCase):
+    @patch(f"{_PLAN}._start_run")
+    @patch(f"{_PLAN}.plan_due_events")
+    def test_workers_enqueued_through_bulk_helper(self, plan_mock, start_run_mock):
+        from google.api_core import exceptions
+        from tasks.notifications.dispatch_batch import (
+            notifications_dispatch_batch_handler,
+        )
+
+        client = FakeCloudTasksClient()
+        # One transient error is retried transparently
+        client.fail_next(exceptions.ServiceUnavailable("try again"))
+        plan_mock.return_value = {f"sub-{i}": [f"evt-{i}"] for i in range(5)}
+
+        with patch(
+            f"{_PLAN}.enqueue_http_tasks",
+            partial(enqueue_http_tasks, client=client, backoff_seconds=0),
+        ):
+            result = notifications_dispatch_batch_handler(
+                {"cadence": "weekly", "dry_run": False}
+            )
+
+        self.assertEqual(result["by_cadence"]["weekly"]["enqueued"], 5)
+        self.assertEqual(len(client.task_names("dispatch-queue")), 5)
+        self.assertEqual(len(client.task_names("monitor-queue")), 1)
+        self.assertEqual(
+            sorted(
+                body["payload"]["subscription_id"]
+                for body in client.bodies()
+                if body["task"] == "notifications_dispatch"
+            ),
+            [f"sub-{i}" for i in range(5)],
+        )
+
+
 # ---------------------------------------------------------------------------
 # notifications_dispatch (worker)
 # ---------------------------------------------------------------------------
@@ -133,7 +289,7 @@ class TestWorkerHandler(unittest.TestCase):
         with self.assertRaises(ValueError):
             notifications_dispatch_handler({"run_id": "r1"})
 
-    @patch(f"{_WORKER}._mark_entry")
+    @patch(f"{_WORKER}._mark_entries")
     @patch(f"{_WORKER}.process_subscription")
     def test_marks_completed_on_success(self, proc_mock, mark_mock):
         from tasks.notifications.dispatch_worker import (
@@ -147,11 +303,64 @@ class TestWorkerHandler(unittest.TestCase):
 
         proc_mock.assert_called_once()
         # marked completed (no error kwarg)
-        mark_mock.assert_called_once_with("r1", "sub-1")
+        mark_mock.assert_called_once_with("r1", ["sub-1"])
         self.assertEqual(result["status"], "ok")
         self.assertEqual(result["emails_sent"], 2)
 
-    @patch(f"{_WORKER}._mark_entry")
+    @patch(f"{_WORKER}._mark_entries")
+    @patch(f"{_WORKER}.process_subscription")
+    def test_forwards_planned_event_ids(self, proc_mock, mark_mock):
+        from tasks.notifications.dispatch_worker import (
+            notifications_dispatch_handler,
+        )
+
+        proc_mock.return_value = {"emails_sent": 1}
+        notifications_dispatch_handler(
+            {"subscription_id": "sub-1", "run_id": "r1", "event_ids": ["evt-1"]}
+        )
+
+        self.assertEqual(proc_mock.call_args.kwargs["event_ids"], ["evt-1"])
+
+    @patch(f"{_WORKER}._mark_entries")
+    @patch(f"{_WORKER}.process_subscriptions")
+    @patch(f"{_WORKER}.process_subscription")
+    def test_batch_payload_marks_every_subscription(
+        self, proc_mock, batch_mock, mark_mock
+    ):
+        from tasks.notifications.dispatch_worker import (
+            notifications_dispatch_handler,
+        )
+
+        batch_mock.return_value = {"emails_sent": 3, "brevo_requests": 1}
+        result = notifications_dispatch_handler(
+            {"subscription_ids": ["sub-1", "sub-2"], "run_id": "r1"}
+        )
+
+        proc_mock.assert_not_called()
+        self.assertEqual(
+            batch_mock.call_args.kwargs["subscription_ids"], ["sub-1", "sub-2"]
+        )
+        mark_mock.assert_called_once_with("r1", ["sub-1", "sub-2"])
+        self.assertEqual(result["brevo_requests"], 1)
+
+    @patch(f"{_WORKER}._mark_entries")
+    @patch(f"{_WORKER}.process_subscriptions")
+    def test_batch_infra_error_marks_every_subscription_failed(
+        self, batch_mock, mark_mock
+    ):
+        from tasks.notifications.dispatch_worker import (
+            notifications_dispatch_handler,
+        )
+
+        batch_mock.side_effect = RuntimeError("db down")
+        with self.assertRaises(RuntimeError):
+            notifications_dispatch_handler(
+                {"subscription_ids": ["sub-1", "sub-2"], "run_id": "r1"}
+            )
+
+        mark_mock.assert_called_once_with("r1", ["sub-1", "sub-2"], error="db down")
+
+    @patch(f"{_WORKER}._mark_entries")
     @patch(f"{_WORKER}.process_subscription")
     def test_infra_error_marks_failed_and_reraises(self, proc_mock, mark_mock):
         from tasks.notifications.dispatch_worker import (
@@ -162,7 +371,47 @@ class TestWorkerHandler(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             notifications_dispatch_handler({"subscription_id": "sub-1", "run_id": "r1"})
 
-        mark_mock.assert_called_once_with("r1", "sub-1", error="db down")
+        mark_mock.assert_called_once_with("r1", ["sub-1"], error="db down")
+
+
+class TestMarkEntries(unittest.TestCase):
+    @patch(f"{_WORKER}.TaskExecutionTracker")
+    def test_marks_the_chunk_completed_with_one_bulk_call(self, tracker_cls):
+        from tasks.notifications.dispatch_worker import _mark_entries
+
+        session = MagicMock()
+        _mark_entries("r1", ["sub-1", "sub-2"], db_session=session)
+
+        tracker = tracker_cls.return_value
+        tracker.mark_completed_many.assert_called_once_with(["sub-1", "sub-2"])
+        tracker.mark_completed.assert_not_called()
+        tracker.mark_failed_many.assert_not_called()
+        session.commit.assert_called_once()
+
+    @patch(f"{_WORKER}.TaskExecutionTracker")
+    def test_marks_the_chunk_failed_with_one_bulk_call(self, tracker_cls):
+        from tasks.notifications.dispatch_worker import _mark_entries
+
+        session = MagicMock()
+        _mark_entries("r1", ["sub-1", "sub-2"], error="db down", db_session=session)
+
+        tracker = tracker_cls.return_value
+        tracker.mark_failed_many.assert_called_once_with(
+            ["sub-1", "sub-2"], error_messages={"sub-1": "db down", "sub-2": "db down"}
+        )
+        tracker.mark_failed.assert_not_called()
+        tracker.mark_completed_many.assert_not_called()
+        session.commit.assert_called_once()
+
+    @patch(f"{_WORKER}.TaskExecutionTracker")
+    def test_no_run_id_is_noop(self, tracker_cls):
+        from tasks.notifications.dispatch_worker import _mark_entries
+
+        session = MagicMock()
+        _mark_entries(None, ["sub-1", "sub-2"], db_session=session)
+
+        tracker_cls.assert_not_called()
+        session.commit.assert_not_called()
 
 
 # ---------------------------------------------------------------------------
@@ -51,7 +51,9 @@ from tasks.notifications.dispatch_notifications import (
     emit_admin_summary,
     find_events_for_subscription,
     find_subscriptions,
+    plan_due_events,
     process_subscription,
+    process_subscriptions,
     _resolve_scheduled_cadences,
 )
 from test_shared.test_utils.database_utils import default_users_db_url
@@ -443,6 +445,133 @@ class TestFindEventsForSubscription(unittest.TestCase):
 # ---------------------------------------------------------------------------
 
 
+class TestPlanDueEvents(unittest.TestCase):
+    """Set-based planner: must agree with the per-subscription lookups."""
+
+    def tearDown(self):
+        _cleanup_notifications()
+
+    def _plan(self, db_session, **kwargs):
+        params = dict(
+            db_session=db_session,
+            cadence=NotificationCadence.WEEKLY,
+            user_ids=[],
+            force=False,
+            status_filter="new",
+            max_retries=5,
+        )
+        params.update(kwargs)
+        return plan_due_events(**params)
+
+    def _per_subscription(self, db_session, subscription, status_filter="new"):
+        return [
+            e.id
+            for e in find_events_for_subscription(
+                db_session=db_session,
+                subscription=subscription,
+                status_filter=status_filter,
+                max_retries=5,
+            )
+        ]
+
+    @with_users_db_session(db_url=default_users_db_url)
+    def test_new_events_respect_feed_filter_and_active_since(
+        self, db_session: Session = None
+    ):
+        unfiltered = _make_subscription(db_session, "user-alice")
+        filtered = _make_subscription(
+            db_session, "user-bob", filter_params={"feed_ids": ["mdb-2"]}
+        )
+        late = _make_subscription(
+            db_session,
+            "user-alice",
+            active_since=datetime.now(timezone.utc) + timedelta(hours=1),
+        )
+        e1 = _make_event(db_session, feed_stable_id="mdb-1")
+        e2 = _make_event(
+            db_session, feed_stable_id="mdb-3", target_feed_stable_id="mdb-2"
+        )
+
+        plan = self._plan(db_session)
+
+        self.assertEqual(plan[unfiltered.id], [e1.id, e2.id])
+        self.assertEqual(plan[filtered.id], [e2.id])
+        self.assertNotIn(late.id, plan)
+        for sub in (unfiltered, filtered):
+            self.assertEqual(plan[sub.id], self._per_subscription(db_session, sub))
+
+    @with_users_db_session(db_url=default_users_db_url)
+    def test_log_states_follow_status_filter(self, db_session: Session = None):
+        sub = _make_subscription(db_session, "user-alice")
+        sent = _make_event(db_session)
+        failed = _make_event(db_session)
+        exhausted = _make_event(db_session)
+        stale = _make_event(db_session)
+        for event, status, retries, sent_at in (
+            (sent, NotificationLogStatus.SENT, 0, None),
+            (failed, NotificationLogStatus.FAILED, 1, None),
+            (exhausted, NotificationLogStatus.FAILED, 5, None),
+            (
+                stale,
+                NotificationLogStatus.PENDING,
+                0,
+                datetime.now(timezone.utc) - timedelta(hours=2),
+            ),
+        ):
+            db_session.add(
+                NotificationLog(
+                    id=_uid(),
+                    notification_event_id=event.id,
+                    subscription_id=sub.id,
+                    channel="email",
+                    status=status,
+                    retry_count=retries,
+                    sent_at=sent_at or datetime.now(timezone.utc),
+                )
+            )
+        new = _make_event(db_session)
+        db_session.flush()
+
+        expected = {
+            "new": [stale.id, new.id],
+            "failed": [failed.id, stale.id],
+            "all": [failed.id, stale.id, new.id],
+        }
+        for status_filter, event_ids in expected.items():
+            plan = self._plan(db_session, status_filter=status_filter)
+            self.assertEqual(plan[sub.id], event_ids, status_filter)
+            self.assertEqual(
+                sorted(plan[sub.id]),
+                sorted(self._per_subscription(db_session, sub, status_filter)),
+                status_filter,
+            )
+
+    @with_users_db_session(db_url=default_users_db_url)
+    def test_cadence_and_user_filters(self, db_session: Session = None):
+        weekly = _make_subscription(db_session, "user-alice")
+        daily = _make_subscription(
+            db_session, "user-bob", cadence=NotificationCadence.DAILY
+        )
+        _make_event(db_session)
+
+        self.assertEqual(set(self._plan(db_session)), {weekly.id})
+        self.assertEqual(
+            set(self._plan(db_session, cadence="all", user_ids=["user-bob"])),
+            {daily.id},
+        )
+        self.assertEqual(
+            set(
+                self._plan(
+                    db_session,
+                    cadence=NotificationCadence.WEEKLY,
+                    user_ids=["user-bob"],
+                    force=True,
+                )
+            ),
+            {daily.id},
+        )
+
+
 class TestEmitAdminSummary(unittest.TestCase):
     def tearDown(self):
         _cleanup_notifications()
@@ -679,6 +808,29 @@ class TestProcessSubscription(unittest.TestCase):
         self.assertFalse(mock_send.called)
         self.assertEqual(stats["emails_sent"], 0)
 
+    @patch("tasks.notifications.dispatch_notifications.send_single")
+    @with_users_db_session(db_url=default_users_db_url)
+    def test_planned_event_ids_replace_lookup(
+        self, mock_send, db_session: Session = None
+    ):
+        sub = _make_subscription(
+            db_session, "user-alice", cadence=NotificationCadence.WEEKLY, digest=False
+        )
+        planned = _make_event(db_session)
+        _make_event(db_session)
+
+        stats = process_subscription(
+            subscription_id=sub.id,
+            status_filter="new",
+            max_retries=5,
+            event_ids=[planned.id],
+            db_session=db_session,
+        )
+
+        self.assertEqual(stats["events_found"], 1)
+        self.assertEqual(mock_send.call_count, 1)
+        self.assertEqual(mock_send.call_args.args[1].id, planned.id)
+
     @patch("tasks.notifications.dispatch_notifications.send_single")
     @with_users_db_session(db_url=default_users_db_url)
     def test_inactive_subscription_skipped(self, mock_send, db_session: Session = None):
@@ -813,5 +965,123 @@ class TestProcessSubscription(unittest.TestCase):
         self.assertEqual(stats["permanently_failed"], 1)
 
 
+class TestProcessSubscriptions(unittest.TestCase):
+    """Worker core, batch mode: template emails share Brevo requests."""
+
+    def tearDown(self):
+        _cleanup_notifications()
+
+    @patch.dict(
+        "os.environ",
+        {
+            "BREVO_TEMPLATE_FEED_URL_UPDATED": "11",
+            "BREVO_TEMPLATE_FEED_URL_UPDATED_DIGEST": "12",
+        },
+    )
+    @patch("tasks.notifications.dispatch_notifications.send_prepared")
+    @patch("tasks.notifications.dispatch_notifications.send_batch")
+    @with_users_db_session(db_url=default_users_db_url)
+    def test_groups_template_emails_into_batches(
+        self, mock_batch, mock_prepared, db_session: Session = None
+    ):
+        digest_sub = _make_subscription(
+            db_session, "user-alice", cadence=NotificationCadence.WEEKLY, digest=True
+        )
+        single_sub = _make_subscription(
+            db_session, "user-bob", cadence=NotificationCadence.WEEKLY, digest=False
+        )
+        _make_event(db_session, feed_stable_id="mdb-1")
+        _make_event(db_session, feed_stable_id="mdb-2")
+
+        stats = process_subscriptions(
+            subscription_ids=[digest_sub.id, single_sub.id],
+            status_filter="new",
+            max_retries=5,
+            db_session=db_session,
+        )
+
+        mock_prepared.assert_not_called()
+        # One batch per template: the digest template (1 email) and the single
+        # template (2 emails, one per event).
+        self.assertEqual(mock_batch.call_count, 2)
+        batch_sizes = sorted(len(c.args[0]) for c in mock_batch.call_args_list)
+        self.assertEqual(batch_sizes, [1, 2])
+        self.assertEqual(stats["brevo_requests"], 2)
+        self.assertEqual(stats["events_claimed"], 4)
+        self.assertEqual(stats["emails_sent"], 4)
+        statuses = {
+            log.status
+            for log in db_session.query(NotificationLog)
+            .filter(NotificationLog.subscription_id.in_([digest_sub.id, single_sub.id]))
+            .all()
+        }
+        self.assertEqual(statuses, {NotificationLogStatus.SENT})
+
+    @patch.dict(
+        "os.environ",
+        {"BREVO_TEMPLATE_FEED_URL_UPDATED": "11", "BREVO_BATCH_MAX_VERSIONS": "2"},
+    )
+    @patch("tasks.notifications.dispatch_notifications.send_batch")
+    @with_users_db_session(db_url=default_users_db_url)
+    def test_failed_batch_marks_every_recipient_log_failed(
+        self, mock_batch, db_session: Session = None
+    ):
+        from shared.notifications.brevo_notification_sender import BrevoSendError
+
+        mock_batch.side_effect = BrevoSendError("Brevo 500")
+        subs = [
+            _make_subscription(
+                db_session, user, cadence=NotificationCadence.WEEKLY, digest=False
+            )
+            for user in ("user-alice", "user-bob")
+        ]
+        _make_event(db_session)
+
+        with patch("tasks.notifications.dispatch_notifications.time.sleep"):
+            stats = process_subscriptions(
+                subscription_ids=[s.id for s in subs],
+                status_filter="new",
+                max_retries=5,
+                db_session=db_session,
+            )
+
+        # One batch of two recipients, attempted once per in-run retry.
+        self.assertTrue(all(len(c.args[0]) == 2 for c in mock_batch.call_args_list))
+        self.assertEqual(stats["emails_failed"], 2)
+        logs = (
+            db_session.query(NotificationLog)
+            .filter(NotificationLog.subscription_id.in_([s.id for s in subs]))
+            .all()
+        )
+        self.assertEqual(len(logs), 2)
+        for log in logs:
+            self.assertEqual(log.status, NotificationLogStatus.FAILED)
+            self.assertEqual(log.retry_count, 1)
+
+    @patch("tasks.notifications.dispatch_notifications.send_batch")
+    @patch("tasks.notifications.dispatch_notifications.send_prepared")
+    @with_users_db_session(db_url=default_users_db_url)
+    def test_html_fallback_is_sent_one_by_one(
+        self, mock_prepared, mock_batch, db_session: Session = None
+    ):
+        sub = _make_subscription(
+            db_session, "user-alice", cadence=NotificationCadence.WEEKLY, digest=False
+        )
+        _make_event(db_session, feed_stable_id="mdb-1")
+        _make_event(db_session, feed_stable_id="mdb-2")
+
+        # No BREVO_TEMPLATE_* configured: every email uses the HTML fallback.
+        stats = process_subscriptions(
+            subscription_ids=[sub.id],
+            status_filter="new",
+            max_retries=5,
+            db_session=db_session,
+        )
+
+        mock_batch.assert_not_called()
+        self.assertEqual(mock_prepared.call_count, 2)
+        self.assertEqual(stats["emails_sent"], 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -18,6 +18,7 @@ import unittest
 from unittest.mock import patch, MagicMock
 
 from shared.helpers.gtfs_validator_common import GTFS_VALIDATOR_URL_STAGING
+from test_shared.test_utils.fake_gcs import FakeBucket
 from tasks.validation_reports.rebuild_missing_validation_reports import (
     rebuild_missing_validation_reports_handler,
     get_parameters,
@@ -456,25 +457,25 @@ class TestRebuildMissingValidationReports(unittest.TestCase):
 class TestFilterDatasetsWithExistingBlob(unittest.TestCase):
     @patch(f"{_MODULE}.storage")
     def test_stops_at_limit(self, storage_mock):
-        """Should stop checking GCS as soon as limit valid datasets are found."""
+        """Should stop listing GCS as soon as limit valid datasets are found."""
         from tasks.validation_reports.rebuild_missing_validation_reports import (
             _filter_out_datasets_without_blob,
         )
 
-        bucket_mock = MagicMock()
-        storage_mock.Client.return_value.bucket.return_value = bucket_mock
-
-        # All blobs exist
-        blob_mock = MagicMock()
-        blob_mock.exists.return_value = True
-        bucket_mock.blob.return_value = blob_mock
+        bucket = FakeBucket()
+        for i in range(20):
+            bucket.add_blob(f"feed-{i}/ds-{i}/ds-{i}.zip")
+        storage_mock.Client.return_value.bucket.return_value = bucket
 
         datasets = [(f"feed-{i}", f"ds-{i}") for i in range(20)]
         result = _filter_out_datasets_without_blob(datasets, limit=3)
 
         self.assertEqual(len(result), 3)
-        # Only 3 GCS calls should have been made
-        self.assertEqual(blob_mock.exists.call_count, 3)
+        # Only the feeds of the 3 checked datasets should have been listed
+        self.assertEqual(
+            [call["prefix"] for call in bucket.list_calls],
+            ["feed-0/", "feed-1/", "feed-2/"],
+        )
 
     @patch(f"{_MODULE}.storage")
     def test_skips_missing_blobs_and_continues(self, storage_mock):
@@ -483,18 +484,37 @@ class TestFilterDatasetsWithExistingBlob(unittest.TestCase):
             _filter_out_datasets_without_blob,
         )
 
-        bucket_mock = MagicMock()
-        storage_mock.Client.return_value.bucket.return_value = bucket_mock
-
-        # First 2 blobs missing, next 3 exist
-        exists_sequence = [False, False, True, True, True, True, True]
-        blob_mock = MagicMock()
-        blob_mock.exists.side_effect = exists_sequence
-        bucket_mock.blob.return_value = blob_mock
+        bucket = FakeBucket()
+        # First 2 blobs missing, next 5 exist
+        for i in range(2, 7):
+            bucket.add_blob(f"feed-{i}/ds-{i}/ds-{i}.zip")
+        storage_mock.Client.return_value.bucket.return_value = bucket
 
         datasets = [(f"feed-{i}", f"ds-{i}") for i in range(7)]
         result = _filter_out_datasets_without_blob(datasets, limit=3)
 
-        self.assertEqual(len(result), 3)
-        # Must have checked 5 items: 2 missing + 3 valid
-        self.assertEqual(blob_mock.exists.call_count, 5)
+        self.assertEqual(
+            result, [("feed-2", "ds-2"), ("feed-3", "ds-3"), ("feed-4", "ds-4")]
+        )
+        # Must have listed 5 feeds: 2 missing + 3 valid
+        self.assertEqual(len(bucket.list_calls), 5)
+
+    @patch(f"{_MODULE}.storage")
+    def test_lists_each_feed_once(self, storage_mock):
+        """Datasets of the same feed should be answered from a single listing."""
+        from tasks.validation_reports.rebuild_missing_validation_reports import (
+            _filter_out_datasets_without_blob,
+        )
+
+        bucket = FakeBucket()
+        bucket.add_blob("feed-1/ds-1/ds-1.zip")
+        bucket.add_blob("feed-1/ds-2/ds-2.zip")
+        bucket.add_blob("feed-1/ds-3/report.json")
+        storage_mock.Client.return_value.bucket.return_value = bucket
+
+        datasets = [("feed-1", "ds-1"), ("feed-1", "ds-2"), ("feed-1", "ds-3")]
+        result = _filter_out_datasets_without_blob(datasets)
+
+        self.assertEqual(result, [("feed-1", "ds-1"), ("feed-1", "ds-2")])
+        self.assertEqual(len(bucket.list_calls), 1)
+        self.assertEqual(bucket.list_calls[0]["match_glob"], "**/*.zip")
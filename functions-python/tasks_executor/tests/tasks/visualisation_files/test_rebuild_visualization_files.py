@@ -14,12 +14,14 @@
 #  limitations under the License.
 #
 
+import json
 import unittest
 from unittest.mock import patch, MagicMock
 
 from sqlalchemy import func, distinct
 from sqlalchemy.orm import Session
 
+from shared.common.gcp_utils import TaskEnqueueResult
 from shared.database.database import with_db_session
 from shared.database_gen.sqlacodegen_models import Gtfsdataset, Gtfsfile, Gtfsfeed
 from test_shared.test_utils.database_utils import default_db_url
@@ -45,6 +47,7 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
             include_deprecated_feeds,
             include_feed_op_status,
             limit,
+            run_id,
         ) = get_parameters(payload)
 
         self.assertTrue(dry_run)
@@ -53,6 +56,7 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
         self.assertFalse(include_deprecated_feeds)
         self.assertEqual(include_feed_op_status, ["published"])
         self.assertIsNone(limit)
+        self.assertIsNone(run_id)
 
     def test_get_parameters_explicit_bool_and_string(self):
         # dry_run as bool False
@@ -68,6 +72,7 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
             include_deprecated_feeds,
             include_feed_op_status,
             limit,
+            run_id,
         ) = get_parameters(payload)
         self.assertFalse(dry_run)
         self.assertEqual(include_feed_op_status, ["published", "wip"])
@@ -82,6 +87,7 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
             include_deprecated_feeds,
             include_feed_op_status,
             limit,
+            run_id,
         ) = get_parameters(payload)
         self.assertFalse(dry_run)
         self.assertEqual(include_feed_op_status, ["wip"])
@@ -96,6 +102,7 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
             include_deprecated_feeds,
             include_feed_op_status,
             limit,
+            run_id,
         ) = get_parameters(payload)
         self.assertTrue(dry_run)
         self.assertEqual(include_feed_op_status, ["published"])
@@ -122,6 +129,7 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
             latest_only=True,
             limit=None,
             check_existing=False,
+            run_id=None,
         )
 
     # --------------------------
@@ -129,10 +137,10 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
     # --------------------------
     @with_db_session(db_url=default_db_url)
     @patch(
-        "tasks.visualization_files.rebuild_missing_visualization_files.create_http_pmtiles_builder_task"
+        "tasks.visualization_files.rebuild_missing_visualization_files.enqueue_http_tasks"
     )
     def test_rebuild_no_check_existing_counts_all_eligible_dryrun(
-        self, create_task_mock, db_session: Session
+        self, enqueue_mock, db_session: Session
     ):
         """
         When check_existing=False, every eligible dataset should be considered for processing.
@@ -159,17 +167,17 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
         self.assertIsNotNone(resp)
         self.assertEqual(resp["total_processed"], eligible_count)
         self.assertEqual(resp["message"], "Dry run: no datasets processed.")
-        create_task_mock.assert_not_called()
+        enqueue_mock.assert_not_called()
 
     # --------------------------
     # core function: check_existing=True (all files exist)
     # --------------------------
     @with_db_session(db_url=default_db_url)
     @patch(
-        "tasks.visualization_files.rebuild_missing_visualization_files.create_http_pmtiles_builder_task"
+        "tasks.visualization_files.rebuild_missing_visualization_files.enqueue_http_tasks"
     )
     def test_rebuild_check_existing_all_exist_dryrun_zero(
-        self, create_task_mock, db_session: Session
+        self, enqueue_mock, db_session: Session
     ):
         """
         When check_existing=True and every PMTiles file exists, total_processed should be 0.
@@ -193,17 +201,17 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
         self.assertIsNotNone(resp)
         self.assertEqual(resp["total_processed"], 0)
         self.assertEqual(resp["message"], "Dry run: no datasets processed.")
-        create_task_mock.assert_not_called()
+        enqueue_mock.assert_not_called()
 
     # --------------------------
     # core function: check_existing=True (all files missing)
     # --------------------------
     @with_db_session(db_url=default_db_url)
     @patch(
-        "tasks.visualization_files.rebuild_missing_visualization_files.create_http_pmtiles_builder_task"
+        "tasks.visualization_files.rebuild_missing_visualization_files.enqueue_http_tasks"
     )
     def test_rebuild_check_existing_all_missing_dryrun_counts_all(
-        self, create_task_mock, db_session: Session
+        self, enqueue_mock, db_session: Session
     ):
         """
         When check_existing=True and nothing exists, all eligible datasets should be processed (in dry run).
@@ -237,20 +245,20 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
         self.assertIsNotNone(resp)
         self.assertEqual(resp["total_processed"], eligible_count)
         self.assertEqual(resp["message"], "Dry run: no datasets processed.")
-        create_task_mock.assert_not_called()
+        enqueue_mock.assert_not_called()
 
     # --------------------------
     # core function: non-dry run => tasks created only for missing
     # --------------------------
     @with_db_session(db_url=default_db_url)
     @patch(
-        "tasks.visualization_files.rebuild_missing_visualization_files.create_http_pmtiles_builder_task"
+        "tasks.visualization_files.rebuild_missing_visualization_files.enqueue_http_tasks"
     )
     def test_rebuild_non_dry_run_creates_tasks_for_missing(
-        self, create_task_mock, db_session: Session
+        self, enqueue_mock, db_session: Session
     ):
         """
-        Non-dry run: ensure create_http_pmtiles_builder_task is called once per dataset
+        Non-dry run: ensure a pmtiles task is enqueued once per dataset
         missing at least one PMTiles file.
         Here we simulate: first dataset missing (False), others present (True).
         """
@@ -274,13 +282,17 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
                 check_existing=True,
             )
             self.assertEqual(resp["total_processed"], 0)
-            create_task_mock.assert_not_called()
+            enqueue_mock.assert_not_called()
             return
 
+        enqueue_mock.side_effect = lambda specs: [
+            TaskEnqueueResult(spec=spec, status="created", attempts=1) for spec in specs
+        ]
         resp = rebuild_missing_visualization_files(
             db_session=db_session,
             dry_run=False,
             check_existing=True,
+            run_id="run-1",
         )
 
         # Exactly one dataset should have been processed (the first one we forced to be missing)
@@ -290,12 +302,18 @@ class TestRebuildMissingVisualizationFiles(unittest.TestCase):
             resp["message"],
             "Rebuild missing visualization files task executed successfully.",
         )
-        create_task_mock.assert_called_once()
-        # Validate call signature shape (feed_stable_id, dataset_stable_id)
-        args, kwargs = create_task_mock.call_args
-        self.assertEqual(len(args), 2)
-        self.assertIsInstance(args[0], str)
-        self.assertIsInstance(args[1], str)
+        enqueue_mock.assert_called_once()
+        self.assertEqual(
+            resp["tasks"], {"created": 1, "already_exists": 0, "failed": 0}
+        )
+        # One pmtiles task per dataset, named after the dataset and the run
+        (specs,), _ = enqueue_mock.call_args
+        self.assertEqual(len(specs), 1)
+        self.assertIn(
+            json.loads(specs[0].body)["dataset_stable_id"],
+            [dataset.stable_id for dataset in eligible_datasets],
+        )
+        self.assertTrue(specs[0].task_name.endswith("-run-1"))
 
     # --------------------------
     # sanity: constants are as expected
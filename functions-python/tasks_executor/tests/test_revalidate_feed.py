@@ -14,9 +14,59 @@
 #
 
 import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
-from tasks.web_revalidation.revalidate_feed import revalidate_feed_handler
+import requests
+
+from tasks.web_revalidation.revalidate_feed import (
+    MAX_BUFFERED_ATTEMPTS,
+    post_revalidation,
+    revalidate_feed_handler,
+    revalidate_feeds,
+    revalidate_feeds_handler,
+)
+
+REVALIDATE_ENV = {
+    "WEB_APP_REVALIDATE_URL": "https://example.com/api/revalidate",
+    "WEB_APP_REVALIDATE_SECRET": "test-secret",
+}
+
+
+def _response(status_code: int) -> MagicMock:
+    response = MagicMock(status_code=status_code)
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(
+            f"{status_code} error", response=response
+        )
+    return response
+
+
+REQUESTED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _session_with_buffer(*requests_attempts) -> MagicMock:
+    """Session whose web_revalidation_request rows are (stable_id, attempts)."""
+    db_session = MagicMock()
+    db_session.query.return_value.all.return_value = [
+        SimpleNamespace(
+            feed_stable_id=stable_id, requested_at=REQUESTED_AT, attempts=attempts
+        )
+        for stable_id, attempts in requests_attempts
+    ]
+    return db_session
+
+
+def _matched_requests(statement) -> list:
+    """(stable_id, requested_at) pairs a delete or update statement is restricted to."""
+    params = statement.compile().params
+    return sorted(
+        pair
+        for values in params.values()
+        if isinstance(values, list)
+        for pair in values
+    )
 
 
 class TestRevalidateFeedHandler(unittest.TestCase):
@@ -97,5 +147,139 @@ class TestRevalidateFeedHandler(unittest.TestCase):
         self.assertIn("Connection refused", result["error"])
 
 
+class TestPostRevalidation(unittest.TestCase):
+    @patch("tasks.web_revalidation.revalidate_feed.time.sleep")
+    @patch("tasks.web_revalidation.revalidate_feed.requests.post")
+    def test_retries_with_backoff(self, mock_post, mock_sleep):
+        mock_post.side_effect = [
+            requests.ConnectionError("reset"),
+            _response(503),
+            _response(200),
+        ]
+
+        ok = post_revalidation(
+            "https://example.com/api/revalidate",
+            "secret",
+            ["mdb-1", "mdb-2"],
+            max_retries=3,
+            backoff_seconds=0.5,
+        )
+
+        self.assertTrue(ok)
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(
+            mock_post.call_args.kwargs["json"],
+            {"feedIds": ["mdb-1", "mdb-2"], "type": "specific-feeds"},
+        )
+        self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [0.5, 1.0])
+
+    @patch("tasks.web_revalidation.revalidate_feed.time.sleep")
+    @patch("tasks.web_revalidation.revalidate_feed.requests.post")
+    def test_client_error_is_not_retried(self, mock_post, mock_sleep):
+        mock_post.return_value = _response(401)
+
+        ok = post_revalidation("https://example.com", "secret", ["mdb-1"])
+
+        self.assertFalse(ok)
+        mock_post.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("tasks.web_revalidation.revalidate_feed.time.sleep")
+    @patch("tasks.web_revalidation.revalidate_feed.requests.post")
+    def test_gives_up_after_max_retries(self, mock_post, _):
+        mock_post.return_value = _response(429)
+
+        ok = post_revalidation("https://example.com", "secret", ["mdb-1"], 2)
+
+        self.assertFalse(ok)
+        self.assertEqual(mock_post.call_count, 2)
+
+
+@patch.dict("os.environ", REVALIDATE_ENV)
+class TestRevalidateFeeds(unittest.TestCase):
+    @patch("tasks.web_revalidation.revalidate_feed.create_revalidate_feeds_task")
+    @patch("tasks.web_revalidation.revalidate_feed.post_revalidation")
+    def test_chunks_deduplicated_feeds(self, mock_post, mock_schedule):
+        mock_post.return_value = True
+        db_session = _session_with_buffer(("mdb-3", 0), ("mdb-1", 0), ("mdb-2", 1))
+
+        result = revalidate_feeds(
+            feed_stable_ids=["mdb-1", "mdb-4"], chunk_size=3, db_session=db_session
+        )
+
+        self.assertEqual(
+            [c.args[2] for c in mock_post.call_args_list],
+            [["mdb-1", "mdb-2", "mdb-3"], ["mdb-4"]],
+        )
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["feeds"], 4)
+        self.assertEqual(result["calls"], 2)
+        # Only the buffered feeds, as read, are deleted; nothing is left to retry
+        db_session.execute.assert_called_once()
+        self.assertEqual(
+            _matched_requests(db_session.execute.call_args.args[0]),
+            [
+                ("mdb-1", REQUESTED_AT),
+                ("mdb-2", REQUESTED_AT),
+                ("mdb-3", REQUESTED_AT),
+            ],
+        )
+        db_session.commit.assert_called_once()
+        mock_schedule.assert_not_called()
+
+    @patch("tasks.web_revalidation.revalidate_feed.create_revalidate_feeds_task")
+    @patch("tasks.web_revalidation.revalidate_feed.post_revalidation")
+    def test_failed_feeds_stay_buffered_and_are_retried(self, mock_post, mock_schedule):
+        mock_post.side_effect = [True, False, False]
+        db_session = _session_with_buffer(
+            ("mdb-1", 0), ("mdb-2", 0), ("mdb-3", MAX_BUFFERED_ATTEMPTS - 1)
+        )
+
+        result = revalidate_feeds(chunk_size=1, db_session=db_session)
+
+        # mdb-3 fails on its last allowed run and is dropped
+        self.assertEqual(result["status"], "error")
+        self.assertEqual(result["failed"], ["mdb-2", "mdb-3"])
+        self.assertEqual(result["dropped"], ["mdb-3"])
+        delete_statement, update_statement = [
+            c.args[0] for c in db_session.execute.call_args_list
+        ]
+        self.assertEqual(
+            _matched_requests(delete_statement),
+            [("mdb-1", REQUESTED_AT), ("mdb-3", REQUESTED_AT)],
+        )
+        self.assertEqual(_matched_requests(update_statement), [("mdb-2", REQUESTED_AT)])
+        mock_schedule.assert_called_once()
+
+    @patch("tasks.web_revalidation.revalidate_feed.post_revalidation")
+    def test_empty_buffer(self, mock_post):
+        result = revalidate_feeds(db_session=_session_with_buffer())
+
+        self.assertEqual(result["feeds"], 0)
+        mock_post.assert_not_called()
+
+    @patch.dict("os.environ", {"WEB_APP_REVALIDATE_URL": ""})
+    def test_missing_configuration_keeps_buffer(self):
+        db_session = _session_with_buffer(("mdb-1", 0))
+
+        result = revalidate_feeds(db_session=db_session)
+
+        self.assertEqual(result["status"], "skipped")
+        db_session.query.assert_not_called()
+
+    @patch("tasks.web_revalidation.revalidate_feed.revalidate_feeds")
+    def test_handler_passes_payload(self, mock_revalidate):
+        revalidate_feeds_handler(
+            {"feed_stable_ids": ["mdb-1"], "chunk_size": 10, "max_retries": 2}
+        )
+
+        mock_revalidate.assert_called_once_with(
+            feed_stable_ids=["mdb-1"],
+            chunk_size=10,
+            max_retries=2,
+            backoff_seconds=1.0,
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,142 @@
+#
+#   MobilityData 2026
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""
+In-memory stand-in for a google.cloud.bigquery Client, to test ingestion code offline.
+"""
+
+import json
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+from google.api_core.exceptions import Conflict, NotFound
+
+
+def _table_key(table_ref) -> Tuple[str, str, str]:
+    reference = getattr(table_ref, "reference", table_ref)
+    return reference.project, reference.dataset_id, reference.table_id
+
+
+class FakeJob:
+    """Completed job; result() raises the error the job failed with, if any."""
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+
+    def result(self):
+        if self.error:
+            raise self.error
+        return self
+
+
+class FakeBigQueryClient:
+    """
+    Client keeping datasets and table rows in memory.
+
+    Load jobs read the NDJSON rows of their gs:// URIs from `storage_client` (a FakeStorageClient)
+    and honour the write disposition of their job config. Copy jobs copy rows. Queries are not
+    executed: they are recorded in `queries`. `load_jobs` records the URIs of every load job, and
+    `fail_next_load` scripts the errors of the next load jobs (None for a job that succeeds).
+    """
+
+    def __init__(self, storage_client, project: str = "fake-project"):
+        self.project = project
+        self.storage_client = storage_client
+        self.datasets = set()
+        self.tables: Dict[Tuple[str, str, str], SimpleNamespace] = {}
+        self.load_jobs: List[List[str]] = []
+        self.queries: List[str] = []
+        self.fail_next_load: List[Exception] = []
+
+    def get_dataset(self, dataset_ref):
+        key = (dataset_ref.project, dataset_ref.dataset_id)
+        if key not in self.datasets:
+            raise NotFound(f"Dataset {key} not found")
+        return SimpleNamespace(project=key[0], dataset_id=key[1])
+
+    def create_dataset(self, dataset, exists_ok: bool = False):
+        key = (dataset.project, dataset.dataset_id)
+        if key in self.datasets and not exists_ok:
+            raise Conflict(f"Dataset {key} already exists")
+        self.datasets.add(key)
+        return dataset
+
+    def get_table(self, table_ref) -> SimpleNamespace:
+        key = _table_key(table_ref)
+        if key not in self.tables:
+            raise NotFound(f"Table {key} not found")
+        table = self.tables[key]
+        table.num_rows = len(table.rows)
+        return table
+
+    def create_table(self, table, exists_ok: bool = False) -> SimpleNamespace:
+        key = _table_key(table)
+        if key in self.tables:
+            if exists_ok:
+                return self.tables[key]
+            raise Conflict(f"Table {key} already exists")
+        self.tables[key] = SimpleNamespace(
+            project=key[0],
+            dataset_id=key[1],
+            table_id=key[2],
+            reference=table.reference,
+            schema=list(table.schema),
+            time_partitioning=getattr(table, "time_partitioning", None),
+            range_partitioning=getattr(table, "range_partitioning", None),
+            clustering_fields=getattr(table, "clustering_fields", None),
+            rows=[],
+            num_rows=0,
+        )
+        return self.tables[key]
+
+    def delete_table(self, table_ref, not_found_ok: bool = False) -> None:
+        key = _table_key(table_ref)
+        if self.tables.pop(key, None) is None and not not_found_ok:
+            raise NotFound(f"Table {key} not found")
+
+    def load_table_from_uri(self, source_uris, destination, job_config=None):
+        uris = [source_uris] if isinstance(source_uris, str) else list(source_uris)
+        self.load_jobs.append(uris)
+        error = self.fail_next_load.pop(0) if self.fail_next_load else None
+        if error:
+            return FakeJob(error)
+        table = self.get_table(destination)
+        rows = [row for uri in uris for row in self._read_ndjson(uri)]
+        if getattr(job_config, "write_disposition", None) == "WRITE_TRUNCATE":
+            table.rows = []
+        table.rows.extend(rows)
+        return FakeJob()
+
+    def copy_table(self, sources, destination, job_config=None):
+        source = self.get_table(sources)
+        target = self.get_table(destination)
+        if getattr(job_config, "write_disposition", None) == "WRITE_TRUNCATE":
+            target.rows = []
+        target.rows.extend(source.rows)
+        return FakeJob()
+
+    def query(self, query: str, job_config=None):
+        self.queries.append(query)
+        return FakeJob()
+
+    def _read_ndjson(self, uri: str) -> List[dict]:
+        bucket_name, _, blob_name = uri[len("gs://") :].partition("/")
+        content = self.storage_client.bucket(bucket_name).blob(blob_name)
+        return [
+            json.loads(line)
+            for line in content.download_as_text().splitlines()
+            if line.strip()
+        ]
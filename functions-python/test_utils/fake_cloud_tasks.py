@@ -0,0 +1,76 @@
+#
+#   MobilityData 2026
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""
+In-process stand-in for a google.cloud.tasks_v2 CloudTasksClient, to test Cloud Tasks
+fan-outs offline.
+"""
+
+import json
+import threading
+from typing import Dict, List, Optional
+
+
+class FakeCloudTasksClient:
+    """
+    Client keeping created tasks in memory. Like Cloud Tasks, creating a task whose name already
+    exists raises AlreadyExists. `fail_next` scripts errors raised by the next create_task calls,
+    to exercise retries.
+    """
+
+    def __init__(self):
+        self.tasks: List = []
+        self.create_calls = 0
+        self._names: Dict[str, object] = {}
+        self._failures: List[Exception] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def queue_path(project: str, location: str, queue: str) -> str:
+        return f"projects/{project}/locations/{location}/queues/{queue}"
+
+    def fail_next(self, *errors: Exception) -> None:
+        """Makes the next create_task calls raise these errors, in order."""
+        with self._lock:
+            self._failures.extend(errors)
+
+    def create_task(self, parent: str, task, **kwargs):
+        from google.api_core import exceptions
+
+        with self._lock:
+            self.create_calls += 1
+            if self._failures:
+                raise self._failures.pop(0)
+            if task.name and task.name in self._names:
+                raise exceptions.AlreadyExists(
+                    f"Requested entity already exists: {task.name}"
+                )
+            if task.name:
+                self._names[task.name] = task
+            self.tasks.append(task)
+            return task
+
+    def task_names(self, queue: Optional[str] = None) -> List[str]:
+        """Short names of the created named tasks, optionally of one queue only."""
+        return [
+            task.name.rsplit("/", 1)[-1]
+            for task in self.tasks
+            if task.name and (queue is None or f"/queues/{queue}/" in task.name)
+        ]
+
+    def bodies(self) -> List[dict]:
+        """JSON bodies of the created tasks, in creation order."""
+        return [json.loads(task.http_request.body) for task in self.tasks]
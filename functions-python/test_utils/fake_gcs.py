@@ -0,0 +1,137 @@
+#
+#   MobilityData 2026
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""
+In-memory stand-ins for google.cloud.storage clients and buckets, to test GCS code offline.
+"""
+
+import base64
+import hashlib
+import itertools
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from google.api_core.exceptions import NotFound
+
+_generations = itertools.count(1)
+
+
+def _glob_to_regex(pattern: str):
+    """Translates a GCS match_glob pattern (`**`, `*`, `?`) to a compiled regex."""
+    parts = re.split(r"(\*\*|\*|\?)", pattern)
+    translated = {"**": ".*", "*": "[^/]*", "?": "[^/]"}
+    return re.compile(
+        "".join(translated.get(part, re.escape(part)) for part in parts) + r"\Z"
+    )
+
+
+class FakeBlob:
+    """
+    Blob of a FakeBucket. Like GCS, every upload creates a new generation, and a blob only exists
+    in its bucket once uploaded.
+    """
+
+    def __init__(self, bucket: "FakeBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+        self.content = b""
+        self.size = None
+        self.md5_hash = None
+        self.updated = None
+        self.generation = None
+
+    def _set_content(self, content: bytes, updated: Optional[datetime] = None):
+        self.content = content
+        self.size = len(content)
+        self.md5_hash = base64.b64encode(hashlib.md5(content).digest()).decode()
+        self.updated = updated or datetime.now(timezone.utc)
+        self.generation = next(_generations)
+        self.bucket._blobs[self.name] = self
+
+    def exists(self) -> bool:
+        return self.name in self.bucket._blobs
+
+    def upload_from_string(self, data, content_type: str = None) -> None:
+        self._set_content(data.encode() if isinstance(data, str) else data)
+
+    def download_as_bytes(self) -> bytes:
+        if not self.exists():
+            raise NotFound(f"{self.bucket.name}/{self.name}")
+        return self.bucket._blobs[self.name].content
+
+    def download_as_text(self) -> str:
+        return self.download_as_bytes().decode()
+
+    def delete(self) -> None:
+        if self.bucket._blobs.pop(self.name, None) is None:
+            raise NotFound(f"{self.bucket.name}/{self.name}")
+
+
+class FakeBucket:
+    """
+    Bucket keeping blobs in memory. `list_blobs` honours prefix and match_glob and records every
+    call in `list_calls` so tests can assert how many listings were made.
+    """
+
+    def __init__(self, name: str = "fake-bucket"):
+        self.name = name
+        self._blobs: Dict[str, FakeBlob] = {}
+        self.list_calls: List[dict] = []
+
+    def add_blob(
+        self,
+        name: str,
+        content: bytes = b"",
+        updated: Optional[datetime] = None,
+        md5_hash: Optional[str] = None,
+    ) -> FakeBlob:
+        """Adds a blob. The MD5 is computed from content unless md5_hash is given."""
+        blob = FakeBlob(self, name)
+        blob._set_content(content, updated)
+        if md5_hash:
+            blob.md5_hash = md5_hash
+        return blob
+
+    def blob(self, name: str) -> FakeBlob:
+        """Returns the blob, or a new blob that exists once uploaded."""
+        return self._blobs.get(name) or FakeBlob(self, name)
+
+    def list_blobs(self, prefix=None, match_glob=None, fields=None, **kwargs):
+        self.list_calls.append(
+            {"prefix": prefix, "match_glob": match_glob, "fields": fields}
+        )
+        glob = _glob_to_regex(match_glob) if match_glob else None
+        return iter(
+            [
+                blob
+                for name, blob in sorted(self._blobs.items())
+                if name.startswith(prefix or "") and (not glob or glob.match(name))
+            ]
+        )
+
+
+class FakeStorageClient:
+    """Storage client serving FakeBuckets, created on first use."""
+
+    def __init__(self):
+        self.buckets: Dict[str, FakeBucket] = {}
+
+    def bucket(self, name: str) -> FakeBucket:
+        return self.buckets.setdefault(name, FakeBucket(name))
+
+    def list_blobs(self, bucket_name: str, **kwargs):
+        return self.bucket(bucket_name).list_blobs(**kwargs)
@@ -0,0 +1,128 @@
+#
+#   MobilityData 2026
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+
+"""
+Local HTTP server standing in for the GBFS validator summary endpoint, to test validation
+requests offline over real HTTP.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+def default_report_summary(url: str) -> dict:
+    """Minimal validator summary for url, with no error."""
+    return {
+        "summary": {"validatorVersion": "1.0.13", "errorsCount": 0},
+        "filesSummary": [
+            {
+                "file": "gbfs.json",
+                "required": True,
+                "exists": True,
+                "hasErrors": False,
+                "groupedErrors": [],
+            }
+        ],
+        "url": url,
+    }
+
+
+class StubGbfsValidatorServer:
+    """
+    Threaded server answering POST {"url": ...} requests with a report summary.
+
+    Args:
+        summaries: Report summary returned per validated URL; default_report_summary otherwise.
+        delay_seconds: Time spent on each request, to observe concurrency.
+        failures: Number of 503 responses returned per URL before answering, to exercise retries.
+
+    Use as a context manager; `url` is the endpoint to use as VALIDATOR_URL.
+    """
+
+    def __init__(
+        self,
+        summaries: Optional[Dict[str, dict]] = None,
+        delay_seconds: float = 0,
+        failures: Optional[Dict[str, int]] = None,
+    ):
+        self.summaries = summaries or {}
+        self.delay_seconds = delay_seconds
+        self.failures = dict(failures or {})
+        self.requests: List[str] = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/validator-summary"
+
+    def __enter__(self) -> "StubGbfsValidatorServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def _respond(self, validated_url: str):
+        """Returns the (status, body) of a request validating validated_url."""
+        with self._lock:
+            self.requests.append(validated_url)
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            failing = self.failures.get(validated_url, 0) > 0
+            if failing:
+                self.failures[validated_url] -= 1
+        try:
+            time.sleep(self.delay_seconds)
+            if failing:
+                return 503, {"error": "unavailable"}
+            summary = self.summaries.get(validated_url) or default_report_summary(
+                validated_url
+            )
+            return 200, summary
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                status, body = stub._respond(payload.get("url"))
+                content = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
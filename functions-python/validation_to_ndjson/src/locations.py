@@ -1,7 +1,7 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Iterable, List
 
-from sqlalchemy.orm import joinedload, Session
+from sqlalchemy.orm import joinedload, selectinload, Session
 
 from shared.database_gen.sqlacodegen_models import Feed
 from shared.database.database import with_db_session
@@ -46,3 +46,36 @@ def get_feed_location(stable_id: str, db_session: Session) -> List[Location]:
         if feeds is not None and len(feeds) > 0
         else []
     )
+
+
+@with_db_session
+def get_feeds_locations(
+    stable_ids: Iterable[str], db_session: Session
+) -> Dict[str, List[Location]]:
+    """
+    Get the locations of several feeds in one query.
+    @param stable_ids: The stable IDs of the feeds.
+    @param db_session: The database session.
+    @return: The locations of each feed by stable ID; feeds not found have no entry.
+    """
+    stable_ids = list(set(stable_ids))
+    if not stable_ids:
+        return {}
+    feeds = (
+        db_session.query(Feed)
+        .filter(Feed.stable_id.in_(stable_ids))
+        .options(selectinload(Feed.locations))
+        .all()
+    )
+    return {
+        feed.stable_id: [
+            Location(
+                country=location.country,
+                country_code=location.country_code,
+                subdivision_name=location.subdivision_name,
+                municipality=location.municipality,
+            )
+            for location in feed.locations
+        ]
+        for feed in feeds
+    }
@@ -7,7 +7,9 @@ from cloudevents.http import CloudEvent
 from shared.helpers.logger import init_logger
 from google.cloud import storage
 from validation_report_converter import (
+    ReportSource,
     ValidationReportConverter,
+    convert_reports_batch,
     project_id,
     bucket_name,
 )
@@ -23,12 +25,20 @@ def parse_resource_data(data: dict) -> tuple:
     """
     logging.info("Parsing resource data {}".format(data))
     resource_name = data["protoPayload"]["resourceName"]
-    stable_id = resource_name.split("/")[-3]
-    dataset_id = resource_name.split("/")[-2]
-    file_name = resource_name.split("/")[-1]
-    report_id = ".".join(file_name.split(".")[:-1])
     bucket_name = data["resource"]["labels"]["bucket_name"]
-    url = f"https://storage.googleapis.com/{bucket_name}/{stable_id}/{dataset_id}/{file_name}"
+    return parse_report_blob_name(bucket_name, resource_name)
+
+
+def parse_report_blob_name(bucket: str, blob_name: str) -> tuple:
+    """
+    Extract the report information from the name of a report blob (<stable_id>/<dataset_id>/<file>).
+    @return tuple: A tuple containing the stable_id, dataset_id, report_id, and url.
+    """
+    stable_id, dataset_id, file_name = blob_name.split("/")[-3:]
+    report_id = ".".join(file_name.split(".")[:-1])
+    url = (
+        f"https://storage.googleapis.com/{bucket}/{stable_id}/{dataset_id}/{file_name}"
+    )
     return stable_id, dataset_id, report_id, url
 
 
@@ -54,7 +64,10 @@ def convert_reports_to_ndjson(cloud_event: CloudEvent):
 
 @functions_framework.http
 def batch_convert_reports_to_ndjson(request: flask.Request):
-    """Batch convert all reports in the bucket to NDJSON format."""
+    """
+    Batch convert all reports in the bucket to NDJSON format. The reports are written to a few
+    NDJSON shards under ndjson/batch/ instead of one file per report.
+    """
     logging.info("Function triggered")
 
     # 1. Get the validator version from the request
@@ -68,27 +81,15 @@ def batch_convert_reports_to_ndjson(request: flask.Request):
 
     # 2. Get all reports in the bucket
     storage_client = storage.Client(project_id)
-    blobs = list(storage_client.list_blobs(bucket_name))
-    report_blobs = [
-        blob
+    blobs = storage_client.list_blobs(bucket_name)
+    reports = [
+        ReportSource(*parse_report_blob_name(bucket_name, blob.name))
         for blob in blobs
         if "report_" in blob.name and blob.name.endswith(report_suffix)
     ]
-    logging.info("Found %s reports to process.", len(report_blobs))
+    logging.info("Found %s reports to process.", len(reports))
 
-    # 3. For each report create cloud event and call convert_reports_to_ndjson
-    for blob in report_blobs:
-        cloud_event = CloudEvent(
-            data={
-                "protoPayload": {
-                    "resourceName": blob.name,
-                },
-                "resource": {"labels": {"bucket_name": bucket_name}},
-            },
-            attributes={
-                "source": "batch_convert_reports_to_ndjson",
-                "type": "batch_convert_reports_to_ndjson",
-            },
-        )
-        convert_reports_to_ndjson(cloud_event)
+    # 3. Convert the reports into NDJSON shards
+    shard_names = convert_reports_batch(reports)
+    logging.info("Wrote %s NDJSON shards.", len(shard_names))
     return "Success converting reports to NDJSON"
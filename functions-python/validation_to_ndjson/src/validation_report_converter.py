@@ -1,23 +1,42 @@
 import json
 import logging
 import os
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
 
 import requests
 from google.cloud import storage
+from requests.adapters import HTTPAdapter
 
 from shared.helpers.bq_schema.schema import (
     json_schema_map,
     load_json_schema,
     filter_json_by_schema,
 )
-from locations import get_feed_location
+from locations import Location, get_feed_location, get_feeds_locations
 
 # Environment variables
 project_id = os.getenv("PROJECT_ID")
 bucket_name = os.getenv("BUCKET_NAME")
 data_type = os.getenv("DATA_TYPE")
 
+# Batch conversion: reports written per NDJSON shard, and reports downloaded in parallel
+BATCH_SHARD_SIZE = int(os.getenv("BATCH_SHARD_SIZE", "1000"))
+BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "16"))
+REPORT_REQUEST_TIMEOUT_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class ReportSource:
+    """Location of a validation report to convert."""
+
+    stable_id: str
+    dataset_id: str
+    report_id: str
+    url: str
+
 
 class ValidationReportConverter:
     """Converts a validation report to NDJSON format."""
@@ -28,23 +47,30 @@ class ValidationReportConverter:
         dataset_id: str,
         report_id: str,
         validation_report_url: str,
+        validation_report: Optional[dict] = None,
+        locations: Optional[List[Location]] = None,
+        json_schema: Optional[dict] = None,
     ):
-        try:
-            self.validation_report = requests.get(validation_report_url).json()
-        except Exception as e:
-            logging.error("Failed to download the validation report: %", e)
-            self.validation_report = None
+        """
+        The validation report, feed locations and JSON schema are fetched unless given, as done by
+        the batch conversion which prefetches them for many reports.
+        """
+        if validation_report is None:
+            try:
+                validation_report = requests.get(validation_report_url).json()
+            except Exception as e:
+                logging.error("Failed to download the validation report: %s", e)
+        self.validation_report = validation_report
         self.stable_id = stable_id
         self.dataset_id = dataset_id
         self.report_id = report_id
         self.nd_json_path_prefix = "ndjson"
-        self.locations = get_feed_location(stable_id)
-        self.json_schema_path = os.path.join(
-            os.path.dirname(__file__),
-            "shared/helpers/bq_schema",
-            json_schema_map.get(data_type, "gtfs"),
+        self.locations = (
+            locations if locations is not None else get_feed_location(stable_id)
+        )
+        self.json_schema = (
+            json_schema if json_schema is not None else load_json_schema_for_data_type()
         )
-        self.json_schema = load_json_schema(self.json_schema_path)
 
     @staticmethod
     def get_converter(data_type_value: Optional[str] = None) -> type:
@@ -68,9 +94,24 @@ class ValidationReportConverter:
             f"{self.dataset_id}/"
             f"{self.report_id}.ndjson"
         )
+        ndjson_content = self.to_ndjson_line()
+        if ndjson_content is None:
+            return
+
+        storage_client = storage.Client(project=project_id)
+        bucket = storage_client.bucket(bucket_name)
+        ndjson_blob = bucket.blob(ndjson_blob_name)
+        ndjson_blob.upload_from_string(ndjson_content + "\n")
+        logging.info("Processed and uploaded %s to", ndjson_blob_name)
+
+    def to_ndjson_line(self) -> Optional[str]:
+        """
+        Augments the validation report and returns it as a single NDJSON record (one line, without
+        line break), or None if the report is empty.
+        """
         if self.validation_report is None:
             logging.error("Validation report is empty for %s.", self.report_id)
-            return
+            return None
 
         # Add feedId to the JSON data
         self.validation_report["feedId"] = self.stable_id
@@ -86,14 +127,7 @@ class ValidationReportConverter:
 
         self._process()
         json_data = filter_json_by_schema(self.json_schema, self.validation_report)
-
-        # Convert the JSON data to a single NDJSON record (one line)
-        storage_client = storage.Client(project=project_id)
-        bucket = storage_client.bucket(bucket_name)
-        ndjson_content = json.dumps(json_data, separators=(",", ":"))
-        ndjson_blob = bucket.blob(ndjson_blob_name)
-        ndjson_blob.upload_from_string(ndjson_content + "\n")
-        logging.info("Processed and uploaded %s to", ndjson_blob_name)
+        return json.dumps(json_data, separators=(",", ":"))
 
 
 class GTFSValidationReportConverter(ValidationReportConverter):
@@ -105,8 +139,11 @@ class GTFSValidationReportConverter(ValidationReportConverter):
         dataset_id: str,
         report_id: str,
         validation_report_url: str,
+        **kwargs,
     ):
-        super().__init__(stable_id, dataset_id, report_id, validation_report_url)
+        super().__init__(
+            stable_id, dataset_id, report_id, validation_report_url, **kwargs
+        )
 
     def _process(self):
         self.validation_report["datasetId"] = self.dataset_id
@@ -126,8 +163,130 @@ class GTFSValidationReportConverter(ValidationReportConverter):
 class GBFSValidationReportConverter(ValidationReportConverter):
     """Converts a GBFS validation report to NDJSON format."""
 
-    def __init__(self, stable_id, dataset_id, report_id, validation_report_url):
-        super().__init__(stable_id, dataset_id, report_id, validation_report_url)
+    def __init__(
+        self, stable_id, dataset_id, report_id, validation_report_url, **kwargs
+    ):
+        super().__init__(
+            stable_id, dataset_id, report_id, validation_report_url, **kwargs
+        )
 
     def _process(self):
         self.validation_report["snapshotId"] = self.dataset_id
+
+
+def load_json_schema_for_data_type() -> dict:
+    """Loads the BigQuery JSON schema of the reports of the DATA_TYPE."""
+    json_schema_path = os.path.join(
+        os.path.dirname(__file__),
+        "shared/helpers/bq_schema",
+        json_schema_map.get(data_type, "gtfs"),
+    )
+    return load_json_schema(json_schema_path)
+
+
+def fetch_validation_report(session: requests.Session, url: str) -> Optional[dict]:
+    """Downloads a validation report, or returns None if it cannot be downloaded."""
+    try:
+        response = session.get(url, timeout=REPORT_REQUEST_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        logging.error("Failed to download the validation report %s: %s", url, e)
+        return None
+
+
+def convert_reports_batch(
+    reports: List[ReportSource],
+    shard_size: int = BATCH_SHARD_SIZE,
+    max_workers: int = BATCH_MAX_WORKERS,
+    data_type_value: Optional[str] = None,
+) -> List[str]:
+    """
+    Converts many validation reports into a few NDJSON shards of up to shard_size reports each,
+    under ndjson/batch/<run>/. The feed locations are fetched in one query and the reports are
+    downloaded in parallel over a pooled session, one shard at a time; each report is written to
+    its shard as soon as it is converted.
+    @return: The names of the written shards.
+    """
+    if not reports:
+        return []
+    converter_type = ValidationReportConverter.get_converter(data_type_value)
+    locations = get_feeds_locations(report.stable_id for report in reports)
+    json_schema = load_json_schema_for_data_type()
+    bucket = storage.Client(project=project_id).bucket(bucket_name)
+    run_id = datetime.now().strftime("%Y%m%d%H%M%S")
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    shard_names = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for start in range(0, len(reports), shard_size):
+                shard_reports = reports[start : start + shard_size]
+                bodies = executor.map(
+                    lambda report: fetch_validation_report(session, report.url),
+                    shard_reports,
+                )
+                shard_name = (
+                    f"ndjson/batch/{run_id}/shard-{len(shard_names):05d}.ndjson"
+                )
+                written = _write_shard(
+                    bucket.blob(shard_name),
+                    converter_type,
+                    shard_reports,
+                    bodies,
+                    locations,
+                    json_schema,
+                )
+                if written:
+                    shard_names.append(shard_name)
+                logging.info("Wrote %s reports to %s", written, shard_name)
+    finally:
+        session.close()
+    return shard_names
+
+
+def _write_shard(
+    blob: storage.Blob,
+    converter_type: type,
+    reports: List[ReportSource],
+    bodies,
+    locations: Dict[str, List[Location]],
+    json_schema: dict,
+) -> int:
+    """
+    Streams the NDJSON lines of the reports to blob. Returns the number of lines written.
+    The upload is only finalized once every line is written: on error it is left unfinished and
+    the shard is deleted if it exists, so no partial shard is loaded.
+    """
+    written = 0
+    writer = None
+    try:
+        for report, body in zip(reports, bodies):
+            line = converter_type(
+                report.stable_id,
+                report.dataset_id,
+                report.report_id,
+                report.url,
+                validation_report=body,
+                locations=locations.get(report.stable_id, []),
+                json_schema=json_schema,
+            ).to_ndjson_line()
+            if line is None:
+                continue
+            # Only create the shard once it has a line
+            writer = writer or blob.open("w", content_type="application/x-ndjson")
+            writer.write(line + "\n")
+            written += 1
+    except Exception:
+        if writer is not None:
+            logging.error("Aborting the upload of %s", blob.name)
+            if blob.exists():
+                blob.delete()
+        raise
+    if writer is not None:
+        writer.close()
+    return written
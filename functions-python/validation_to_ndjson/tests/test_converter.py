@@ -5,6 +5,8 @@ from validation_report_converter import (
     ValidationReportConverter,
     GTFSValidationReportConverter,
     GBFSValidationReportConverter,
+    ReportSource,
+    convert_reports_batch,
 )
 
 
@@ -141,3 +143,109 @@ class TestValidationReportConverter(unittest.TestCase):
         self.assertEqual(gbfs_type_converter, GBFSValidationReportConverter)
         with self.assertRaises(ValueError):
             ValidationReportConverter.get_converter("invalid_type")
+
+
+class TestConvertReportsBatch(unittest.TestCase):
+    def setUp(self):
+        self.reports = [
+            ReportSource("feed1", "ds1", f"report_{i}", f"http://example.com/{i}.json")
+            for i in range(5)
+        ]
+        self.mock_bucket = MagicMock()
+        self.shards = {}
+
+        self.blobs = {}
+
+        def blob(name):
+            mock_blob = MagicMock()
+            writer = MagicMock()
+            self.shards[name] = []
+            writer.write.side_effect = self.shards[name].append
+            mock_blob.open.return_value = writer
+            self.blobs[name] = mock_blob
+            return mock_blob
+
+        self.mock_bucket.blob.side_effect = blob
+
+    @patch("validation_report_converter.load_json_schema")
+    @patch("validation_report_converter.get_feeds_locations")
+    @patch("validation_report_converter.storage.Client")
+    @patch("validation_report_converter.requests.Session.get")
+    def test_writes_shards(
+        self, mock_get, mock_storage_client, mock_get_feeds_locations, mock_schema
+    ):
+        mock_storage_client().bucket.return_value = self.mock_bucket
+        mock_get_feeds_locations.return_value = {"feed1": []}
+        mock_schema.return_value = {
+            "fields": [
+                {"name": "feedId", "type": "STRING"},
+                {"name": "datasetId", "type": "STRING"},
+            ]
+        }
+        mock_get.return_value.json.side_effect = lambda: {"summary": {}}
+
+        shard_names = convert_reports_batch(
+            self.reports, shard_size=2, max_workers=2, data_type_value="gtfs"
+        )
+
+        # The locations are fetched once for all the reports
+        mock_get_feeds_locations.assert_called_once()
+        self.assertEqual(mock_get.call_count, 5)
+        self.assertEqual(len(shard_names), 3)
+        self.assertTrue(shard_names[0].endswith("/shard-00000.ndjson"))
+        lines = [line for name in shard_names for line in self.shards[name]]
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{"feedId": "feed1", "datasetId": "ds1"}] * 5,
+        )
+        self.assertTrue(all(line.endswith("\n") for line in lines))
+
+    @patch("validation_report_converter.load_json_schema")
+    @patch("validation_report_converter.get_feeds_locations")
+    @patch("validation_report_converter.storage.Client")
+    @patch("validation_report_converter.requests.Session.get")
+    def test_skips_reports_that_cannot_be_downloaded(
+        self, mock_get, mock_storage_client, mock_get_feeds_locations, mock_schema
+    ):
+        mock_storage_client().bucket.return_value = self.mock_bucket
+        mock_get_feeds_locations.return_value = {}
+        mock_schema.return_value = {"fields": [{"name": "feedId", "type": "STRING"}]}
+        mock_get.side_effect = Exception("Connection error")
+
+        shard_names = convert_reports_batch(
+            self.reports, shard_size=10, max_workers=2, data_type_value="gtfs"
+        )
+
+        self.assertEqual(shard_names, [])
+        # The shard is never opened, so no empty file is created
+        self.assertEqual(list(self.shards.values()), [[]])
+
+    @patch("validation_report_converter.load_json_schema")
+    @patch("validation_report_converter.get_feeds_locations")
+    @patch("validation_report_converter.storage.Client")
+    @patch("validation_report_converter.requests.Session.get")
+    def test_partial_shard_is_not_committed(
+        self, mock_get, mock_storage_client, mock_get_feeds_locations, mock_schema
+    ):
+        mock_storage_client().bucket.return_value = self.mock_bucket
+        mock_get_feeds_locations.return_value = {}
+        mock_schema.return_value = {"fields": [{"name": "feedId", "type": "STRING"}]}
+        mock_get.return_value.json.side_effect = lambda: {"summary": {}}
+
+        with patch.object(
+            GTFSValidationReportConverter,
+            "to_ndjson_line",
+            side_effect=['{"feedId": "feed1"}', ValueError("Invalid report")],
+        ), self.assertRaises(ValueError):
+            convert_reports_batch(
+                self.reports, shard_size=10, max_workers=1, data_type_value="gtfs"
+            )
+
+        (shard,) = self.blobs.values()
+        writer = shard.open.return_value
+        writer.write.assert_called_once()
+        writer.close.assert_not_called()
+        shard.delete.assert_called_once()
+
+    def test_no_reports(self):
+        self.assertEqual(convert_reports_batch([]), [])
@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import MagicMock
 
-from locations import get_feed_location, Location
+from locations import get_feed_location, get_feeds_locations, Location
 
 
 class TestFeedsLocations(unittest.TestCase):
@@ -55,3 +55,32 @@ class TestFeedsLocations(unittest.TestCase):
         result = get_feed_location("test_stable_id", db_session=mock_session)
 
         self.assertEqual(result, [])  # The result should be an empty dictionary
+
+    def test_get_feeds_locations(self):
+        mock_session = MagicMock()
+        location = Location(
+            country_code="US",
+            country="United States",
+            subdivision_name="California",
+            municipality="San Francisco",
+        )
+        mock_feed1 = MagicMock(stable_id="feed1", locations=[location])
+        mock_feed2 = MagicMock(stable_id="feed2", locations=[])
+        mock_query = mock_session.query.return_value
+        mock_query.filter.return_value.options.return_value.all.return_value = [
+            mock_feed1,
+            mock_feed2,
+        ]
+
+        result = get_feeds_locations(
+            ["feed1", "feed2", "feed1"], db_session=mock_session
+        )
+
+        mock_session.query.assert_called_once()
+        self.assertEqual(result, {"feed1": [location], "feed2": []})
+
+    def test_get_feeds_locations_empty(self):
+        mock_session = MagicMock()
+
+        self.assertEqual(get_feeds_locations([], db_session=mock_session), {})
+        mock_session.query.assert_not_called()
@@ -50,9 +50,9 @@ class TestReportConversionFunctions(unittest.TestCase):
         self.assertEqual(result, ("stable_id", "dataset_id", "url"))
 
     @patch("main.storage.Client")
-    @patch("main.convert_reports_to_ndjson")
+    @patch("main.convert_reports_batch")
     def test_batch_convert_reports_to_ndjson(
-        self, mock_convert_reports_to_ndjson, mock_storage_client
+        self, mock_convert_reports_batch, mock_storage_client
     ):
         # Setup mocks
         mock_blob1 = MagicMock()
@@ -61,14 +61,28 @@ class TestReportConversionFunctions(unittest.TestCase):
         mock_blob2 = MagicMock()
         mock_blob2.name = "stable_id/dataset_id/report_2.json"
 
-        mock_storage_client().list_blobs.return_value = [mock_blob1, mock_blob2]
+        mock_blob3 = MagicMock()
+        mock_blob3.name = "ndjson/stable_id/dataset_id/report_1.ndjson"
+
+        mock_storage_client().list_blobs.return_value = [
+            mock_blob1,
+            mock_blob2,
+            mock_blob3,
+        ]
+        mock_convert_reports_batch.return_value = ["ndjson/batch/1/shard-00000.ndjson"]
 
         # Call the function
         result = batch_convert_reports_to_ndjson(None)
 
         # Assertions
         mock_storage_client().list_blobs.assert_called_once()
-        self.assertEqual(mock_convert_reports_to_ndjson.call_count, 2)
+        mock_convert_reports_batch.assert_called_once()
+        reports = mock_convert_reports_batch.call_args[0][0]
+        self.assertEqual(
+            [(report.stable_id, report.report_id) for report in reports],
+            [("stable_id", "report_1"), ("stable_id", "report_2")],
+        )
+        self.assertTrue(reports[0].url.endswith("/stable_id/dataset_id/report_1.json"))
         self.assertEqual(result, "Success converting reports to NDJSON")
 
     def test_parse_resource_data(self):
@@ -0,0 +1,114 @@
+-- Convert gtfs_feed_availability_check into a table range-partitioned by month on checked_at.
+-- Availability history is the fastest-growing table: feeds are checked several times a day and
+-- rows are never deleted. With monthly partitions, range queries on checked_at (the
+-- get_gtfs_feed_availability endpoints) only scan the partitions that overlap the range, and old
+-- months can later be detached or archived without rewriting the table.
+--
+-- PostgreSQL requires the partition key to be part of the primary key, so the primary key becomes
+-- (id, checked_at). id is still generated by gen_random_uuid() and remains unique in practice.
+
+-- Keep the existing table aside while the partitioned table is created under the original name.
+ALTER TABLE gtfs_feed_availability_check RENAME TO gtfs_feed_availability_check_unpartitioned;
+ALTER INDEX gtfs_feed_availability_check_pkey RENAME TO gtfs_feed_availability_check_unpartitioned_pkey;
+ALTER TABLE gtfs_feed_availability_check_unpartitioned
+    RENAME CONSTRAINT gtfs_feed_availability_check_feed_id_fkey
+    TO gtfs_feed_availability_check_unpartitioned_feed_id_fkey;
+DROP INDEX IF EXISTS idx_gtfs_feed_availability_check_feed_checked_at;
+DROP INDEX IF EXISTS idx_gtfs_feed_availability_check_checked_at;
+DROP INDEX IF EXISTS idx_gtfs_feed_availability_check_feed_success_checked_at;
+
+CREATE TABLE gtfs_feed_availability_check (
+    id           UUID NOT NULL DEFAULT gen_random_uuid(),
+
+    feed_id      VARCHAR(255) NOT NULL,
+    checked_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+    request_url  TEXT NOT NULL,
+    request_type availability_check_request_type NOT NULL,
+    status_code  INTEGER,
+    latency_ms   INTEGER,
+
+    error_message TEXT,
+    error_type   VARCHAR(255),
+
+    success      BOOLEAN NOT NULL,
+
+    created_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+    content_type TEXT,
+    is_zip       BOOLEAN,
+
+    CONSTRAINT gtfs_feed_availability_check_pkey PRIMARY KEY (id, checked_at),
+    CONSTRAINT gtfs_feed_availability_check_feed_id_fkey
+        FOREIGN KEY (feed_id)
+        REFERENCES gtfsfeed(id)
+        ON DELETE CASCADE
+) PARTITION BY RANGE (checked_at);
+
+-- Catch-all partition so an insert never fails because its month has not been created yet.
+-- The availability task creates the partition of the current month before writing, so this
+-- partition is expected to stay empty.
+CREATE TABLE IF NOT EXISTS gtfs_feed_availability_check_default
+    PARTITION OF gtfs_feed_availability_check DEFAULT;
+
+-- Create (if missing) the monthly partition containing p_checked_at and return its name.
+-- Months are computed in UTC, e.g. gtfs_feed_availability_check_y2026m03 holds
+-- [2026-03-01 00:00 UTC, 2026-04-01 00:00 UTC).
+CREATE OR REPLACE FUNCTION create_gtfs_feed_availability_check_partition(p_checked_at TIMESTAMPTZ)
+RETURNS TEXT AS $$
+DECLARE
+    month_start TIMESTAMPTZ := date_trunc('month', p_checked_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    month_end   TIMESTAMPTZ := month_start + INTERVAL '1 month';
+    partition_name TEXT := format(
+        'gtfs_feed_availability_check_y%sm%s',
+        to_char(month_start AT TIME ZONE 'UTC', 'YYYY'),
+        to_char(month_start AT TIME ZONE 'UTC', 'MM')
+    );
+BEGIN
+    IF to_regclass(partition_name) IS NULL THEN
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF gtfs_feed_availability_check FOR VALUES FROM (%L) TO (%L)',
+            partition_name,
+            month_start,
+            month_end
+        );
+    END IF;
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- One partition per month of existing history, plus the current and the next month.
+DO $$
+DECLARE
+    month_cursor TIMESTAMPTZ;
+BEGIN
+    SELECT date_trunc('month', COALESCE(MIN(checked_at), now()) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+    INTO month_cursor
+    FROM gtfs_feed_availability_check_unpartitioned;
+
+    WHILE month_cursor <= now() + INTERVAL '1 month' LOOP
+        PERFORM create_gtfs_feed_availability_check_partition(month_cursor);
+        month_cursor := month_cursor + INTERVAL '1 month';
+    END LOOP;
+END $$;
+
+INSERT INTO gtfs_feed_availability_check (
+    id, feed_id, checked_at, request_url, request_type, status_code, latency_ms,
+    error_message, error_type, success, created_at, content_type, is_zip
+)
+SELECT
+    id, feed_id, checked_at, request_url, request_type, status_code, latency_ms,
+    error_message, error_type, success, created_at, content_type, is_zip
+FROM gtfs_feed_availability_check_unpartitioned;
+
+DROP TABLE gtfs_feed_availability_check_unpartitioned;
+
+-- Indexes defined on the parent are created on every partition, including future ones.
+CREATE INDEX IF NOT EXISTS idx_gtfs_feed_availability_check_feed_checked_at
+    ON gtfs_feed_availability_check (feed_id, checked_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_gtfs_feed_availability_check_checked_at
+    ON gtfs_feed_availability_check (checked_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_gtfs_feed_availability_check_feed_success_checked_at
+    ON gtfs_feed_availability_check (feed_id, success, checked_at DESC);
@@ -0,0 +1,81 @@
+-- Daily roll-up of gtfs_feed_availability_check.
+-- gtfs_feed_availability_check stays the append-only source of truth. This table keeps one row per
+-- feed per UTC day so availability dashboards and the aggregated availability endpoints read a
+-- handful of rows instead of scanning every raw check of a date range.
+CREATE TABLE IF NOT EXISTS gtfs_feed_availability_daily (
+    feed_id           VARCHAR(255) NOT NULL,
+    day               DATE NOT NULL,
+
+    total_checks      INTEGER NOT NULL,
+    successful_checks INTEGER NOT NULL,
+    success_ratio     DOUBLE PRECISION NOT NULL,
+
+    -- Latency percentiles over the checks of the day that have a latency (NULL if none has).
+    latency_p50_ms    DOUBLE PRECISION,
+    latency_p95_ms    DOUBLE PRECISION,
+
+    -- error_type of the most recent check of the day that reported an error.
+    last_error_type   VARCHAR(255),
+    last_checked_at   TIMESTAMPTZ NOT NULL,
+
+    updated_at        TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+    PRIMARY KEY (feed_id, day),
+    CONSTRAINT gtfs_feed_availability_daily_feed_id_fkey
+        FOREIGN KEY (feed_id)
+        REFERENCES gtfsfeed(id)
+        ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_gtfs_feed_availability_daily_day
+    ON gtfs_feed_availability_daily (day);
+
+-- Recompute the roll-up rows of every feed for the UTC days in [p_from_day, p_to_day].
+-- Percentiles cannot be merged from partial aggregates, so a touched day is recomputed from the raw
+-- checks of that day only; the range predicate on checked_at keeps the scan on the matching
+-- monthly partitions. Returns the number of roll-up rows written.
+CREATE OR REPLACE FUNCTION refresh_gtfs_feed_availability_daily(p_from_day DATE, p_to_day DATE)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    INSERT INTO gtfs_feed_availability_daily (
+        feed_id, day, total_checks, successful_checks, success_ratio,
+        latency_p50_ms, latency_p95_ms, last_error_type, last_checked_at, updated_at
+    )
+    SELECT
+        c.feed_id,
+        (c.checked_at AT TIME ZONE 'UTC')::DATE AS day,
+        COUNT(*) AS total_checks,
+        COUNT(*) FILTER (WHERE c.success) AS successful_checks,
+        COUNT(*) FILTER (WHERE c.success)::DOUBLE PRECISION / COUNT(*) AS success_ratio,
+        percentile_cont(0.5) WITHIN GROUP (ORDER BY c.latency_ms) AS latency_p50_ms,
+        percentile_cont(0.95) WITHIN GROUP (ORDER BY c.latency_ms) AS latency_p95_ms,
+        (array_agg(c.error_type ORDER BY c.checked_at DESC) FILTER (WHERE c.error_type IS NOT NULL))[1]
+            AS last_error_type,
+        MAX(c.checked_at) AS last_checked_at,
+        now() AS updated_at
+    FROM gtfs_feed_availability_check c
+    WHERE c.checked_at >= (p_from_day::TIMESTAMP AT TIME ZONE 'UTC')
+      AND c.checked_at < ((p_to_day + 1)::TIMESTAMP AT TIME ZONE 'UTC')
+    GROUP BY c.feed_id, (c.checked_at AT TIME ZONE 'UTC')::DATE
+    ON CONFLICT (feed_id, day) DO UPDATE SET
+        total_checks      = EXCLUDED.total_checks,
+        successful_checks = EXCLUDED.successful_checks,
+        success_ratio     = EXCLUDED.success_ratio,
+        latency_p50_ms    = EXCLUDED.latency_p50_ms,
+        latency_p95_ms    = EXCLUDED.latency_p95_ms,
+        last_error_type   = EXCLUDED.last_error_type,
+        last_checked_at   = EXCLUDED.last_checked_at,
+        updated_at        = EXCLUDED.updated_at;
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill the roll-up from the existing history.
+SELECT refresh_gtfs_feed_availability_daily(
+    COALESCE((SELECT MIN(checked_at AT TIME ZONE 'UTC')::DATE FROM gtfs_feed_availability_check), CURRENT_DATE),
+    CURRENT_DATE
+);
@@ -0,0 +1,4 @@
+-- Row-level changes of a changelog are stored apart from its summary JSON (changelog_url), as one
+-- gzipped JSON file per GTFS file. row_changes_urls maps each file name to the URL of its row
+-- changes. NULL for changelogs generated before the split, whose JSON embeds the row changes.
+ALTER TABLE gtfs_dataset_changelog ADD COLUMN IF NOT EXISTS row_changes_urls JSONB;
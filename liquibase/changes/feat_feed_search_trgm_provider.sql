@@ -0,0 +1,5 @@
+-- Trigram index backing the operations API feed search (ILIKE '%term%' on feed.provider).
+-- pg_trgm is enabled by feat_1432_indexes.xml
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_feed_provider_trgm
+  ON feed USING gin (provider gin_trgm_ops);
@@ -0,0 +1,444 @@
+-- Denormalized feed summary.
+-- The feed endpoints used to build every response from a chain of relationship loads (latest dataset,
+-- its validation reports and features, locations, external ids, redirects, related links, license),
+-- costing several round-trips per page. feed_summary keeps one row per feed with the scalars and
+-- pre-flattened arrays these responses need, so a page of feeds is a single-table read.
+-- The rows are computed by the feed_summary_source view and kept up to date by the statement-level
+-- triggers below, which refresh the feeds touched by each write on the source tables.
+
+-- Sort key of a validator version ("7.1.0", "7.1.0-SNAPSHOT"): the numbers of its release part without
+-- the trailing zeros, so the latest report of a dataset is the one of the highest validator version as
+-- ordered by compare_java_versions in the API models, where "5.0" and "5.0.0" are equal and both lower
+-- than "5.0.1". Snapshots of a release are ordered before the release by the caller.
+CREATE OR REPLACE FUNCTION validator_version_sort_key(p_version TEXT)
+RETURNS NUMERIC[] AS $$
+    SELECT string_to_array(
+        regexp_replace(rtrim(substring(p_version FROM '^[0-9]+[0-9.]*'), '.'), '(\.0+)+$', ''),
+        '.'
+    )::NUMERIC[];
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE VIEW feed_summary_source AS
+SELECT
+    -- feed
+    f.id AS feed_id,
+    f.stable_id,
+    f.data_type,
+    f.status,
+    f.operational_status,
+    f.created_at,
+    f.provider,
+    f.feed_name,
+    f.note,
+    f.feed_contact_email,
+    f.official,
+    f.official_updated_at,
+    f.seasonal,
+
+    -- source
+    f.producer_url,
+    f.is_producer_url_unstable,
+    f.authentication_type,
+    f.authentication_info_url,
+    f.api_key_parameter_name,
+    f.license_url,
+    f.license_id,
+    license.is_spdx AS license_is_spdx,
+    license_tags.license_tags,
+    f.license_notes,
+
+    -- pre-flattened collections
+    COALESCE(external_ids.external_ids, '[]'::jsonb) AS external_ids,
+    COALESCE(redirects.redirects, '[]'::jsonb) AS redirects,
+    COALESCE(related_links.related_links, '[]'::jsonb) AS related_links,
+    COALESCE(locations.locations, '[]'::jsonb) AS locations,
+
+    -- GTFS feed
+    visualization_dataset.stable_id AS visualization_dataset_stable_id,
+    ST_YMin(gf.bounding_box) AS bounding_box_minimum_latitude,
+    ST_YMax(gf.bounding_box) AS bounding_box_maximum_latitude,
+    ST_XMin(gf.bounding_box) AS bounding_box_minimum_longitude,
+    ST_XMax(gf.bounding_box) AS bounding_box_maximum_longitude,
+
+    -- latest dataset
+    latest_dataset.stable_id AS latest_dataset_stable_id,
+    latest_dataset.hosted_url AS latest_dataset_hosted_url,
+    latest_dataset.downloaded_at AS latest_dataset_downloaded_at,
+    latest_dataset.service_date_range_start AS latest_dataset_service_date_range_start,
+    latest_dataset.service_date_range_end AS latest_dataset_service_date_range_end,
+    latest_dataset.agency_timezone AS latest_dataset_agency_timezone,
+    latest_dataset.hash AS latest_dataset_hash,
+    latest_dataset.hash_md5 AS latest_dataset_hash_md5,
+    latest_dataset.unzipped_size_bytes AS latest_dataset_unzipped_size_bytes,
+    latest_dataset.zipped_size_bytes AS latest_dataset_zipped_size_bytes,
+    ST_YMin(latest_dataset.bounding_box) AS latest_dataset_minimum_latitude,
+    ST_YMax(latest_dataset.bounding_box) AS latest_dataset_maximum_latitude,
+    ST_XMin(latest_dataset.bounding_box) AS latest_dataset_minimum_longitude,
+    ST_XMax(latest_dataset.bounding_box) AS latest_dataset_maximum_longitude,
+
+    -- latest validation report of the latest dataset
+    latest_report.id AS latest_report_id,
+    latest_report.total_error AS latest_report_total_error,
+    latest_report.total_warning AS latest_report_total_warning,
+    latest_report.total_info AS latest_report_total_info,
+    latest_report.unique_error_count AS latest_report_unique_error_count,
+    latest_report.unique_warning_count AS latest_report_unique_warning_count,
+    latest_report.unique_info_count AS latest_report_unique_info_count,
+    latest_report.features AS latest_report_features,
+
+    now() AS updated_at
+FROM feed f
+LEFT JOIN license ON license.id = f.license_id
+LEFT JOIN LATERAL (
+    SELECT array_agg(llt.tag_id ORDER BY llt.tag_id) AS license_tags
+    FROM license_license_tags llt
+    WHERE llt.license_id = f.license_id
+) AS license_tags ON TRUE
+LEFT JOIN LATERAL (
+    SELECT jsonb_agg(
+        jsonb_build_object('external_id', e.associated_id, 'source', e.source)
+        ORDER BY e.associated_id
+    ) AS external_ids
+    FROM externalid e
+    WHERE e.feed_id = f.id
+) AS external_ids ON TRUE
+LEFT JOIN LATERAL (
+    SELECT jsonb_agg(
+        jsonb_build_object('target_id', target.stable_id, 'comment', r.redirect_comment)
+        ORDER BY target.stable_id
+    ) AS redirects
+    FROM redirectingid r
+    JOIN feed target ON target.id = r.target_id
+    WHERE r.source_id = f.id
+) AS redirects ON TRUE
+LEFT JOIN LATERAL (
+    SELECT jsonb_agg(
+        jsonb_build_object(
+            'code', link.code,
+            'url', link.url,
+            'description', link.description,
+            'created_at', link.created_at
+        )
+        ORDER BY link.created_at, link.code
+    ) AS related_links
+    FROM feedrelatedlink link
+    WHERE link.feed_id = f.id
+) AS related_links ON TRUE
+LEFT JOIN LATERAL (
+    SELECT jsonb_agg(
+        jsonb_build_object(
+            'country_code', l.country_code,
+            'country', l.country,
+            'subdivision_name', l.subdivision_name,
+            'municipality', l.municipality
+        )
+        ORDER BY l.id
+    ) AS locations
+    FROM locationfeed lf
+    JOIN location l ON l.id = lf.location_id
+    WHERE lf.feed_id = f.id
+) AS locations ON TRUE
+LEFT JOIN gtfsfeed gf ON gf.id = f.id
+LEFT JOIN gtfsdataset visualization_dataset ON visualization_dataset.id = gf.visualization_dataset_id
+LEFT JOIN gtfsdataset latest_dataset ON latest_dataset.id = gf.latest_dataset_id
+LEFT JOIN LATERAL (
+    SELECT
+        vr.id,
+        vr.total_error,
+        vr.total_warning,
+        vr.total_info,
+        vr.unique_error_count,
+        vr.unique_warning_count,
+        vr.unique_info_count,
+        ARRAY(
+            SELECT fvr.feature
+            FROM featurevalidationreport fvr
+            WHERE fvr.validation_id = vr.id
+            ORDER BY fvr.feature
+        ) AS features
+    FROM validationreportgtfsdataset vrd
+    JOIN validationreport vr ON vr.id = vrd.validation_report_id
+    WHERE vrd.dataset_id = latest_dataset.id
+    ORDER BY
+        validator_version_sort_key(vr.validator_version) DESC NULLS LAST,
+        vr.validator_version LIKE '%-SNAPSHOT',
+        vr.validated_at DESC
+    LIMIT 1
+) AS latest_report ON TRUE;
+
+CREATE TABLE IF NOT EXISTS feed_summary AS
+SELECT * FROM feed_summary_source
+WITH NO DATA;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'feed_summary_pkey') THEN
+        ALTER TABLE feed_summary ADD CONSTRAINT feed_summary_pkey PRIMARY KEY (feed_id);
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'feed_summary_feed_id_fkey') THEN
+        ALTER TABLE feed_summary
+            ADD CONSTRAINT feed_summary_feed_id_fkey
+            FOREIGN KEY (feed_id) REFERENCES feed(id) ON DELETE CASCADE;
+    END IF;
+END $$;
+
+-- Listing order of the feed endpoints.
+CREATE INDEX IF NOT EXISTS idx_feed_summary_provider_stable_id ON feed_summary (provider, stable_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_feed_summary_stable_id ON feed_summary (stable_id);
+
+-- Recompute the summary of the given feeds, or of every feed when p_feed_ids is NULL.
+-- Returns the number of summary rows written.
+CREATE OR REPLACE FUNCTION refresh_feed_summary(p_feed_ids VARCHAR[] DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    IF p_feed_ids IS NOT NULL AND cardinality(p_feed_ids) = 0 THEN
+        RETURN 0;
+    END IF;
+
+    INSERT INTO feed_summary
+    SELECT *
+    FROM feed_summary_source
+    WHERE p_feed_ids IS NULL OR feed_id = ANY(p_feed_ids)
+    -- Consistent lock order between concurrent refreshes of overlapping feeds
+    ORDER BY feed_id
+    ON CONFLICT (feed_id) DO UPDATE SET
+        stable_id = EXCLUDED.stable_id,
+        data_type = EXCLUDED.data_type,
+        status = EXCLUDED.status,
+        operational_status = EXCLUDED.operational_status,
+        created_at = EXCLUDED.created_at,
+        provider = EXCLUDED.provider,
+        feed_name = EXCLUDED.feed_name,
+        note = EXCLUDED.note,
+        feed_contact_email = EXCLUDED.feed_contact_email,
+        official = EXCLUDED.official,
+        official_updated_at = EXCLUDED.official_updated_at,
+        seasonal = EXCLUDED.seasonal,
+        producer_url = EXCLUDED.producer_url,
+        is_producer_url_unstable = EXCLUDED.is_producer_url_unstable,
+        authentication_type = EXCLUDED.authentication_type,
+        authentication_info_url = EXCLUDED.authentication_info_url,
+        api_key_parameter_name = EXCLUDED.api_key_parameter_name,
+        license_url = EXCLUDED.license_url,
+        license_id = EXCLUDED.license_id,
+        license_is_spdx = EXCLUDED.license_is_spdx,
+        license_tags = EXCLUDED.license_tags,
+        license_notes = EXCLUDED.license_notes,
+        external_ids = EXCLUDED.external_ids,
+        redirects = EXCLUDED.redirects,
+        related_links = EXCLUDED.related_links,
+        locations = EXCLUDED.locations,
+        visualization_dataset_stable_id = EXCLUDED.visualization_dataset_stable_id,
+        bounding_box_minimum_latitude = EXCLUDED.bounding_box_minimum_latitude,
+        bounding_box_maximum_latitude = EXCLUDED.bounding_box_maximum_latitude,
+        bounding_box_minimum_longitude = EXCLUDED.bounding_box_minimum_longitude,
+        bounding_box_maximum_longitude = EXCLUDED.bounding_box_maximum_longitude,
+        latest_dataset_stable_id = EXCLUDED.latest_dataset_stable_id,
+        latest_dataset_hosted_url = EXCLUDED.latest_dataset_hosted_url,
+        latest_dataset_downloaded_at = EXCLUDED.latest_dataset_downloaded_at,
+        latest_dataset_service_date_range_start = EXCLUDED.latest_dataset_service_date_range_start,
+        latest_dataset_service_date_range_end = EXCLUDED.latest_dataset_service_date_range_end,
+        latest_dataset_agency_timezone = EXCLUDED.latest_dataset_agency_timezone,
+        latest_dataset_hash = EXCLUDED.latest_dataset_hash,
+        latest_dataset_hash_md5 = EXCLUDED.latest_dataset_hash_md5,
+        latest_dataset_unzipped_size_bytes = EXCLUDED.latest_dataset_unzipped_size_bytes,
+        latest_dataset_zipped_size_bytes = EXCLUDED.latest_dataset_zipped_size_bytes,
+        latest_dataset_minimum_latitude = EXCLUDED.latest_dataset_minimum_latitude,
+        latest_dataset_maximum_latitude = EXCLUDED.latest_dataset_maximum_latitude,
+        latest_dataset_minimum_longitude = EXCLUDED.latest_dataset_minimum_longitude,
+        latest_dataset_maximum_longitude = EXCLUDED.latest_dataset_maximum_longitude,
+        latest_report_id = EXCLUDED.latest_report_id,
+        latest_report_total_error = EXCLUDED.latest_report_total_error,
+        latest_report_total_warning = EXCLUDED.latest_report_total_warning,
+        latest_report_total_info = EXCLUDED.latest_report_total_info,
+        latest_report_unique_error_count = EXCLUDED.latest_report_unique_error_count,
+        latest_report_unique_warning_count = EXCLUDED.latest_report_unique_warning_count,
+        latest_report_unique_info_count = EXCLUDED.latest_report_unique_info_count,
+        latest_report_features = EXCLUDED.latest_report_features,
+        updated_at = EXCLUDED.updated_at;
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Trigger functions. Every trigger is a statement-level AFTER trigger exposing the written rows as the
+-- changed_rows transition table, so a bulk write refreshes each touched feed once. UPDATE triggers also
+-- expose the rows before the update as previous_rows.
+
+-- Tables holding the feed id in the column named by the first trigger argument. An update refreshes the
+-- feeds before and after the update, so a row moved to another feed is removed from its previous one.
+CREATE OR REPLACE FUNCTION feed_summary_on_feed_rows_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    feed_ids VARCHAR[];
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        EXECUTE format(
+            'SELECT array_agg(DISTINCT feed_id) FROM '
+            '(SELECT %1$I AS feed_id FROM changed_rows UNION SELECT %1$I FROM previous_rows) AS feed_rows',
+            TG_ARGV[0]
+        ) INTO feed_ids;
+    ELSE
+        EXECUTE format('SELECT array_agg(DISTINCT %I) FROM changed_rows', TG_ARGV[0]) INTO feed_ids;
+    END IF;
+    PERFORM refresh_feed_summary(COALESCE(feed_ids, '{}'));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- feed updates: refresh the updated feeds, and the feeds redirecting to a feed whose stable id changed
+-- since their redirects hold the stable id of the target.
+CREATE OR REPLACE FUNCTION feed_summary_on_feed_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_feed_summary(ARRAY(
+        SELECT id FROM changed_rows
+        UNION
+        SELECT r.source_id
+        FROM changed_rows f
+        JOIN previous_rows p ON p.id = f.id AND p.stable_id IS DISTINCT FROM f.stable_id
+        JOIN redirectingid r ON r.target_id = f.id
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- gtfsdataset: refresh the feeds whose latest or visualization dataset changed.
+CREATE OR REPLACE FUNCTION feed_summary_on_dataset_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_feed_summary(ARRAY(
+        SELECT gf.id
+        FROM gtfsfeed gf
+        JOIN changed_rows d ON d.id = gf.latest_dataset_id OR d.id = gf.visualization_dataset_id
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- validationreport / featurevalidationreport / validationreportgtfsdataset: refresh the feeds whose
+-- latest dataset has a report with the id held in the column named by the first trigger argument.
+CREATE OR REPLACE FUNCTION feed_summary_on_report_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    report_ids VARCHAR[];
+BEGIN
+    EXECUTE format('SELECT array_agg(DISTINCT %I) FROM changed_rows', TG_ARGV[0]) INTO report_ids;
+    IF report_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+    PERFORM refresh_feed_summary(ARRAY(
+        SELECT DISTINCT gf.id
+        FROM validationreportgtfsdataset vrd
+        JOIN gtfsfeed gf ON gf.latest_dataset_id = vrd.dataset_id
+        WHERE vrd.validation_report_id = ANY(report_ids)
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- validationreportgtfsdataset deletions: the link rows are gone, so map their dataset ids directly.
+CREATE OR REPLACE FUNCTION feed_summary_on_report_link_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_feed_summary(ARRAY(
+        SELECT DISTINCT gf.id
+        FROM changed_rows vrd
+        JOIN gtfsfeed gf ON gf.latest_dataset_id = vrd.dataset_id
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- location: refresh the feeds of the changed locations.
+CREATE OR REPLACE FUNCTION feed_summary_on_location_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_feed_summary(ARRAY(
+        SELECT DISTINCT lf.feed_id
+        FROM locationfeed lf
+        JOIN changed_rows l ON l.id = lf.location_id
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- license / license_license_tags: refresh the feeds using the license whose id is held in the column
+-- named by the first trigger argument.
+CREATE OR REPLACE FUNCTION feed_summary_on_license_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    license_ids TEXT[];
+BEGIN
+    EXECUTE format('SELECT array_agg(DISTINCT %I) FROM changed_rows', TG_ARGV[0]) INTO license_ids;
+    IF license_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+    PERFORM refresh_feed_summary(ARRAY(
+        SELECT f.id FROM feed f WHERE f.license_id = ANY(license_ids)
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Create the statement-level triggers. Transition tables cannot be shared by several events, so each
+-- (table, event) pair gets its own trigger. Deleting a feed cascades to its summary row.
+DO $$
+DECLARE
+    spec RECORD;
+    trigger_name TEXT;
+BEGIN
+    FOR spec IN
+        SELECT * FROM (VALUES
+            ('feed',                        'INSERT', 'feed_summary_on_feed_rows_change', 'id'),
+            ('feed',                        'UPDATE', 'feed_summary_on_feed_update', NULL),
+            ('gtfsfeed',                    'INSERT', 'feed_summary_on_feed_rows_change', 'id'),
+            ('gtfsfeed',                    'UPDATE', 'feed_summary_on_feed_rows_change', 'id'),
+            ('locationfeed',                'INSERT', 'feed_summary_on_feed_rows_change', 'feed_id'),
+            ('locationfeed',                'UPDATE', 'feed_summary_on_feed_rows_change', 'feed_id'),
+            ('locationfeed',                'DELETE', 'feed_summary_on_feed_rows_change', 'feed_id'),
+            ('externalid',                  'INSERT', 'feed_summary_on_feed_rows_change', 'feed_id'),
+            ('externalid',                  'UPDATE', 'feed_summary_on_feed_rows_change', 'feed_id'),
+            ('externalid',                  'DELETE', 'feed_summary_on_feed_rows_change', 'feed_id'),
+            ('feedrelatedlink',             'INSERT', 'feed_summary_on_feed_rows_change', 'feed_id'),
+            ('feedrelatedlink',             'UPDATE', 'feed_summary_on_feed_rows_change', 'feed_id'),
+            ('feedrelatedlink',             'DELETE', 'feed_summary_on_feed_rows_change', 'feed_id'),
+            ('redirectingid',               'INSERT', 'feed_summary_on_feed_rows_change', 'source_id'),
+            ('redirectingid',               'UPDATE', 'feed_summary_on_feed_rows_change', 'source_id'),
+            ('redirectingid',               'DELETE', 'feed_summary_on_feed_rows_change', 'source_id'),
+            ('gtfsdataset',                 'UPDATE', 'feed_summary_on_dataset_change', NULL),
+            ('validationreport',            'UPDATE', 'feed_summary_on_report_change', 'id'),
+            ('validationreportgtfsdataset', 'INSERT', 'feed_summary_on_report_change', 'validation_report_id'),
+            ('validationreportgtfsdataset', 'DELETE', 'feed_summary_on_report_link_delete', NULL),
+            ('featurevalidationreport',     'INSERT', 'feed_summary_on_report_change', 'validation_id'),
+            ('featurevalidationreport',     'DELETE', 'feed_summary_on_report_change', 'validation_id'),
+            ('location',                    'UPDATE', 'feed_summary_on_location_change', NULL),
+            ('license',                     'UPDATE', 'feed_summary_on_license_change', 'id'),
+            ('license_license_tags',        'INSERT', 'feed_summary_on_license_change', 'license_id'),
+            ('license_license_tags',        'DELETE', 'feed_summary_on_license_change', 'license_id')
+        ) AS t(table_name, event, function_name, argument)
+    LOOP
+        trigger_name := format('feed_summary_%s_%s', spec.table_name, lower(spec.event));
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', trigger_name, spec.table_name);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER %s ON %I REFERENCING %s '
+            'FOR EACH STATEMENT EXECUTE FUNCTION %I(%s)',
+            trigger_name,
+            spec.event,
+            spec.table_name,
+            CASE spec.event
+                WHEN 'DELETE' THEN 'OLD TABLE AS changed_rows'
+                WHEN 'UPDATE' THEN 'OLD TABLE AS previous_rows NEW TABLE AS changed_rows'
+                ELSE 'NEW TABLE AS changed_rows'
+            END,
+            spec.function_name,
+            COALESCE(quote_literal(spec.argument), '')
+        );
+    END LOOP;
+END $$;
+
+-- Backfill the summary of every feed.
+SELECT refresh_feed_summary();
@@ -0,0 +1,10 @@
+-- Buffer of feeds whose website pages must be revalidated.
+-- Dataset processing, validation reports, pmtiles and imports record the feeds they touched here
+-- instead of enqueuing one Cloud Task per feed. A single revalidate_feeds task per 30-minute window
+-- drains the table and calls the web app revalidation endpoint with chunked multi-feed requests.
+CREATE TABLE IF NOT EXISTS web_revalidation_request (
+    feed_stable_id VARCHAR(255) PRIMARY KEY,
+    requested_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+    -- Failed revalidation calls that included this feed; the row is dropped after too many.
+    attempts       INTEGER NOT NULL DEFAULT 0
+);